@@ -1,3 +1,5 @@
+from data import building_type_codes, default_building_type_code
+
 class Building:
     def __init__(self, idx, base_supply=0.0, name=None):
         self.idx=idx
@@ -9,6 +11,7 @@ class Building:
         self.x=0
         self.y=0
         self.removed=False
+        self.deleted=False            # 사용자 삭제 여부 (고장으로 인한 removed와 구분)
         self.blackout=False
         self.is_prosumer=False        # 프로슈머 여부
         
@@ -27,6 +30,8 @@ class Building:
         self.battery_capacity = 0.0         # 배터리 저장 용량
         self.battery_charge = 0.0           # 현재 배터리 충전량
         self.shortage = 0.0                 # 현재 부족 전력량 (check_blackouts에서 계산)
+        self.load_profile = None            # 실측 부하 프로필 id (없으면 공용 패턴 사용)
+        self.profile_row = -1               # 부하 프로필 저장소 행 번호
         
         # 재생에너지 발전소 속성
         self.wind_capacity = 0.0            # 풍력 발전 용량
@@ -36,6 +41,16 @@ class Building:
         self.hydrogen_efficiency = 0.6      # 수소 변환 효율 (60%)
         self.power_plant_type = None        # 발전소 타입 (wind, solar, hydro, hydrogen, thermal)
 
+    @property
+    def building_type(self):
+        return self._building_type
+
+    @building_type.setter
+    def building_type(self, value):
+        # 건물 유형이 바뀌면 수요 인자 테이블용 정수 코드도 함께 갱신
+        self._building_type = value
+        self.type_code = building_type_codes.get(value, default_building_type_code)
+
     def get_type_str(self):
         # building_type이 명시적으로 설정되어 있으면 우선 사용
         if self.building_type == "shopping_mall":
@@ -168,6 +183,7 @@ class PowerLine:
         self.cost=cost
         self.flow=0.0
         self.removed=False
+        self.deleted=False   # 사용자 삭제 여부 (고장으로 인한 removed와 구분)
         self.usage_rate=0.0  # 사용률
     
     def add_waypoint(self, x, y, index=None):
@@ -318,6 +334,7 @@ class CityGraph:
         b.rated_wind_speed = 12.0  # 정격 풍속 (m/s)
         b.cut_in_speed = 3.0  # 시동 풍속 (m/s)
         b.cut_out_speed = 25.0  # 정지 풍속 (m/s)
+        b.hub_height = 80.0  # 허브 높이 (m) - 기준 높이 10m 풍속의 약 1.35배 (WindModel.hub_height_factor)
         self.buildings.append(b)
         self.n += 1
         return b
@@ -370,7 +387,7 @@ class CityGraph:
         b.base_supply = 1  # 최소 발전량 설정
         b.name = f"수소연료전지발전소_{self.n}"
         b.fuel_cell_efficiency = 0.6  # 연료전지 효율 60%
-        b.electrolyzer_efficiency = 0.7  # 수전해 효율 70%
+        b.electrolysis_efficiency = 0.7  # 수전해 효율 70%
         self.buildings.append(b)
         self.n += 1
         return b
@@ -489,8 +506,15 @@ class CityGraph:
 
 
 
+    def delete(self, component):
+        """사용자 삭제 (건물/송전선) - 고장과 달리 수리반/자동 복구 대상에서 제외된다"""
+        component.removed = True
+        component.deleted = True
+
     def restore_all(self):
         for b in self.buildings:
             b.removed=False
+            b.deleted=False
         for pl in self.lines:
             pl.removed=False
+            pl.deleted=False
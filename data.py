@@ -1,13 +1,16 @@
 
 
 # -----------------------------------------------------
-# 지역별 확장 데이터 테이블 (예: 서울, 인천, 강릉, 춘천)
-# 각 지역별: latitude(위도), altitude(해발고도) 추가
+# 지역별 확장 데이터 테이블 (예: 서울, 인천, 강릉, 춘천, 부산, 제주 등)
+# 각 지역별: latitude(위도), longitude(경도), altitude(해발고도) 추가
 # pm_levels: 미세먼지 등급별 확률
+# weather_offset: 월별 기본 날씨 확률(monthly_weather_probs)에 더할 지역 보정값
+# monthly_humidity: 월별 평균 습도 (없으면 default_monthly_humidity 사용)
 # -----------------------------------------------------
 region_data = {
     "Seoul": {
         "lat": 37.5665,
+        "lon": 126.9780,
         "altitude": 38,  # 해발고도(대략 38m)
         "monthly_avg_temp":  [-2.0, 0.0, 5.0, 12.0, 18.0, 22.0, 26.0, 27.0, 21.0, 14.0, 6.0, 0.0],
         "monthly_daily_range":[ 8.0, 8.0,10.0,10.0, 9.0, 8.0, 6.0, 6.0, 8.0, 9.0,10.0, 8.0],
@@ -23,6 +26,7 @@ region_data = {
     },
     "Incheon": {
         "lat": 37.4563,
+        "lon": 126.7052,
         "altitude": 10,
         "monthly_avg_temp":  [-1.5, 0.5, 5.5, 11.5, 17.5, 21.5, 25.5, 26.5, 20.5, 14.5, 7.0, 1.0],
         "monthly_daily_range":[ 7.0, 7.0, 9.0, 9.0, 8.0, 7.0, 6.0, 6.0, 8.0, 8.0, 9.0, 7.0],
@@ -37,6 +41,7 @@ region_data = {
     },
     "Gangneung": {
         "lat": 37.7519,
+        "lon": 128.8761,
         "altitude": 20,
         "monthly_avg_temp":  [-1.0, 1.0, 6.0, 12.0, 17.5, 21.0, 25.0, 26.0, 20.0, 14.0, 7.0, 2.0],
         "monthly_daily_range":[ 7.0, 7.0, 9.0, 9.0, 8.0, 7.0, 6.0, 6.0, 8.0, 8.0, 9.0, 7.0],
@@ -51,6 +56,7 @@ region_data = {
     },
     "Chuncheon": {
         "lat": 37.8813,
+        "lon": 127.7298,
         "altitude": 75,
         "monthly_avg_temp":  [-3.0, -1.5, 4.0, 11.0, 17.0, 21.0, 25.0, 26.0, 19.5, 13.0, 5.0, -0.5],
         "monthly_daily_range":[10.0,10.0,12.0,12.0,10.0, 9.0, 8.0, 8.0, 9.0,10.0,12.0,10.0],
@@ -63,8 +69,108 @@ region_data = {
             "hazardous": 0.05
         }
     },
+    "Busan": {
+        "lat": 35.1796,
+        "lon": 129.0756,
+        "altitude": 70,
+        "monthly_avg_temp":  [ 0.5, 3.5, 9.0, 14.5, 20.0, 24.5, 28.0, 29.0, 24.5, 17.0, 9.5, 4.0],
+        "monthly_daily_range":[ 9.0, 9.0,10.0,11.0,12.0,11.0, 8.0, 8.0, 9.0,10.0, 9.0, 8.0],
+        "monthly_rain_prob":  [0.15,0.20,0.25,0.30,0.35,0.40,0.55,0.50,0.40,0.30,0.25,0.20],
+        "weather_offset": {"맑음": -0.05, "흐림": 0.0, "비": 0.05, "눈": 0.0},
+        "pm_levels": {
+            "good": 0.25,
+            "moderate": 0.35,
+            "unhealthy": 0.20,
+            "very_unhealthy": 0.15,
+            "hazardous": 0.05
+        }
+    },
+    "Gangwon": {
+        "lat": 37.8604,
+        "lon": 128.3115,
+        "altitude": 200,
+        "monthly_avg_temp":  [-4.5, -1.5, 4.0, 9.5, 15.0, 19.5, 23.0, 24.0, 19.5, 12.0, 4.5, -1.0],
+        "monthly_daily_range":[ 9.0, 9.0,10.0,11.0,12.0,11.0, 8.0, 8.0, 9.0,10.0, 9.0, 8.0],
+        "monthly_rain_prob":  [0.15,0.20,0.25,0.30,0.35,0.40,0.55,0.50,0.40,0.30,0.25,0.20],
+        "weather_offset": {"맑음": -0.1, "흐림": 0.0, "비": -0.05, "눈": 0.15},
+        "pm_levels": {
+            "good": 0.25,
+            "moderate": 0.35,
+            "unhealthy": 0.20,
+            "very_unhealthy": 0.15,
+            "hazardous": 0.05
+        }
+    },
+    "Daejeon": {
+        "lat": 36.3504,
+        "lon": 127.3845,
+        "altitude": 68,
+        "monthly_avg_temp":  [-1.5, 1.5, 7.0, 12.5, 18.0, 22.5, 26.0, 27.0, 22.5, 15.0, 7.5, 2.0],
+        "monthly_daily_range":[ 9.0, 9.0,10.0,11.0,12.0,11.0, 8.0, 8.0, 9.0,10.0, 9.0, 8.0],
+        "monthly_rain_prob":  [0.15,0.20,0.25,0.30,0.35,0.40,0.55,0.50,0.40,0.30,0.25,0.20],
+        "pm_levels": {
+            "good": 0.25,
+            "moderate": 0.35,
+            "unhealthy": 0.20,
+            "very_unhealthy": 0.15,
+            "hazardous": 0.05
+        }
+    },
+    "Gwangju": {
+        "lat": 35.1595,
+        "lon": 126.8526,
+        "altitude": 72,
+        "monthly_avg_temp":  [-0.5, 2.5, 8.0, 13.5, 19.0, 23.5, 27.0, 28.0, 23.5, 16.0, 8.5, 3.0],
+        "monthly_daily_range":[ 9.0, 9.0,10.0,11.0,12.0,11.0, 8.0, 8.0, 9.0,10.0, 9.0, 8.0],
+        "monthly_rain_prob":  [0.15,0.20,0.25,0.30,0.35,0.40,0.55,0.50,0.40,0.30,0.25,0.20],
+        "weather_offset": {"맑음": -0.05, "흐림": 0.05, "비": 0.0, "눈": 0.0},
+        "pm_levels": {
+            "good": 0.25,
+            "moderate": 0.35,
+            "unhealthy": 0.20,
+            "very_unhealthy": 0.15,
+            "hazardous": 0.05
+        }
+    },
+    "Jeju": {
+        "lat": 33.4996,
+        "lon": 126.5312,
+        "altitude": 20,
+        "monthly_avg_temp":  [ 3.0, 6.0, 11.5, 17.0, 22.5, 27.0, 30.5, 31.5, 27.0, 19.5, 12.0, 6.5],
+        "monthly_daily_range":[ 8.0, 8.0, 9.0,10.0,11.0,10.0, 7.0, 7.0, 8.0, 9.0, 8.0, 7.0],
+        "monthly_rain_prob":  [0.15,0.20,0.25,0.30,0.35,0.40,0.55,0.50,0.40,0.30,0.25,0.20],
+        "weather_offset": {"맑음": -0.1, "흐림": 0.0, "비": 0.1, "눈": 0.0},
+        "pm_levels": {
+            "good": 0.25,
+            "moderate": 0.35,
+            "unhealthy": 0.20,
+            "very_unhealthy": 0.15,
+            "hazardous": 0.05
+        }
+    },
 }
 
+# -----------------------------------------------------
+# 월별 기본 날씨 확률 (서울 기준) - 지역별 weather_offset으로 보정 후 정규화
+# -----------------------------------------------------
+monthly_weather_probs = {
+    1:  {"맑음": 0.3, "흐림": 0.3, "비": 0.1, "눈": 0.3},
+    2:  {"맑음": 0.4, "흐림": 0.3, "비": 0.1, "눈": 0.2},
+    3:  {"맑음": 0.5, "흐림": 0.3, "비": 0.2, "눈": 0.0},
+    4:  {"맑음": 0.5, "흐림": 0.3, "비": 0.2, "눈": 0.0},
+    5:  {"맑음": 0.5, "흐림": 0.3, "비": 0.2, "눈": 0.0},
+    6:  {"맑음": 0.4, "흐림": 0.3, "비": 0.3, "눈": 0.0},
+    7:  {"맑음": 0.3, "흐림": 0.3, "비": 0.4, "눈": 0.0},
+    8:  {"맑음": 0.3, "흐림": 0.3, "비": 0.4, "눈": 0.0},
+    9:  {"맑음": 0.4, "흐림": 0.3, "비": 0.3, "눈": 0.0},
+    10: {"맑음": 0.5, "흐림": 0.4, "비": 0.1, "눈": 0.0},
+    11: {"맑음": 0.4, "흐림": 0.4, "비": 0.2, "눈": 0.0},
+    12: {"맑음": 0.3, "흐림": 0.3, "비": 0.1, "눈": 0.3}
+}
+
+# 월별 평균 습도 (%) 기본값
+default_monthly_humidity = [59.5, 58.3, 58.1, 59.2, 64.4, 71.7, 80.3, 78.9, 72.1, 66.3, 62.8, 60.1]
+
 # -----------------------------------------------------
 # 건물 유형별 파라미터 - 주말/평일, 주간/야간 사용 패턴, 조명 부하 등
 #  - weekday_factor: 평일 주간 배율
@@ -130,3 +236,8 @@ building_type_factors = {
     },
 }
 
+
+# 건물 유형 -> 정수 코드 (수요 인자 테이블 인덱스)
+# building_type_factors에 없는 유형은 default_building_type_code (유형 인자 1.0)
+building_type_codes = {name: code for code, name in enumerate(building_type_factors)}
+default_building_type_code = len(building_type_codes)
@@ -136,11 +136,8 @@ class Drawer:
             # 이벤트 처리
             self.ui.handle_events()
             
-            # 시뮬레이터 로직 업데이트
-            self.simulator.update_sim_time(dt)
-            self.simulator.apply_demand_pattern()
-            self.simulator.update_events()
-            self.simulator.update_flow(instant=True)
+            # 시뮬레이터 로직 업데이트 (시간 -> 수요 -> 이벤트 -> 흐름)
+            self.simulator.step(dt)
             
             # 파티클 업데이트
             self.particles.update(dt)
@@ -1610,6 +1610,15 @@ class DrawerRenderer:
             b = self.drawer.hover_bldg
             lines.append(("● " + b.get_type_str() + f" {b.idx}", (255, 255, 200)))
             
+            # 노드 가격 (경제 모델이 노드 가격을 계산한 경우)
+            econ = getattr(self.simulator, 'economic_model', None)
+            if econ is not None and b.idx < len(econ.nodal_prices):
+                price_text = f"  전력요금: {econ.nodal_prices[b.idx]:.1f} 원/kWh"
+                if econ.nodal_congested[b.idx]:
+                    lines.append((price_text + " (혼잡)", (255, 150, 150)))
+                else:
+                    lines.append((price_text, (220, 220, 255)))
+            
             # 건물 상세 정보 추가
             if hasattr(b, 'get_detailed_info'):
                 detailed_info = b.get_detailed_info()
@@ -1,15 +1,20 @@
 import pygame
 import math
+import copy
+import threading
 from utils import *
 from uis import *
 from city import PowerLine
 from algorithms import simple_upgrade_ai, analyze_current_grid_status, upgrade_critical_lines, build_producer_in_needed_area
+from modules.investment import InvestmentEvaluator, score_candidates
 
 class DrawerUI:
     def __init__(self, drawer):
         self.drawer = drawer
         self.simulator = drawer.simulator
         self.ai_upgrade_option_buttons = []
+        self.investment_job = None       # 백그라운드 투자 평가 {"thread", "scores"}
+        self.investment_scores = None    # 마지막 평가 결과 (선택지 순서)
     
     def setup_buttons(self):
         """버튼 설정 초기화"""
@@ -61,8 +66,10 @@ class DrawerUI:
     
     def restore_all(self):
         """모든 건물과 송전선 복원"""
-        self.simulator.city.restore_all()
-        self.simulator.update_flow(instant=True)
+        with self.simulator.record_edit("drawer_ui", "restore_all", effects=("restoration_reset",)):
+            self.simulator.city.restore_all()
+            self.simulator.event_system.restoration.reset()  # 대기/진행 중 수리 작업 취소
+            self.simulator.update_flow(instant=True)
 
     def toggle_ai_upgrade(self):
         """AI 업그레이드 패널 토글"""
@@ -201,6 +208,8 @@ class DrawerUI:
         # 기존 current_grid_analysis_text는 직접 사용하지 않거나, 여기서 채울 수 있음 (일단 results 전체를 넘김)
 
         # print(f"AI 업그레이드 패널 표시. 분석 요약: {analysis_output.get('summary', 'N/A')}")
+        self.investment_scores = None  # 패널을 열 때마다 투자 평가를 새로 시작 (이전 평가 결과는 버림)
+        self.investment_job = None
         self.setup_ai_upgrade_buttons() # 버튼 설정은 분석 결과 이후에 호출 (나중에 동적 생성 위해)
     
     def setup_ai_upgrade_buttons(self):
@@ -447,9 +456,24 @@ class DrawerUI:
                 "benefit": "자연재해 발생 시 정전 피해 50% 감소, 주요 인프라 전력 공급 보장"
             })
         
+        # 시뮬레이션 기반 투자 평가 (같은 우선순위 안에서는 NPV가 큰 순)
+        # 평가는 백그라운드 스레드에서 돌고, 끝나면 poll_investment_evaluation이 버튼을 다시 만든다
+        for option in upgrade_options:
+            option['npv'] = None
+        if self.investment_scores is None:
+            if self.investment_job is None:
+                self.start_investment_evaluation(upgrade_options)
+        for option, score in zip(upgrade_options, self.investment_scores or []):
+            if score['id'] != option['id']:
+                continue
+            option['npv'] = score['npv']
+            if score['npv'] is not None:
+                payback = f"{score['payback']:.1f}년" if score['payback'] != float('inf') else "회수 불가"
+                option['benefit'] += f" [NPV {score['npv']:.0f}, 회수 {payback}]"
+        
         # 우선순위와 예산에 따라 옵션 정렬 및 필터링
         # 최대 5개 옵션만 표시
-        upgrade_options = sorted(upgrade_options, key=lambda x: (x['priority'], -x['cost']))[:5]
+        upgrade_options = sorted(upgrade_options, key=lambda x: (x['priority'], -(x['npv'] if x['npv'] is not None else float('-inf')), -x['cost']))[:5]
         
         # 버튼 생성
         current_y = button_start_y
@@ -549,6 +573,9 @@ class DrawerUI:
         
         if self.simulator.budget >= cost_of_selected_option:
             actual_spent_cost = 0
+            journal = self.simulator.journal
+            if journal is not None:
+                journal.begin_edit("drawer_ui", f"ai_upgrade:{option_id}")
             
             try:
                 if option_id == "upgrade_line":
@@ -629,6 +656,7 @@ class DrawerUI:
                             
                             actual_spent_cost = total_cost
                     
+                    self.simulator.power_system.invalidate_fleets()
                     # print(f"[DEBUG-UI] 배터리 {option_id} 완료, 비용: {actual_spent_cost:.1f}")
                 
                 elif option_id == "smart_grid":
@@ -661,6 +689,8 @@ class DrawerUI:
             elif actual_spent_cost == 0:
                 # print(f"[DEBUG-UI] {option_id} 업그레이드가 실행되지 않았거나 비용이 발생하지 않음.")
                 pass
+            if journal is not None:
+                journal.commit_edit()
         else:
             # print(f"[DEBUG-UI] 예산 부족 ({self.simulator.budget:.1f})으로 {option_id} 업그레이드 불가 (필요 예산: {cost_of_selected_option:.1f}).")
             pass
@@ -681,8 +711,37 @@ class DrawerUI:
         else:
             print("[ERROR] 시뮬레이터에 update_flow 메서드가 없습니다.")
     
+    def start_investment_evaluation(self, options):
+        """선택지 투자 평가를 백그라운드 스레드로 시작
+
+        시뮬레이터 상태는 여기(화면 스레드)에서 읽어 사본으로 떼어 두므로 평가 중에 도시가 바뀌어도 안전하다.
+        """
+        evaluator = InvestmentEvaluator(self.simulator)
+        evaluator.prepare()
+        context = copy.deepcopy(evaluator.detached())
+        candidates = [evaluator.portable(option) for option in options]
+        job = {"scores": None}
+
+        def work():
+            job["scores"] = score_candidates(context, candidates)
+
+        job["thread"] = threading.Thread(target=work, daemon=True)
+        job["thread"].start()
+        self.investment_job = job
+
+    def poll_investment_evaluation(self):
+        """백그라운드 투자 평가가 끝났으면 결과를 반영해 패널 버튼을 다시 만든다"""
+        job = self.investment_job
+        if job is None or job["thread"].is_alive():
+            return
+        self.investment_job = None
+        self.investment_scores = job["scores"] or []   # 평가가 실패하면 NPV 없이 표시
+        if self.drawer.show_ai_upgrade_panel:
+            self.setup_ai_upgrade_buttons()
+
     def handle_events(self):
         """이벤트 처리"""
+        self.poll_investment_evaluation()
         mx, my = pygame.mouse.get_pos()
         wx, wy = self.drawer.screen_to_world(mx, my)
         
@@ -862,13 +921,15 @@ class DrawerUI:
                 # 삭제 모드에서는 건물이나 라인을 삭제
                 delete_target_bldg = self.pick_building(mx, my)
                 if delete_target_bldg:
-                    delete_target_bldg.removed = True
-                    self.simulator.update_flow(instant=True)
+                    with self.simulator.record_edit("drawer_ui", "delete_building"):
+                        self.simulator.city.delete(delete_target_bldg)
+                        self.simulator.update_flow(instant=True)
                 else:
                     delete_target_line = self.pick_line(mx, my)
                     if delete_target_line:
-                        delete_target_line.removed = True
-                        self.simulator.update_flow(instant=True)
+                        with self.simulator.record_edit("drawer_ui", "delete_line"):
+                            self.simulator.city.delete(delete_target_line)
+                            self.simulator.update_flow(instant=True)
             elif self.drawer.add_mode == "select_line_for_waypoint":
                 # waypoint 편집할 송전선 선택 모드
                 print(f"[DEBUG] 송전선 선택 시도 중... mx={mx}, my={my}")
@@ -901,8 +962,10 @@ class DrawerUI:
             else:
                 # 일반 모드에서는 드래그 시작
                 if self.drawer.hover_bldg:
-                    # 건물 드래그 시작
+                    # 건물 드래그 시작 (드래그 중 위치 변경은 틱마다 저널에 확정)
                     self.drawer.dragging_bldg = self.drawer.hover_bldg
+                    if self.simulator.journal is not None:
+                        self.simulator.journal.begin_edit("drawer_ui", "move_building")
                     self.drawer.drag_offset = (self.drawer.dragging_bldg.x - wx,
                                              self.drawer.dragging_bldg.y - wy)
                 else:
@@ -943,6 +1006,8 @@ class DrawerUI:
     def handle_mouse_up(self, event):
         """마우스 버튼 놓음 이벤트 처리"""
         if event.button == 1:  # 왼쪽 버튼
+            if self.drawer.dragging_bldg and self.simulator.journal is not None:
+                self.simulator.journal.commit_edit()
             self.drawer.dragging_bldg = None
             self.drawer.dragging_background = False
             
@@ -985,17 +1050,25 @@ class DrawerUI:
             else:
                 # 끝 건물 설정 및 송전선 추가
                 if target_bldg != self.drawer.temp_line_start:
-                    self.simulator.city.add_line(
-                        self.drawer.temp_line_start.idx,
-                        target_bldg.idx,
-                        5.0,
-                        1.0
-                    )
-                    self.simulator.update_flow(instant=True)
+                    with self.simulator.record_edit("drawer_ui", "add_line"):
+                        self.simulator.city.add_line(
+                            self.drawer.temp_line_start.idx,
+                            target_bldg.idx,
+                            5.0,
+                            1.0
+                        )
+                        self.simulator.update_flow(instant=True)
                 self.drawer.temp_line_start = None
     
     def handle_add_building(self, wx, wy):
         """건물 추가 처리"""
+        with self.simulator.record_edit("drawer_ui", self.drawer.add_mode):
+            self._add_building(wx, wy)
+        self.drawer.add_mode = "none"
+        self.selected_power_plant_type = None
+        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+    
+    def _add_building(self, wx, wy):
         if self.drawer.add_mode == "add_power_plant":
             # 발전소 추가 - 각 타입별 전용 함수 사용
             if self.selected_power_plant_type == "wind":
@@ -1037,9 +1110,6 @@ class DrawerUI:
             self.simulator.city.add_building(sup, wx, wy)
         
         self.simulator.update_flow(instant=True)
-        self.drawer.add_mode = "none"
-        self.selected_power_plant_type = None
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
     
     def handle_scenario_list_events(self, event):
         """시나리오 목록 스크롤 처리"""
@@ -15,6 +15,8 @@ def main():
     parser = argparse.ArgumentParser(description='전력 네트워크 시뮬레이터')
     parser.add_argument('--analyze', action='store_true', help='시뮬레이션 결과 분석')
     parser.add_argument('--scenario', type=str, help='특정 시나리오 이름')
+    parser.add_argument('--journal', type=str, help='이벤트 저널 기록 파일 (틱/편집/이벤트/난수 체크포인트)')
+    parser.add_argument('--replay', type=str, help='이벤트 저널을 화면 없이 재실행하고 처음 정전이 생긴 시점 출력')
     args = parser.parse_args()
 
     # 시나리오 JSON 로드
@@ -52,6 +54,16 @@ def main():
             print(f"[에러] '{args.scenario}' 시나리오를 찾을 수 없습니다.")
             sys.exit(1)
     
+    # 저널 재실행 모드 (--scenario가 있으면 그 시나리오에 같은 입력 적용)
+    if args.replay:
+        from modules.journal import JournalReplayer
+        replayer = JournalReplayer(args.replay, scenario=scenario_list[0] if args.scenario else None)
+        result = replayer.first_blackout()
+        print("\n===== 저널 재실행 결과 =====")
+        for key, value in result.to_dict().items():
+            print(f"{key}: {value}")
+        return
+    
     # 시뮬레이터 생성
     sim = Simulator()
     sim.gameSpeed = 6000.0 # 기존 300.0에서 20배 빠르게 설정 (1초당 100시간)
@@ -61,6 +73,10 @@ def main():
     econ_model = EconomicModel(sim)
     sim.set_economic_model(econ_model)
     
+    # 이벤트 저널 (재실행이 같은 결과를 내도록 첫 시나리오 로드 전에 시작)
+    if args.journal:
+        sim.start_journal(args.journal)
+    
     # 초기에 첫 시나리오 불러오기
     sim.load_scenario(scenario_list[0])
     
@@ -72,6 +88,9 @@ def main():
     # Drawer 생성 + 실행
     drawer = Drawer(sim)
     drawer.run()
+    sim.stop_journal()
+    if sim.profile_store is not None:
+        sim.profile_store.close()
     
     # 시뮬레이션 결과 분석 (--analyze 옵션이 있는 경우)
     if args.analyze:
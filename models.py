@@ -1,3 +1,5 @@
+from data import building_type_codes, default_building_type_code
+
 class Building:
     def __init__(self, idx, base_supply=0.0):
         self.idx=idx
@@ -12,6 +14,7 @@ class Building:
         self.x=0
         self.y=0
         self.removed=False
+        self.deleted=False            # 사용자 삭제 여부 (고장으로 인한 removed와 구분)
         self.blackout=False
         self.is_prosumer=False        # 프로슈머 여부
         self.power_plant_type=None    # 발전소 타입 (wind, solar, hydro, hydrogen, thermal)
@@ -27,6 +30,17 @@ class Building:
         self.hydrogen_consumption_rate=0.0 # 수소 소비률 (kg당 MW)
         self.electrolysis_efficiency=0.75  # 전기분해 효율 (75%)
         self.fuel_cell_efficiency=0.55     # 연료전지 효율 (55%)
+        self.building_type=None            # 건물 유형 (수요 인자용)
+
+    @property
+    def building_type(self):
+        return self._building_type
+
+    @building_type.setter
+    def building_type(self, value):
+        # 건물 유형이 바뀌면 수요 인자 테이블용 정수 코드도 함께 갱신
+        self._building_type = value
+        self.type_code = building_type_codes.get(value, default_building_type_code)
 
     def get_type_str(self):
         # building_type 속성이 있으면 우선적으로 사용
@@ -98,6 +112,7 @@ class WindPowerPlant(Building):
         self.rated_wind_speed = 12.0  # 정격 풍속 (m/s)
         self.cut_in_speed = 3.0  # 시동 풍속
         self.cut_out_speed = 25.0  # 정지 풍속
+        self.hub_height = 80.0  # 허브 높이 (m) - 기준 높이 10m 풍속의 약 1.35배 (WindModel.hub_height_factor)
         
     def calculate_output(self, wind_speed):
         """풍속에 따른 발전량 계산"""
@@ -227,6 +242,7 @@ class PowerLine:
         self.cost=cost
         self.flow=0.0
         self.removed=False
+        self.deleted=False   # 사용자 삭제 여부 (고장으로 인한 removed와 구분)
 
 class CityGraph:
     def __init__(self):
@@ -0,0 +1,213 @@
+import copy
+import math
+
+class RunningStats:
+    """Welford 온라인 평균/분산 + 최솟값/최댓값 (병합 가능)"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0               # 편차 제곱합
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        """다른 RunningStats를 합침 (Chan 병렬 분산 공식)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = other.count, other.mean, other.m2, other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """표본 분산 (값이 2개 미만이면 0)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        empty = self.count == 0
+        return {"count": self.count, "mean": self.mean, "std": self.std,
+                "min": None if empty else self.min, "max": None if empty else self.max}
+
+
+class QuantileSketch:
+    """상대 오차 보장 분위수 스케치 (DDSketch 방식, 병합 가능)
+
+    - 값 x를 로그 구간 ceil(log_gamma |x|)에 세어 두고, 분위수는 구간 중앙값으로 답한다
+      -> 모든 분위수의 상대 오차 <= relative_accuracy (gamma = (1 + a) / (1 - a))
+    - 양수/음수는 따로 세고 |x| < min_value는 0으로 센다 (온도처럼 부호가 바뀌는 값 지원)
+    - 구간 수가 max_bins를 넘으면 가장 작은 크기의 구간부터 합쳐 메모리 상한 유지 (꼬리 한쪽만 정확도 손실)
+    - 같은 설정의 스케치끼리 구간 카운트를 더하면 병합 (작업 프로세스별 스케치를 원본 없이 합침)
+    """
+
+    def __init__(self, relative_accuracy=0.01, max_bins=2048, min_value=1e-9):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self.positive = {}          # 구간 번호 -> 개수
+        self.negative = {}
+        self.zero = 0
+        self.count = 0
+
+    def _key(self, magnitude):
+        return math.ceil(math.log(magnitude) / self._log_gamma)
+
+    def _value(self, key):
+        # 구간 (gamma^(k-1), gamma^k]의 상대 오차가 가장 작은 대표값
+        return 2 * self.gamma ** key / (1 + self.gamma)
+
+    def add(self, value, count=1):
+        value = float(value)
+        if value > self.min_value:
+            bins = self.positive
+            key = self._key(value)
+        elif value < -self.min_value:
+            bins = self.negative
+            key = self._key(-value)
+        else:
+            self.zero += count
+            self.count += count
+            return
+        bins[key] = bins.get(key, 0) + count
+        self.count += count
+        if len(self.positive) + len(self.negative) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        """크기가 가장 작은 구간 둘을 합침 (양수 쪽 최소 구간 -> 다음 구간, 없으면 음수 쪽)"""
+        bins = self.positive if len(self.positive) > 1 else self.negative
+        smallest, second = sorted(bins)[:2]
+        bins[second] += bins.pop(smallest)
+
+    def merge(self, other):
+        if (other.gamma, other.min_value) != (self.gamma, self.min_value):
+            raise ValueError("설정이 다른 분위수 스케치는 병합할 수 없습니다")
+        for mine, theirs in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in theirs.items():
+                mine[key] = mine.get(key, 0) + count
+        self.zero += other.zero
+        self.count += other.count
+        while len(self.positive) + len(self.negative) > self.max_bins:
+            self._collapse()
+        return self
+
+    def quantile(self, q):
+        """q 분위수 (0 <= q <= 1, 값이 없으면 None)"""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        # 음수는 크기가 큰 구간부터(작은 값부터), 그다음 0, 양수는 작은 구간부터
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive)) if self.positive else 0.0
+
+    def quantiles(self, qs=(0.05, 0.5, 0.95)):
+        return {f"p{round(q * 100)}": self.quantile(q) for q in qs}
+
+
+class StreamingAggregates:
+    """스냅샷 지표의 누적 집계 (보고서를 O(1)로 만들기 위한 상태)
+
+    - 지표별 RunningStats (평균/분산/최소/최대)
+    - 수요/공급/전력 가격/온도 분위수 스케치
+    - 정전 구간 수: 정전 건물이 0인 스냅샷 다음에 정전이 생긴 횟수, 정전 스냅샷 사이 경과 시간 합
+    - merge()로 앙상블 작업 프로세스의 집계를 원본 시계열 없이 합친다
+    """
+
+    STAT_METRICS = ("total_demand", "total_supply", "total_flow", "blackout_count", "temperature", "electricity_price")
+    SKETCH_METRICS = ("total_demand", "total_supply", "electricity_price", "temperature")
+
+    def __init__(self, relative_accuracy=0.01, max_bins=2048):
+        self.stats = {name: RunningStats() for name in self.STAT_METRICS}
+        self.sketches = {name: QuantileSketch(relative_accuracy, max_bins) for name in self.SKETCH_METRICS}
+        self.blackout_intervals = 0     # 정전 구간 (연속된 정전 스냅샷 묶음) 수
+        self.blackout_seconds = 0       # 정전 상태였던 스냅샷 간 경과 시간 합
+        self.first_epoch = None
+        self.last_epoch = None
+        self._in_blackout = False
+
+    def add(self, epoch, values):
+        """스냅샷 한 행 반영 (values에 없는 지표는 건너뜀 - 예: 경제 모델이 없으면 가격)"""
+        for name, stats in self.stats.items():
+            if name in values:
+                stats.add(values[name])
+        for name, sketch in self.sketches.items():
+            if name in values:
+                sketch.add(values[name])
+        blackout = values.get("blackout_count", 0) > 0
+        if blackout and not self._in_blackout:
+            self.blackout_intervals += 1
+        if self._in_blackout and self.last_epoch is not None:
+            self.blackout_seconds += epoch - self.last_epoch
+        self._in_blackout = blackout
+        if self.first_epoch is None:
+            self.first_epoch = epoch
+        self.last_epoch = epoch
+
+    def merge(self, other):
+        """다른 실행(앙상블 작업)의 집계를 합침 (정전 구간/시간은 실행별 합)"""
+        for name, stats in self.stats.items():
+            stats.merge(other.stats[name])
+        for name, sketch in self.sketches.items():
+            sketch.merge(other.sketches[name])
+        self.blackout_intervals += other.blackout_intervals
+        self.blackout_seconds += other.blackout_seconds
+        epochs = [e for e in (self.first_epoch, other.first_epoch) if e is not None]
+        self.first_epoch = min(epochs) if epochs else None
+        epochs = [e for e in (self.last_epoch, other.last_epoch) if e is not None]
+        self.last_epoch = max(epochs) if epochs else None
+        return self
+
+    def to_dict(self, qs=(0.05, 0.5, 0.95)):
+        result = {name: stats.to_dict() for name, stats in self.stats.items()}
+        for name, sketch in self.sketches.items():
+            result[name].update(sketch.quantiles(qs))
+        result["blackout_intervals"] = self.blackout_intervals
+        result["blackout_hours"] = self.blackout_seconds / 3600
+        return result
+
+
+def merge_aggregates(aggregates):
+    """여러 StreamingAggregates를 하나로 합침 (입력은 바꾸지 않음, 스케치 설정은 첫 집계를 따름)"""
+    aggregates = list(aggregates)
+    if not aggregates:
+        return StreamingAggregates()
+    merged = copy.deepcopy(aggregates[0])
+    for item in aggregates[1:]:
+        merged.merge(item)
+    return merged
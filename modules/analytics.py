@@ -1,15 +1,55 @@
 import json
 import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+from datetime import timedelta
 import os
+import numpy as np
+from modules.timeseries import TimeSeriesStore, to_epoch, from_epoch
+from modules.aggregates import StreamingAggregates
+from modules.sink import NDJSONSink, ColumnarSink
+
+SINK_FORMATS = {"ndjson": NDJSONSink, "columnar": ColumnarSink}
+
+# 스냅샷 지표 열 (이름 -> dtype): 전력/용량은 float32, 개수는 int32, 경제 지표는 float64
+METRIC_COLUMNS = {
+    "total_demand": np.float32,
+    "total_supply": np.float32,
+    "total_flow": np.float32,
+    "blackout_count": np.int32,
+    "temperature": np.float32,
+    "buildings_total": np.int32,
+    "buildings_active": np.int32,
+    "lines_total": np.int32,
+    "lines_active": np.int32,
+    "lines_congested": np.int32,
+    "solar_capacity": np.float32,
+    "battery_capacity": np.float32,
+    "battery_charge": np.float32,
+}
+ECONOMIC_COLUMNS = ("electricity_price", "operational_cost", "revenue", "carbon_tax",
+                    "investment_cost", "profit", "roi")
 
 class SimulationAnalytics:
-    def __init__(self, simulator):
+    """시뮬레이션 지표 스냅샷 수집/보고서/그래프
+
+    스냅샷은 지표 이름별 열(TimeSeriesStore, 시각은 int64 epoch 초)에 저장한다.
+    열은 chunk 행 단위로 미리 잡아 두고 늘려 가므로 1분 간격 1년(약 52만 행)도 수십 MB 안에 들어가고,
+    보고서와 그래프는 열 배열 구간에서 바로 계산한다.
+    수집할 때마다 누적 집계(평균/분산/최소/최대, 분위수 스케치, 정전 구간 수)도 갱신하므로
+    전체 기간 보고서는 데이터 수와 무관하게 O(1)로 만든다.
+    stream_to()로 싱크를 붙이면 스냅샷을 청크 단위로 백그라운드 스레드가 파일에 흘려 쓴다.
+    """
+
+    def __init__(self, simulator, snapshot_interval=timedelta(minutes=30), chunk=4096):
         self.simulator = simulator
-        self.data_points = []
+        columns = dict(METRIC_COLUMNS)
+        columns.update({name: np.float64 for name in ECONOMIC_COLUMNS})
+        self.metrics = TimeSeriesStore(columns, capacity=chunk, chunk=chunk, categorical=("weather", "pm_level"))
+        self.aggregates = StreamingAggregates()
+        self.has_economics = False
+        self.sinks = []
         self.start_time = simulator.simTime
         self.last_snapshot_time = simulator.simTime
-        self.snapshot_interval = timedelta(minutes=30)  # 시뮬레이션 시간 기준 30분마다 데이터 수집
+        self.snapshot_interval = snapshot_interval  # 시뮬레이션 시간 기준 데이터 수집 간격 (기본 30분)
         
         # LLM API 설정 (선택사항)
         self.use_llm_api = False
@@ -28,90 +68,150 @@ class SimulationAnalytics:
             self.last_snapshot_time = current_time
     
     def collect_data_point(self):
-        """현재 시뮬레이션 상태의 데이터 포인트 수집"""
+        """현재 시뮬레이션 상태의 지표를 열 저장소에 한 행으로 추가"""
         sim = self.simulator
         city = sim.city
+        active_buildings = [b for b in city.buildings if not b.removed]
+        active_lines = [pl for pl in city.lines if not pl.removed]
         
-        # 기본 데이터
-        data_point = {
-            "timestamp": sim.simTime.isoformat(),
-            "simulation_minutes": (sim.simTime - self.start_time).total_seconds() / 60,
+        values = {
             "total_demand": abs(city.total_demand()),
-            "total_supply": sum(b.current_supply for b in city.buildings if b.current_supply > 0 and not b.removed),
+            "total_supply": sum(b.current_supply for b in active_buildings if b.current_supply > 0),
             "total_flow": sim.calc_total_flow(),
-            "blackout_count": len([b for b in city.buildings if b.blackout]),
+            "blackout_count": sum(1 for b in city.buildings if b.blackout),
             "weather": sim.weather_system.current_weather,
             "temperature": sim.weather_system.current_temperature,
-            "buildings": {
-                "total": len(city.buildings),
-                "active": len([b for b in city.buildings if not b.removed]),
-                "blackout": len([b for b in city.buildings if b.blackout])
-            },
-            "power_lines": {
-                "total": len(city.lines),
-                "active": len([pl for pl in city.lines if not pl.removed]),
-                "congested": len([pl for pl in city.lines if not pl.removed and abs(pl.flow) / pl.capacity > 0.9])
-            },
-            "solar_capacity": sum(b.solar_capacity for b in city.buildings if not b.removed),
-            "battery_capacity": sum(getattr(b, 'battery_capacity', 0) for b in city.buildings if not b.removed),
-            "battery_charge": sum(getattr(b, 'battery_charge', 0) for b in city.buildings if not b.removed)
+            "buildings_total": len(city.buildings),
+            "buildings_active": len(active_buildings),
+            "lines_total": len(city.lines),
+            "lines_active": len(active_lines),
+            "lines_congested": sum(1 for pl in active_lines if abs(pl.flow) / pl.capacity > 0.9),
+            "solar_capacity": sum(b.solar_capacity for b in active_buildings),
+            "battery_capacity": sum(getattr(b, 'battery_capacity', 0) for b in active_buildings),
+            "battery_charge": sum(getattr(b, 'battery_charge', 0) for b in active_buildings),
+            "pm_level": sim.weather_system.current_pm_level
         }
         
         # 경제 모델 데이터 추가
         if self.simulator.economic_model:
             econ_data = self.simulator.economic_model.get_economic_stats()
-            data_point["economics"] = econ_data
-        
-        # 미세먼지 데이터 추가
-        data_point["pm_level"] = sim.weather_system.current_pm_level
+            values.update({name: econ_data.get(name, 0.0) for name in ECONOMIC_COLUMNS})
+            self.has_economics = True
         
-        # 데이터 포인트 저장
-        self.data_points.append(data_point)
+        self.metrics.append(sim.simTime, **values)
+        self.aggregates.add(to_epoch(sim.simTime), values)
+        for sink in self.sinks:
+            sink.offer(self.metrics)
+
+    def stream_to(self, path, format="ndjson", chunk_rows=None):
+        """스냅샷을 path에 청크 단위로 흘려 쓰는 싱크 추가 (이미 모은 스냅샷부터 씀) -> 싱크
+
+        format: "ndjson" (줄마다 스냅샷 하나) 또는 "columnar" (열 이진 파일 + 청크 색인 푸터, ColumnarReader로 조회)
+        """
+        if format not in SINK_FORMATS:
+            raise ValueError(f"알 수 없는 싱크 형식: {format}")
+        sink_class = SINK_FORMATS[format]
+        sink = sink_class(path) if chunk_rows is None else sink_class(path, chunk_rows)
+        self.sinks.append(sink)
+        sink.offer(self.metrics)
+        return sink
+
+    def close_sinks(self):
+        """남은 스냅샷을 모든 싱크에 쓰고 파일 마무리"""
+        sinks, self.sinks = self.sinks, []
+        for sink in sinks:
+            sink.close(self.metrics)
     
-    def generate_report(self):
-        """시뮬레이션 종합 보고서 생성"""
-        if not self.data_points:
-            return {"error": "데이터 포인트가 없습니다"}
-        
-        # 마지막 데이터 포인트 가져오기
-        last_point = self.data_points[-1]
+    @property
+    def data_points(self):
+        """기존 중첩 dict 목록 형식으로 변환 (저장/호환용, 행마다 dict를 만들므로 큰 기록에는 느림)"""
+        epochs = self.metrics.epochs
+        start = to_epoch(self.start_time)
+        columns = {name: self.metrics.column(name).tolist() for name in self.metrics.dtypes
+                   if name not in self.metrics.categories}
+        weather = self.metrics.labels("weather")
+        pm_level = self.metrics.labels("pm_level")
+        points = []
+        for i, epoch in enumerate(epochs.tolist()):
+            point = {
+                "timestamp": from_epoch(epoch).isoformat(),
+                "simulation_minutes": (epoch - start) / 60,
+                "total_demand": columns["total_demand"][i],
+                "total_supply": columns["total_supply"][i],
+                "total_flow": columns["total_flow"][i],
+                "blackout_count": columns["blackout_count"][i],
+                "weather": weather[i],
+                "temperature": columns["temperature"][i],
+                "buildings": {"total": columns["buildings_total"][i], "active": columns["buildings_active"][i],
+                              "blackout": columns["blackout_count"][i]},
+                "power_lines": {"total": columns["lines_total"][i], "active": columns["lines_active"][i],
+                                "congested": columns["lines_congested"][i]},
+                "solar_capacity": columns["solar_capacity"][i],
+                "battery_capacity": columns["battery_capacity"][i],
+                "battery_charge": columns["battery_charge"][i]
+            }
+            if self.has_economics:
+                point["economics"] = {name: columns[name][i] for name in ECONOMIC_COLUMNS}
+            point["pm_level"] = pm_level[i]
+            points.append(point)
+        return points
+    
+    def window_aggregates(self, start=None, end=None):
+        """[start, end) 구간 스냅샷으로 누적 집계를 새로 계산 (구간 보고서용, O(구간 길이))"""
+        aggregates = StreamingAggregates()
+        epochs, columns = self.metrics.range(start, end, StreamingAggregates.STAT_METRICS)
+        if not self.has_economics:
+            columns.pop("electricity_price")
+        rows = {name: values.tolist() for name, values in columns.items()}
+        for i, epoch in enumerate(epochs.tolist()):
+            aggregates.add(epoch, {name: values[i] for name, values in rows.items()})
+        return aggregates
+    
+    def generate_report(self, start=None, end=None):
+        """시뮬레이션 종합 보고서 생성 ([start, end) 구간, 기본 전체)
         
-        # 첫 데이터 포인트 가져오기
-        first_point = self.data_points[0]
+        전체 기간은 누적 집계와 마지막 행만 읽으므로 O(1), 구간을 주면 그 구간 배열로 다시 집계한다.
+        """
+        if start is None and end is None:
+            if not len(self.metrics):
+                return {"error": "데이터 포인트가 없습니다"}
+            aggregates = self.aggregates
+            last = {name: self.metrics.last(name).item() for name in self.metrics.dtypes}
+        else:
+            epochs, columns = self.metrics.range(start, end)
+            if len(epochs) == 0:
+                return {"error": "데이터 포인트가 없습니다"}
+            aggregates = self.window_aggregates(start, end)
+            last = {name: values[-1].item() for name, values in columns.items()}
+        categories = self.metrics.categories
         
-        # 평균 계산
-        avg_demand = sum(point["total_demand"] for point in self.data_points) / len(self.data_points)
-        avg_supply = sum(point["total_supply"] for point in self.data_points) / len(self.data_points)
-        avg_blackouts = sum(point["blackout_count"] for point in self.data_points) / len(self.data_points)
+        # 평균
+        avg_demand = aggregates.stats["total_demand"].mean
+        avg_supply = aggregates.stats["total_supply"].mean
+        avg_blackouts = aggregates.stats["blackout_count"].mean
         
         # 시뮬레이션 시간 정보
-        sim_start = datetime.fromisoformat(first_point["timestamp"])
-        sim_end = datetime.fromisoformat(last_point["timestamp"])
-        sim_duration = (sim_end - sim_start).total_seconds() / 3600  # 시간 단위
+        sim_start = from_epoch(aggregates.first_epoch)
+        sim_end = from_epoch(aggregates.last_epoch)
+        sim_duration = (aggregates.last_epoch - aggregates.first_epoch) / 3600  # 시간 단위
         
         # 주요 지표
-        energy_satisfaction = last_point["total_flow"] / max(0.1, last_point["total_demand"]) * 100
+        energy_satisfaction = last["total_flow"] / max(0.1, last["total_demand"]) * 100
         
         # 에너지 믹스
-        solar_ratio = last_point["solar_capacity"] / max(0.1, last_point["total_supply"]) * 100
-        battery_utilization = last_point["battery_charge"] / max(0.1, last_point["battery_capacity"]) * 100
+        solar_ratio = last["solar_capacity"] / max(0.1, last["total_supply"]) * 100
+        battery_utilization = last["battery_charge"] / max(0.1, last["battery_capacity"]) * 100
         
         # 정전 비율
-        blackout_ratio = last_point["buildings"]["blackout"] / max(1, last_point["buildings"]["active"]) * 100
+        blackout_ratio = last["blackout_count"] / max(1, last["buildings_active"]) * 100
         
         # 혼잡 송전선 비율
-        congestion_ratio = last_point["power_lines"]["congested"] / max(1, last_point["power_lines"]["active"]) * 100
+        congestion_ratio = last["lines_congested"] / max(1, last["lines_active"]) * 100
         
-        # 경제 데이터 처리
-        if "economics" in last_point:
-            econ = last_point["economics"]
-            roi = econ.get("roi", 0.0)
-            profit = econ.get("profit", 0.0)
-            electricity_price = econ.get("electricity_price", 0.0)
-        else:
-            roi = 0.0
-            profit = 0.0
-            electricity_price = 0.0
+        # 경제 데이터 처리 (경제 모델이 없으면 0)
+        roi = last["roi"]
+        profit = last["profit"]
+        electricity_price = last["electricity_price"]
         
         # 보고서 생성
         report = {
@@ -121,24 +221,24 @@ class SimulationAnalytics:
                 "duration_hours": sim_duration
             },
             "energy_metrics": {
-                "current_demand": last_point["total_demand"],
-                "current_supply": last_point["total_supply"],
-                "current_flow": last_point["total_flow"],
+                "current_demand": last["total_demand"],
+                "current_supply": last["total_supply"],
+                "current_flow": last["total_flow"],
                 "avg_demand": avg_demand,
                 "avg_supply": avg_supply,
                 "energy_satisfaction_percent": energy_satisfaction
             },
             "reliability_metrics": {
-                "current_blackouts": last_point["blackout_count"],
+                "current_blackouts": last["blackout_count"],
                 "avg_blackouts": avg_blackouts,
                 "blackout_ratio_percent": blackout_ratio,
                 "congestion_ratio_percent": congestion_ratio
             },
             "renewable_metrics": {
-                "solar_capacity": last_point["solar_capacity"],
+                "solar_capacity": last["solar_capacity"],
                 "solar_ratio_percent": solar_ratio,
-                "battery_capacity": last_point["battery_capacity"],
-                "battery_charge": last_point["battery_charge"],
+                "battery_capacity": last["battery_capacity"],
+                "battery_charge": last["battery_charge"],
                 "battery_utilization_percent": battery_utilization
             },
             "economic_metrics": {
@@ -147,10 +247,12 @@ class SimulationAnalytics:
                 "electricity_price": electricity_price
             },
             "environmental_metrics": {
-                "current_temperature": last_point["temperature"],
-                "current_weather": last_point["weather"],
-                "current_pm_level": last_point["pm_level"]
-            }
+                "current_temperature": last["temperature"],
+                "current_weather": categories["weather"][last["weather"]] if last["weather"] >= 0 else None,
+                "current_pm_level": categories["pm_level"][last["pm_level"]] if last["pm_level"] >= 0 else None
+            },
+            # 지표 분포 (평균/표준편차/최소/최대/분위수, 정전 구간 수와 정전 시간)
+            "statistics": aggregates.to_dict()
         }
         
         return report
@@ -199,28 +301,24 @@ class SimulationAnalytics:
             
         return f"데이터가 {filename}에 저장되었습니다."
     
-    def plot_metrics(self, save_path=None):
-        """주요 지표 시각화 및 이미지 저장"""
-        if not self.data_points:
+    def plot_metrics(self, save_path=None, start=None, end=None):
+        """주요 지표 시각화 및 이미지 저장 ([start, end) 구간, 기본 전체)"""
+        if not len(self.metrics):
             return "데이터 포인트가 없습니다"
             
-        # 데이터 추출
-        times = [(datetime.fromisoformat(point["timestamp"]) - self.start_time).total_seconds() / 3600 for point in self.data_points]  # 시간 단위
-        demands = [point["total_demand"] for point in self.data_points]
-        supplies = [point["total_supply"] for point in self.data_points]
-        flows = [point["total_flow"] for point in self.data_points]
-        blackouts = [point["blackout_count"] for point in self.data_points]
+        # 데이터 추출 (열 배열 그대로 사용)
+        epochs, columns = self.metrics.range(start, end)
+        times = (epochs - to_epoch(self.start_time)) / 3600  # 시간 단위
+        demands = columns["total_demand"]
+        supplies = columns["total_supply"]
+        flows = columns["total_flow"]
+        blackouts = columns["blackout_count"]
         
         # 온도 데이터
-        temperatures = [point["temperature"] for point in self.data_points]
+        temperatures = columns["temperature"]
         
-        # 경제 데이터가 있으면 추출
-        prices = []
-        for point in self.data_points:
-            if "economics" in point and "electricity_price" in point["economics"]:
-                prices.append(point["economics"]["electricity_price"])
-            else:
-                prices.append(0)
+        # 경제 데이터 (경제 모델이 없으면 0)
+        prices = columns["electricity_price"]
         
         # 그래프 구성
         fig, axs = plt.subplots(3, 1, figsize=(12, 15))
@@ -0,0 +1,56 @@
+import numpy as np
+
+class SystemBalance:
+    """틱 단위 계통 수급 누산기
+
+    - compute(): 발전 커널 적용 후 전체 발전량/수요량과 저장소별 연결 발전소 발전량을 한 번에 계산
+    - set_supply(): 저장소가 출력을 바꿀 때 합계와 이웃 저장소의 연결 발전량을 증분 갱신
+    저장소 배치(dispatch)는 전체 건물/송전선을 다시 훑지 않고 이 값만 읽는다.
+    """
+
+    def __init__(self):
+        self.generation = 0.0         # 전체 발전량 (current_supply > 0 합)
+        self.demand = 0.0             # 전체 수요량 (current_supply < 0 절대값 합)
+        self._plant_neighbors = {}    # 저장소 idx -> 연결된 발전소 idx 목록 (송전선 수만큼 중복)
+        self._watchers = {}           # 발전소 idx -> 이 발전소를 이웃으로 둔 저장소 idx 목록
+        self._connected = {}          # 저장소 idx -> 연결 발전소 발전량 합
+
+    def compute(self, buildings, lines, watch=()):
+        """전체 수급과 watch(저장소 건물들)의 연결 발전량 계산 - 건물/송전선 각각 한 번씩만 순회"""
+        count = len(buildings)
+        supply = np.fromiter((0.0 if b.removed else b.current_supply for b in buildings), dtype=float, count=count)
+        self.generation = float(supply[supply > 0].sum())
+        self.demand = float(-supply[supply < 0].sum())
+
+        watched = {b.idx for b in watch}
+        self._plant_neighbors = {idx: [] for idx in watched}
+        self._watchers = {}
+        for line in lines:
+            if line.removed:
+                continue
+            for node, other in ((line.u, line.v), (line.v, line.u)):
+                if node in watched:
+                    other_building = buildings[other]
+                    if not other_building.removed and other_building.base_supply > 0:
+                        self._plant_neighbors[node].append(other)
+                        self._watchers.setdefault(other, []).append(node)
+
+        self._connected = {idx: float(sum(supply[n] for n in neighbors))
+                           for idx, neighbors in self._plant_neighbors.items()}
+
+    def connected_plant_count(self, idx):
+        return len(self._plant_neighbors.get(idx, ()))
+
+    def connected_generation(self, idx):
+        return self._connected.get(idx, 0.0)
+
+    def set_supply(self, building, value):
+        """건물 출력 변경 + 합계/연결 발전량 증분 갱신"""
+        old = building.current_supply
+        building.current_supply = value
+        if building.removed:
+            return
+        self.generation += max(value, 0.0) - max(old, 0.0)
+        self.demand += max(-value, 0.0) - max(-old, 0.0)
+        for storage_idx in self._watchers.get(building.idx, ()):
+            self._connected[storage_idx] += value - old
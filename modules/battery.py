@@ -0,0 +1,102 @@
+import numpy as np
+
+class BatteryFleet:
+    """배터리 보유 건물 전체를 배열로 관리하는 충방전 엔진
+
+    - 정적 정보(용량, 효율, 운전 모드)는 배터리 구성이 바뀔 때만 배열로 다시 구성
+    - 매 스텝 충전량/현재 공급량만 모아서 마스크 연산 한 번으로 갱신 후 건물에 되돌려 씀
+    - 운전 모드
+        MODE_SMART_GRID: 스마트 그리드 연결 건물 (오프피크 충전, 피크 방전)
+        MODE_PROSUMER: 태양광 보유 프로슈머 (잉여 전력 자가 저장)
+    """
+
+    MODE_NONE = 0
+    MODE_SMART_GRID = 1
+    MODE_PROSUMER = 2
+
+    def __init__(self, charge_rate=0.1, efficiency=0.95,
+                 offpeak_hours=(1, 2, 3, 4, 5), peak_hours=(9, 10, 11, 17, 18, 19, 20)):
+        self.charge_rate = charge_rate          # 스텝당 최대 충전량 (용량 대비)
+        self.efficiency = efficiency            # 충방전 효율
+        self.offpeak_hours = frozenset(offpeak_hours)
+        self.peak_hours = frozenset(peak_hours)
+
+        self.members = []
+        self.capacity = np.empty(0)
+        self.round_trip = np.empty(0)
+        self.mode = np.empty(0, dtype=np.int8)
+        self._key = None
+
+    def invalidate(self):
+        """배터리 용량, 스마트 그리드 연결, 프로슈머/태양광 구성이 바뀌었을 때 호출"""
+        self._key = None
+
+    def refresh(self, buildings):
+        """배터리 보유 건물 목록과 정적 배열 재구성"""
+        self.members = [b for b in buildings if getattr(b, 'battery_capacity', 0) > 0]
+        self.capacity = np.array([b.battery_capacity for b in self.members], dtype=float)
+        self.round_trip = np.array([getattr(b, 'battery_efficiency', self.efficiency) for b in self.members], dtype=float)
+        self.mode = np.array([self.mode_of(b) for b in self.members], dtype=np.int8)
+        self._key = (id(buildings), len(buildings))
+
+    def mode_of(self, building):
+        if building.is_prosumer:
+            # 프로슈머는 태양광 잉여 전력만 저장 (태양광이 없으면 운전하지 않음)
+            if building.solar_capacity > 0 or getattr(building, 'power_plant_type', None) == 'solar':
+                return self.MODE_PROSUMER
+            return self.MODE_NONE
+        if building.smart_grid_connected:
+            return self.MODE_SMART_GRID
+        return self.MODE_NONE
+
+    def sync(self, buildings):
+        """건물 리스트가 바뀌었거나 무효화된 경우에만 재구성"""
+        if self._key != (id(buildings), len(buildings)):
+            self.refresh(buildings)
+
+    def step(self, buildings, hour, modes):
+        """지정한 운전 모드의 배터리를 한 번에 충방전 -> (충전한 건물 수, 방전한 건물 수)"""
+        self.sync(buildings)
+        count = len(self.members)
+        if count == 0:
+            return 0, 0
+
+        members = self.members
+        active = np.fromiter((not b.removed for b in members), dtype=bool, count=count)
+        selected = active & np.isin(self.mode, modes)
+        if not selected.any():
+            return 0, 0
+        charge = np.fromiter((b.battery_charge for b in members), dtype=float, count=count)
+        supply = np.fromiter((b.current_supply for b in members), dtype=float, count=count)
+
+        room = self.capacity - charge
+        smart_grid = selected & (self.mode == self.MODE_SMART_GRID)
+        prosumer = selected & (self.mode == self.MODE_PROSUMER)
+
+        # 충전: 스마트 그리드는 오프피크 시간, 프로슈머는 잉여 전력이 있을 때 (용량의 최대 charge_rate)
+        charging = room > 0
+        if hour in self.offpeak_hours:
+            charging &= smart_grid | (prosumer & (supply > 0))
+        else:
+            charging &= prosumer & (supply > 0)
+        charge_amount = np.where(charging, np.minimum(room, self.capacity * self.charge_rate), 0.0)
+
+        # 방전: 스마트 그리드 건물이 피크 시간에 소비 중이면 수요만큼 (손실 반영)
+        if hour in self.peak_hours:
+            discharging = smart_grid & (supply < 0) & (charge > 0)
+            discharge_amount = np.where(discharging, np.minimum(-supply, charge), 0.0)
+        else:
+            discharging = np.zeros(count, dtype=bool)
+            discharge_amount = np.zeros(count)
+
+        changed = charging | discharging
+        if not changed.any():
+            return 0, 0
+        charge += charge_amount - discharge_amount
+        supply += discharge_amount * self.round_trip - charge_amount / self.round_trip
+
+        for i in np.flatnonzero(changed).tolist():
+            b = members[i]
+            b.battery_charge = float(charge[i])
+            b.current_supply = float(supply[i])
+        return int(charging.sum()), int(discharging.sum())
@@ -0,0 +1,167 @@
+import numpy as np
+from data import building_type_codes, default_building_type_code
+
+# 건물 유형별 요금제 (에너지 단가는 기본 전력 가격 대비 배수, 단위: 원/kWh 기준 가격 x 배수)
+#   kind: "tou" (시간대별 단가) / "tiered" (월 사용량 누진 구간)
+#   tiers: 누진 구간 경계 (MWh/월), tier_factors: 구간별 단가 배수 (구간 수 + 1개)
+#   demand_charge: 월 최대 수요 요금 (원/kW), fixed: 월 기본 요금 (원), multiplier: 건물 유형 할증/할인
+DEFAULT_TARIFFS = {
+    "apartment": {"kind": "tiered", "tiers": (500.0, 1500.0), "tier_factors": (0.8, 1.0, 1.4),
+                  "demand_charge": 0.0, "fixed": 50000.0, "multiplier": 1.0},
+    "office": {"kind": "tou", "demand_charge": 8000.0, "fixed": 200000.0, "multiplier": 1.0},
+    "school": {"kind": "tou", "demand_charge": 4000.0, "fixed": 100000.0, "multiplier": 0.9},
+    "hospital": {"kind": "tou", "demand_charge": 6000.0, "fixed": 200000.0, "multiplier": 1.2},
+    "shopping_mall": {"kind": "tou", "demand_charge": 9000.0, "fixed": 300000.0, "multiplier": 1.0},
+    None: {"kind": "tou", "demand_charge": 0.0, "fixed": 0.0, "multiplier": 1.0},   # 그 외 유형
+}
+
+
+class MonthlyBills:
+    """한 달치 전체 건물 청구서 (배열은 건물 idx 순)"""
+
+    def __init__(self, year, month, energy, peak, energy_charge, demand_charge, fixed_charge, total):
+        self.year = year
+        self.month = month
+        self.energy = energy                  # 사용 전력량 (MWh)
+        self.peak = peak                      # 월 최대 수요 (MW)
+        self.energy_charge = energy_charge    # 전력량 요금 (원)
+        self.demand_charge = demand_charge    # 최대 수요 요금 (원)
+        self.fixed_charge = fixed_charge      # 기본 요금 (원)
+        self.total = total                    # 청구 금액 (원)
+
+    def bill(self, idx):
+        return {"energy": float(self.energy[idx]), "peak": float(self.peak[idx]),
+                "energy_charge": float(self.energy_charge[idx]), "demand_charge": float(self.demand_charge[idx]),
+                "fixed_charge": float(self.fixed_charge[idx]), "total": float(self.total[idx])}
+
+
+class BillingEngine:
+    """전체 수요 건물 요금 계산 엔진
+
+    - 요금제는 건물 유형 코드(type_code)로 인덱싱되는 배열 테이블 (유형 수 + 1 행)
+    - 매 틱 건물별 공급받은 전력으로 사용량/월 최대 수요/시간대별 요금을 배열로 적분
+    - 달이 바뀌면 누진/최대 수요/기본 요금을 한 번에 계산해 MonthlyBills로 마감
+    """
+
+    def __init__(self, economic_model, tariffs=None):
+        self.economic_model = economic_model
+        self.simulator = economic_model.simulator
+        self.tariffs = {**DEFAULT_TARIFFS, **(tariffs or {})}
+        self.history = []          # 마감된 MonthlyBills 목록
+        self.period = None         # 현재 청구 기간 (연, 월)
+        self._key = None
+        self.build_tables()
+        self._reset(0)
+
+    def build_tables(self):
+        """요금제 dict -> 유형 코드별 배열 테이블"""
+        rows = default_building_type_code + 1
+        names = {code: name for name, code in building_type_codes.items()}
+        tariffs = [self.tariffs.get(names.get(code), self.tariffs[None]) for code in range(rows)]
+        tier_count = max(len(t.get("tiers", ())) for t in tariffs)
+
+        economic_model = self.economic_model
+        hourly = np.array([economic_model.time_of_use_factor(h) for h in range(24)])
+        # 시간대별 단가 (원/MWh)
+        self.tou_rate = economic_model.base_electricity_price * 1000.0 * np.tile(hourly, (rows, 1))
+        self.tiered = np.array([t["kind"] == "tiered" for t in tariffs], dtype=bool)
+        # 누진 구간: 경계가 적은 요금제는 무한대 경계로 채움
+        self.tier_bounds = np.full((rows, tier_count), np.inf)
+        self.tier_factors = np.ones((rows, tier_count + 1))
+        for code, t in enumerate(tariffs):
+            bounds = t.get("tiers", ())
+            factors = t.get("tier_factors", (1.0,))
+            self.tier_bounds[code, :len(bounds)] = bounds
+            self.tier_factors[code, :len(factors)] = factors
+            self.tier_factors[code, len(factors):] = factors[-1]
+        self.demand_rate = np.array([t["demand_charge"] for t in tariffs]) * 1000.0   # 원/MW
+        self.fixed = np.array([t["fixed"] for t in tariffs])
+        self.multiplier = np.array([t["multiplier"] for t in tariffs])
+
+    def _reset(self, count):
+        self.energy = np.zeros(count)
+        self.peak = np.zeros(count)
+        self.tou_cost = np.zeros(count)
+        self.active = np.zeros(count, dtype=bool)   # 이번 달 한 번이라도 전력을 쓴 건물
+
+    def _sync(self, buildings):
+        """건물이 추가되면 누적 배열 확장 (기존 건물 누적값 유지), 도시가 바뀌면 초기화"""
+        key = (id(buildings), len(buildings))
+        if self._key == key:
+            return
+        count = len(buildings)
+        if self._key is not None and self._key[0] != key[0]:
+            self._reset(count)
+        elif count != len(self.energy):
+            grown = {}
+            for name in ("energy", "peak", "tou_cost"):
+                arr = np.zeros(count)
+                keep = min(count, len(getattr(self, name)))
+                arr[:keep] = getattr(self, name)[:keep]
+                grown[name] = arr
+            active = np.zeros(count, dtype=bool)
+            keep = min(count, len(self.active))
+            active[:keep] = self.active[:keep]
+            self.energy, self.peak, self.tou_cost = grown["energy"], grown["peak"], grown["tou_cost"]
+            self.active = active
+        self._key = key
+
+    def tick(self, dt_hours):
+        """dt_hours 동안 현재 공급 상태로 사용량 적분 (달이 바뀌면 먼저 지난달 마감)"""
+        now = self.simulator.simTime
+        if self.period is None:
+            self.period = (now.year, now.month)
+        elif self.period != (now.year, now.month):
+            self.close_month()
+            self.period = (now.year, now.month)
+        if dt_hours <= 0:
+            return
+
+        buildings = self.simulator.city.buildings
+        self._sync(buildings)
+        count = len(buildings)
+        if count == 0:
+            return
+        supply = np.fromiter((b.current_supply for b in buildings), dtype=float, count=count)
+        shortage = np.fromiter((getattr(b, 'shortage', 0.0) for b in buildings), dtype=float, count=count)
+        removed = np.fromiter((b.removed for b in buildings), dtype=bool, count=count)
+        codes = np.fromiter((b.type_code for b in buildings), dtype=np.intp, count=count)
+
+        # 실제 공급받은 전력 (MW) = 수요 - 부족분
+        served = np.where(removed, 0.0, np.maximum(np.maximum(-supply, 0.0) - shortage, 0.0))
+        energy = served * dt_hours
+        self.energy += energy
+        self.tou_cost += energy * self.tou_rate[codes, now.hour]
+        np.maximum(self.peak, served, out=self.peak)
+        self.active |= served > 0
+
+    def compute_bills(self):
+        """현재까지 누적값으로 전체 건물 청구서 계산 (한 번의 배열 연산)"""
+        buildings = self.simulator.city.buildings
+        self._sync(buildings)
+        codes = np.fromiter((b.type_code for b in buildings), dtype=np.intp, count=len(buildings))
+
+        # 누진 요금: 구간별 사용량 x 구간 단가 (기본 단가 기준)
+        base_rate = self.economic_model.base_electricity_price * 1000.0
+        bounds = self.tier_bounds[codes]                                   # (N, K)
+        lower = np.concatenate([np.zeros((len(codes), 1)), bounds], axis=1)  # (N, K+1)
+        upper = np.concatenate([bounds, np.full((len(codes), 1), np.inf)], axis=1)
+        in_tier = np.maximum(np.minimum(self.energy[:, None], upper) - lower, 0.0)
+        tiered_cost = (in_tier * self.tier_factors[codes]).sum(axis=1) * base_rate
+
+        multiplier = self.multiplier[codes]
+        energy_charge = np.where(self.tiered[codes], tiered_cost, self.tou_cost) * multiplier
+        demand_charge = self.peak * self.demand_rate[codes] * multiplier
+        fixed_charge = np.where(self.active, self.fixed[codes], 0.0)
+        total = energy_charge + demand_charge + fixed_charge
+        year, month = self.period or (self.simulator.simTime.year, self.simulator.simTime.month)
+        return MonthlyBills(year, month, self.energy.copy(), self.peak.copy(),
+                            energy_charge, demand_charge, fixed_charge, total)
+
+    def close_month(self):
+        """이번 달 청구서 마감 -> MonthlyBills (누적값 초기화, 경제 모델 수익에 반영)"""
+        bills = self.compute_bills()
+        self.history.append(bills)
+        self.economic_model.record_billing(bills)
+        self._reset(len(self.energy))
+        return bills
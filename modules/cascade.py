@@ -0,0 +1,265 @@
+import copy
+import numpy as np
+from modules.flow import FlowNetwork, augment_paths
+
+class CascadeResult:
+    """연쇄 고장 한 번의 결과"""
+
+    def __init__(self, initial, rounds, served_before, served_after, line_flows):
+        self.initial = initial                # 최초 고장 송전선 위치 목록 (city.lines 기준)
+        self.rounds = rounds                  # 라운드별 추가 트립 송전선 위치 목록
+        self.served_before = served_before    # 고장 전 공급량 (MW)
+        self.served_after = served_after      # 연쇄 고장 후 공급량 (MW)
+        self.line_flows = line_flows          # 최종 송전선 흐름 (u -> v, city.lines 순)
+
+    @property
+    def tripped(self):
+        """최초 고장 포함 전체 트립 송전선 위치 (트립 순서)"""
+        return list(self.initial) + [pos for round_lines in self.rounds for pos in round_lines]
+
+    @property
+    def load_lost(self):
+        return self.served_before - self.served_after
+
+    def to_dict(self):
+        return {"initial": list(self.initial), "rounds": [list(r) for r in self.rounds],
+                "served_before": self.served_before, "served_after": self.served_after,
+                "load_lost": self.load_lost}
+
+
+class CascadeEngine:
+    """송전선 연쇄 고장 시뮬레이션
+
+    - 송전선 하나를 정방향/역방향 잔여 용량 쌍(capacity - flow, capacity + flow)으로 표현한 최대 유량 그래프
+    - 송전선이 트립되면 처음부터 다시 풀지 않고 직전 잔여 그래프에서 이어서 푼다 (warm start):
+        1) 트립 송전선의 흐름 f를 양 끝 노드의 초과/부족으로 남기고 간선 차단
+        2) 초과 노드 -> 부족 노드 우회 경로로 최대한 재송전
+        3) 못 보낸 양은 초과 노드 -> 소스, 싱크 -> 부족 노드로 되돌려 흐름 보존 복구
+        4) 라운드 끝에 소스 -> 싱크 증가 경로를 다시 찾아 최대 유량 회복
+    - 라운드마다 흐름이 정격(rating_factor x 용량)을 넘고 고장 전보다 increase_tolerance 이상 늘어난
+      송전선(우회 흐름을 떠안은 선)을 트립하고, 더 트립할 선이 없을 때까지 반복
+    - 기준 잔여 그래프는 마지막 흐름 계산 결과(line.flow)로 구성하고(유효하지 않으면 한 번 새로 풂),
+      표본마다 잔여 용량 리스트만 복사하므로 수천 번의 연쇄 고장 표본을 빠르게 돌릴 수 있다
+    """
+
+    def __init__(self, power_system, rating_factor=0.9, increase_tolerance=0.05, max_rounds=50, eps=1e-6):
+        self.power_system = power_system
+        self.rating_factor = rating_factor
+        self.increase_tolerance = increase_tolerance
+        self.max_rounds = max_rounds
+        self.eps = eps
+        self.network = None
+        self.line_positions = []      # 그래프에 포함된 송전선의 city.lines 위치
+        self.line_edges = np.empty(0, dtype=np.int64)
+        self.line_capacity = np.empty(0)
+        self.base_residual = None
+        self.base_flow = np.empty(0)
+        self.base_served = 0.0
+        self.source_edges = np.empty(0, dtype=np.int64)
+        self.sink_edges = np.empty(0, dtype=np.int64)
+        self.producers = np.empty(0, dtype=np.int64)
+        self.line_count = 0           # 그래프 구성 시점 city.lines 길이 (결과 흐름 배열 크기)
+
+    # ---------------- 기준 상태 ----------------
+    def build(self, include=()):
+        """현재 상태로 그래프와 기준 잔여 용량 구성 (include: removed여도 고장 전 상태로 포함할 송전선)"""
+        city = self.power_system.simulator.city
+        buildings = city.buildings
+        lines = city.lines
+        include = {id(pl) for pl in include}
+        n = len(buildings)
+        source, sink = n, n + 1
+
+        positions = [i for i, pl in enumerate(lines)
+                     if (not pl.removed or id(pl) in include)
+                     and not buildings[pl.u].removed and not buildings[pl.v].removed]
+        self.line_positions = positions
+        self.line_count = len(lines)
+        u = np.array([lines[i].u for i in positions], dtype=np.int64)
+        v = np.array([lines[i].v for i in positions], dtype=np.int64)
+        capacity = np.array([lines[i].capacity for i in positions], dtype=float)
+
+        line_capacity = np.zeros(n)
+        np.add.at(line_capacity, u, capacity)
+        np.add.at(line_capacity, v, capacity)
+        supply = np.array([0.0 if b.removed else b.current_supply for b in buildings], dtype=float)
+        producers = np.flatnonzero(supply > 0)
+        consumers = np.flatnonzero(supply < 0)
+
+        network = FlowNetwork(n + 2, edge_hint=len(positions) + len(producers) + len(consumers))
+        source_edges = network.add_edges(np.full(len(producers), source), producers,
+                                         np.minimum(supply[producers], line_capacity[producers]), 0.0)
+        sink_edges = network.add_edges(consumers, np.full(len(consumers), sink), -supply[consumers], 0.0)
+        line_edges = network.add_edges(u, v, capacity, 0.0)
+        network.finalize()
+        # 송전선은 양방향: 역방향 간선에도 같은 용량 (순흐름 x: 정방향 잔여 c - x, 역방향 잔여 c + x)
+        network.capacity[line_edges + 1] = capacity
+        self.network = network
+        self.line_edges = line_edges
+        self.line_capacity = capacity
+        self.source, self.sink = source, sink
+        self.source_edges = source_edges
+        self.sink_edges = sink_edges
+        self.producers = producers            # 소스 간선 순 발전 건물 idx
+
+        residual = self._warm_residual(lines, positions, u, v, capacity, source_edges, producers,
+                                       sink_edges, consumers, n)
+        if residual is None:
+            residual = network.capacity.tolist()
+            augment_paths(network, residual, source, sink, eps=self.eps)
+        self.base_residual = residual
+        self.base_flow = self.flows(residual)
+        self.base_served = self.served(residual)
+        return self
+
+    def _warm_residual(self, lines, positions, u, v, capacity, source_edges, producers, sink_edges, consumers, n):
+        """마지막 흐름 계산 결과(line.flow)로 잔여 용량 구성 (흐름 보존/용량 위반이면 None)"""
+        network = self.network
+        flow = np.array([lines[i].flow for i in positions], dtype=float)
+        if np.any(np.abs(flow) > capacity + self.eps):
+            return None
+        outflow = np.zeros(n)
+        np.add.at(outflow, u, flow)
+        np.add.at(outflow, v, -flow)
+        source_flow = outflow[producers]
+        sink_flow = -outflow[consumers]
+        others = np.ones(n, dtype=bool)
+        others[producers] = False
+        others[consumers] = False
+        source_capacity = network.capacity[source_edges]
+        sink_capacity = network.capacity[sink_edges]
+        if (np.any(source_flow < -self.eps) or np.any(source_flow > source_capacity + self.eps)
+                or np.any(sink_flow < -self.eps) or np.any(sink_flow > sink_capacity + self.eps)
+                or np.any(np.abs(outflow[others]) > self.eps)):
+            return None
+        residual = network.capacity.copy()
+        for edges, amount in ((source_edges, source_flow), (sink_edges, sink_flow)):
+            amount = np.clip(amount, 0.0, residual[edges])
+            residual[edges] -= amount
+            residual[edges + 1] += amount
+        residual[self.line_edges] -= flow
+        residual[self.line_edges + 1] += flow
+        residual = residual.tolist()
+        # 마지막 계산 이후 바뀐 부분이 있으면 남은 증가 경로로 최대 유량 회복
+        augment_paths(network, residual, self.source, self.sink, eps=self.eps)
+        return residual
+
+    def flows(self, residual):
+        """송전선 순흐름 배열 (u -> v, line_positions 순)"""
+        residual = np.asarray(residual)
+        return self.line_capacity - residual[self.line_edges]
+
+    def served(self, residual):
+        """싱크로 들어간 총 공급량 = 싱크 간선 유량 합
+
+        정지한 발전소의 소스 간선은 양방향 잔여 용량을 0으로 막으므로 용량 - 잔여로는 유량을 알 수 없다.
+        싱크 간선은 차단되지 않으므로 여기서 세면 정지 발전소 몫이 빠진 실제 공급량이 된다.
+        """
+        edges = self.sink_edges
+        residual = np.asarray(residual)
+        return float((self.network.capacity[edges] - residual[edges]).sum())
+
+    # ---------------- 연쇄 고장 ----------------
+    def _trip(self, residual, k):
+        """송전선 k(그래프 내 번호) 차단 후 흐름 보존 복구 (warm start)"""
+        network = self.network
+        e = int(self.line_edges[k])
+        x = self.line_capacity[k] - residual[e]
+        head = network.head_list
+        a, b = (head[e ^ 1], head[e]) if x > 0 else (head[e], head[e ^ 1])
+        f = abs(x)
+        residual[e] = 0.0
+        residual[e ^ 1] = 0.0
+        if f <= self.eps:
+            return
+        rerouted = augment_paths(network, residual, a, b, f, eps=self.eps)
+        rest = f - rerouted
+        if rest > self.eps:
+            augment_paths(network, residual, a, self.source, rest, eps=self.eps)
+            augment_paths(network, residual, self.sink, b, rest, eps=self.eps)
+
+    def _trip_source(self, residual, j):
+        """발전소 j(소스 간선 번호) 정지: 소스 간선 차단 후 그 발전소가 보내던 흐름을 싱크 쪽에서 되돌림"""
+        e = int(self.source_edges[j])
+        f = self.network.capacity[e] - residual[e]
+        residual[e] = 0.0
+        residual[e ^ 1] = 0.0
+        if f > self.eps:
+            augment_paths(self.network, residual, self.sink, int(self.producers[j]), f, eps=self.eps)
+
+    def run(self, initial_lines, apply=False, rebuild=True):
+        """최초 고장 송전선 목록으로 연쇄 고장 진행 -> CascadeResult
+
+        initial_lines: PowerLine 객체 또는 city.lines 위치. rebuild=False면 직전 build()의 기준 상태를 재사용
+        apply=True면 트립된 송전선을 모두 removed 처리한다.
+        """
+        lines = self.power_system.simulator.city.lines
+        initial_lines = [lines[t] if isinstance(t, int) else t for t in initial_lines]
+        if rebuild or self.network is None:
+            self.build(include=initial_lines)
+        position_of = {pos: k for k, pos in enumerate(self.line_positions)}
+        line_pos = {id(pl): i for i, pl in enumerate(lines)}
+        initial = [line_pos[id(pl)] for pl in initial_lines]
+        result = self.cascade([position_of[p] for p in initial if p in position_of])
+        if apply:
+            for pos in result.tripped:
+                lines[pos].removed = True
+        return result
+
+    def detached(self):
+        """기준 상태만 가진 복사본 (시뮬레이터 참조 없음 -> 작업 프로세스로 보낼 수 있음, cascade()만 사용 가능)"""
+        engine = copy.copy(self)
+        engine.power_system = None
+        return engine
+
+    def cascade(self, initial, plants=(), propagate=True):
+        """그래프 내 송전선 번호 initial에서 시작하는 연쇄 고장 (기준 잔여 용량 복사본에서 진행)
+
+        plants: 함께 정지시킬 발전소(소스 간선 번호), propagate=False면 과부하 트립 없이 최초 고장만 반영
+        """
+        residual = list(self.base_residual)
+        for j in plants:
+            self._trip_source(residual, j)
+        base_load = np.abs(self.base_flow)
+        rating = self.rating_factor * self.line_capacity
+        increase = self.increase_tolerance * self.line_capacity
+        active = np.ones(len(self.line_positions), dtype=bool)
+
+        current = list(initial)
+        rounds = []
+        for round_index in range(self.max_rounds + 1):
+            for k in current:
+                active[k] = False
+                self._trip(residual, k)
+            augment_paths(self.network, residual, self.source, self.sink, eps=self.eps)
+            if round_index > 0:
+                rounds.append([self.line_positions[k] for k in current])
+            load = np.abs(self.flows(residual))
+            overloaded = active & (load > rating + self.eps) & (load > base_load + increase)
+            current = np.flatnonzero(overloaded).tolist()
+            if not current or not propagate:
+                break
+
+        flows = np.zeros(self.line_count)
+        flows[self.line_positions] = np.where(active, self.flows(residual), 0.0)
+        return CascadeResult([self.line_positions[k] for k in initial], rounds,
+                             self.base_served, self.served(residual), flows)
+
+    def sample(self, count, seed=None, weights=None):
+        """최초 고장 송전선을 count번 추출해 연쇄 고장 표본 생성 (weights: 송전선별 가중치, 기본 위험률)
+
+        기준 그래프는 한 번만 구성하고 표본마다 잔여 용량만 복사한다.
+        """
+        self.build()
+        m = len(self.line_positions)
+        if m == 0:
+            return []
+        rng = np.random.default_rng(seed)
+        if weights is None:
+            lines = self.power_system.simulator.city.lines
+            hazard = self.power_system.simulator.event_system.hazard
+            weights = hazard.line_rates([lines[p] for p in self.line_positions])
+        weights = np.asarray(weights, dtype=float)
+        probability = weights / weights.sum() if weights.sum() > 0 else None
+        picks = rng.choice(m, size=count, p=probability)
+        return [self.cascade([int(k)]) for k in picks]
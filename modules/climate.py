@@ -0,0 +1,126 @@
+import numpy as np
+from data import region_data, monthly_weather_probs, default_monthly_humidity
+
+# 월 중간일(평년 기준 day of year) - 월별 값을 일별로 보간할 때 기준점
+MID_MONTH_DAYS = np.array([15.5, 45.0, 74.5, 105.0, 135.5, 166.0, 196.5, 227.5, 258.0, 288.5, 319.0, 349.5])
+
+# 계절별 적정 실내 온도/습도 (1월~12월)
+OPTIMAL_TEMP = (18.0, 18.0, 20.0, 20.0, 20.0, 24.0, 24.0, 24.0, 20.0, 20.0, 20.0, 18.0)
+OPTIMAL_HUMIDITY = (40.0, 40.0, 50.0, 50.0, 50.0, 60.0, 60.0, 60.0, 50.0, 50.0, 50.0, 40.0)
+
+class ClimateModel:
+    """지역별 기후 모델 - data.region_data에서 한 번만 구성되는 파생 테이블 모음
+
+    - 월별 평균기온/일교차/최저/최고기온/습도 배열
+    - 일(day of year) 단위로 부드럽게 보간된 평균기온/일교차 테이블
+    - 지역 보정 후 정규화된 월별 날씨 확률 테이블
+    - 포화수증기압 룩업 테이블
+    """
+
+    SVP_MIN_TEMP = -50.0
+    SVP_MAX_TEMP = 60.0
+    SVP_STEP = 0.1
+
+    def __init__(self, region, info):
+        self.region = region
+        self.lat = info.get("lat", 37.5665)
+        self.lon = info.get("lon", 126.9780)
+        self.altitude = info.get("altitude", 0)
+        self.pm_levels = dict(info.get("pm_levels", {}))
+
+        # 월별 배열
+        self.monthly_avg_temp = np.asarray(info["monthly_avg_temp"], dtype=float)
+        self.monthly_daily_range = np.asarray(info["monthly_daily_range"], dtype=float)
+        self.monthly_min_temp = self.monthly_avg_temp - self.monthly_daily_range / 2.0
+        self.monthly_max_temp = self.monthly_avg_temp + self.monthly_daily_range / 2.0
+        self.monthly_humidity = np.asarray(info.get("monthly_humidity", default_monthly_humidity), dtype=float)
+        self.optimal_temp = OPTIMAL_TEMP
+        self.optimal_humidity = OPTIMAL_HUMIDITY
+
+        # 일별 보간 테이블 (인덱스 = day of year, 1~366)
+        days = np.arange(0, 367, dtype=float)
+        self.daily_avg_temp = np.interp(days, MID_MONTH_DAYS, self.monthly_avg_temp, period=365.0)
+        self.daily_temp_range = np.interp(days, MID_MONTH_DAYS, self.monthly_daily_range, period=365.0)
+
+        # 날씨 확률 테이블 (지역 보정 후 정규화)
+        self.weather_names = list(monthly_weather_probs[1].keys())
+        self.weather_probs = self._build_weather_probs(info.get("weather_offset", {}))
+        self.weather_cumprobs = np.cumsum(self.weather_probs, axis=1)
+        self._weather_tables = {
+            m: [(w, float(p)) for w, p in zip(self.weather_names, self.weather_probs[m - 1]) if p > 0]
+            for m in range(1, 13)
+        }
+
+        # 포화수증기압 룩업 (Pa)
+        temps = np.arange(self.SVP_MIN_TEMP, self.SVP_MAX_TEMP + self.SVP_STEP, self.SVP_STEP)
+        self._svp_table = 610.78 * np.exp(temps / (temps + 238.3) * 17.2694)
+
+        # 기존 get_region_info 형식 호환 딕셔너리 (한 번만 생성)
+        self.region_info = {
+            "lat": self.lat,
+            "lon": self.lon,
+            "temp_data": {
+                m: {"min": float(self.monthly_min_temp[m - 1]), "max": float(self.monthly_max_temp[m - 1])}
+                for m in range(1, 13)
+            },
+            "weather_table": self._weather_tables,
+            "humidity": {m: float(self.monthly_humidity[m - 1]) for m in range(1, 13)}
+        }
+
+    def _build_weather_probs(self, offset):
+        """월별 기본 날씨 확률에 지역 보정을 더하고 정규화 (기본 확률 0인 날씨는 보정하지 않음)"""
+        probs = np.zeros((12, len(self.weather_names)))
+        for m in range(1, 13):
+            for k, name in enumerate(self.weather_names):
+                base = monthly_weather_probs[m].get(name, 0.0)
+                if base > 0:
+                    probs[m - 1, k] = max(0.0, base + offset.get(name, 0.0))
+            total = probs[m - 1].sum()
+            if total < 1e-9:
+                probs[m - 1, self.weather_names.index("맑음")] = 1.0
+            else:
+                probs[m - 1] /= total
+        return probs
+
+    def weather_table(self, month):
+        """해당 월의 (날씨, 확률) 리스트 (정규화 완료)"""
+        return self._weather_tables[month]
+
+    def avg_temp(self, day_of_year):
+        """일 평균기온 (월 평균을 일 단위로 보간)"""
+        return float(self.daily_avg_temp[day_of_year])
+
+    def temp_range(self, day_of_year):
+        """일교차 (월 값을 일 단위로 보간)"""
+        return float(self.daily_temp_range[day_of_year])
+
+    def saturation_vapor_pressure(self, temp):
+        """포화수증기압 (Pa) - 룩업 테이블 선형 보간"""
+        pos = (temp - self.SVP_MIN_TEMP) / self.SVP_STEP
+        if isinstance(pos, np.ndarray):
+            return np.interp(temp, np.arange(len(self._svp_table)) * self.SVP_STEP + self.SVP_MIN_TEMP, self._svp_table)
+        i = int(pos)
+        if i < 0:
+            return float(self._svp_table[0])
+        if i >= len(self._svp_table) - 1:
+            return float(self._svp_table[-1])
+        frac = pos - i
+        return float(self._svp_table[i] * (1.0 - frac) + self._svp_table[i + 1] * frac)
+
+    def absolute_humidity(self, temp, relative_humidity):
+        """혼합비 기준 절대습도 (kg/kg)"""
+        actual_vapor_pressure = self.saturation_vapor_pressure(temp) * (relative_humidity / 100.0)
+        return 0.622 * actual_vapor_pressure / (101325 - actual_vapor_pressure)
+
+# 지역별 기후 모델 캐시
+_climate_models = {}
+
+def get_climate_model(region="Seoul"):
+    """지역 기후 모델 반환 (최초 호출 시 한 번만 생성, 없는 지역은 서울)"""
+    if region not in region_data:
+        region = "Seoul"
+    model = _climate_models.get(region)
+    if model is None:
+        model = ClimateModel(region, region_data[region])
+        _climate_models[region] = model
+    return model
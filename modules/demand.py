@@ -0,0 +1,64 @@
+import numpy as np
+from datetime import date
+from data import building_type_factors, building_type_codes, default_building_type_code
+
+class DemandFactorTable:
+    """건물 유형 x 요일 x 시간 수요 인자 텐서 + 연중 휴일 비트맵
+
+    시나리오 로드 시 한 번 구성하고, 매 틱에는 건물별 type_code 배열로
+    한 번에 인자를 모아(gather) 곱한다.
+    """
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        n_types = default_building_type_code + 1  # 마지막 코드는 유형 인자 1.0
+
+        daily = np.asarray(pattern["daily_pattern"], dtype=float)      # (24,)
+        weekly = np.asarray(pattern["weekly_pattern"], dtype=float)    # (7,)
+        self.seasonal = [float(f) for f in pattern["seasonal_pattern"]]  # 1월~12월
+        self.holiday_factor = pattern.get("holiday_factor", 1.3)
+        self.holiday_list = [(h["month"], h["day"]) for h in pattern.get("holiday_list", [])]
+
+        # 유형별 (주중/주말) x (주간/야간) 인자 -> (n_types, 7, 24)
+        type_factor = np.ones((n_types, 7, 24))
+        hours = np.arange(24)
+        is_night = (hours < 6) | (hours >= 20)
+        for name, code in building_type_codes.items():
+            data = building_type_factors[name]
+            for wday in range(7):
+                if wday >= 5:  # 5(토), 6(일)
+                    type_factor[code, wday] = np.where(is_night, data["weekend_night_factor"], data["weekend_day_factor"])
+                else:
+                    type_factor[code, wday] = np.where(is_night, data["weekday_night_factor"], data["weekday_day_factor"])
+
+        # 시간대 x 요일 패턴을 미리 곱해둔 텐서
+        self.tensor = type_factor * weekly[None, :, None] * daily[None, None, :]
+
+        # 연도별 휴일 비트맵 캐시 (인덱스 = day of year)
+        self._holiday_year = None
+        self._holiday_bitmap = None
+
+    def holiday_bitmap(self, year):
+        """해당 연도의 day of year별 휴일 여부 배열"""
+        if self._holiday_year != year:
+            bitmap = np.zeros(367, dtype=bool)
+            for month, day in self.holiday_list:
+                try:
+                    bitmap[date(year, month, day).timetuple().tm_yday] = True
+                except ValueError:
+                    continue  # 존재하지 않는 날짜 (예: 평년의 2월 29일)
+            self._holiday_year = year
+            self._holiday_bitmap = bitmap
+        return self._holiday_bitmap
+
+    def calendar_factor(self, sim_time):
+        """계절 x 휴일 인자 (모든 건물 공통)"""
+        factor = self.seasonal[sim_time.month - 1]
+        if self.holiday_bitmap(sim_time.year)[sim_time.timetuple().tm_yday]:
+            factor *= self.holiday_factor
+        return factor
+
+    def factors(self, type_codes, sim_time):
+        """건물 type_code 배열 -> 건물별 패턴 인자 배열 (gather 한 번 + 곱셈 한 번)"""
+        row = self.tensor[:, sim_time.weekday(), sim_time.hour]
+        return row[type_codes] * self.calendar_factor(sim_time)
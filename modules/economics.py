@@ -1,6 +1,10 @@
 import random
 import math
 from datetime import datetime, timedelta
+import numpy as np
+from modules.timeseries import TimeSeriesStore
+from modules.investment import InvestmentEvaluator
+from modules.billing import BillingEngine
 
 class EconomicModel:
     def __init__(self, simulator):
@@ -33,7 +37,8 @@ class EconomicModel:
             "gas": 80.0,      # 원/kWh
             "nuclear": 40.0,  # 원/kWh
             "solar": 5.0,     # 원/kWh (유지보수 비용)
-            "wind": 5.0       # 원/kWh (유지보수 비용)
+            "wind": 5.0,      # 원/kWh (유지보수 비용)
+            "hydro": 8.0      # 원/kWh (유지보수 비용)
         }
         
         # 설비 투자 비용
@@ -58,31 +63,41 @@ class EconomicModel:
         self.investment_cost = 0.0         # 투자 비용 누적
         self.profit = 0.0                  # 순이익
         
+        # 가격/거래 이력 최대 보관 행 수 (15분 간격 약 3년)
+        self.history_limit = 1 << 17
+        
         # 발전소 종류 정보 (확장 가능)
         self.generator_types = {}
         
-        # 거래 기록
-        self.transactions = []
+        # 거래 기록 (열 저장소, 투자 파라미터만 시퀀스 번호 기준 dict에 별도 보관)
+        self.transactions = TimeSeriesStore(("amount", "price", "revenue"), max_length=self.history_limit,
+                                            categorical=("type", "investment_type", "building_type"))
+        self.transaction_params = {}
         
         # 가격 변동 추적
-        self.price_history = []
+        self.price_history = TimeSeriesStore(("price",), max_length=self.history_limit)
         self.last_price_update = simulator.simTime
         
         # 실시간 가격 업데이트 주기 (시뮬레이션 시간 기준, 분)
         self.price_update_interval = 15
+        
+        # 건물별 노드 가격 (도시 평균 가격 + 송전 혼잡 성분), 건물 idx 순
+        self.nodal_prices = np.empty(0)
+        self.nodal_congested = np.empty(0, dtype=bool)
+        
+        # 건물 유형별 요금제 청구 (매 틱 사용량 적분, 월 단위 청구서)
+        self.billing = BillingEngine(self)
     
     def update_energy_prices(self, dt_ms):
         """전력 가격 주기적 업데이트"""
         current_time = self.simulator.simTime
         if (current_time - self.last_price_update).total_seconds() / 60 >= self.price_update_interval:
             self.calculate_electricity_price()
+            self.update_nodal_prices()
             self.last_price_update = current_time
             
             # 가격 기록 저장
-            self.price_history.append({
-                "time": current_time.isoformat(),
-                "price": self.current_electricity_price
-            })
+            self.price_history.append(current_time, price=self.current_electricity_price)
     
     def calculate_electricity_price(self):
         """시간, 수요/공급, 가격 영향 요소 고려하여 전력 가격 계산"""
@@ -92,11 +107,7 @@ class EconomicModel:
         base_price = self.base_electricity_price
         
         # 1. 시간대별 가격 조정
-        time_factor = 1.0
-        if hour in self.peak_hours:
-            time_factor = self.peak_price_factor
-        elif hour in self.offpeak_hours:
-            time_factor = self.offpeak_price_factor
+        time_factor = self.time_of_use_factor(hour)
         
         # 2. 수요/공급 균형에 따른 가격 조정
         supply_demand_factor = self.calculate_supply_demand_factor()
@@ -113,6 +124,66 @@ class EconomicModel:
         # 가격 범위 제한 (너무 극단적인 값 방지)
         self.current_electricity_price = max(self.base_electricity_price * 0.5, min(self.base_electricity_price * 3.0, self.current_electricity_price))
     
+    def update_billing(self, dt_hours):
+        """요금 청구 엔진에 이번 틱 사용량 반영"""
+        self.billing.tick(dt_hours)
+    
+    def record_billing(self, bills):
+        """월 청구서 마감 시 청구액을 수익에 반영하고 거래 기록 (amount: 총 사용량 MWh, revenue: 총 청구액 원)"""
+        revenue = float(bills.total.sum())
+        self.revenue += revenue
+        self.profit = self.revenue - self.operational_cost - self.carbon_tax_paid
+        self.transactions.append(self.simulator.simTime, type="billing",
+                                 amount=float(bills.energy.sum()), revenue=revenue)
+    
+    def get_bills(self, month_index=-1):
+        """마감된 월 청구서 (기본: 가장 최근), 없으면 이번 달 누적 기준 예상 청구서"""
+        if self.billing.history:
+            return self.billing.history[month_index]
+        return self.billing.compute_bills()
+    
+    def update_nodal_prices(self):
+        """급전 쌍대변수(LMP)로 건물별 가격 계산
+
+        도시 가격(current_electricity_price)에 각 노드 LMP와 수요 가중 평균 LMP의 차이(혼잡 성분)를 더한다.
+        추가 공급이 불가능한 노드는 가격 상한을 적용한다.
+        """
+        power_system = self.simulator.power_system
+        lmp = power_system.compute_nodal_prices()
+        congested = power_system.pricer.congested
+        buildings = self.simulator.city.buildings
+        demand = np.array([max(-b.current_supply, 0.0) if not b.removed else 0.0 for b in buildings])
+        weights = np.where(congested, 0.0, demand)
+        if weights.sum() > 0:
+            reference = float(np.dot(weights, lmp) / weights.sum())
+        else:
+            reference = float(lmp[~congested].mean()) if (~congested).any() else 0.0
+        low, high = self.base_electricity_price * 0.5, self.base_electricity_price * 3.0
+        prices = np.clip(self.current_electricity_price + (lmp - reference), low, high)
+        self.nodal_prices = np.where(congested, high, prices)
+        self.nodal_congested = congested
+    
+    def get_nodal_price(self, building):
+        """건물(또는 건물 idx)의 전력 가격 (노드 가격 계산 전이면 도시 가격)"""
+        idx = getattr(building, 'idx', building)
+        if idx is not None and idx < len(self.nodal_prices):
+            return float(self.nodal_prices[idx])
+        return self.current_electricity_price
+    
+    def time_of_use_factor(self, hour):
+        """시간대별 가격 인자 (피크 할증 / 오프피크 할인)"""
+        if hour in self.peak_hours:
+            return self.peak_price_factor
+        if hour in self.offpeak_hours:
+            return self.offpeak_price_factor
+        return 1.0
+    
+    def price_forecast(self, start_time, hours):
+        """향후 hours시간의 예상 가격 (시간대 인자 x 현재 날씨 인자, 무작위 변동/수급 인자 제외)"""
+        weather_factor = self.calculate_weather_price_factor()
+        return [self.base_electricity_price * self.time_of_use_factor((start_time + timedelta(hours=h)).hour) * weather_factor
+                for h in range(hours)]
+    
     def calculate_supply_demand_factor(self):
         """수요/공급 비율에 따른 가격 인자 계산"""
         total_demand = abs(self.simulator.city.total_demand())
@@ -216,6 +287,11 @@ class EconomicModel:
         
         return roi, payback_period, cost
     
+    def evaluate_investments(self, candidates, **options):
+        """후보 투자 묶음을 호라이즌 경제 급전으로 평가 -> 후보별 {npv, roi, payback, annual_benefit, cost}
+        (options: hours, step_hours, discount_rate, lifetime_years)"""
+        return InvestmentEvaluator(self.simulator, **options).evaluate(candidates)
+    
     def make_investment(self, investment_type, params):
         """투자 실행 및 비용 처리"""
         roi, payback, cost = self.calculate_roi(investment_type, params)
@@ -229,20 +305,26 @@ class EconomicModel:
         self.investment_cost += cost
         
         # 투자 거래 기록
-        self.transactions.append({
-            "time": self.simulator.simTime.isoformat(),
-            "type": "investment",
-            "investment_type": investment_type,
-            "amount": cost,
-            "params": params
-        })
+        seq = self.transactions.append(self.simulator.simTime, type="investment",
+                                       investment_type=investment_type, amount=cost)
+        self.transaction_params[seq] = params
+        if len(self.transaction_params) > len(self.transactions):
+            # 링 버퍼에서 밀려난 거래의 파라미터 정리
+            oldest = self.transactions.dropped
+            self.transaction_params = {k: v for k, v in self.transaction_params.items() if k >= oldest}
         
         return True, f"투자 완료: {investment_type}, 비용: {cost:.1f}, ROI: {roi:.1f}%, 회수기간: {payback:.1f}년"
     
-    def sell_electricity(self, amount, building_type=None):
-        """전력 판매 처리 및 수익 계산"""
+    def sell_electricity(self, amount, building_type=None, building=None):
+        """요금제 밖 직접 판매 처리 및 수익 계산 (building을 주면 해당 노드 가격 적용)
+
+        월 요금 청구액은 record_billing에서 따로 수익에 반영되므로 여기에는 요금제 밖 거래만 넘긴다.
+        """
         if amount <= 0:
             return 0.0
+        if building is not None:
+            building_type = building_type or building.building_type
+        price = self.get_nodal_price(building)
         
         # 건물 유형별 전력 요금 차등
         price_multiplier = 1.0
@@ -251,21 +333,16 @@ class EconomicModel:
         elif building_type == "school":
             price_multiplier = 0.9  # 학교 할인
             
-        revenue = amount * self.current_electricity_price * price_multiplier / 1000.0  # kWh 단위 변환
+        revenue = amount * price * price_multiplier / 1000.0  # kWh 단위 변환
         
         # 통계 업데이트
         self.revenue += revenue
         self.profit = self.revenue - self.operational_cost - self.carbon_tax_paid
         
         # 판매 거래 기록
-        self.transactions.append({
-            "time": self.simulator.simTime.isoformat(),
-            "type": "sell",
-            "amount": amount,
-            "price": self.current_electricity_price,
-            "revenue": revenue,
-            "building_type": building_type
-        })
+        self.transactions.append(self.simulator.simTime, type="sell", amount=amount,
+                                 price=price, revenue=revenue,
+                                 building_type=building_type)
         
         return revenue
     
@@ -281,10 +358,15 @@ class EconomicModel:
             "roi": (self.profit / max(1.0, self.investment_cost)) * 100 if self.investment_cost > 0 else 0.0
         }
     
-    def get_price_history(self):
-        """가격 변동 이력 반환"""
-        return self.price_history
+    def get_price_history(self, start=None, end=None):
+        """가격 변동 이력 반환 -> (epoch 초 배열, 가격 배열), 복사 없는 뷰"""
+        epochs, columns = self.price_history.range(start, end, ("price",))
+        return epochs, columns["price"]
+    
+    def get_price_stats(self, interval=3600, start=None, end=None):
+        """구간별 평균 가격 (기본 1시간) -> (구간 시작 epoch, 평균 가격)"""
+        return self.price_history.resample("price", interval, start, end, how="mean")
     
-    def get_transactions(self):
-        """거래 내역 반환"""
-        return self.transactions 
\ No newline at end of file
+    def get_transactions(self, start=None, end=None):
+        """거래 내역 반환 -> (epoch 배열, {열: 배열}); 투자 파라미터는 transaction_params[시퀀스 번호]"""
+        return self.transactions.range(start, end) 
\ No newline at end of file
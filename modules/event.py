@@ -1,9 +1,24 @@
+import heapq
 import random
+from datetime import timedelta
+from modules.hazard import HazardModel
+from modules.restoration import RestorationSystem
 
 class EventSystem:
-    def __init__(self, simulator):
+    """랜덤 이벤트 발생기 - 시뮬레이션 시간 기준 포아송 과정
+
+    이벤트 유형마다 지수 분포 도착 간격(평균 1/rate 시간)을 뽑아 (발생 시각, 순번, 유형) 우선순위 큐에 넣고,
+    시뮬레이션 시각이 큐 맨 앞 발생 시각에 도달했을 때만 처리한다.
+    발생 빈도가 프레임 속도/gameSpeed와 무관하므로 UI와 무화면 실행에서 같은 분포로 이벤트가 일어난다.
+    """
+
+    # 유형별 기본 발생률 (시뮬레이션 1시간당 건수)
+    # 기존 프레임당 확률 0.0001 x 시뮬레이션 1시간당 18프레임(gameSpeed 6000, 30 FPS면 프레임당 200초) = 전체 약 0.0018건/시간을
+    # 7개 유형에 균등 배분
+    DEFAULT_RATE = 0.0018 / 7
+
+    def __init__(self, simulator, event_rates=None):
         self.simulator = simulator
-        self.event_probability = 0.0001  # 매 업데이트마다 이벤트 발생 확률
         self.event_types = [
             self.random_line_trip,
             self.random_line_half,
@@ -13,48 +28,184 @@ class EventSystem:
             self.random_solar_boost,
             self.random_battery_fault
         ]
+        # 유형 이름 -> 시간당 발생률 (0이면 발생하지 않음)
+        self.event_rates = {func.__name__: self.DEFAULT_RATE for func in self.event_types}
+        if event_rates:
+            self.event_rates.update(event_rates)
         self.last_event_time = None
-        self.min_event_interval = 30  # 최소 이벤트 간격(분)
+        self.min_event_interval = 30  # 최소 이벤트 간격(분), 간격 안에 도착한 이벤트는 버림
         self.event_history = []
+        self._queue = []       # (발생 시각, 순번, 유형 이름 또는 예약 콜백)
+        self._seq = 0
+        self._clock = None     # 마지막으로 처리한 시뮬레이션 시각 (시간이 되돌아가면 재스케줄)
+        # 날씨/부하 연동 설비 고장 (interval마다 일괄 추출, 복구는 수리반이 담당)
+        self.hazard = HazardModel(simulator, mean_repair_hours=0)
+        self.restoration = RestorationSystem(simulator, self)  # 수리반 복구 대기열 (완료 사건을 큐에 예약)
+        self.cascade_history = []  # 연쇄 고장 기록 (CascadeResult.to_dict + 시각)
+        self._tripped_lines = []   # 이번 이벤트에서 고장난 송전선 (연쇄 고장 시작점)
+        self._removed_buildings = []  # 이번 이벤트에서 고장난 건물
+        self._changes = []         # 이번 이벤트에서 바뀐 설비와 속성 (이벤트 저널 기록용)
+    
+    @property
+    def next_event_time(self):
+        """다음 이벤트 예정 시각 (예정된 이벤트가 없으면 None)"""
+        return self._queue[0][0] if self._queue else None
+    
+    def is_due(self, now):
+        """이벤트 시스템을 깨워야 하는지 (예정 시각 도달, 스케줄 전, 시간 역행)"""
+        if self._clock is None or now < self._clock or self.hazard.is_due(now):
+            return True
+        return bool(self._queue) and now >= self._queue[0][0]
+    
+    def set_rate(self, name, rate):
+        """유형별 발생률(시간당 건수) 변경 후 해당 유형만 다시 스케줄"""
+        self.event_rates[name] = rate
+        if self._clock is not None:
+            self._queue = [item for item in self._queue if item[2] != name]
+            heapq.heapify(self._queue)
+            self._schedule(name, self._clock)
+    
+    def schedule(self, at, callback):
+        """at 시각에 callback(at) 호출 예약 (복구 완료 등 다른 서브시스템의 사건, 반환값 True면 흐름 갱신)"""
+        heapq.heappush(self._queue, (at, self._seq, callback))
+        self._seq += 1
+    
+    def reset_schedule(self, now=None):
+        """현재 시각 기준으로 전체 유형 도착 시각 다시 샘플링 (예약 콜백은 유지)"""
+        now = now or self.simulator.simTime
+        self._queue = [item for item in self._queue if callable(item[2])]
+        heapq.heapify(self._queue)
+        self._clock = now
+        for name in self.event_rates:
+            self._schedule(name, now)
+    
+    def _schedule(self, name, after):
+        """유형 name의 다음 도착 시각 = after + Exp(rate)"""
+        rate = self.event_rates.get(name, 0.0)
+        if rate <= 0:
+            return
+        hours = random.expovariate(rate)
+        if hours > 24 * 365 * 100:
+            return  # 시뮬레이션 범위를 벗어나는 도착은 무시 (timedelta 범위 보호)
+        heapq.heappush(self._queue, (after + timedelta(hours=hours), self._seq, name))
+        self._seq += 1
     
     def update_events(self):
-        """랜덤 이벤트 발생 확인 및 처리"""
+        """예정 시각이 지난 이벤트를 순서대로 처리 -> 이벤트가 하나라도 발생했는지"""
         current_time = self.simulator.simTime
+        if self._clock is None or current_time < self._clock:
+            if self._clock is not None:
+                self.restoration.reset()  # 시간이 되돌아가면(시나리오 재시작) 진행 중 복구 작업 취소
+            self.reset_schedule(current_time)
+        self._clock = current_time
         
-        # 마지막 이벤트와의 시간 간격 확인
-        if self.last_event_time is not None:
-            time_diff = (current_time - self.last_event_time).total_seconds() / 60  # 분 단위
-            if time_diff < self.min_event_interval:
-                return False  # 최소 간격 미달
+        handlers = {func.__name__: func for func in self.event_types}
+        occurred = False
+        restored = False
+        while self._queue and self._queue[0][0] <= current_time:
+            due, _, name = heapq.heappop(self._queue)
+            if callable(name):
+                restored |= bool(name(due))
+                continue
+            self._schedule(name, due)
+            handler = handlers.get(name)
+            if handler is None:
+                continue
+            # 마지막 이벤트와의 최소 간격 미달이면 이번 도착은 버림
+            if self.last_event_time is not None:
+                time_diff = (due - self.last_event_time).total_seconds() / 60  # 분 단위
+                if time_diff < self.min_event_interval:
+                    continue
+            occurred |= self.random_event(handler, due)
+        if restored:
+            self.simulator.update_flow(instant=True)
+            occurred = True
         
-        # 이벤트 발생 확률 계산 (기본 확률에 시간 흐름 가중치)
-        if random.random() < self.event_probability:
-            return self.random_event()
-            
-        return False
+        if self.hazard.is_due(current_time):
+            occurred |= self.apply_hazards(current_time)
+        return occurred
     
-    def random_event(self):
-        """랜덤 이벤트 발생"""
-        # 이벤트 타입 랜덤 선택
-        event_func = random.choice(self.event_types)
+    def apply_hazards(self, now):
+        """날씨/부하 연동 고장 추출 결과 반영 (고장이 있으면 흐름 갱신 후 기록)"""
+        lines, plants = self.hazard.step(now)
+        if not lines and not plants:
+            return False
+        self.simulator.event_count += len(lines) + len(plants)
+        self._changes = []
+        for component in lines + plants:
+            self._touch(component, "removed")
+        if lines:
+            self.propagate_cascade(lines, now)
+        self.restoration.report(plants, now)
+        self.simulator.update_flow(instant=True)
+        for event_type, count in (("hazard_line_trip", len(lines)), ("hazard_gen_trip", len(plants))):
+            if count:
+                self.event_history.append({
+                    "time": now.isoformat(),
+                    "type": event_type,
+                    "count": count,
+                    "weather": self.simulator.weather_system.current_weather,
+                    "total_count": self.simulator.event_count
+                })
+        self.journal_event("hazard", now, self._changes)
+        return True
+    
+    def random_event(self, event_func=None, event_time=None):
+        """이벤트 발생 (event_func가 없으면 유형 랜덤 선택)"""
+        if event_func is None:
+            event_func = random.choice(self.event_types)
+        self._tripped_lines = []
+        self._removed_buildings = []
+        self._changes = []
         success = event_func()
         
         if success:
             self.simulator.event_count += 1
-            self.last_event_time = self.simulator.simTime
+            self.last_event_time = event_time or self.simulator.simTime
+            
+            # 송전선 고장이면 우회 흐름으로 인한 연쇄 고장 진행
+            if self._tripped_lines:
+                self.propagate_cascade(self._tripped_lines, self.last_event_time)
+            self.restoration.report(self._removed_buildings, self.last_event_time)
             
             # 이벤트 발생 시 즉시 전력 흐름 업데이트
             self.simulator.update_flow(instant=True)
             
             # 이벤트 기록
             self.event_history.append({
-                "time": self.simulator.simTime.isoformat(),
+                "time": self.last_event_time.isoformat(),
                 "type": event_func.__name__,
                 "total_count": self.simulator.event_count
             })
+            self.journal_event(event_func.__name__, self.last_event_time, self._changes)
             
         return success
     
+    def _touch(self, component, *attrs):
+        """이번 이벤트에서 바뀐 설비 속성 기록"""
+        self._changes.append((component, {attr: getattr(component, attr) for attr in attrs}))
+    
+    def journal_event(self, event_type, time, changes):
+        """이벤트 저널이 켜져 있으면 이벤트와 바뀐 설비 기록"""
+        journal = getattr(self.simulator, 'journal', None)
+        if journal is not None:
+            journal.event(event_type, time, changes)
+    
+    def propagate_cascade(self, lines, now):
+        """고장 송전선에서 시작하는 연쇄 고장을 반영하고 추가 트립이 있으면 기록 -> CascadeResult
+        (트립된 송전선은 모두 수리반 대기열에 등록)"""
+        result = self.simulator.power_system.simulate_cascade(lines, apply=True)
+        city_lines = self.simulator.city.lines
+        self.restoration.report([city_lines[pos] for pos in result.tripped], now)
+        for round_lines in result.rounds:
+            for pos in round_lines:
+                self._touch(city_lines[pos], "removed")
+        if result.rounds:
+            record = result.to_dict()
+            record["time"] = now.isoformat()
+            self.cascade_history.append(record)
+        return result
+    
     def random_line_trip(self):
         """랜덤 송전선 고장 - 일시적 제거"""
         # 활성 상태인 송전선 필터링
@@ -63,9 +214,12 @@ class EventSystem:
         if not active_lines:
             return False
             
-        # 랜덤 선택 후 제거
-        target_line = random.choice(active_lines)
+        # 날씨/부하 고장률에 비례해 선택 후 제거
+        rates = self.hazard.line_rates(active_lines)
+        target_line = random.choices(active_lines, weights=rates.tolist())[0] if rates.sum() > 0 else random.choice(active_lines)
         target_line.removed = True
+        self._tripped_lines.append(target_line)
+        self._touch(target_line, "removed")
         
         return True
     
@@ -78,6 +232,7 @@ class EventSystem:
             
         target_line = random.choice(active_lines)
         target_line.capacity /= 2  # 용량 절반으로
+        self._touch(target_line, "capacity")
         
         return True
     
@@ -90,6 +245,8 @@ class EventSystem:
             
         target_building = random.choice(active_buildings)
         target_building.removed = True
+        self._removed_buildings.append(target_building)
+        self._touch(target_building, "removed")
         
         return True
     
@@ -101,10 +258,12 @@ class EventSystem:
         if not generators:
             return False
             
-        target_gen = random.choice(generators)
+        rates = self.hazard.plant_rates(generators)
+        target_gen = random.choices(generators, weights=rates.tolist())[0] if rates.sum() > 0 else random.choice(generators)
         # 발전량 20-50% 감소
         reduction = random.uniform(0.2, 0.5)
         target_gen.current_supply *= (1 - reduction)
+        self._touch(target_gen, "current_supply")
         
         return True
     
@@ -120,6 +279,7 @@ class EventSystem:
         # 수요 30-80% 증가
         increase = random.uniform(0.3, 0.8)
         target_consumer.current_supply *= (1 + increase)
+        self._touch(target_consumer, "current_supply")
         
         return True
     
@@ -140,6 +300,7 @@ class EventSystem:
                 b.current_supply += b.solar_capacity * 0.3  # 30% 추가 발전
             else:  # 소비 건물 (태양광 설비가 있는)
                 b.current_supply += b.solar_capacity * 0.3  # 수요 상쇄
+            self._touch(b, "current_supply")
                 
         return True
     
@@ -156,6 +317,7 @@ class EventSystem:
         loss_ratio = random.uniform(0.5, 1.0)
         lost_charge = target_building.battery_charge * loss_ratio
         target_building.battery_charge -= lost_charge
+        self._touch(target_building, "battery_charge")
         
         return True
     
@@ -0,0 +1,267 @@
+import heapq
+import numpy as np
+
+class FlowNetwork:
+    """CSR 배열 기반 잔여 그래프 (최소비용 유량용)
+
+    간선은 (정방향, 역방향) 쌍으로 저장한다: 간선 e의 역방향은 e ^ 1.
+    간선 추가가 끝나면 finalize()로 꼬리 노드 기준 CSR(indptr, adjacency)을 만든다.
+    노드/간선 수가 커져도 파이썬 객체 대신 numpy 배열만 유지한다.
+    """
+
+    def __init__(self, num_nodes, edge_hint=0):
+        self.num_nodes = num_nodes
+        self._tail = np.empty(max(edge_hint, 16) * 2, dtype=np.int64)
+        self._head = np.empty_like(self._tail)
+        self._cap = np.empty(len(self._tail), dtype=float)
+        self._cost = np.empty(len(self._tail), dtype=float)
+        self.num_edges = 0
+        self.indptr = None
+        self.adjacency = None
+
+    def _grow(self, needed):
+        size = len(self._tail)
+        if needed <= size:
+            return
+        while size < needed:
+            size *= 2
+        for name in ("_tail", "_head", "_cap", "_cost"):
+            old = getattr(self, name)
+            new = np.empty(size, dtype=old.dtype)
+            new[:self.num_edges] = old[:self.num_edges]
+            setattr(self, name, new)
+
+    def add_edges(self, tails, heads, caps, costs):
+        """간선 묶음 추가 -> 정방향 간선 id 배열"""
+        tails = np.asarray(tails, dtype=np.int64)
+        count = len(tails)
+        if count == 0:
+            return np.empty(0, dtype=np.int64)
+        start = self.num_edges
+        self._grow(start + 2 * count)
+        forward = np.arange(start, start + 2 * count, 2)
+        heads = np.asarray(heads, dtype=np.int64)
+        costs = np.broadcast_to(np.asarray(costs, dtype=float), (count,))
+        self._tail[forward] = tails
+        self._head[forward] = heads
+        self._cap[forward] = np.broadcast_to(np.asarray(caps, dtype=float), (count,))
+        self._cost[forward] = costs
+        self._tail[forward + 1] = heads
+        self._head[forward + 1] = tails
+        self._cap[forward + 1] = 0.0
+        self._cost[forward + 1] = -costs
+        self.num_edges = start + 2 * count
+        return forward
+
+    def finalize(self):
+        """CSR 인접 구조 구성"""
+        m = self.num_edges
+        self.tail = self._tail[:m]
+        self.head = self._head[:m]
+        self.capacity = self._cap[:m].copy()
+        self.cost = self._cost[:m]
+        self.adjacency = np.argsort(self.tail, kind="stable")
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.tail, minlength=self.num_nodes), out=self.indptr[1:])
+        # 파이썬 루프용 리스트 사본 (반복 탐색에서 numpy 원소 접근 비용 회피)
+        self.indptr_list = self.indptr.tolist()
+        self.adjacency_list = self.adjacency.tolist()
+        self.head_list = self.head.tolist()
+        return self
+
+
+def min_cost_flow(network, source, sink, max_flow=float("inf"), eps=1e-9):
+    """연속 최단경로(SSP) + 노드 포텐셜(존슨 재가중)로 최소비용 최대유량 계산
+
+    모든 정방향 간선 비용이 0 이상이라고 가정하므로 초기 포텐셜은 0에서 시작한다.
+    반환: (총 유량, 총 비용, 간선별 유량 배열, 노드 포텐셜 배열)
+    노드 포텐셜은 최종 잔여 그래프에서 source로부터의 최단거리(실제 비용)로, 해당 노드에 한 단위를
+    더 보낼 때의 한계 비용(쌍대변수)이다. 더 보낼 수 없는 노드(혼잡/공급 부족)는 inf.
+    """
+    n = network.num_nodes
+    indptr = network.indptr.tolist()
+    adjacency = network.adjacency.tolist()
+    head = network.head.tolist()
+    cost = network.cost.tolist()
+    residual = network.capacity.tolist()
+    potential = [0.0] * n
+    inf = float("inf")
+
+    total_flow = 0.0
+    total_cost = 0.0
+    while total_flow < max_flow - eps:
+        # 감소 비용(reduced cost) 기준 다익스트라
+        dist = [inf] * n
+        prev_edge = [-1] * n
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            if u == sink:
+                # sink보다 먼 노드는 포텐셜 갱신에서 dist[sink]로 잘리므로 더 탐색할 필요 없음
+                break
+            pu = potential[u]
+            for k in range(indptr[u], indptr[u + 1]):
+                e = adjacency[k]
+                if residual[e] <= eps:
+                    continue
+                v = head[e]
+                nd = d + cost[e] + pu - potential[v]
+                if nd < dist[v] - 1e-12:
+                    dist[v] = nd
+                    prev_edge[v] = e
+                    heapq.heappush(heap, (nd, v))
+        if dist[sink] == inf:
+            # 마지막 탐색 결과로 최종 포텐셜 확정 (추가 계산 없이 한계 비용을 얻음)
+            for v in range(n):
+                potential[v] = potential[v] + dist[v] if dist[v] < inf else inf
+            break
+
+        # 포텐셜 갱신 (도달 못한 노드는 이번 최단거리 상한으로)
+        limit = dist[sink]
+        for v in range(n):
+            potential[v] += dist[v] if dist[v] < limit else limit
+
+        # 감소 비용 0인 간선(최단경로 위 간선)으로 막힐 때까지 보냄 (다익스트라 한 번에 경로 여러 개)
+        pushed, pushed_cost = _admissible_flow(indptr, adjacency, head, cost, residual, potential,
+                                               source, sink, max_flow - total_flow, eps)
+        if pushed <= eps:
+            # 반올림으로 허용 간선이 끊긴 경우 다익스트라 경로 하나로 진행
+            pushed = max_flow - total_flow
+            v = sink
+            while v != source:
+                e = prev_edge[v]
+                pushed = min(pushed, residual[e])
+                v = head[e ^ 1]
+            v = sink
+            while v != source:
+                e = prev_edge[v]
+                residual[e] -= pushed
+                residual[e ^ 1] += pushed
+                pushed_cost += pushed * cost[e]
+                v = head[e ^ 1]
+        total_cost += pushed_cost
+        total_flow += pushed
+
+    flow = network.capacity - np.asarray(residual)
+    return total_flow, total_cost, flow, np.asarray(potential)
+
+
+def _admissible_flow(indptr, adjacency, head, cost, residual, potential, source, sink, limit, eps, tol=1e-9):
+    """감소 비용이 0인 간선만 쓰는 레벨 그래프에서 블로킹 유량(Dinic) 추가 -> (보낸 유량, 비용)
+
+    포텐셜이 최단거리로 갱신된 직후라 이 간선들 위의 경로는 모두 최단경로이고,
+    역방향 간선의 감소 비용도 0이 되므로 보낸 뒤에도 포텐셜의 최적성이 유지된다.
+    """
+    n = len(potential)
+    pushed = 0.0
+    pushed_cost = 0.0
+    while pushed < limit - eps:
+        level = [-1] * n
+        level[source] = 0
+        queue = [source]
+        for u in queue:
+            if 0 <= level[sink] <= level[u]:
+                # 너비 우선이므로 남은 노드는 모두 sink보다 깊어 블로킹 유량에 쓰이지 않음
+                break
+            pu = potential[u]
+            for k in range(indptr[u], indptr[u + 1]):
+                e = adjacency[k]
+                v = head[e]
+                if level[v] < 0 and residual[e] > eps and cost[e] + pu - potential[v] <= tol:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[sink] < 0:
+            break
+        arc = indptr[:-1]
+        blocked = False
+        while not blocked and pushed < limit - eps:
+            path = []
+            u = source
+            while u != sink:
+                end = indptr[u + 1]
+                k = arc[u]
+                while k < end:
+                    e = adjacency[k]
+                    v = head[e]
+                    if residual[e] > eps and level[v] == level[u] + 1 and cost[e] + potential[u] - potential[v] <= tol:
+                        break
+                    k += 1
+                arc[u] = k
+                if k < end:
+                    path.append(adjacency[k])
+                    u = head[adjacency[k]]
+                elif u == source:
+                    blocked = True
+                    break
+                else:
+                    # 막다른 노드는 이번 단계에서 제외하고 한 칸 되돌아감
+                    level[u] = -1
+                    u = head[path.pop() ^ 1]
+                    arc[u] += 1
+            if blocked:
+                break
+            push = limit - pushed
+            for e in path:
+                if residual[e] < push:
+                    push = residual[e]
+            for e in path:
+                residual[e] -= push
+                residual[e ^ 1] += push
+                pushed_cost += push * cost[e]
+            pushed += push
+    return pushed, pushed_cost
+
+
+def augment_paths(network, residual, source, sink, limit=float("inf"), eps=1e-9):
+    """잔여 용량 리스트 residual 위에서 source -> sink로 최대 limit만큼 BFS 증가 경로(Edmonds-Karp) 추가
+
+    residual은 제자리에서 갱신되므로 이전 해의 잔여 그래프에 이어서(warm start) 호출할 수 있다.
+    반환: 추가로 보낸 유량
+    """
+    if source == sink or limit <= eps:
+        return 0.0
+    indptr = network.indptr_list
+    adjacency = network.adjacency_list
+    head = network.head_list
+    n = network.num_nodes
+    pushed = 0.0
+    while pushed < limit - eps:
+        prev_edge = [-1] * n
+        prev_edge[source] = -2
+        queue = [source]
+        found = False
+        for u in queue:
+            for k in range(indptr[u], indptr[u + 1]):
+                e = adjacency[k]
+                if residual[e] <= eps:
+                    continue
+                v = head[e]
+                if prev_edge[v] != -1:
+                    continue
+                prev_edge[v] = e
+                if v == sink:
+                    found = True
+                    break
+                queue.append(v)
+            if found:
+                break
+        if not found:
+            break
+        push = limit - pushed
+        v = sink
+        while v != source:
+            e = prev_edge[v]
+            if residual[e] < push:
+                push = residual[e]
+            v = head[e ^ 1]
+        v = sink
+        while v != source:
+            e = prev_edge[v]
+            residual[e] -= push
+            residual[e ^ 1] += push
+            v = head[e ^ 1]
+        pushed += push
+    return pushed
@@ -0,0 +1,238 @@
+import numpy as np
+
+class GeneratorKernel:
+    """발전소 유형별 배치 출력 커널 기본 클래스
+
+    - matches(): 건물이 이 유형 발전 설비를 가졌는지 (설비 용량 > 0 또는 power_plant_type 일치)
+    - prepare(): 발전소 목록이 바뀔 때 한 번 정적 배열(용량, 효율 등) 구성
+    - apply(): 매 틱 해당 유형 발전소 전체 출력을 한 번에 계산해 current_supply에 반영
+    """
+
+    plant_type = None
+    capacity_attr = None
+
+    def matches(self, building):
+        if self.capacity_attr and getattr(building, self.capacity_attr, 0) > 0:
+            return True
+        return getattr(building, 'power_plant_type', None) == self.plant_type
+
+    def prepare(self, fleet):
+        pass
+
+    def apply(self, fleet, active, power_system, region):
+        raise NotImplementedError
+
+    @staticmethod
+    def _write(fleet, active, values, add=False):
+        """계산된 출력 배열을 건물 current_supply에 반영 (제거된 건물은 건너뜀)"""
+        for b, on, value in zip(fleet, active.tolist(), values.tolist()):
+            if on:
+                b.current_supply = b.current_supply + value if add else value
+
+
+class WindKernel(GeneratorKernel):
+    """풍력 - WindModel의 출력 곡선 테이블로 전체 풍력발전소 출력 계산 (기본 발전량에 더함)"""
+
+    plant_type = "wind"
+    capacity_attr = "wind_capacity"
+
+    def prepare(self, fleet):
+        self._stale = True
+
+    def apply(self, fleet, active, power_system, region):
+        wind_model = power_system.simulator.weather_system.wind_model
+        if self._stale:
+            wind_model.invalidate_fleet()
+            self._stale = False
+        _, output = wind_model.fleet_output(fleet)
+        self._write(fleet, active, output, add=True)
+
+
+class HydroKernel(GeneratorKernel):
+    """수력 - 계절별 수위 인자 x 설비 용량 x 효율 (기본 발전량을 덮어씀)"""
+
+    plant_type = "hydro"
+    capacity_attr = "hydro_capacity"
+
+    def prepare(self, fleet):
+        # HydroPowerPlant 객체는 자체 효율 적용, 일반 건물은 1.0
+        self.efficiency = np.array([getattr(b, 'efficiency', 1.0) if hasattr(b, 'calculate_output') else 1.0
+                                    for b in fleet], dtype=float)
+
+    @staticmethod
+    def water_level_factor(month):
+        if month in (6, 7, 8):  # 여름 (장마철)
+            return 1.2
+        if month in (12, 1, 2):  # 겨울 (갈수기)
+            return 0.7
+        return 1.0
+
+    def apply(self, fleet, active, power_system, region):
+        capacity = np.fromiter((b.hydro_capacity for b in fleet), dtype=float, count=len(fleet))
+        factor = self.water_level_factor(power_system.simulator.simTime.month)
+        self._write(fleet, active, capacity * factor * self.efficiency)
+
+
+class SolarKernel(GeneratorKernel):
+    """태양광 - 태양 위치는 한 번만 계산, 패널 경사/방위별 일사량은 배열로 계산 (발전량을 더함)
+
+    발전량 반영 직후 프로슈머 배터리 충전(잉여 전력 저장)을 BatteryFleet에 요청한다.
+    """
+
+    plant_type = "solar"
+    capacity_attr = "solar_capacity"
+
+    def prepare(self, fleet):
+        # SolarPowerPlant 객체(calculate_output 보유)는 패널 효율과 온도계수 적용
+        self.is_model = np.array([hasattr(b, 'calculate_output') and getattr(b, 'power_plant_type', None) == 'solar'
+                                  for b in fleet], dtype=bool)
+        self.panel_efficiency = np.array([getattr(b, 'efficiency', 1.0) for b in fleet], dtype=float)
+        self.temperature_coefficient = np.array([getattr(b, 'temperature_coefficient', 0.0) for b in fleet], dtype=float)
+        self.panel_tilt = np.array([getattr(b, 'panel_tilt', 35) for b in fleet], dtype=float)
+        self.panel_azimuth = np.array([getattr(b, 'panel_azimuth', 180) for b in fleet], dtype=float)
+
+    def apply(self, fleet, active, power_system, region):
+        simulator = power_system.simulator
+        weather = simulator.weather_system
+        region_info = weather.get_region_info(region)
+        lat = region_info.get("lat", 37.5665)
+        lon = region_info.get("lon", 126.9780)
+
+        sun_altitude, _ = weather.get_sun_position(simulator.simTime, lat, lon)
+        radiation = weather.compute_solar_radiation_batch(sun_altitude, weather.cloud_factor,
+                                                          self.panel_tilt, self.panel_azimuth)
+
+        temperature = weather.temperature if hasattr(weather, 'temperature') else 25
+        scale = np.where(self.is_model,
+                         self.panel_efficiency * (1 + self.temperature_coefficient * (temperature - 25)),
+                         weather.solar_efficiency)
+        capacity = np.fromiter((b.solar_capacity for b in fleet), dtype=float, count=len(fleet))
+        self._write(fleet, active, capacity * radiation * scale, add=True)
+
+        # 프로슈머 건물이 배터리를 가지고 있다면 잉여 전력 저장 (배터리 엔진에서 한 번에 처리)
+        fleet_engine = power_system.battery_fleet
+        fleet_engine.step(simulator.city.buildings, simulator.simTime.hour, (fleet_engine.MODE_PROSUMER,))
+
+
+class DispatchableKernel(GeneratorKernel):
+    """화력/원자력 등 급전 가능 발전소 - 기본 발전량(설비이용률 반영)을 그대로 출력
+
+    기본 발전량은 apply_demand_pattern의 기본 계산 단계에서 이미 current_supply에 들어가므로
+    별도 계산 없이 유형별 분류(fleet)만 제공한다. 옥상 태양광 등 가산 커널보다 먼저 등록된다.
+    """
+
+    def __init__(self, plant_type):
+        self.plant_type = plant_type
+
+    def apply(self, fleet, active, power_system, region):
+        pass
+
+
+def hydrogen_parameters(building):
+    """수소 저장소 변환 파라미터 -> (수전해 효율, 연료전지 효율, 저장 단위당 에너지)
+
+    HydrogenEnergyStorage(models)는 저장량이 수소 질량(kg)이므로 hydrogen_energy_density로 에너지로 바꾸고,
+    add_hydrogen_storage로 만든 일반 건물은 저장량 자체가 에너지(MWh)이다.
+    """
+    charge_efficiency = getattr(building, 'electrolysis_efficiency', building.hydrogen_efficiency)
+    discharge_efficiency = getattr(building, 'fuel_cell_efficiency', building.hydrogen_efficiency)
+    return charge_efficiency, discharge_efficiency, getattr(building, 'hydrogen_energy_density', 1.0)
+
+
+class HydrogenKernel(GeneratorKernel):
+    """그린수소 저장소 - 계통 잉여 시 수전해(충전), 부족 시 연료전지(방전)
+
+    다른 모든 발전 커널이 끝난 뒤 호출되어 이번 틱의 발전/수요(SystemBalance)를 기준으로 판단한다.
+    """
+
+    plant_type = "hydrogen"
+    capacity_attr = "hydrogen_storage"
+
+    def apply(self, fleet, active, power_system, region):
+        # 수급 합계와 저장소별 연결 발전량을 한 번만 계산한 뒤 저장소마다 증분 갱신
+        city = power_system.simulator.city
+        power_system.balance.compute(city.buildings, city.lines, watch=fleet)
+        if power_system.storage_scheduler is not None:
+            return  # 최적 운전 계획 사용 시 StorageScheduler.dispatch에서 처리
+        for building, on in zip(fleet, active.tolist()):
+            if on:
+                power_system.apply_hydrogen_storage(building)
+
+
+class GeneratorRegistry:
+    """발전소 유형별 커널 레지스트리
+
+    발전소 목록은 건물 리스트가 바뀔 때(또는 invalidate 호출 시)만 유형별로 다시 분류하고,
+    매 틱에는 유형당 커널 한 번 호출로 출력을 계산한다. 등록 순서가 적용 순서이다.
+    """
+
+    def __init__(self, kernels=None):
+        self.kernels = list(kernels) if kernels else []
+        self._fleets = [[] for _ in self.kernels]
+        self._key = None
+
+    @classmethod
+    def default(cls):
+        return cls([
+            DispatchableKernel("thermal"),
+            DispatchableKernel("nuclear"),
+            WindKernel(),
+            HydroKernel(),
+            SolarKernel(),
+            HydrogenKernel(),
+        ])
+
+    def register(self, kernel, before=None):
+        """커널 추가 (before: 이 plant_type 커널 앞에 삽입)"""
+        position = len(self.kernels)
+        if before is not None:
+            for i, k in enumerate(self.kernels):
+                if k.plant_type == before:
+                    position = i
+                    break
+        self.kernels.insert(position, kernel)
+        self.invalidate()
+
+    def unregister(self, plant_type):
+        """해당 plant_type 커널 제거"""
+        self.kernels = [k for k in self.kernels if k.plant_type != plant_type]
+        self.invalidate()
+
+    def get(self, plant_type):
+        for kernel in self.kernels:
+            if kernel.plant_type == plant_type:
+                return kernel
+        return None
+
+    def invalidate(self):
+        """발전 설비 구성(용량, 발전소 타입, 패널 설정 등)이 바뀌었을 때 호출"""
+        self._key = None
+
+    def fleets(self, buildings):
+        """유형별 발전소 목록 (건물 리스트가 바뀌었을 때만 다시 분류)"""
+        key = (id(buildings), len(buildings))
+        if self._key != key:
+            self._fleets = []
+            for kernel in self.kernels:
+                fleet = [b for b in buildings if kernel.matches(b)]
+                kernel.prepare(fleet)
+                self._fleets.append(fleet)
+            self._key = key
+        return self._fleets
+
+    def fleet(self, plant_type, buildings):
+        """해당 유형 발전소 목록"""
+        for kernel, fleet in zip(self.kernels, self.fleets(buildings)):
+            if kernel.plant_type == plant_type:
+                return fleet
+        return []
+
+    def apply(self, power_system, region):
+        """모든 유형 커널을 등록 순서대로 한 번씩 실행"""
+        fleets = self.fleets(power_system.simulator.city.buildings)
+        for kernel, fleet in zip(self.kernels, fleets):
+            if not fleet:
+                continue
+            active = np.fromiter((not b.removed for b in fleet), dtype=bool, count=len(fleet))
+            if active.any():
+                kernel.apply(fleet, active, power_system, region)
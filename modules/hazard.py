@@ -0,0 +1,139 @@
+import math
+from datetime import timedelta
+import numpy as np
+
+class HazardModel:
+    """날씨/부하 연동 설비 고장 모델 (송전선, 발전소)
+
+    - 설비별 고장률(시간당) = 기본 고장률 x 날씨 배수 x 부하 배수
+        송전선: 강풍(임계 풍속 초과분에 지수 증가), 눈(착빙), 비, 폭염(처짐)/한파, 사용률(과부하)
+        발전소: 폭염/한파(냉각, 동결), 풍력발전소는 강풍, 출력 대비 부하
+    - 날씨 배수는 모든 설비가 공유하므로 폭풍이 오면 고장이 한꺼번에 몰린다 (군집 정전)
+    - interval_minutes마다 전체 설비 고장을 난수 배열 한 번으로 추출: P(고장) = 1 - exp(-rate x dt)
+    - 고장 설비는 removed 처리하고 수리 시간(지수 분포) 후 자동 복구 (mean_repair_hours <= 0이면 외부 복구에 맡김)
+    """
+
+    WEATHER_LINE_FACTORS = {"비": 1.5, "눈": 4.0}
+    WEATHER_PLANT_FACTORS = {"눈": 1.5}
+
+    def __init__(self, simulator, interval_minutes=10, line_rate=1e-4, plant_rate=5e-5,
+                 wind_threshold=15.0, wind_slope=0.3, heat_threshold=30.0, cold_threshold=-10.0,
+                 overload_threshold=80.0, overload_slope=4.0, mean_repair_hours=4.0, seed=None):
+        self.simulator = simulator
+        self.interval_minutes = interval_minutes
+        self.line_rate = line_rate                  # 평상시 송전선 고장률 (시간당)
+        self.plant_rate = plant_rate                # 평상시 발전소 고장률 (시간당)
+        self.wind_threshold = wind_threshold        # 이 풍속(m/s) 초과분부터 고장률 지수 증가
+        self.wind_slope = wind_slope                # 풍속 1 m/s당 로그 고장률 증가
+        self.heat_threshold = heat_threshold
+        self.cold_threshold = cold_threshold
+        self.overload_threshold = overload_threshold  # 사용률(%) 초과분부터 고장률 증가
+        self.overload_slope = overload_slope
+        self.mean_repair_hours = mean_repair_hours  # 자동 복구까지 평균 시간 (0 이하면 자동 복구 안 함)
+        self.rng = np.random.default_rng(seed)
+        self.last_sample = None
+        self.failed_lines = {}       # 고장 송전선 -> 복구 예정 시각
+        self.failed_plants = {}      # 고장 발전소 건물 -> 복구 예정 시각
+        self.history = []            # (시각, 고장 송전선 수, 고장 발전소 수)
+
+    # ---------------- 고장률 ----------------
+    def weather_multipliers(self):
+        """(송전선 날씨 배수, 발전소 날씨 배수, 풍속 배수) - 모든 설비 공통"""
+        weather = self.simulator.weather_system
+        wind = math.exp(self.wind_slope * max(0.0, weather.wind_speed - self.wind_threshold))
+        temperature = weather.current_temperature
+        thermal = 1.0 + 0.1 * max(0.0, temperature - self.heat_threshold) + 0.1 * max(0.0, self.cold_threshold - temperature)
+        line = wind * thermal * self.WEATHER_LINE_FACTORS.get(weather.current_weather, 1.0)
+        plant = thermal * self.WEATHER_PLANT_FACTORS.get(weather.current_weather, 1.0)
+        return line, plant, wind
+
+    def line_rates(self, lines):
+        """송전선별 시간당 고장률 (이미 제거된 송전선은 0)"""
+        count = len(lines)
+        usage = np.fromiter((pl.usage_rate for pl in lines), dtype=float, count=count)
+        active = np.fromiter((not pl.removed for pl in lines), dtype=bool, count=count)
+        line_factor, _, _ = self.weather_multipliers()
+        # 임계 사용률에서 100%까지 1 -> 1 + overload_slope, 과부하 구간은 제곱으로 증가
+        overload = 1.0 + self.overload_slope * (np.maximum(usage - self.overload_threshold, 0.0) / (100.0 - self.overload_threshold)) ** 2
+        return np.where(active, self.line_rate * line_factor * overload, 0.0)
+
+    def plant_rates(self, plants):
+        """발전소별 시간당 고장률 (풍력발전소는 강풍 배수 추가 적용)"""
+        count = len(plants)
+        active = np.fromiter((not b.removed for b in plants), dtype=bool, count=count)
+        loading = np.fromiter((b.current_supply / b.base_supply if b.base_supply > 0 else 0.0 for b in plants),
+                              dtype=float, count=count)
+        wind_plant = np.fromiter((getattr(b, 'power_plant_type', None) == 'wind' for b in plants), dtype=bool, count=count)
+        _, plant_factor, wind_factor = self.weather_multipliers()
+        rates = self.plant_rate * plant_factor * (1.0 + np.maximum(loading - 1.0, 0.0))
+        rates = np.where(wind_plant, rates * wind_factor, rates)
+        return np.where(active, rates, 0.0)
+
+    def plants(self):
+        return [b for b in self.simulator.city.buildings if b.base_supply > 0]
+
+    # ---------------- 추출 ----------------
+    def sample(self, rates, dt_hours):
+        """설비 전체 고장 여부를 한 번에 추출 -> bool 배열"""
+        if len(rates) == 0 or dt_hours <= 0:
+            return np.zeros(len(rates), dtype=bool)
+        return self.rng.random(len(rates)) < -np.expm1(-rates * dt_hours)
+
+    def repair_time(self, now, count):
+        """고장 count건의 복구 예정 시각 목록 (자동 복구를 끄면 None)"""
+        if self.mean_repair_hours <= 0:
+            return [None] * count
+        return [now + timedelta(hours=h) for h in self.rng.exponential(self.mean_repair_hours, count).tolist()]
+
+    def is_due(self, now):
+        if self.last_sample is None or now < self.last_sample:
+            return True
+        return (now - self.last_sample).total_seconds() >= self.interval_minutes * 60
+
+    def step(self, now=None):
+        """마지막 추출 이후 경과 시간만큼 고장 추출 + 복구 처리 -> (새 고장 송전선, 새 고장 발전소)"""
+        now = now or self.simulator.simTime
+        if self.last_sample is None or now < self.last_sample:
+            self.last_sample = now
+            return [], []
+        dt_hours = (now - self.last_sample).total_seconds() / 3600.0
+        self.last_sample = now
+        self.restore(now)
+
+        city = self.simulator.city
+        lines = city.lines
+        failed = self.sample(self.line_rates(lines), dt_hours)
+        new_lines = [lines[i] for i in np.flatnonzero(failed).tolist()]
+        plants = self.plants()
+        failed = self.sample(self.plant_rates(plants), dt_hours)
+        new_plants = [plants[i] for i in np.flatnonzero(failed).tolist()]
+
+        self.add_line_failures(new_lines, now)
+        for b, until in zip(new_plants, self.repair_time(now, len(new_plants))):
+            b.removed = True
+            self.failed_plants[b] = until
+        if new_lines or new_plants:
+            self.history.append((now, len(new_lines), len(new_plants)))
+        return new_lines, new_plants
+
+    def add_line_failures(self, lines, now):
+        """송전선 고장 등록 (연쇄 고장으로 트립된 송전선도 같은 수리 시간 분포로 복구)"""
+        for pl, until in zip(lines, self.repair_time(now, len(lines))):
+            pl.removed = True
+            self.failed_lines[pl] = until
+
+    def reset(self):
+        """고장 목록 초기화 (시나리오 로드 시 이전 도시 설비 참조 제거)"""
+        self.failed_lines = {}
+        self.failed_plants = {}
+        self.last_sample = None
+
+    def restore(self, now):
+        """복구 예정 시각이 지난 고장 설비 복구 (다른 경로로 이미 복구되었거나 사용자가 삭제한 설비는 목록에서만 제거)"""
+        for failed in (self.failed_lines, self.failed_plants):
+            for component, until in list(failed.items()):
+                if not component.removed or component.deleted:
+                    del failed[component]
+                elif until is not None and until <= now:
+                    component.removed = False
+                    del failed[component]
@@ -0,0 +1,252 @@
+import copy
+import numpy as np
+from modules.multiperiod import MultiPeriodFlowSolver
+from modules.parallel import map_chunks
+
+class CityOverlay:
+    """도시 그래프의 copy-on-write 복제본
+
+    건물/송전선 리스트만 새로 만들고 객체는 원본과 공유한다.
+    후보 투자를 적용할 때 building()/line()으로 가져온 객체만 얕은 복사되어 교체되므로
+    원본 도시는 바뀌지 않고, 바뀌지 않은 대부분의 객체는 복사하지 않는다.
+    """
+
+    def __init__(self, city):
+        self.base = city
+        self.buildings = list(city.buildings)
+        self.lines = list(city.lines)
+        self.added_supply = {}        # 건물 idx -> 추가 발전량 (신규 발전소를 해당 노드 주입으로 근사)
+        self._copied_buildings = set()
+        self._copied_lines = set()
+        self._line_pos = None
+
+    def building(self, target):
+        """쓰기용 건물 (처음 접근할 때만 복사)"""
+        idx = target if isinstance(target, int) else target.idx
+        if idx not in self._copied_buildings:
+            self.buildings[idx] = copy.copy(self.buildings[idx])
+            self._copied_buildings.add(idx)
+        return self.buildings[idx]
+
+    def line(self, target):
+        """쓰기용 송전선 (원본 PowerLine 객체 또는 리스트 위치)"""
+        if isinstance(target, int):
+            pos = target
+        else:
+            if self._line_pos is None:
+                self._line_pos = {id(pl): i for i, pl in enumerate(self.base.lines)}
+            pos = self._line_pos[id(target)]
+        if pos not in self._copied_lines:
+            self.lines[pos] = copy.copy(self.lines[pos])
+            self._copied_lines.add(pos)
+        return self.lines[pos]
+
+
+class CityView:
+    """건물/송전선 리스트만 가진 도시 (작업 프로세스로 보내는 평가용 사본)"""
+
+    def __init__(self, city):
+        self.buildings = list(city.buildings)
+        self.lines = list(city.lines)
+
+
+class InvestmentEvaluator:
+    """후보 투자 묶음을 호라이즌 경제 급전으로 평가 -> 후보별 NPV/ROI/회수기간
+
+    - 후보 형식은 AI 업그레이드 패널 선택지와 같다: {"id", "cost", "target_data"}
+    - 후보마다 CityOverlay에 투자를 적용하고 hours 시간(step_hours 단위)의 다기간 경제 급전
+      (MultiPeriodFlowSolver) 한 번을 풀어 (미공급 손실 감소 + 저장 에너지 증가 - 발전 비용)을
+      투자 전 기준안과 비교해 연간 편익으로 환산한다 (틱 단위 시뮬레이션은 돌리지 않음).
+    - 시뮬레이터에 의존하는 값(날씨/수요 인자, 가격 예측, 발전 단가, 기준안)은 prepare()에서 한 번 계산한다.
+      workers > 1이면 시뮬레이터 참조를 뗀 평가기 사본과 위치 번호로 바꾼 후보 묶음을 작업 프로세스로 보낸다.
+    """
+
+    # 패널 선택지와 같은 투자 규모 (drawer_ui.handle_ai_option_select / algorithms 기준)
+    PRODUCER_SUPPLY = 15.0
+    NEW_SOLAR_CAPACITY = 5.0
+    SOLAR_UPGRADE_FACTOR = 1.5
+    NEW_BATTERY_CAPACITY = 10.0
+    BATTERY_UPGRADE = 5.0
+    SMART_GRID_LINE_FACTOR = 1.1
+
+    def __init__(self, simulator, hours=24, step_hours=3, discount_rate=0.05, lifetime_years=20, workers=1):
+        self.simulator = simulator
+        self.hours = hours
+        self.step_hours = step_hours
+        self.discount_rate = discount_rate
+        self.lifetime_years = lifetime_years
+        self.workers = workers
+        self.city = simulator.city
+        self.steps = max(1, -(-hours // step_hours))
+        self._solver = None
+        self._start = None
+        self._profile = None
+        self._prices = None
+        self._unit_cost = None
+        self._default_cost = None
+        self._baseline = None
+
+    def prepare(self):
+        """시뮬레이터 상태에서 평가 입력을 계산 (evaluate마다 한 번, 기준안은 baseline()이 처음 쓸 때 계산)"""
+        simulator = self.simulator
+        power_system = simulator.power_system
+        pricer = power_system.pricer
+        self.city = simulator.city
+        self._solver = MultiPeriodFlowSolver(power_system)
+        self._start = simulator.simTime
+        self._profile = self._solver.forecast_profile(self._start, self.steps, self.step_hours)
+        self._prices = np.asarray(self.price_forecast(self.steps), dtype=float)
+        self._unit_cost = np.array([pricer.marginal_cost(b) if b.base_supply > 0 else 0.0 for b in self.city.buildings])
+        self._default_cost = pricer.default_cost
+        self._baseline = None
+
+    def detached(self):
+        """prepare()된 평가기에서 시뮬레이터 참조를 뗀 사본 (작업 프로세스로 보낼 수 있음)"""
+        evaluator = copy.copy(self)
+        evaluator.simulator = None
+        evaluator.city = CityView(self.city)
+        evaluator._solver = self._solver.detached(evaluator.city)
+        return evaluator
+
+    def portable(self, candidate):
+        """대상 객체를 위치 번호(송전선 리스트 위치, 건물 idx)로 바꾼 후보 사본"""
+        line_pos = {id(pl): i for i, pl in enumerate(self.city.lines)}
+        target = dict(candidate.get("target_data") or {})
+        if target.get("line") is not None:
+            target["line"] = line_pos[id(target["line"])]
+        if target.get("lines") is not None:
+            target["lines"] = [line_pos[id(pl)] for pl in target["lines"] if pl is not None]
+        if target.get("building") is not None:
+            target["building"] = target["building"].idx
+        if target.get("buildings") is not None:
+            target["buildings"] = [b.idx for b in target["buildings"]]
+        return {"id": candidate.get("id"), "cost": candidate.get("cost", 0.0), "target_data": target}
+
+    # ---------------- 후보 적용 ----------------
+    def apply(self, overlay, candidate):
+        """후보 투자를 복제본에 적용 (모델링할 수 없는 후보면 False)"""
+        option_id = candidate.get("id")
+        target = candidate.get("target_data") or {}
+        city = overlay.base
+
+        def resolve(b):
+            return city.buildings[b] if isinstance(b, int) else b
+        if option_id in ("upgrade_line", "upgrade_multiple_lines"):
+            lines = target.get("lines") or [target.get("line")]
+            lines = [pl for pl in lines if pl is not None]
+            if not lines:
+                return False
+            for pl in lines:
+                line = overlay.line(pl)
+                line.capacity += max(2.0, line.capacity * 0.2)
+        elif option_id == "build_producer":
+            building = target.get("building")
+            if building is not None:
+                building = resolve(building)
+            else:
+                # 대상이 없으면 최대 수요 건물 인근
+                consumers = [b for b in city.buildings if not b.removed and b.base_supply < 0]
+                if not consumers:
+                    return False
+                building = min(consumers, key=lambda b: b.base_supply)
+            overlay.added_supply[building.idx] = overlay.added_supply.get(building.idx, 0.0) + self.PRODUCER_SUPPLY
+        elif option_id == "add_solar":
+            for b in map(resolve, target.get("buildings", [])):
+                if b.solar_capacity == 0:
+                    overlay.building(b).solar_capacity = self.NEW_SOLAR_CAPACITY
+        elif option_id == "upgrade_solar":
+            for b in map(resolve, target.get("buildings", [])):
+                if b.solar_capacity > 0:
+                    overlay.building(b).solar_capacity *= self.SOLAR_UPGRADE_FACTOR
+        elif option_id == "add_battery":
+            candidates = [b for b in city.buildings if not b.removed and getattr(b, 'battery_capacity', 0) == 0]
+            for b in sorted(candidates, key=lambda b: abs(b.base_supply), reverse=True)[:3]:
+                copied = overlay.building(b)
+                copied.battery_capacity = self.NEW_BATTERY_CAPACITY
+                copied.battery_charge = self.NEW_BATTERY_CAPACITY / 2
+        elif option_id == "upgrade_battery":
+            for b in map(resolve, target.get("buildings", [])):
+                if getattr(b, 'battery_capacity', 0) > 0:
+                    overlay.building(b).battery_capacity += self.BATTERY_UPGRADE
+        elif option_id == "smart_grid":
+            for pos, pl in enumerate(city.lines):
+                if not pl.removed:
+                    overlay.line(pos).capacity *= self.SMART_GRID_LINE_FACTOR
+        else:
+            return False
+        return True
+
+    # ---------------- 무화면 시뮬레이션 ----------------
+    def run(self, overlay):
+        """복제본에서 호라이즌 경제 급전 -> (공급 가치, 발전 비용) (원/kWh x MWh를 /1000 환산, prepare() 이후)"""
+        solver = self._solver.detached(overlay)
+        generation, demand = solver.nodes_from_profile(self._profile)
+        for idx, amount in overlay.added_supply.items():
+            generation[:, idx] += amount
+        unit_cost = self._unit_cost.copy()
+        # 신규 발전소는 발전소 유형을 알 수 없으므로 기본 단가
+        for idx in overlay.added_supply:
+            if overlay.buildings[idx].base_supply <= 0:
+                unit_cost[idx] = self._default_cost
+        result = solver.solve(self.steps, start=self._start, generation=generation, demand=demand,
+                              step_hours=self.step_hours, generation_cost=unit_cost)
+        prices = self._prices
+        # 공급 가치: 미공급 전력 손실(음수) + 호라이즌 동안 늘어난 저장 에너지 (자가소비 태양광은 수요 감소로 반영됨)
+        unserved_energy = result.unserved.sum(axis=1) * self.step_hours
+        stored = float((result.storage_level[-1] - result.storage_level[0]).sum())
+        value = (stored * float(prices.mean()) - float(np.dot(unserved_energy, prices))) / 1000.0
+        cost = float((result.generation * self.step_hours * unit_cost[None, :]).sum()) / 1000.0
+        return value, cost
+
+    def price_forecast(self, steps):
+        """스텝별 예상 전력 가격 (원/kWh)"""
+        economic_model = self.simulator.economic_model
+        if economic_model is None:
+            return [100.0] * steps
+        hourly = economic_model.price_forecast(self.simulator.simTime, steps * self.step_hours)
+        return [float(np.mean(hourly[s * self.step_hours:(s + 1) * self.step_hours])) for s in range(steps)]
+
+    def baseline(self):
+        """투자 전 기준안 (prepare 한 번에 한 번만 계산)"""
+        if self._baseline is None:
+            self._baseline = self.run(CityOverlay(self.city))
+        return self._baseline
+
+    def score(self, candidate):
+        """후보 하나 평가 -> 결과 dict (모델링 불가 후보는 npv/roi/payback None)"""
+        cost = float(candidate.get("cost", 0.0))
+        overlay = CityOverlay(self.city)
+        if not self.apply(overlay, candidate):
+            return {"id": candidate.get("id"), "cost": cost, "annual_benefit": None,
+                    "npv": None, "roi": None, "payback": None}
+        base_value, base_cost = self.baseline()
+        value, generation_cost = self.run(overlay)
+        horizon_benefit = (value - generation_cost) - (base_value - base_cost)
+        annual_benefit = horizon_benefit * 8760.0 / self.hours
+        r = self.discount_rate
+        if r > 0:
+            annuity = (1.0 - (1.0 + r) ** -self.lifetime_years) / r
+        else:
+            annuity = float(self.lifetime_years)
+        npv = annual_benefit * annuity - cost
+        roi = (annual_benefit / cost) * 100 if cost > 0 else 0.0
+        payback = cost / annual_benefit if annual_benefit > 0 else float('inf')
+        return {"id": candidate.get("id"), "cost": cost, "annual_benefit": annual_benefit,
+                "npv": npv, "roi": roi, "payback": payback}
+
+    def evaluate(self, candidates):
+        """후보 목록 평가 -> 후보 순서대로 결과 dict 목록"""
+        self.prepare()
+        chunks = min(self.workers, len(candidates))
+        if chunks <= 1:
+            return score_candidates(self, candidates)
+        self.baseline()   # 작업 프로세스마다 다시 풀지 않도록 사본을 만들기 전에 계산
+        portable = [self.portable(c) for c in candidates]
+        bounds = np.linspace(0, len(portable), chunks + 1).astype(int).tolist()
+        parts = map_chunks(score_candidates, self.detached(),
+                           [portable[start:end] for start, end in zip(bounds[:-1], bounds[1:])], self.workers)
+        return [score for part in parts for score in part]
+
+def score_candidates(evaluator, candidates):
+    """후보 묶음 평가 -> 결과 dict 목록 (evaluator: prepare()된 평가기 또는 그 detached() 사본)"""
+    return [evaluator.score(c) for c in candidates]
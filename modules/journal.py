@@ -0,0 +1,411 @@
+import copy
+import importlib
+import pickle
+import random
+import struct
+from contextlib import contextmanager
+import numpy as np
+
+# 저널 파일 형식: MAGIC 뒤에 [레코드 종류(1바이트), 길이(4바이트)] 헤더 + 본문이 이어 붙는다 (추가 전용)
+# 틱 본문은 고정 길이 struct, 나머지는 pickle (신뢰할 수 있는 저널 파일만 읽을 것)
+MAGIC = b"PGJ1"
+RECORD_HEADER = struct.Struct("<BI")
+TICK_BODY = struct.Struct("<ddB")     # (프레임 dt_ms, gameSpeed, 일시 정지 여부)
+
+HEADER = 1      # 세션 시작 (시뮬레이션 시각, 경제 모델 사용 여부 등)
+TICK = 2        # 한 프레임 진행
+SCENARIO = 3    # 시나리오 로드 (시나리오 데이터 전체)
+EDIT = 4        # 사용자 편집 (ContextMenu, DrawerUI) -> 속성 변경/추가 설비 목록
+EVENT = 5       # 이벤트 (어느 송전선/건물이 어떻게 바뀌었는지)
+RNG = 6         # 난수 상태 체크포인트
+
+# 흐름 계산이 다시 만드는 값 (편집 기록에서 제외, 재실행 시 흐름 갱신으로 복원)
+DERIVED_ATTRIBUTES = {"flow", "usage_rate", "blackout", "shortage", "transmitted_power"}
+
+# 편집 기록으로 재생성할 수 있는 설비 클래스 모듈
+FACTORY_MODULES = ("city", "models")
+
+_MISSING = object()
+
+
+def _plain(value):
+    """저널에 그대로 저장할 수 있는 값인지 (수치/문자열/None, 또는 그 리스트/튜플/dict)"""
+    if value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        return True
+    if isinstance(value, (list, tuple)):
+        return all(_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _plain(item) for key, item in value.items())
+    return False
+
+
+def plain_state(obj, exclude=()):
+    """객체 속성 중 저장 가능한 값만 복사 -> dict"""
+    return {key: copy.deepcopy(value) for key, value in vars(obj).items()
+            if key not in exclude and _plain(value)}
+
+
+def read_journal(path):
+    """저널 파일의 레코드를 순서대로 읽음 -> (종류, 본문) 생성기 (끝이 잘린 레코드는 무시)"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"이벤트 저널 파일이 아닙니다: {path}")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            kind, length = RECORD_HEADER.unpack(header)
+            body = f.read(length)
+            if len(body) < length:
+                return
+            if kind == TICK:
+                yield kind, TICK_BODY.unpack(body)
+            else:
+                yield kind, pickle.loads(body)
+
+
+class EventJournal:
+    """추가 전용 이벤트 저널 (결정적 재실행용)
+
+    - 틱(프레임 dt, gameSpeed, 일시 정지), 시나리오 로드, 사용자 편집, 이벤트, 난수 체크포인트를 순서대로 기록
+    - 시뮬레이션 난수는 UI(파티클 등)와 분리된 전용 random 상태로 돌린다:
+      틱/시나리오 로드 동안만 전용 상태로 바꿔 끼우므로 화면 쪽 난수 소비가 재실행 결과에 영향을 주지 않는다
+    - 사용자 편집은 편집 전후 도시 스냅샷의 차이(바뀐 속성, 새로 추가된 건물/송전선)로 기록한다
+    - checkpoint_interval 틱마다 random/numpy 난수 상태를 남겨 재실행이 갈라진 지점을 찾는다
+    - path가 None이면 파일 없이 메모리(records)에만 남긴다 (재실행 비교용, 틱은 개수만 셈)
+    """
+
+    def __init__(self, simulator, path=None, checkpoint_interval=1000):
+        self.simulator = simulator
+        self.path = path
+        self.checkpoint_interval = checkpoint_interval
+        self.records = []               # 메모리 저널 레코드 (틱 제외)
+        self.tick_index = 0
+        self._file = None
+        if path is not None:
+            self._file = open(path, "ab")
+            if self._file.tell() == 0:
+                self._file.write(MAGIC)
+        self._random_state = random.getstate()   # 시뮬레이션 전용 random 상태
+        self._outer_state = None
+        self._depth = 0
+        self._pending = None            # 진행 중 편집 (출처, 동작, 후처리, 편집 전 스냅샷)
+        self.write(HEADER, {"time": simulator.simTime, "game_speed": simulator.gameSpeed,
+                            "economic_model": simulator.economic_model is not None,
+                            "event_count": simulator.event_count, "settings": self.settings()})
+        self.checkpoint()
+
+    # ---------------- 기록 ----------------
+    def write(self, kind, payload):
+        if self._file is None:
+            if kind != TICK:
+                self.records.append((kind, payload))
+            return
+        body = TICK_BODY.pack(*payload) if kind == TICK else pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file.write(RECORD_HEADER.pack(kind, len(body)))
+        self._file.write(body)
+        if kind != TICK:
+            self._file.flush()
+
+    def close(self):
+        self.commit_edit()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def settings(self):
+        """재실행에 필요한 이벤트/고장/복구 설정 (발생률, 고장률, 수리반 등 - 기록 목록은 제외)"""
+        event_system = self.simulator.event_system
+        return {"event_system": plain_state(event_system, ("event_history", "cascade_history")),
+                "hazard": plain_state(event_system.hazard, ("history",)),
+                "restoration": plain_state(event_system.restoration)}
+
+    # ---------------- 난수 ----------------
+    def rng_sources(self):
+        """시뮬레이션이 쓰는 numpy 난수 발생기 {이름: Generator}"""
+        simulator = self.simulator
+        return {"hazard": simulator.event_system.hazard.rng,
+                "restoration": simulator.event_system.restoration.rng,
+                "wind": simulator.weather_system.wind_model.rng}
+
+    def rng_state(self):
+        """(시뮬레이션 random 상태, numpy 발생기 상태 dict)"""
+        random_state = random.getstate() if self._depth else self._random_state
+        return random_state, {name: rng.bit_generator.state for name, rng in self.rng_sources().items()}
+
+    def restore_rng(self, random_state, numpy_states):
+        if self._depth:
+            random.setstate(random_state)
+        else:
+            self._random_state = random_state
+        for name, rng in self.rng_sources().items():
+            if name in numpy_states:
+                rng.bit_generator.state = numpy_states[name]
+
+    def checkpoint(self):
+        random_state, numpy_states = self.rng_state()
+        self.write(RNG, {"tick": self.tick_index, "random": random_state, "numpy": numpy_states})
+
+    @contextmanager
+    def isolated(self):
+        """블록 안에서만 시뮬레이션 전용 random 상태 사용"""
+        if self._depth == 0:
+            self._outer_state = random.getstate()
+            random.setstate(self._random_state)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self._random_state = random.getstate()
+                random.setstate(self._outer_state)
+
+    # ---------------- 틱 / 시나리오 ----------------
+    @contextmanager
+    def tick(self, dt_ms):
+        """한 프레임 기록 (진행 중 편집은 틱 직전까지의 변경을 먼저 확정)"""
+        if self._pending is not None:
+            source, action, effects, _ = self._pending
+            self.commit_edit()
+            self.begin_edit(source, action, effects)
+        simulator = self.simulator
+        self.write(TICK, (float(dt_ms), float(simulator.gameSpeed), int(bool(simulator.is_paused))))
+        with self.isolated():
+            yield
+        self.tick_index += 1
+        if self.checkpoint_interval and self.tick_index % self.checkpoint_interval == 0:
+            self.checkpoint()
+
+    @contextmanager
+    def scenario(self, scenario_data):
+        """시나리오 로드 기록 (로드 중 난수도 시뮬레이션 전용 상태 사용, 로드 후 체크포인트)"""
+        self.commit_edit()
+        self.write(SCENARIO, {"tick": self.tick_index, "time": self.simulator.simTime, "data": scenario_data})
+        with self.isolated():
+            yield
+        self.checkpoint()
+
+    # ---------------- 이벤트 ----------------
+    def locate(self, component):
+        """설비 -> ("building", idx) 또는 ("line", city.lines 위치) - 현재 도시에 없는 설비는 위치 None"""
+        if hasattr(component, 'u'):
+            lines = self.simulator.city.lines
+            return "line", next((i for i, pl in enumerate(lines) if pl is component), None)
+        buildings = self.simulator.city.buildings
+        idx = component.idx
+        return "building", idx if idx < len(buildings) and buildings[idx] is component else None
+
+    def event(self, event_type, time, changes):
+        """이벤트 기록 (changes: [(설비, {속성: 바뀐 값})])"""
+        self.write(EVENT, {"tick": self.tick_index, "time": time, "type": event_type,
+                           "changes": [self.locate(component) + (copy.deepcopy(attrs),) for component, attrs in changes]})
+
+    # ---------------- 사용자 편집 ----------------
+    def snapshot(self):
+        city = self.simulator.city
+        return {"simulator": plain_state(self.simulator),
+                "buildings": [plain_state(b, DERIVED_ATTRIBUTES) for b in city.buildings],
+                "lines": [plain_state(pl, DERIVED_ATTRIBUTES) for pl in city.lines]}
+
+    @staticmethod
+    def diff(before, after):
+        """두 스냅샷 차이 -> 편집 연산 목록
+        ("set", 종류, 위치, {속성: 값}) / ("add", 종류, 클래스 경로, 속성 dict)"""
+        ops = []
+        changed = {k: v for k, v in after["simulator"].items() if before["simulator"].get(k, _MISSING) != v}
+        if changed:
+            ops.append(("set", "simulator", None, changed))
+        for kind in ("buildings", "lines"):
+            old, new = before[kind], after[kind]
+            for i, state in enumerate(new[:len(old)]):
+                changed = {k: v for k, v in state.items() if old[i].get(k, _MISSING) != v}
+                if changed:
+                    ops.append(("set", kind, i, changed))
+        return ops
+
+    def begin_edit(self, source, action, effects=()):
+        """편집 시작 (여러 프레임에 걸친 편집은 틱마다 중간 확정)"""
+        self.commit_edit()
+        self._pending = (source, action, tuple(effects), self.snapshot())
+
+    def commit_edit(self):
+        """진행 중 편집 확정 -> 변경이 있으면 EDIT 레코드 기록"""
+        if self._pending is None:
+            return None
+        source, action, effects, before = self._pending
+        self._pending = None
+        city = self.simulator.city
+        ops = self.diff(before, self.snapshot())
+        for kind, objects in (("buildings", city.buildings), ("lines", city.lines)):
+            for obj in objects[len(before[kind]):]:
+                cls = type(obj)
+                ops.append(("add", kind, f"{cls.__module__}.{cls.__qualname__}", plain_state(obj, DERIVED_ATTRIBUTES)))
+        if not ops and not effects:
+            return None
+        record = {"tick": self.tick_index, "time": self.simulator.simTime, "source": source,
+                  "action": action, "ops": ops, "effects": list(effects)}
+        self.write(EDIT, record)
+        return record
+
+    @contextmanager
+    def capture(self, source, action, effects=()):
+        """with 블록 안의 사용자 편집을 기록"""
+        self.begin_edit(source, action, effects)
+        try:
+            yield
+        finally:
+            self.commit_edit()
+
+
+def apply_edit(simulator, record):
+    """EDIT 레코드를 시뮬레이터에 적용 (속성 반영/설비 추가 -> 후처리 -> 발전소 재분류, 흐름 갱신)"""
+    city = simulator.city
+    for op, kind, where, attrs in record["ops"]:
+        if op == "add":
+            module_name, _, class_name = where.rpartition(".")
+            if module_name not in FACTORY_MODULES:
+                raise ValueError(f"재생성할 수 없는 설비 클래스: {where}")
+            cls = getattr(importlib.import_module(module_name), class_name)
+            obj = cls.__new__(cls)
+            obj.__dict__.update(copy.deepcopy(attrs))
+            getattr(city, kind).append(obj)
+            if kind == "buildings":
+                city.n = len(city.buildings)
+        elif kind == "simulator":
+            simulator.__dict__.update(copy.deepcopy(attrs))
+        else:
+            getattr(city, kind)[where].__dict__.update(copy.deepcopy(attrs))
+    if "restoration_reset" in record["effects"]:
+        simulator.event_system.restoration.reset()
+    simulator.power_system.invalidate_fleets()
+    simulator.update_flow(instant=True)
+
+
+class ReplayResult:
+    """저널 재실행 결과"""
+
+    def __init__(self, simulator, ticks, found_tick=None, found_time=None, divergence=None):
+        self.simulator = simulator          # 재실행을 마친(또는 멈춘) 시뮬레이터
+        self.ticks = ticks                  # 실행한 틱 수
+        self.found_tick = found_tick        # 조건을 처음 만족한 틱 (없으면 None)
+        self.found_time = found_time
+        self.divergence = divergence        # 기록과 처음 어긋난 지점 (틱, 설명) - 없으면 None
+
+    @property
+    def deterministic(self):
+        return self.divergence is None
+
+    def to_dict(self):
+        return {"ticks": self.ticks, "found_tick": self.found_tick,
+                "found_time": self.found_time.isoformat() if self.found_time else None,
+                "divergence": self.divergence}
+
+
+class JournalReplayer:
+    """이벤트 저널 무화면 재실행
+
+    - 새 Simulator(필요하면 EconomicModel 포함)를 만들고 저널 레코드를 순서대로 다시 실행한다:
+      틱은 기록된 dt/gameSpeed로 Simulator.step, 편집은 스냅샷 차이를 그대로 적용, 시나리오는 다시 로드
+    - 렌더링과 프레임 대기 없이 돌기 때문에 기록 시간보다 훨씬 빠르다
+    - 재실행 쪽 이벤트와 난수 체크포인트를 기록과 비교해 처음 어긋난 지점을 보고한다
+      (체크포인트에서는 기록된 난수 상태로 다시 맞춘다)
+    - scenario를 주면 저널의 첫 시나리오 대신 그 시나리오로 재실행 (같은 입력을 바뀐 계통에 적용)
+    """
+
+    def __init__(self, path, scenario=None, session=-1):
+        self.path = path
+        self.scenario = scenario
+        self.session = session
+
+    def sessions(self):
+        """HEADER 단위로 나눈 레코드 목록"""
+        sessions = []
+        for kind, payload in read_journal(self.path):
+            if kind == HEADER:
+                sessions.append([])
+            if sessions:
+                sessions[-1].append((kind, payload))
+        return sessions
+
+    def make_simulator(self, header):
+        from modules.simulator import Simulator
+        from modules.economics import EconomicModel
+        simulator = Simulator()
+        simulator.simTime = header["time"]
+        simulator.gameSpeed = header["game_speed"]
+        simulator.event_count = header.get("event_count", 0)
+        if header.get("economic_model"):
+            simulator.set_economic_model(EconomicModel(simulator))
+        settings = header.get("settings", {})
+        event_system = simulator.event_system
+        for name, target in (("event_system", event_system), ("hazard", event_system.hazard),
+                             ("restoration", event_system.restoration)):
+            target.__dict__.update(copy.deepcopy(settings.get(name, {})))
+        return simulator
+
+    def run(self, stop=None, until_tick=None):
+        """저널 재실행 -> ReplayResult
+
+        stop(simulator): 틱마다 확인하는 조건 (처음 True가 되면 멈춤), until_tick: 이 틱 수까지만 실행
+        """
+        records = self.sessions()[self.session]
+        simulator = self.make_simulator(records[0][1])
+        # 재실행 쪽 이벤트를 메모리 저널로 모아 기록과 비교 (난수 분리도 기록 때와 같게)
+        journal = simulator.start_journal(None, checkpoint_interval=0)
+        expected_events = []
+        actual_events = []
+        divergence = None
+        synced = False
+        ticks = 0
+        scenario = self.scenario
+        for kind, payload in records[1:]:
+            if kind == TICK:
+                if until_tick is not None and ticks >= until_tick:
+                    break
+                dt_ms, simulator.gameSpeed, paused = payload
+                simulator.is_paused = bool(paused)
+                simulator.step(dt_ms)
+                ticks += 1
+            elif kind == SCENARIO:
+                simulator.simTime = payload["time"]
+                simulator.load_scenario(scenario if scenario is not None else payload["data"])
+                scenario = None
+            elif kind == EDIT:
+                apply_edit(simulator, payload)
+            elif kind == EVENT:
+                expected_events.append(payload)
+            elif kind == RNG:
+                # 첫 체크포인트는 시작 상태 맞추기, 이후는 어긋남 확인 후 다시 맞춤
+                if synced and divergence is None and journal.rng_state() != (payload["random"], payload["numpy"]):
+                    divergence = (ticks, "난수 상태 불일치")
+                journal.restore_rng(payload["random"], payload["numpy"])
+                synced = True
+
+            # 재실행된 이벤트를 기록된 이벤트와 순서대로 비교
+            actual_events.extend(record for record_kind, record in journal.records if record_kind == EVENT)
+            journal.records.clear()
+            while expected_events and actual_events:
+                expected, actual = expected_events.pop(0), actual_events.pop(0)
+                if divergence is None and (expected["type"], expected["time"], expected["changes"]) != \
+                        (actual["type"], actual["time"], actual["changes"]):
+                    divergence = (ticks, f"이벤트 불일치: 기록 {expected['type']}, 재실행 {actual['type']}")
+            if kind == TICK and stop is not None and stop(simulator):
+                simulator.stop_journal()
+                return ReplayResult(simulator, ticks, ticks, simulator.simTime, divergence)
+        simulator.stop_journal()
+        if divergence is None and (expected_events or actual_events):
+            divergence = (ticks, f"짝이 맞지 않는 이벤트 (기록 {len(expected_events)}건, 재실행 {len(actual_events)}건)")
+        return ReplayResult(simulator, ticks, divergence=divergence)
+
+    def first_blackout(self, baseline=None):
+        """정전 건물 수가 baseline을 처음 넘는 틱 찾기 (baseline None이면 첫 틱 정전 수 기준)"""
+        state = {"baseline": baseline}
+
+        def stop(simulator):
+            count = simulator.power_system.blackout_count
+            if state["baseline"] is None:
+                state["baseline"] = count
+                return False
+            return count > state["baseline"]
+        return self.run(stop=stop)
@@ -0,0 +1,182 @@
+import bisect
+import numpy as np
+from modules.generators import GeneratorKernel
+from modules.pricing import NodalPricer
+
+class _FenwickTree:
+    """구간 합 트리 (점 갱신 / 접두 합 / 접두 합 기준 탐색 모두 O(log n))"""
+
+    def __init__(self, values):
+        self.size = len(values)
+        self.tree = [0.0] * (self.size + 1)
+        for i, value in enumerate(values):
+            self.tree[i + 1] += value
+            parent = (i + 1) + ((i + 1) & -(i + 1))
+            if parent <= self.size:
+                self.tree[parent] += self.tree[i + 1]
+
+    def add(self, position, delta):
+        i = position + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, count):
+        """앞쪽 count개 합"""
+        total = 0.0
+        i = count
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+    def search(self, target):
+        """접두 합이 target 미만인 가장 긴 접두 길이 (= target을 채우는 마지막 원소 위치)"""
+        position = 0
+        remaining = target
+        step = 1 << self.size.bit_length()
+        while step:
+            nxt = position + step
+            if nxt <= self.size and self.tree[nxt] < remaining:
+                position = nxt
+                remaining -= self.tree[nxt]
+            step >>= 1
+        return position
+
+
+class MeritOrderMarket:
+    """한계 비용 순(merit order) 전력 시장 청산
+
+    - 발전소를 한계 비용(발전 원가 + 탄소 비용) 순으로 정렬해 두고, 공급 가능량은 구간 합 트리로 관리
+    - 청산: 잔여 수요를 채우는 한계 발전소를 트리 탐색(이진 탐색 + 접두 합)으로 찾음
+    - 발전소 공급 가능량이 바뀌면 해당 위치만 점 갱신, 발전소 구성이 바뀔 때만 다시 정렬
+    - interval_minutes(기본 15분)마다 공급 가능량을 갱신해 청산하고, 매 틱 흐름 계산 전에 급전 목표 적용
+    """
+
+    def __init__(self, power_system, interval_minutes=15, reserve_margin=0.2):
+        self.power_system = power_system
+        self.interval_minutes = interval_minutes
+        self.reserve_margin = reserve_margin        # 송전 제약 대비 예비율 (잔여 수요 대비)
+        self.plants = []                            # 한계 비용 순 발전소
+        self.costs = []                             # 정렬된 한계 비용
+        self.capacity = []                          # 위치별 현재 공급 가능량
+        self.position = {}                          # 건물 idx -> 정렬 위치
+        self._tree = _FenwickTree([])
+        self.last_clear = None
+        self.clearing_price = 0.0
+        self.cleared_demand = 0.0
+        self.marginal_position = -1                 # 부분 급전 발전소 위치 (-1: 전체 급전)
+        self.marginal_target = 0.0                  # 한계 발전소 급전 목표
+
+    def cost_tables(self):
+        """(발전 원가, 탄소 배출계수, 탄소 가격) - 경제 모델이 있으면 그 값을 사용"""
+        economic_model = self.power_system.simulator.economic_model
+        if economic_model is not None:
+            return economic_model.generation_cost, economic_model.carbon_emissions, economic_model.carbon_price
+        pricer = self.power_system.pricer
+        return pricer.generation_cost, {"coal": 0.9, "gas": 0.4}, 30.0
+
+    def marginal_cost(self, building):
+        """발전소 한계 비용 (원/kWh) = 발전 원가 + 배출계수 x 탄소 가격"""
+        generation_cost, emissions, carbon_price = self.cost_tables()
+        key = NodalPricer.PLANT_COST_KEYS.get(getattr(building, 'power_plant_type', None), "gas")
+        return generation_cost.get(key, self.power_system.pricer.default_cost) + emissions.get(key, 0.0) * carbon_price
+
+    def rebuild(self, plants):
+        """발전소 구성이 바뀌었을 때 한계 비용 순으로 다시 정렬"""
+        ranked = sorted(((self.marginal_cost(b), b.idx, b) for b in plants), key=lambda item: item[:2])
+        self.costs = [cost for cost, _, _ in ranked]
+        self.plants = [b for _, _, b in ranked]
+        self.position = {b.idx: i for i, b in enumerate(self.plants)}
+        self.capacity = [0.0] * len(self.plants)
+        self._tree = _FenwickTree(self.capacity)
+        self.last_clear = None
+
+    def update_capacity(self, building, available):
+        """발전소 하나의 공급 가능량 변경 (점 갱신)"""
+        position = self.position[building.idx]
+        delta = available - self.capacity[position]
+        if delta:
+            self.capacity[position] = available
+            self._tree.add(position, delta)
+
+    def supply_at(self, price):
+        """가격 price 이하로 공급 가능한 총량 (공급 곡선)"""
+        return self._tree.prefix(bisect.bisect_right(self.costs, price))
+
+    def clear(self, demand):
+        """수요 demand 청산 -> 청산 가격 (한계 발전소의 한계 비용)"""
+        self.cleared_demand = demand
+        count = len(self.plants)
+        if count == 0:
+            self.clearing_price = 0.0
+            self.marginal_position = -1
+            return self.clearing_price
+        supply = self._tree.prefix(count)
+        if demand >= supply:
+            # 공급 부족: 전 발전소 급전, 가격은 실제로 공급하는 발전소 중 가장 비싼 것 (용량 0인 발전소 제외)
+            self.marginal_position = -1
+            self.clearing_price = self.costs[self._tree.search(supply)] if supply > 0 else self.costs[-1]
+            return self.clearing_price
+        position = self._tree.search(demand)
+        self.marginal_position = position
+        self.marginal_target = demand - self._tree.prefix(position)
+        self.clearing_price = self.costs[position]
+        return self.clearing_price
+
+    def dispatch(self, fleet, active, now):
+        """interval마다 공급 곡선을 갱신해 청산하고, 매 틱 급전 목표 적용 (흐름 계산 전 current_supply 제한)
+
+        청산 사이에는 갱신된 공급 곡선 위에서 현재 잔여 수요만 다시 찾아(O(log n)) 부하 변동을 따라간다.
+        """
+        elapsed = None if self.last_clear is None else (now - self.last_clear).total_seconds()
+        if elapsed is None or not 0 <= elapsed < self.interval_minutes * 60:
+            self.refresh_capacity(fleet, active)
+            self.last_clear = now
+        self.clear(self.residual_demand())
+        marginal = self.marginal_position
+        if marginal < 0:
+            return
+        for b, on in zip(fleet, active.tolist()):
+            if not on:
+                continue
+            position = self.position[b.idx]
+            if position > marginal:
+                b.current_supply = 0.0
+            elif position == marginal:
+                b.current_supply = min(b.current_supply, self.marginal_target)
+
+    def refresh_capacity(self, fleet, active):
+        """발전소 공급 가능량 갱신 (바뀐 발전소만 점 갱신)"""
+        available = np.fromiter((b.current_supply for b in fleet), dtype=float, count=len(fleet))
+        available = np.where(active, np.maximum(available, 0.0), 0.0)
+        for b, value in zip(fleet, available.tolist()):
+            self.update_capacity(b, value)
+
+    def residual_demand(self):
+        """시장 밖 건물(수요, 프로슈머)의 순수요 x (1 + 예비율) - 수소 저장소 제외"""
+        members = self.position
+        net = 0.0
+        for b in self.power_system.simulator.city.buildings:
+            if b.removed or b.idx in members or getattr(b, 'power_plant_type', None) == 'hydrogen':
+                continue
+            net += b.current_supply
+        return max(-net, 0.0) * (1.0 + self.reserve_margin)
+
+
+class MarketKernel(GeneratorKernel):
+    """발전 커널 레지스트리에 끼워 넣는 시장 급전 단계 (발전 커널 이후, 수소 저장소 이전)"""
+
+    plant_type = "market"
+
+    def __init__(self, market):
+        self.market = market
+
+    def matches(self, building):
+        return building.base_supply > 0 and getattr(building, 'power_plant_type', None) != 'hydrogen'
+
+    def prepare(self, fleet):
+        self.market.rebuild(fleet)
+
+    def apply(self, fleet, active, power_system, region):
+        self.market.dispatch(fleet, active, power_system.simulator.simTime)
@@ -0,0 +1,311 @@
+import copy
+import numpy as np
+from datetime import timedelta
+from modules.flow import FlowNetwork, min_cost_flow
+from modules.generators import hydrogen_parameters
+
+class MultiPeriodResult:
+    """다기간 유량 계산 결과 (배열은 모두 시간 스텝이 첫 번째 축)"""
+
+    def __init__(self, start, hours, line_index, storage_buildings, step_hours=1):
+        self.start = start
+        self.hours = hours                            # 스텝 수
+        self.step_hours = step_hours                  # 스텝 길이 (시간)
+        self.line_index = line_index                  # 결과 열 -> PowerLine
+        self.storage_buildings = storage_buildings    # 결과 열 -> 저장장치 건물
+        self.line_flows = np.zeros((hours, len(line_index)))         # u->v 순 흐름
+        self.served = None                                             # (T, N) 건물별 공급받은 전력
+        self.generation = None                                         # (T, N) 건물별 실제 발전(급전)량
+        self.unserved = None                                           # (T, N) 건물별 부족 전력
+        self.storage_charge = np.zeros((hours, len(storage_buildings)))
+        self.storage_discharge = np.zeros((hours, len(storage_buildings)))
+        self.storage_level = np.zeros((hours + 1, len(storage_buildings)))  # 스텝 시작 시점 저장량
+        self.storage_losses = np.zeros(len(storage_buildings))
+        self.total_served = 0.0                                        # 호라이즌 전체 공급 에너지 (MWh)
+        self.total_cost = 0.0
+        self.potentials = None                                         # (T, N) 노드 한계 비용 (inf: 추가 공급 불가)
+
+
+class MultiPeriodFlowSolver:
+    """시간 확장(time-expanded) 그래프 위의 다기간 전력 흐름 계산
+
+    T개 스텝마다 도시 그래프를 한 벌씩 복사하고, 저장장치는 스텝 사이를 잇는 저장 간선으로 연결한다.
+        슈퍼소스 -> (건물, t): 발전량            (건물, t) -> 슈퍼싱크: 수요
+        (u, t) <-> (v, t): 송전선 용량, 비용 = 송전선 cost
+        (건물, t) -> (저장, t): 충전 한도     (저장, t) -> (건물, t): 방전 한도
+        (저장, t) -> (저장, t+1): 저장 용량, 비용 = 보유 비용
+        슈퍼소스 -> (저장, 0): 초기 저장량      (저장, T-1) -> 슈퍼싱크: 기말 저장량
+    최소비용 최대유량 한 번으로 하루치 송전선 흐름과 저장장치 궤적을 함께 얻는다.
+    step_hours > 1이면 여러 시간을 한 스텝으로 묶어(간선 용량 = 전력 x 스텝 길이) 그래프 크기를 줄인다.
+    결과의 흐름/공급/충방전은 스텝 평균 전력(MW), 저장량은 에너지(MWh).
+    기말 저장 간선은 어떤 공급 경로보다 비싸게 두어 수요를 먼저 채우고 남는 에너지만 저장에 남긴다
+    (초기 저장량이 항상 저장 간선을 따라 흐르므로 저장 간선 유량이 곧 저장량이 된다).
+    네트워크 유량은 에너지를 보존하므로 왕복 효율은 두 가지로 반영한다.
+        - 방전 간선 비용 (손실분 x loss_price): 불필요한 충방전을 피하게 하는 가격 신호
+        - 물리 손실: 방전 d를 내보내면 저장량이 d / 왕복 효율만큼 줄어든다. 해를 이 규칙으로 재생해서
+          저장량이 모자라면 방전 간선 용량을 그 해의 충전으로 낼 수 있는 만큼으로 줄이고 다시 푼다 (최대 loss_iterations번).
+          결과의 storage_level/storage_discharge는 손실을 뺀 실제 값이고, 다시 푼 해가 충전을 줄여 그래도 모자란
+          방전은 저장 건물의 부족 전력으로 계상한다 (손실이 있는 순환은 보존 유량으로 정확히 풀 수 없음).
+    규모: 노드 T x (N + 저장장치 수), 최단경로 단계 수는 서로 다른 경로 비용 수에 비례해 T x N보다 빠르게 늘어난다.
+    큰 도시나 긴 호라이즌은 step_hours로 스텝을 묶어 T를 줄인다.
+    """
+
+    def __init__(self, power_system, loss_price=10.0, holding_cost=1e-3,
+                 battery_power_ratio=0.25, hydrogen_power_ratio=0.1, city=None, loss_iterations=1):
+        self.power_system = power_system
+        self.simulator = power_system.simulator
+        self.city = city or self.simulator.city   # 다른 도시 뷰(투자 평가용 복제본 등)로 계산할 때 지정
+        self.battery_efficiency = power_system.battery_fleet.efficiency
+        self.loss_price = loss_price
+        self.holding_cost = holding_cost
+        self.battery_power_ratio = battery_power_ratio
+        self.hydrogen_power_ratio = hydrogen_power_ratio
+        self.loss_iterations = loss_iterations    # 물리 손실 때문에 방전 한도를 줄여 다시 푸는 최대 횟수
+
+    def storage_units(self):
+        """저장장치 목록 -> [(건물, 용량(MWh), 초기 저장량(MWh), 시간당 한도, 왕복 효율)]"""
+        units = []
+        for b in self.city.buildings:
+            if b.removed:
+                continue
+            if getattr(b, 'battery_capacity', 0) > 0:
+                efficiency = getattr(b, 'battery_efficiency', self.battery_efficiency)
+                units.append((b, b.battery_capacity, min(b.battery_charge, b.battery_capacity),
+                              b.battery_capacity * self.battery_power_ratio, efficiency * efficiency))
+            elif getattr(b, 'hydrogen_storage', 0) > 0:
+                # 질량(kg) 저장소는 에너지(MWh)로 환산해 배터리와 같은 단위로 계산
+                charge_eff, discharge_eff, energy_density = hydrogen_parameters(b)
+                capacity = b.hydrogen_storage * energy_density
+                rate = getattr(b, 'max_charge_rate', capacity * self.hydrogen_power_ratio)
+                units.append((b, capacity, min(b.hydrogen_level, b.hydrogen_storage) * energy_density, rate,
+                              charge_eff * discharge_eff))
+        return units
+
+    def detached(self, city):
+        """city 뷰만 가진 복사본 (시뮬레이터 참조 없음 -> 작업 프로세스로 보낼 수 있음)
+
+        forecast_nodes는 쓸 수 없으므로 forecast_profile 결과를 nodes_from_profile에 넘기고 solve에 start를 준다.
+        """
+        solver = copy.copy(self)
+        solver.power_system = None
+        solver.simulator = None
+        solver.city = city
+        return solver
+
+    def forecast_profile(self, start, hours, step_hours=1):
+        """건물과 무관한 예측 인자 -> (현재 태양광 인자, 스텝별 태양광 인자 (T,), 스텝별 유형 수요 인자 (T, 유형 수))
+
+        태양광 인자는 설비 1MW당 출력 (태양 고도, 현재 구름량 유지), 수요 인자는 수요 인자 테이블 값.
+        step_hours > 1이면 각 스텝 중간 시각의 값을 쓴다.
+        """
+        simulator = self.simulator
+        power_system = self.power_system
+        weather = simulator.weather_system
+        if power_system.demand_table is None:
+            power_system.build_demand_table()
+        table = power_system.demand_table
+
+        region_info = weather.get_region_info(simulator.region)
+        lat = region_info.get("lat", 37.5665)
+        lon = region_info.get("lon", 126.9780)
+
+        def solar_factor(t):
+            altitude, _ = weather.get_sun_position(t, lat, lon)
+            return weather.compute_solar_radiation(altitude, weather.cloud_factor, 30, 180) * weather.solar_efficiency
+
+        solar_now = solar_factor(simulator.simTime)
+        solar = np.zeros(hours)
+        type_count = table.tensor.shape[0] if table is not None else 0
+        demand = np.zeros((hours, type_count))
+        for h in range(hours):
+            t = start + timedelta(hours=(h + 0.5) * step_hours if step_hours > 1 else h)
+            solar[h] = solar_factor(t)
+            if table is not None:
+                demand[h] = table.factors(np.arange(type_count), t)
+        return solar_now, solar, demand
+
+    def forecast_nodes(self, start, hours, step_hours=1):
+        """건물별 스텝별 발전량/수요 예측 (MW) -> (generation (T, N), demand (T, N))
+
+        수요는 수요 인자 테이블, 태양광은 태양 고도(현재 구름량 유지), 그 외 발전은 현재값 유지.
+        """
+        return self.nodes_from_profile(self.forecast_profile(start, hours, step_hours))
+
+    def nodes_from_profile(self, profile):
+        """forecast_profile 인자와 city 건물 상태 -> (generation (T, N), demand (T, N))"""
+        solar_now, solar_steps, type_factors = profile
+        buildings = self.city.buildings
+        n = len(buildings)
+        hours = len(solar_steps)
+
+        active = np.array([not b.removed for b in buildings], dtype=bool)
+        base = np.array([b.base_supply for b in buildings], dtype=float)
+        consumer = active & (base <= 0)
+        codes = np.array([b.type_code for b in buildings], dtype=np.intp)
+        solar_capacity = np.array([b.solar_capacity for b in buildings], dtype=float) * active
+        is_storage = np.array([getattr(b, 'power_plant_type', None) == 'hydrogen' for b in buildings], dtype=bool)
+        producer = active & (base > 0) & ~is_storage
+
+        # 현재 태양광 기여분을 뺀 발전소 출력은 그대로 유지된다고 가정
+        current = np.array([b.current_supply for b in buildings], dtype=float)
+        steady = np.where(producer, np.maximum(current - solar_capacity * solar_now, 0.0), 0.0)
+
+        generation = np.zeros((hours, n))
+        demand = np.zeros((hours, n))
+        for h in range(hours):
+            solar = solar_capacity * solar_steps[h]
+            load = np.zeros(n)
+            if type_factors.shape[1]:
+                load[consumer] = -base[consumer] * type_factors[h, codes[consumer]]
+            # 수요 건물의 지붕 태양광은 자기 수요를 먼저 상쇄
+            net = load - np.where(consumer, solar, 0.0)
+            demand[h] = np.maximum(net, 0.0)
+            generation[h] = steady + np.where(producer, solar, 0.0) + np.maximum(-net, 0.0)
+        return generation, demand
+
+    def solve(self, hours=24, start=None, generation=None, demand=None, step_hours=1, generation_cost=None):
+        """hours 스텝 다기간 유량 계산
+
+        generation/demand (T, N, MW)를 주지 않으면 forecast_nodes 사용.
+        generation_cost (N,)를 주면 발전 간선에 건물별 발전 단가를 더해 경제 급전으로 푼다.
+        """
+        city = self.city
+        buildings = city.buildings
+        n = len(buildings)
+        if start is None:
+            start = self.simulator.simTime
+        if generation is None or demand is None:
+            generation, demand = self.forecast_nodes(start, hours, step_hours)
+        # 이하 간선 용량은 스텝당 에너지 (MW x step_hours)
+        generation = np.asarray(generation, dtype=float) * step_hours
+        demand = np.asarray(demand, dtype=float) * step_hours
+
+        lines = [pl for pl in city.lines
+                 if not pl.removed and not buildings[pl.u].removed and not buildings[pl.v].removed]
+        units = self.storage_units()
+        storage_count = len(units)
+        result = MultiPeriodResult(start, hours, lines, [u[0] for u in units], step_hours)
+
+        # 노드 번호: (건물, t) = t*n + i, (저장, t) = T*n + t*S + s, 슈퍼소스/싱크는 마지막 두 개
+        building_nodes = hours * n
+        source = building_nodes + hours * storage_count
+        sink = source + 1
+        network = FlowNetwork(sink + 1, edge_hint=hours * (n + 2 * len(lines) + 3 * storage_count))
+        steps = np.arange(hours)
+
+        # 발전: 슈퍼소스 -> (발전 건물, t), 송전선 총용량으로 제한 (단일 시점 계산과 동일)
+        line_capacity = np.zeros(n)
+        for pl in lines:
+            line_capacity[pl.u] += pl.capacity
+            line_capacity[pl.v] += pl.capacity
+        supply = np.minimum(generation, line_capacity[None, :] * step_hours)
+        t_idx, b_idx = np.nonzero(supply > 0)
+        # 발전 간선 비용을 호라이즌 전체 보유 비용보다 크게 둬서 초기 저장량이 먼저 저장 간선을 채우게 함
+        base_cost = self.holding_cost * (hours + 1)
+        unit_cost = np.zeros(n) if generation_cost is None else np.asarray(generation_cost, dtype=float)
+        generation_edges = network.add_edges(np.full(len(t_idx), source), t_idx * n + b_idx,
+                                             supply[t_idx, b_idx], base_cost + unit_cost[b_idx])
+        generation_pos = (t_idx, b_idx)
+
+        # 수요: (수요 건물, t) -> 슈퍼싱크
+        t_idx, b_idx = np.nonzero(demand > 0)
+        demand_edges = network.add_edges(t_idx * n + b_idx, np.full(len(t_idx), sink), demand[t_idx, b_idx], 0.0)
+        demand_pos = (t_idx, b_idx)
+
+        # 송전선 (양방향, 스텝마다 복사)
+        line_edges = None
+        if lines:
+            u = np.array([pl.u for pl in lines])
+            v = np.array([pl.v for pl in lines])
+            cap = np.array([pl.capacity for pl in lines], dtype=float)
+            cost = np.array([pl.cost for pl in lines], dtype=float)
+            offset = (steps[:, None] * n)
+            cap = np.tile(cap * step_hours, hours)
+            cost = np.tile(cost, hours)
+            forward = network.add_edges((offset + u).ravel(), (offset + v).ravel(), cap, cost)
+            backward = network.add_edges((offset + v).ravel(), (offset + u).ravel(), cap, cost)
+            line_edges = (forward.reshape(hours, -1), backward.reshape(hours, -1))
+
+        # 저장장치
+        storage_edges = None
+        if storage_count:
+            idx = np.array([u[0].idx for u in units])
+            capacity = np.array([u[1] for u in units], dtype=float)
+            level0 = np.array([u[2] for u in units], dtype=float)
+            rate = np.array([u[3] for u in units], dtype=float) * step_hours
+            round_trip = np.array([u[4] for u in units], dtype=float)
+            store = building_nodes + steps[:, None] * storage_count + np.arange(storage_count)[None, :]   # (T, S)
+            grid = steps[:, None] * n + idx[None, :]                                                    # (T, S)
+            loss_cost = self.loss_price * (1.0 - round_trip)
+            charge = network.add_edges(grid.ravel(), store.ravel(), np.tile(rate, hours), 0.0)
+            discharge = network.add_edges(store.ravel(), grid.ravel(), np.tile(rate, hours), np.tile(loss_cost, hours))
+            carry = network.add_edges(store[:-1].ravel(), store[1:].ravel(), np.tile(capacity, hours - 1), self.holding_cost)
+            initial = network.add_edges(np.full(storage_count, source), store[0], level0, 0.0)
+            # 기말 저장 비용 > 가장 비싼 공급 경로 비용 (송전선 비용 합 + 방전 손실 + 보유 비용)
+            terminal_cost = sum(pl.cost for pl in lines) + self.loss_price + 2 * base_cost + unit_cost.max(initial=0.0) + 1.0
+            terminal = network.add_edges(store[-1], np.full(storage_count, sink), capacity, terminal_cost)
+            storage_edges = (charge.reshape(hours, -1), discharge.reshape(hours, -1),
+                             carry.reshape(max(hours - 1, 0), storage_count), initial, terminal, terminal_cost, round_trip)
+
+        network.finalize()
+        for attempt in range(self.loss_iterations + 1):
+            _, total_cost, flow, potential = min_cost_flow(network, source, sink)
+            if storage_edges is None:
+                break
+            charge, discharge, _, initial = storage_edges[:4]
+            _, deliverable = replay_storage(flow[initial], flow[charge], flow[discharge], storage_edges[6])
+            over = flow[discharge] > deliverable + 1e-9
+            if not over.any() or attempt == self.loss_iterations:
+                break
+            # 모자란 스텝만 줄이면 방전이 한 스텝씩 뒤로 밀리므로 모든 스텝을 이번 해의 충전으로 낼 수 있는 만큼으로 제한
+            network.capacity[discharge] = np.minimum(network.capacity[discharge], deliverable)
+        result.total_served = float(flow[demand_edges].sum())
+        result.total_cost = total_cost
+        result.potentials = potential[:building_nodes].reshape(hours, n)
+
+        served = np.zeros((hours, n))
+        served[demand_pos] = flow[demand_edges]
+        result.served = served / step_hours
+        result.unserved = np.maximum(demand - served, 0.0) / step_hours
+        dispatched = np.zeros((hours, n))
+        dispatched[generation_pos] = flow[generation_edges]
+        result.generation = dispatched / step_hours
+        if line_edges is not None:
+            result.line_flows = (flow[line_edges[0]] - flow[line_edges[1]]) / step_hours
+        if storage_edges is not None:
+            charge, discharge, carry, initial, terminal, terminal_cost, round_trip = storage_edges
+            result.total_cost -= terminal_cost * float(flow[terminal].sum())
+            level, deliverable = replay_storage(flow[initial], flow[charge], flow[discharge], round_trip)
+            delivered = np.minimum(flow[discharge], deliverable)
+            # 재계산 횟수 안에 맞추지 못한 방전은 저장 건물에서 모자란 것으로 계상
+            shortfall = flow[discharge] - delivered
+            if shortfall.any():
+                result.unserved[:, idx] += shortfall / step_hours
+                result.total_served -= float(shortfall.sum())
+            result.storage_charge = flow[charge] / step_hours
+            result.storage_discharge = delivered / step_hours
+            result.storage_level = level
+            result.storage_losses = delivered.sum(axis=0) * (1.0 / np.maximum(round_trip, 1e-9) - 1.0)
+        return result
+
+    def apply_first_step(self, result):
+        """첫 스텝의 송전선 흐름을 실제 송전선에 반영 (화면 표시용)"""
+        for column, pl in enumerate(result.line_index):
+            pl.flow = float(result.line_flows[0, column])
+            pl.usage_rate = abs(pl.flow) / pl.capacity * 100 if pl.capacity > 0 else 0
+
+
+def replay_storage(level0, charge, discharge, round_trip):
+    """스텝별 충방전 에너지 (T, S)를 물리 손실로 재생 -> (저장량 (T+1, S), 스텝별 낼 수 있는 방전 (T, S))
+
+    같은 스텝 안에서는 충전 후 방전, 방전 d는 저장량을 d / 왕복 효율만큼 줄인다.
+    """
+    round_trip = np.maximum(round_trip, 1e-9)
+    level = np.zeros((len(charge) + 1, len(level0)))
+    level[0] = level0
+    deliverable = np.zeros_like(charge)
+    for t in range(len(charge)):
+        available = level[t] + charge[t]
+        deliverable[t] = available * round_trip
+        level[t + 1] = np.maximum(available - np.minimum(discharge[t], deliverable[t]) / round_trip, 0.0)
+    return level, deliverable
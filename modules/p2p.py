@@ -0,0 +1,219 @@
+import heapq
+import numpy as np
+from modules.generators import GeneratorKernel
+
+class OrderBook:
+    """가격-시간 우선 호가창 (매수: 최대 힙, 매도: 최소 힙)
+
+    - 호가는 (가격, 접수 순번, 수량, 건물 idx), 같은 가격이면 먼저 낸 호가가 우선
+    - 한 번에 모은 호가는 heapify로 O(n) 구성, 체결은 체결/잔량 갱신마다 O(log n)
+      -> 구간 전체 청산 O((매수 + 매도) log n)
+    - 체결 가격은 매수/매도 호가의 중간값 (지역 거래 이익을 양쪽이 나눔)
+    """
+
+    def __init__(self):
+        self._bids = []     # (-가격, 순번, 수량, 건물 idx)
+        self._asks = []     # (가격, 순번, 수량, 건물 idx)
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._bids) + len(self._asks)
+
+    def clear(self):
+        self._bids = []
+        self._asks = []
+        self._seq = 0
+
+    def add_bid(self, idx, quantity, price):
+        heapq.heappush(self._bids, (-price, self._seq, quantity, idx))
+        self._seq += 1
+
+    def add_ask(self, idx, quantity, price):
+        heapq.heappush(self._asks, (price, self._seq, quantity, idx))
+        self._seq += 1
+
+    def load(self, bids, asks):
+        """호가 일괄 등록 (bids/asks: (건물 idx, 수량, 가격) 목록, 목록 순서가 접수 순서)"""
+        seq = self._seq
+        self._bids.extend((-price, seq + i, quantity, idx) for i, (idx, quantity, price) in enumerate(bids))
+        seq += len(bids)
+        self._asks.extend((price, seq + i, quantity, idx) for i, (idx, quantity, price) in enumerate(asks))
+        self._seq = seq + len(asks)
+        heapq.heapify(self._bids)
+        heapq.heapify(self._asks)
+
+    def best_bid(self):
+        return -self._bids[0][0] if self._bids else None
+
+    def best_ask(self):
+        return self._asks[0][0] if self._asks else None
+
+    def match(self):
+        """교차하는 호가를 모두 체결 -> [(매수 idx, 매도 idx, 수량, 가격)] (미체결 잔량은 호가창에 남음)"""
+        bids, asks = self._bids, self._asks
+        trades = []
+        while bids and asks and -bids[0][0] >= asks[0][0]:
+            neg_bid, bid_seq, bid_quantity, buyer = bids[0]
+            ask_price, ask_seq, ask_quantity, seller = asks[0]
+            price = (ask_price - neg_bid) * 0.5
+            quantity = min(bid_quantity, ask_quantity)
+            trades.append((buyer, seller, quantity, price))
+            if bid_quantity > quantity:
+                heapq.heapreplace(bids, (neg_bid, bid_seq, bid_quantity - quantity, buyer))
+            else:
+                heapq.heappop(bids)
+            if ask_quantity > quantity:
+                heapq.heapreplace(asks, (ask_price, ask_seq, ask_quantity - quantity, seller))
+            else:
+                heapq.heappop(asks)
+        return trades
+
+
+class P2PMarket:
+    """프로슈머 간 지역 전력 거래 시장
+
+    - interval_minutes(기본 15분)마다 프로슈머(태양광/배터리 보유)가 순발전량으로 호가를 냄
+        잉여(순발전 > 0) 또는 방전 가능한 배터리 -> 매도, 부족(순발전 < 0) -> 매수
+    - 호가 가격은 건물 노드 가격(없으면 도시 전력 가격) 기준 [1 - spread, 1] 구간
+        매도: 배터리가 찰수록 저장할 곳이 없으므로 낮게, 매수: 배터리가 찰수록 자가 공급 가능하므로 낮게
+    - 체결된 거래는 매 틱 흐름 계산 전 주입으로 반영: 매도자의 현재 잉여보다 많이 판 만큼 배터리 방전
+    """
+
+    def __init__(self, power_system, interval_minutes=15, spread=0.2, min_quantity=1e-3):
+        self.power_system = power_system
+        self.interval_minutes = interval_minutes
+        self.spread = spread
+        self.min_quantity = min_quantity
+        self.book = OrderBook()
+        self.members = []
+        self.position = {}                 # 건물 idx -> members 위치
+        self.sold = np.empty(0)            # members 순 이번 구간 체결 매도량 (MW)
+        self.bought = np.empty(0)          # members 순 이번 구간 체결 매수량 (MW)
+        self.trades = []                   # 이번 구간 체결 목록 (매수 idx, 매도 idx, 수량, 가격)
+        self.last_clear = None
+        self.volume = 0.0                  # 이번 구간 체결량 (MW)
+        self.average_price = 0.0           # 이번 구간 체결량 가중 평균 가격 (원/kWh)
+        self.injected = 0.0                # 마지막 틱 배터리 방전 주입량 (MW)
+
+    @staticmethod
+    def is_member(building):
+        return building.is_prosumer and (building.solar_capacity > 0 or getattr(building, 'battery_capacity', 0) > 0)
+
+    def rebuild(self, members):
+        """프로슈머 구성이 바뀌었을 때 회원 배열 재구성"""
+        self.members = list(members)
+        self.position = {b.idx: i for i, b in enumerate(self.members)}
+        self.capacity = np.array([getattr(b, 'battery_capacity', 0.0) for b in self.members], dtype=float)
+        self.round_trip = np.array([getattr(b, 'battery_efficiency', self.power_system.battery_fleet.efficiency)
+                                    for b in self.members], dtype=float)
+        self.sold = np.zeros(len(self.members))
+        self.bought = np.zeros(len(self.members))
+        self.trades = []
+        self.last_clear = None
+
+    def reference_prices(self):
+        """회원별 기준 가격 (원/kWh) - 노드 가격이 계산돼 있으면 노드 가격"""
+        economic_model = self.power_system.simulator.economic_model
+        if economic_model is None:
+            return np.full(len(self.members), self.power_system.pricer.default_cost)
+        idx = np.fromiter((b.idx for b in self.members), dtype=np.intp, count=len(self.members))
+        nodal = economic_model.nodal_prices
+        if len(nodal) > (idx.max() if len(idx) else -1):
+            return nodal[idx]
+        return np.full(len(self.members), economic_model.current_electricity_price)
+
+    def collect_orders(self, active):
+        """현재 순발전량/배터리 상태로 호가 목록 생성 -> (bids, asks)"""
+        count = len(self.members)
+        members = self.members
+        supply = np.fromiter((b.current_supply for b in members), dtype=float, count=count)
+        charge = np.fromiter((getattr(b, 'battery_charge', 0.0) for b in members), dtype=float, count=count)
+        soc = np.divide(charge, self.capacity, out=np.zeros(count), where=self.capacity > 0)
+        # 배터리에서 한 틱에 낼 수 있는 양 (BatteryFleet 충전 속도와 같은 한도)
+        dischargeable = np.minimum(charge, self.capacity * self.power_system.battery_fleet.charge_rate) * self.round_trip
+
+        price = self.reference_prices()
+        ask_quantity = np.where(active, np.maximum(supply, 0.0) + dischargeable, 0.0)
+        bid_quantity = np.where(active & (supply < 0), -supply, 0.0)
+        ask_quantity = np.where(bid_quantity > 0, 0.0, ask_quantity)
+        ask_price = price * (1.0 - self.spread * (0.5 + 0.5 * soc))
+        bid_price = price * (1.0 - self.spread * soc)
+
+        idx = [b.idx for b in members]
+        sellers = np.flatnonzero(ask_quantity > self.min_quantity).tolist()
+        buyers = np.flatnonzero(bid_quantity > self.min_quantity).tolist()
+        asks = list(zip([idx[i] for i in sellers], ask_quantity[sellers].tolist(), ask_price[sellers].tolist()))
+        bids = list(zip([idx[i] for i in buyers], bid_quantity[buyers].tolist(), bid_price[buyers].tolist()))
+        return bids, asks
+
+    def clear(self, active):
+        """호가 수집 후 체결 -> 체결 목록"""
+        bids, asks = self.collect_orders(active)
+        self.book.clear()
+        self.book.load(bids, asks)
+        self.trades = self.book.match()
+
+        self.sold = np.zeros(len(self.members))
+        self.bought = np.zeros(len(self.members))
+        if self.trades:
+            buyers, sellers, quantity, price = zip(*self.trades)
+            quantity = np.array(quantity)
+            position = self.position
+            np.add.at(self.sold, [position[i] for i in sellers], quantity)
+            np.add.at(self.bought, [position[i] for i in buyers], quantity)
+            self.volume = float(quantity.sum())
+            self.average_price = float(np.dot(quantity, price) / self.volume)
+        else:
+            self.volume = 0.0
+            self.average_price = 0.0
+        self.settle()
+        return self.trades
+
+    def settle(self):
+        """체결 대금 기록 (경제 모델이 있을 때, 거래량 MW x 가격)"""
+        economic_model = self.power_system.simulator.economic_model
+        if economic_model is None or not self.trades:
+            return
+        economic_model.transactions.append(self.power_system.simulator.simTime, type="p2p",
+                                           amount=self.volume, price=self.average_price,
+                                           revenue=self.volume * self.average_price / 1000)
+
+    def dispatch(self, active, now):
+        """interval마다 청산하고, 매 틱 매도자의 부족분을 배터리 방전으로 주입"""
+        elapsed = None if self.last_clear is None else (now - self.last_clear).total_seconds()
+        if elapsed is None or not 0 <= elapsed < self.interval_minutes * 60:
+            self.clear(active)
+            self.last_clear = now
+        self.injected = 0.0
+        sellers = np.flatnonzero(active & (self.sold > 0))
+        if len(sellers) == 0:
+            return
+        members = self.members
+        for i in sellers.tolist():
+            b = members[i]
+            shortfall = self.sold[i] - max(b.current_supply, 0.0)
+            if shortfall <= 0 or getattr(b, 'battery_charge', 0.0) <= 0:
+                continue
+            # 이미 틱 배터리 한도 안에서 호가를 냈으므로 남은 충전량만 확인
+            discharge = min(shortfall / self.round_trip[i], b.battery_charge)
+            b.battery_charge -= discharge
+            b.current_supply += discharge * self.round_trip[i]
+            self.injected += discharge * self.round_trip[i]
+
+
+class P2PKernel(GeneratorKernel):
+    """발전 커널 레지스트리에 끼워 넣는 프로슈머 거래 단계 (태양광/프로슈머 충전 이후, 시장 급전 이전)"""
+
+    plant_type = "p2p"
+
+    def __init__(self, market):
+        self.market = market
+
+    def matches(self, building):
+        return P2PMarket.is_member(building)
+
+    def prepare(self, fleet):
+        self.market.rebuild(fleet)
+
+    def apply(self, fleet, active, power_system, region):
+        self.market.dispatch(active, power_system.simulator.simTime)
@@ -0,0 +1,13 @@
+import multiprocessing
+
+def map_chunks(function, context, chunks, workers=1):
+    """function(context, chunk)를 묶음마다 실행 -> 묶음 순서대로 결과 목록
+
+    workers <= 1이면 현재 프로세스에서 차례로 실행한다. 그보다 크면 spawn 방식 프로세스 풀에서 실행하므로
+    context와 chunk, function은 pickle 가능해야 한다 (fork를 쓰지 않으므로 화면(SDL)이나 스레드 상태를 물려받지 않음).
+    """
+    chunks = list(chunks)
+    if workers <= 1 or len(chunks) <= 1:
+        return [function(context, chunk) for chunk in chunks]
+    with multiprocessing.get_context("spawn").Pool(min(workers, len(chunks))) as pool:
+        return pool.starmap(function, [(context, chunk) for chunk in chunks])
@@ -1,10 +1,35 @@
 import random
 from collections import deque
 import math
+import numpy as np
+from data import default_building_type_code
+from modules.demand import DemandFactorTable
+from modules.generators import GeneratorRegistry
+from modules.battery import BatteryFleet
+from modules.balance import SystemBalance
+from modules.storage import StorageScheduler
+from modules.multiperiod import MultiPeriodFlowSolver
+from modules.pricing import NodalPricer
+from modules.market import MeritOrderMarket, MarketKernel
+from modules.p2p import P2PMarket, P2PKernel
+from modules.cascade import CascadeEngine
+from modules.reliability import ReliabilityEstimator
 
 class PowerSystem:
+    # 스마트 그리드 피크 시간대 (수요 감축)
+    SMART_GRID_PEAK_HOURS = (9, 10, 11, 17, 18, 19, 20)
+    
     def __init__(self, simulator):
         self.simulator = simulator
+        self.demand_table = None  # 건물 유형 x 요일 x 시간 수요 인자 테이블
+        self.generators = GeneratorRegistry.default()  # 발전소 유형별 배치 출력 커널
+        self.battery_fleet = BatteryFleet()  # 배터리 충방전 배열 엔진
+        self.balance = SystemBalance()  # 틱 단위 수급 누산기 (저장소 배치용)
+        self.storage_scheduler = None  # 롤링 호라이즌 저장장치 운전 계획 (없으면 시간대 규칙 운전)
+        self.pricer = NodalPricer(self)  # 최소비용 급전 쌍대변수 기반 노드 가격
+        self.market = None  # 한계 비용 순 시장 청산 (없으면 모든 발전소가 가능 출력 전부 공급)
+        self.p2p = None  # 프로슈머 간 지역 전력 거래 (없으면 자가 소비/충전만)
+        self.cascade = CascadeEngine(self)  # 송전선 연쇄 고장 (직전 흐름에서 이어서 재계산)
         self.total_supplied = 0
         self.total_demanded = 0
         self.total_flow = 0
@@ -24,322 +49,216 @@ class PowerSystem:
         """수요 패턴 적용 - 건물별 전력 수요 계산"""
         # 패턴에서 기본 수요 인자 계산
         hour = self.simulator.simTime.hour
-        wday = self.simulator.simTime.weekday()
         month = self.simulator.simTime.month
-        mday = self.simulator.simTime.day
         
         pattern = self.simulator.pattern
         
         # 패턴이 없으면 기본값 설정
         if not pattern:
             return
-            
-        # 시간대, 요일, 계절별 인자
-        hour_factor = pattern["daily_pattern"][hour]
-        weekday_factor = pattern["weekly_pattern"][wday]
-        seasonal_factor = pattern["seasonal_pattern"][month-1]
-        
-        # 휴일 인자 확인
-        holiday_factor = 1.0
-        for holiday in pattern.get("holiday_list", []):
-            if holiday["month"] == month and holiday["day"] == mday:
-                holiday_factor = pattern.get("holiday_factor", 1.3)
-                break
         
-        # 기본 수요 인자
-        base_factor = hour_factor * weekday_factor * seasonal_factor * holiday_factor
+        # 수요 인자 테이블은 시나리오(패턴)가 바뀔 때만 다시 구성
+        if self.demand_table is None or self.demand_table.pattern is not pattern:
+            self.build_demand_table()
         
         # 날씨 시스템에서 환경 정보 가져오기
         weather = self.simulator.weather_system
         
+        # 수요 건물 전체의 수요를 한 번에 계산
+        consumer_demands = self.compute_consumer_demands(weather, hour, month)
+        
+        # 1. 기본 발전/수요 계산
         for building in self.simulator.city.buildings:
             if building.removed:
                 continue
-                
-            # 1. 기본 발전/수요 계산
             if building.base_supply <= 0:  # 수요 건물 (상가 포함)
-                # 기본 수요
-                base_demand = abs(building.base_supply)
-                
-                # 환경 인자 적용 (온도, 습도, 미세먼지)
-                temp_factor = weather.get_temperature_demand_factor(building)
-                humidity_factor = weather.get_humidity_demand_factor(building, month)
-                pm_factor = weather.get_pm_demand_factor(building)
-                
-                # 패턴 및 환경 요인 통합 인자
-                total_factor = base_factor * temp_factor * humidity_factor * pm_factor
-                
-                # 건물 유형별 시간대 별도 처리
-                if hasattr(building, "building_type"):
-                    hour = self.simulator.simTime.hour
-                    is_weekend = wday >= 5  # 5(토), 6(일)
-                    
-                    # 데이터에서 유형별 패턴 가져오기
-                    from data import building_type_factors
-                    if building.building_type in building_type_factors:
-                        type_data = building_type_factors[building.building_type]
-                        
-                        # 주중/주말, 주간/야간 구분
-                        is_night = hour < 6 or hour >= 20
-                        
-                        if is_weekend and is_night:
-                            type_factor = type_data["weekend_night_factor"]
-                        elif is_weekend:
-                            type_factor = type_data["weekend_day_factor"]
-                        elif is_night:
-                            type_factor = type_data["weekday_night_factor"]
-                        else:
-                            type_factor = type_data["weekday_day_factor"]
-                        
-                        # 건물 유형별 인자 적용
-                        total_factor *= type_factor
-                
-                # 최종 수요 계산
-                new_demand = -base_demand * total_factor
-                
-                # 스마트 그리드 연결된 건물은 피크 시간에 수요 감소
-                if hasattr(building, "smart_grid_connected") and building.smart_grid_connected:
-                    peak_hours = [9, 10, 11, 17, 18, 19, 20]
-                    if hour in peak_hours:
-                        new_demand *= 0.85  # 피크 시간 15% 감소
-                
-                building.current_supply = new_demand
-            
-            # 2. 발전소인 경우 처리
-            elif building.base_supply > 0:
-                # 기본 발전량 설정
+                building.current_supply = consumer_demands[building.idx]
+            else:  # 발전소는 기본 발전량
                 building.current_supply = building.base_supply
+        
+        # 2. 발전소 유형별 배치 커널 (화력/원자력 -> 풍력 -> 수력 -> 태양광 -> [시장 급전] -> 수소 순)
+        self.generators.apply(self, region)
+        
+        # 3. 저장장치 최적 운전 계획 실행 (스마트 그리드 배터리, 수소 저장소)
+        if self.storage_scheduler is not None:
+            self.storage_scheduler.dispatch()
+    
+    def apply_hydrogen_storage(self, building):
+        """그린수소 에너지 저장소 처리 - 잉여 시 수소 생산, 부족 시 연료전지 발전
+        
+        전체 발전량/수요량과 연결 발전소 발전량은 self.balance(틱 단위 누산기)에서 읽는다.
+        """
+        balance = self.balance
+        
+        # 연결된 발전소가 있을 때만 작동
+        connected_count = balance.connected_plant_count(building.idx)
+        if not connected_count:
+            return
+        
+        # 연결된 발전소들의 발전량, 전체 시스템의 발전량과 수요량
+        connected_generation = balance.connected_generation(building.idx)
+        total_generation = balance.generation
+        total_demand = balance.demand
+        
+        # HydrogenEnergyStorage 클래스의 메서드 사용 가능 여부 확인
+        if hasattr(building, 'charge') and hasattr(building, 'discharge'):
+            print(f"[DEBUG] 수소저장소 {building.idx}: 연결된 발전소 {connected_count}개, 발전량={total_generation:.1f}, 수요량={total_demand:.1f}")
             
-            # 2-1. 풍력발전소 처리
-            if building.wind_capacity > 0 or (hasattr(building, 'power_plant_type') and building.power_plant_type == 'wind'):
-                # WindPowerPlant 클래스의 메서드 사용 가능 여부 확인
-                if hasattr(building, 'calculate_output'):
-                    wind_speed = weather.wind_speed if hasattr(weather, 'wind_speed') else 7.0  # 기본 풍속 7m/s
-                    wind_output = building.calculate_output(wind_speed)
-                else:
-                    # 기존 로직 유지
-                    wind_speed = weather.wind_speed if hasattr(weather, 'wind_speed') else 5.0  # m/s
-                    if wind_speed < 3:
-                        wind_output = 0
-                    elif wind_speed > 25:
-                        wind_output = 0  # 과풍속 정지
-                    else:
-                        rated_wind = 12  # 정격 풍속 12m/s
-                        wind_factor = min((wind_speed / rated_wind) ** 3, 1.0)
-                        wind_output = building.wind_capacity * wind_factor
-                building.current_supply += wind_output
-            
-            # 2-2. 수력발전소 처리
-            if building.hydro_capacity > 0 or (hasattr(building, 'power_plant_type') and building.power_plant_type == 'hydro'):
-                # HydroPowerPlant 클래스의 메서드 사용 가능 여부 확인
-                if hasattr(building, 'calculate_output'):
-                    # 계절별 수위 변동 계산
-                    month = self.simulator.simTime.month
-                    if month in [6, 7, 8]:  # 여름 (장마철)
-                        water_level_factor = 1.2
-                    elif month in [12, 1, 2]:  # 겨울 (갈수기)
-                        water_level_factor = 0.7
-                    else:
-                        water_level_factor = 1.0
-                    hydro_output = building.calculate_output(water_level_factor)
-                else:
-                    # 기존 로직 유지
-                    month = self.simulator.simTime.month
-                    if month in [6, 7, 8]:  # 여름 (장마철)
-                        hydro_factor = 1.2
-                    elif month in [12, 1, 2]:  # 겨울 (갈수기)
-                        hydro_factor = 0.7
-                    else:
-                        hydro_factor = 1.0
-                    hydro_output = building.hydro_capacity * hydro_factor
-                building.current_supply = hydro_output  # 수력은 base_supply를 덮어씀
+            # 잉여 전력이 있을 때 수소 생산 (충전)
+            if total_generation > total_demand * 1.1 and connected_generation > 0:  # 10% 이상 잉여
+                surplus_power = min((total_generation - total_demand) * 0.5, connected_generation * 0.8)  # 연결된 발전소 용량의 80%까지만
+                power_consumed = building.charge(surplus_power, duration=1.0)
+                balance.set_supply(building, -power_consumed)  # 수소 생산에 사용한 전력 (수요로 계산)
+                print(f"[DEBUG] 수소 생산: 잉여전력={surplus_power:.1f}, 소비전력={power_consumed:.1f}")
             
-            # 3. 태양광 발전량 추가 계산
-            if building.solar_capacity > 0 or (hasattr(building, 'power_plant_type') and building.power_plant_type == 'solar'):
-                # SolarPowerPlant 클래스의 메서드 사용 가능 여부 확인
-                if hasattr(building, 'calculate_output') and hasattr(building, 'power_plant_type') and building.power_plant_type == 'solar':
-                    region_info = weather.get_region_info(region)
-                    lat = region_info.get("lat", 37.5665)
-                    lon = region_info.get("lon", 126.9780)
-                    
-                    sun_altitude, sun_azimuth = weather.get_sun_position(self.simulator.simTime, lat, lon)
-                    solar_radiation = weather.compute_solar_radiation(
-                        sun_altitude, 
-                        weather.cloud_factor, 
-                        building.panel_tilt, 
-                        building.panel_azimuth
-                    )
-                    
-                    temperature = weather.temperature if hasattr(weather, 'temperature') else 25
-                    solar_output = building.calculate_output(solar_radiation, temperature)
-                else:
-                    # 기존 로직 유지
-                    region_info = weather.get_region_info(region)
-                    lat = region_info.get("lat", 37.5665)  # 서울 기본값
-                    lon = region_info.get("lon", 126.9780)
-                    
-                    # 태양 위치 계산
-                    sun_altitude, sun_azimuth = weather.get_sun_position(self.simulator.simTime, lat, lon)
-                    
-                    # 태양광 발전량 계산
-                    solar_radiation = weather.compute_solar_radiation(
-                        sun_altitude, 
-                        weather.cloud_factor, 
-                        building.panel_tilt if hasattr(building, 'panel_tilt') else 35, 
-                        building.panel_azimuth if hasattr(building, 'panel_azimuth') else 180
-                    )
-                    
-                    # 날씨 효율 적용
-                    solar_output = building.solar_capacity * solar_radiation * weather.solar_efficiency
-                
-                # 발전량 추가 (수요 건물이면 소비 상쇄, 발전소는 발전량 추가)
-                building.current_supply += solar_output
+            # 전력 부족 시 수소 연료전지로 발전 (방전)
+            elif total_demand > total_generation * 1.05:  # 5% 이상 부족
+                power_shortage = (total_demand - total_generation) * 0.3  # 부족분의 30%만 보충
+                power_generated = building.discharge(power_shortage, duration=1.0)
+                balance.set_supply(building, power_generated)  # 발전량으로 공급
+                print(f"[DEBUG] 수소 발전: 부족전력={power_shortage:.1f}, 발전량={power_generated:.1f}")
+        else:
+            # 잉여 전력이 있을 때 수소 생산 (전기분해)
+            if total_generation > total_demand * 1.1 and connected_generation > 0:  # 10% 이상 잉여
+                surplus_power = min(total_generation - total_demand, connected_generation * 0.8)  # 연결된 발전소 용량의 80%까지만
+                # 수소 생산량 = 잉여전력 * 변환효율
+                hydrogen_efficiency = building.electrolysis_efficiency if hasattr(building, 'electrolysis_efficiency') else building.hydrogen_efficiency
+                hydrogen_produced = surplus_power * hydrogen_efficiency * 0.1  # 시간당 10%만 변환
+                storage_available = building.hydrogen_storage - building.hydrogen_level
                 
-                # 프로슈머 건물이 배터리를 가지고 있다면 잉여 전력 저장
-                if building.is_prosumer and hasattr(building, 'battery_capacity') and building.battery_capacity > 0 and building.current_supply > 0:
-                    surplus = building.current_supply
-                    # 배터리 충전 가능 용량 계산
-                    charge_capacity = building.battery_capacity - building.battery_charge
-                    charge_amount = min(surplus, charge_capacity)
-                    
-                    if charge_amount > 0:
-                        # 충전량은 배터리 용량의 최대 10%로 제한
-                        charge_amount = min(charge_capacity, building.battery_capacity * 0.1)
-                        
-                        # 배터리에는 charge_amount 만큼 저장됨
-                        building.battery_charge += charge_amount
-                        
-                        # 충전에 필요한 전력은 충전 효율을 고려하여 계산 (효율 95% 가정)
-                        # 즉, charge_amount를 저장하기 위해 외부에서 charge_amount / 0.95 만큼 전력을 끌어옴
-                        required_power_for_charging = charge_amount / 0.95 
-                        building.current_supply -= required_power_for_charging # 수요 증가
+                if storage_available > 0:
+                    actual_production = min(hydrogen_produced, storage_available)
+                    building.hydrogen_level += actual_production
+                    # 수소 생산에 사용한 전력은 수요로 계산
+                    balance.set_supply(building, -(actual_production / hydrogen_efficiency / 0.1))
             
-            # 4. 그린수소 에너지 저장소 처리
-            if building.hydrogen_storage > 0 or (hasattr(building, 'power_plant_type') and building.power_plant_type == 'hydrogen'):
-                hour = self.simulator.simTime.hour
+            # 전력 부족 시 수소 연료전지로 발전
+            elif total_demand > total_generation * 1.05 and building.hydrogen_level > 0:  # 5% 이상 부족
+                power_shortage = total_demand - total_generation
+                # 수소 발전량 = 저장된 수소 * 변환효율
+                fuel_cell_efficiency = building.fuel_cell_efficiency if hasattr(building, 'fuel_cell_efficiency') else building.hydrogen_efficiency
+                max_power_from_hydrogen = building.hydrogen_level * fuel_cell_efficiency
                 
-                # 수소저장소와 연결된 발전소 찾기
-                connected_power_plants = []
-                for line in self.simulator.city.lines:
-                    if line.removed:
-                        continue
-                    if line.u == building.idx:
-                        other_building = self.simulator.city.buildings[line.v]
-                        if not other_building.removed and other_building.base_supply > 0:
-                            connected_power_plants.append(other_building)
-                    elif line.v == building.idx:
-                        other_building = self.simulator.city.buildings[line.u]
-                        if not other_building.removed and other_building.base_supply > 0:
-                            connected_power_plants.append(other_building)
-                
-                # HydrogenEnergyStorage 클래스의 메서드 사용 가능 여부 확인
-                if hasattr(building, 'charge') and hasattr(building, 'discharge'):
-                    # 연결된 발전소가 있을 때만 작동
-                    if connected_power_plants:
-                        # 연결된 발전소들의 잉여 전력 계산
-                        connected_generation = sum(plant.current_supply for plant in connected_power_plants)
-                        
-                        # 전체 시스템의 발전량과 수요량 계산
-                        total_generation = sum(b.current_supply for b in self.simulator.city.buildings 
-                                             if b.current_supply > 0 and not b.removed)
-                        total_demand = sum(-b.current_supply for b in self.simulator.city.buildings 
-                                          if b.current_supply < 0 and not b.removed)
-                        
-                        print(f"[DEBUG] 수소저장소 {building.idx}: 연결된 발전소 {len(connected_power_plants)}개, 발전량={total_generation:.1f}, 수요량={total_demand:.1f}")
-                        
-                        # 잉여 전력이 있을 때 수소 생산 (충전)
-                        if total_generation > total_demand * 1.1 and connected_generation > 0:  # 10% 이상 잉여
-                            surplus_power = min((total_generation - total_demand) * 0.5, connected_generation * 0.8)  # 연결된 발전소 용량의 80%까지만
-                            power_consumed = building.charge(surplus_power, duration=1.0)
-                            building.current_supply = -power_consumed  # 수소 생산에 사용한 전력 (수요로 계산)
-                            print(f"[DEBUG] 수소 생산: 잉여전력={surplus_power:.1f}, 소비전력={power_consumed:.1f}")
-                        
-                        # 전력 부족 시 수소 연료전지로 발전 (방전)
-                        elif total_demand > total_generation * 1.05:  # 5% 이상 부족
-                            power_shortage = (total_demand - total_generation) * 0.3  # 부족분의 30%만 보충
-                            power_generated = building.discharge(power_shortage, duration=1.0)
-                            building.current_supply = power_generated  # 발전량으로 공급
-                            print(f"[DEBUG] 수소 발전: 부족전력={power_shortage:.1f}, 발전량={power_generated:.1f}")
-                else:
-                    # 기존 로직 - 연결된 발전소가 있을 때만 작동
-                    if connected_power_plants:
-                        # 연결된 발전소들의 잉여 전력 계산
-                        connected_generation = sum(plant.current_supply for plant in connected_power_plants)
-                        
-                        # 전체 시스템의 발전량과 수요량 계산
-                        total_generation = sum(b.current_supply for b in self.simulator.city.buildings 
-                                             if b.current_supply > 0 and not b.removed)
-                        total_demand = sum(-b.current_supply for b in self.simulator.city.buildings 
-                                          if b.current_supply < 0 and not b.removed)
-                        
-                        # 잉여 전력이 있을 때 수소 생산 (전기분해)
-                        if total_generation > total_demand * 1.1 and connected_generation > 0:  # 10% 이상 잉여
-                            surplus_power = min(total_generation - total_demand, connected_generation * 0.8)  # 연결된 발전소 용량의 80%까지만
-                            # 수소 생산량 = 잉여전력 * 변환효율
-                            hydrogen_efficiency = building.electrolysis_efficiency if hasattr(building, 'electrolysis_efficiency') else building.hydrogen_efficiency
-                            hydrogen_produced = surplus_power * hydrogen_efficiency * 0.1  # 시간당 10%만 변환
-                            storage_available = building.hydrogen_storage - building.hydrogen_level
-                            
-                            if storage_available > 0:
-                                actual_production = min(hydrogen_produced, storage_available)
-                                building.hydrogen_level += actual_production
-                                # 수소 생산에 사용한 전력은 수요로 계산
-                                building.current_supply = -(actual_production / hydrogen_efficiency / 0.1)
-                        
-                        # 전력 부족 시 수소 연료전지로 발전
-                        elif total_demand > total_generation * 1.05 and building.hydrogen_level > 0:  # 5% 이상 부족
-                            power_shortage = total_demand - total_generation
-                            # 수소 발전량 = 저장된 수소 * 변환효율
-                            fuel_cell_efficiency = building.fuel_cell_efficiency if hasattr(building, 'fuel_cell_efficiency') else building.hydrogen_efficiency
-                            max_power_from_hydrogen = building.hydrogen_level * fuel_cell_efficiency
-                            
-                            actual_generation = min(power_shortage * 0.5, max_power_from_hydrogen)  # 부족분의 50%까지만 보충
-                            if actual_generation > 0:
-                                hydrogen_consumed = actual_generation / fuel_cell_efficiency
-                                building.hydrogen_level -= hydrogen_consumed
-                                building.current_supply = actual_generation  # 발전량으로 공급
+                actual_generation = min(power_shortage * 0.5, max_power_from_hydrogen)  # 부족분의 50%까지만 보충
+                if actual_generation > 0:
+                    hydrogen_consumed = actual_generation / fuel_cell_efficiency
+                    building.hydrogen_level -= hydrogen_consumed
+                    balance.set_supply(building, actual_generation)  # 발전량으로 공급
+    
+    def build_demand_table(self):
+        """현재 시나리오 패턴으로 건물 유형 x 요일 x 시간 수요 인자 테이블 구성"""
+        pattern = self.simulator.pattern
+        self.demand_table = DemandFactorTable(pattern) if pattern else None
+    
+    def compute_consumer_demands(self, weather, hour, month):
+        """수요 건물별 수요 계산 - 패턴 인자는 type_code로 한 번에 gather하여 곱함"""
+        consumers = [b for b in self.simulator.city.buildings if not b.removed and b.base_supply <= 0]
+        if not consumers:
+            return {}
+        count = len(consumers)
+        
+        # 건물 유형 코드 -> 유형 x 요일 x 시간 x 계절 x 휴일 인자
+        type_codes = np.fromiter((getattr(b, 'type_code', default_building_type_code) for b in consumers), dtype=np.intp, count=count)
+        pattern_factors = self.demand_table.factors(type_codes, self.simulator.simTime)
+        
+        # 실측 부하 프로필이 있는 건물은 현재 스텝 프로필 값으로 패턴 인자 대체
+        store = self.simulator.profile_store
+        if store is not None and len(store):
+            profile_rows = np.fromiter((getattr(b, 'profile_row', -1) for b in consumers), dtype=np.intp, count=count)
+            has_profile = profile_rows >= 0
+            if has_profile.any():
+                pattern_factors[has_profile] = store.values(profile_rows[has_profile], self.simulator.simTime)
+        
+        # 환경 인자 (온도, 습도, 미세먼지)
+        base_demands = np.fromiter((-b.base_supply for b in consumers), dtype=float, count=count)
+        env_factors = np.fromiter(
+            (weather.get_temperature_demand_factor(b) * weather.get_humidity_demand_factor(b, month) * weather.get_pm_demand_factor(b)
+             for b in consumers),
+            dtype=float, count=count)
+        
+        demands = -base_demands * pattern_factors * env_factors
+        
+        # 스마트 그리드 연결된 건물은 피크 시간에 수요 15% 감소
+        if hour in self.SMART_GRID_PEAK_HOURS:
+            smart_grid = np.fromiter((getattr(b, 'smart_grid_connected', False) for b in consumers), dtype=bool, count=count)
+            demands[smart_grid] *= 0.85
+        
+        return dict(zip((b.idx for b in consumers), demands.tolist()))
     
     def update_battery(self):
-        """배터리 충방전 관리"""
-        for building in self.simulator.city.buildings:
-            if building.removed:
-                continue
-            # battery_capacity 속성이 없거나 0 이하인 경우 건너뛰기
-            if not hasattr(building, 'battery_capacity') or building.battery_capacity <= 0:
-                continue
-                
-            # 프로슈머 건물은 자체 처리 로직이 있으므로 여기서는 스킵
-            if building.is_prosumer:
-                continue
-                
-            # 스마트 그리드 연결된 건물의 배터리 관리
-            if building.smart_grid_connected:
-                hour = self.simulator.simTime.hour
-                # 오프피크 시간 (심야, 새벽)에는 충전
-                if 1 <= hour <= 5:
-                    # 충전 가능량
-                    charge_capacity = building.battery_capacity - building.battery_charge
-                    if charge_capacity > 0:
-                        # 충전량은 배터리 용량의 최대 10%로 제한
-                        charge_amount = min(charge_capacity, building.battery_capacity * 0.1)
-                        
-                        # 배터리에는 charge_amount 만큼 저장됨
-                        building.battery_charge += charge_amount
-                        
-                        # 충전에 필요한 전력은 충전 효율을 고려하여 계산 (효율 95% 가정)
-                        # 즉, charge_amount를 저장하기 위해 외부에서 charge_amount / 0.95 만큼 전력을 끌어옴
-                        required_power_for_charging = charge_amount / 0.95 
-                        building.current_supply -= required_power_for_charging # 수요 증가
-                
-                # 피크 시간대 방전
-                elif hour in [9, 10, 11, 17, 18, 19, 20]:
-                    # 현재 수요가 음수인 경우만 (소비 건물)
-                    if building.current_supply < 0:
-                        discharge_needed = min(-building.current_supply, building.battery_charge)
-                        if discharge_needed > 0:
-                            building.battery_charge -= discharge_needed
-                            # 방전량의 95%만 유효 (5% 손실)
-                            building.current_supply += discharge_needed * 0.95
+        """배터리 충방전 관리 - 스마트 그리드 배터리 (오프피크 충전, 피크 방전)"""
+        if self.storage_scheduler is not None:
+            return  # 최적 운전 계획 사용 시 apply_demand_pattern에서 처리
+        self.battery_fleet.step(self.simulator.city.buildings, self.simulator.simTime.hour,
+                                (BatteryFleet.MODE_SMART_GRID,))
+    
+    def enable_storage_scheduler(self, horizon=24, **options):
+        """롤링 호라이즌 저장장치 운전 계획 사용 (horizon: 계획 시간 수)"""
+        self.storage_scheduler = StorageScheduler(self, horizon=horizon, **options)
+        return self.storage_scheduler
+    
+    def disable_storage_scheduler(self):
+        """시간대 규칙 기반 운전으로 복귀"""
+        self.storage_scheduler = None
+    
+    def enable_market(self, **options):
+        """한계 비용 순 시장 급전 사용 (options: interval_minutes, reserve_margin)"""
+        self.disable_market()
+        self.market = MeritOrderMarket(self, **options)
+        self.generators.register(MarketKernel(self.market), before="hydrogen")
+        return self.market
+    
+    def disable_market(self):
+        """시장 급전 해제 (발전소는 가능 출력 전부 공급)"""
+        if self.market is not None:
+            self.generators.unregister(MarketKernel.plant_type)
+            self.market = None
+    
+    def enable_p2p(self, **options):
+        """프로슈머 간 전력 거래 사용 (options: interval_minutes, spread, min_quantity)"""
+        self.disable_p2p()
+        self.p2p = P2PMarket(self, **options)
+        before = MarketKernel.plant_type if self.market is not None else "hydrogen"
+        self.generators.register(P2PKernel(self.p2p), before=before)
+        return self.p2p
+    
+    def disable_p2p(self):
+        """프로슈머 간 전력 거래 해제"""
+        if self.p2p is not None:
+            self.generators.unregister(P2PKernel.plant_type)
+            self.p2p = None
+    
+    def simulate_cascade(self, initial_lines, apply=False):
+        """송전선 고장에서 시작하는 연쇄 고장 계산 -> CascadeResult (apply=True면 트립 송전선 제거)"""
+        return self.cascade.run(initial_lines, apply=apply)
+    
+    def estimate_reliability(self, samples=2000, **options):
+        """중요도 표본추출로 현재 상태의 LOLP/EENS 추정 -> ReliabilityResult
+        (options: bias, target_failures, propagate, workers, seed)"""
+        return ReliabilityEstimator(self.simulator, **options).estimate(samples)
+    
+    def solve_multi_period(self, hours=24, apply=False, **options):
+        """시간 확장 그래프로 hours 스텝의 송전선 흐름과 저장장치 궤적을 한 번에 계산
+        (apply=True면 첫 스텝 흐름을 송전선에 반영)"""
+        solver = MultiPeriodFlowSolver(self, **options)
+        result = solver.solve(hours)
+        if apply:
+            solver.apply_first_step(result)
+        return result
+    
+    def compute_nodal_prices(self):
+        """건물별 한계 가격(LMP, 원/kWh) -> 건물 idx 순 배열
+
+        마지막 흐름 계산(compute_line_flows)의 급전 해에서 얻은 가격이며, 아직 계산 전이면 흐름을 계산한다.
+        """
+        if len(self.pricer.prices) != len(self.simulator.city.buildings):
+            self.compute_line_flows()
+        return self.pricer.prices
+    
+    def invalidate_fleets(self):
+        """발전 설비/배터리 구성이 바뀌었을 때 유형별 발전소 목록과 배터리 배열 재구성 요청"""
+        self.generators.invalidate()
+        self.battery_fleet.invalidate()
     
     def calc_total_flow(self):
         """총 전력 흐름(실제 공급량) 계산"""
@@ -433,6 +352,9 @@ class PowerSystem:
                 consumers[idx] = -building.current_supply  # 음수를 양수로 변환
                 # print(f"소비자 {idx}: {building.name}, 수요량: {-building.current_supply}") # 로그 축소
         
+        # 최소비용 급전 한 번으로 송전선 흐름과 노드 가격(쌍대변수)을 함께 계산
+        active_lines, line_flows = self.pricer.solve()
+        
         # 생산자와 소비자가 있는지 확인
         if not producers:
             # print("경고: 발전소가 없습니다!")
@@ -455,96 +377,11 @@ class PowerSystem:
             self.check_blackouts()
             return
         
-        # 슈퍼소스와 슈퍼싱크 추가
-        num_buildings = len(buildings)
-        S_star = num_buildings
-        T_star = num_buildings + 1
-        
-        # 그래프 구성: 모든 가능한 엣지를 용량과 함께 저장
-        graph = {}
-        
-        # 모든 노드에 대해 빈 인접 리스트 초기화
-        for i in range(num_buildings + 2):  # 건물 + 슈퍼소스 + 슈퍼싱크
-            graph[i] = {}
-        
-        # 슈퍼소스에서 생산자로 연결 (중요: 슈퍼소스 -> 생산자 방향)
-        for producer_idx, current_prod_supply in producers.items():
-            # 해당 생산자에 연결된 송전선들의 총 용량 합계 계산
-            total_line_capacity_for_producer = 0
-            # buildings 리스트에서 producer_idx에 해당하는 건물 객체를 직접 사용하기보다는
-            # 이미 루프를 돌고 있는 buildings[producer_idx]를 활용하는 것이 안전합니다.
-            # (단, producer_idx가 buildings 리스트의 유효한 인덱스임을 보장해야 함 - 현재 producers 딕셔너리 생성 시 idx 사용)
-            
-            for line_obj in lines: # lines는 city.lines
-                if line_obj.removed:
-                    continue
-                # 연결된 건물이 제거되었는지도 확인
-                if buildings[line_obj.u].removed or buildings[line_obj.v].removed:
-                    continue
-                
-                # 양방향 송전선이므로 발전소에 연결된 모든 선의 용량을 고려
-                if line_obj.u == producer_idx or line_obj.v == producer_idx:
-                    total_line_capacity_for_producer += line_obj.capacity
-
-            # 실제 공급 가능한 최대 용량은 current_supply와 총 회선 용량 중 작은 값
-            effective_supply = min(current_prod_supply, total_line_capacity_for_producer)
-            
-            graph[S_star][producer_idx] = effective_supply
-            # print(f"연결: 슈퍼소스 -> 생산자 {producer_idx}, 발전량: {current_prod_supply}, 회선총용량: {total_line_capacity_for_producer}, 실제용량: {effective_supply}") # 로그 축소
-        
-        # 소비자에서 슈퍼싱크로 연결 (중요: 소비자 -> 슈퍼싱크 방향)
-        for consumer_idx, demand in consumers.items():
-            graph[consumer_idx][T_star] = demand
-            # print(f"연결: 소비자 {consumer_idx} -> 슈퍼싱크, 용량: {demand}") # 로그 축소
-        
-        # 송전선 연결 추가
-        for line in lines:
-            if line.removed:
-                continue
-            if buildings[line.u].removed or buildings[line.v].removed:
-                continue
-                
-            capacity = line.capacity
-            u, v = line.u, line.v
-            
-            # 양방향 송전선으로 설정 - 두 방향 모두 같은 용량 할당
-            graph[u][v] = capacity
-            if v not in graph: graph[v] = {}
-            graph[v][u] = capacity 
-            
-            # print(f"송전선: {u}({buildings[u].name}) -> {v}({buildings[v].name}), 용량: {capacity}") # 로그 축소
-            # print(f"송전선: {v}({buildings[v].name}) -> {u}({buildings[u].name}), 초기용량: 0") # 로그 축소
-        
-        # Edmonds-Karp 알고리즘으로 최대 유량 계산
-        # print("\n최대 유량 계산 시작...") # 로그 축소
-        max_flow, flows = self.edmonds_karp(graph, S_star, T_star)
-        # print(f"계산된 최대 유량: {max_flow}") # 로그 축소
-        
-        # 결과를 송전선에 반영
-        for line in lines:
-            if line.removed:
-                continue
-            if buildings[line.u].removed or buildings[line.v].removed:
-                continue
-                
-            u, v = line.u, line.v
-            
-            # flows[(u, v)]는 u에서 v로의 최종 순 흐름(net flow)을 나타냄.
-            # (음수일 경우 실제 흐름은 v -> u)
-            # 이전 계산 방식: flow_forward = flows.get((u, v), 0); flow_backward = flows.get((v, u), 0); net_flow = flow_forward - flow_backward (오류!)
-            actual_net_flow_uv = flows.get((u, v), 0) 
-
-            # line.flow에 이 순 흐름 값을 직접 저장
-            line.flow = actual_net_flow_uv
-            
-            # 사용률 계산
-            if line.capacity > 0:
-                # 사용률은 흐름의 크기(절대값) 기준
-                line.usage_rate = (abs(line.flow) / line.capacity) * 100
-            else:
-                line.usage_rate = 0
-            # 출력문도 명확하게 수정
-            # print(f"송전선 {u}({buildings[u].name}) <-> {v}({buildings[v].name}): 최종 흐름(u->v) = {actual_net_flow_uv:.2f}, line.flow = {line.flow:.2f}, 사용률 = {line.usage_rate:.1f}%")
+        # 송전선 흐름 반영 (최소비용 급전 해, 흐름이 음수면 실제 흐름은 v -> u)
+        for line, flow in zip(active_lines, line_flows):
+            line.flow = float(flow)
+            # 사용률은 흐름의 크기(절대값) 기준
+            line.usage_rate = (abs(line.flow) / line.capacity) * 100 if line.capacity > 0 else 0
         
         # 총 흐름과 블랙아웃 통계 업데이트
         self.check_blackouts()
@@ -0,0 +1,92 @@
+import numpy as np
+from modules.flow import FlowNetwork, min_cost_flow
+
+class NodalPricer:
+    """최소비용 급전(dispatch)과 그 쌍대변수로 건물별 한계 가격(LMP) 계산
+
+    현재 시점의 발전량/수요/송전선으로 흐름 그래프를 만들되,
+    발전 간선에는 발전원별 한계 비용, 송전선에는 송전 비용(line.cost)을 준다.
+    compute_line_flows가 이 최소비용 최대유량 해를 송전선 흐름으로 그대로 쓰므로 가격과 실제 흐름이 일치하고,
+    노드 포텐셜이 곧 각 노드의 한계 공급 비용이므로 노드마다 다시 풀 필요가 없다.
+    혼잡/공급 부족으로 더 보낼 수 없는 노드는 scarcity_price.
+    """
+
+    # 발전소 유형 -> 발전 원가 키 (EconomicModel.generation_cost)
+    PLANT_COST_KEYS = {
+        "thermal": "coal",
+        "nuclear": "nuclear",
+        "solar": "solar",
+        "wind": "wind",
+        "hydro": "hydro",
+        "hydrogen": "gas",
+    }
+
+    def __init__(self, power_system, generation_cost=None, default_cost=80.0, scarcity_price=300.0):
+        self.power_system = power_system
+        self.generation_cost = generation_cost or {"coal": 60.0, "gas": 80.0, "nuclear": 40.0, "solar": 5.0, "wind": 5.0, "hydro": 8.0}
+        self.default_cost = default_cost        # 유형을 알 수 없는 발전 (가스 수준)
+        self.scarcity_price = scarcity_price    # 추가 공급이 불가능한 노드의 가격 (정전 비용)
+        self.prices = np.empty(0)               # 건물 idx -> 한계 가격 (원/kWh)
+        self.congested = np.empty(0, dtype=bool)
+
+    def cost_table(self):
+        """발전원별 원가 (경제 모델이 있으면 그 표)"""
+        economic_model = self.power_system.simulator.economic_model
+        if economic_model is not None:
+            return economic_model.generation_cost
+        return self.generation_cost
+
+    def marginal_cost(self, building):
+        """발전 건물의 한계 비용 (수요 건물의 잉여 태양광은 태양광 원가)"""
+        plant_type = getattr(building, 'power_plant_type', None)
+        if plant_type is None and building.base_supply <= 0:
+            plant_type = "solar"
+        key = self.PLANT_COST_KEYS.get(plant_type)
+        return self.cost_table().get(key, self.default_cost)
+
+    def solve(self):
+        """현재 시점 최소비용 급전 -> (송전선 목록, 송전선별 u->v 순흐름 배열)
+
+        같은 해의 노드 포텐셜로 prices/congested를 갱신한다.
+        """
+        city = self.power_system.simulator.city
+        buildings = city.buildings
+        n = len(buildings)
+        source, sink = n, n + 1
+        lines = [pl for pl in city.lines
+                 if not pl.removed and not buildings[pl.u].removed and not buildings[pl.v].removed]
+        network = FlowNetwork(n + 2, edge_hint=n + 2 * len(lines))
+
+        line_capacity = np.zeros(n)
+        for pl in lines:
+            line_capacity[pl.u] += pl.capacity
+            line_capacity[pl.v] += pl.capacity
+        producers = [b for b in buildings if not b.removed and b.current_supply > 0]
+        consumers = [b for b in buildings if not b.removed and b.current_supply < 0]
+        if producers:
+            idx = np.array([b.idx for b in producers])
+            network.add_edges(np.full(len(idx), source), idx,
+                              np.minimum([b.current_supply for b in producers], line_capacity[idx]),
+                              [self.marginal_cost(b) for b in producers])
+        if consumers:
+            network.add_edges([b.idx for b in consumers], np.full(len(consumers), sink),
+                              [-b.current_supply for b in consumers], 0.0)
+        u = [pl.u for pl in lines]
+        v = [pl.v for pl in lines]
+        cap = [pl.capacity for pl in lines]
+        cost = [pl.cost for pl in lines]
+        forward = network.add_edges(u, v, cap, cost)
+        backward = network.add_edges(v, u, cap, cost)
+        network.finalize()
+
+        _, _, flow, potential = min_cost_flow(network, source, sink)
+        prices = potential[:n]
+        self.congested = ~np.isfinite(prices)
+        self.prices = np.where(self.congested, self.scarcity_price, prices)
+        return lines, flow[forward] - flow[backward]
+
+    def price(self, idx):
+        """건물 idx의 마지막 계산 가격 (계산 전이면 None)"""
+        if idx < len(self.prices):
+            return float(self.prices[idx])
+        return None
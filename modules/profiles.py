@@ -0,0 +1,151 @@
+import os
+import csv
+import json
+import hashlib
+import tempfile
+import numpy as np
+
+class LoadProfileStore:
+    """건물별 실측 부하 프로필 저장소
+
+    - 프로필은 (프로필 수, 연간 스텝 수) float32 행렬로 디스크 파일에 이어 쓰고 np.memmap으로 읽음
+    - 내용 해시(sha1)로 중복 제거: 같은 원형(archetype)을 쓰는 건물이 많아도 행은 하나
+    - 프로필 값은 건물 기본 수요(|base_supply|)에 곱하는 인자 (공용 daily/weekly/seasonal 패턴 대신 사용)
+    - 행은 프로필 단위로 연속 저장 (추가가 파일 끝 append로 끝나도록)
+    - path를 주지 않으면 저장소가 소유한 임시 디렉터리를 쓰고 close()에서 지움
+    """
+
+    MINUTES_PER_YEAR = 365 * 24 * 60
+
+    def __init__(self, path=None, steps=8760):
+        self._tmpdir = None
+        if path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="load_profiles_")
+            path = os.path.join(self._tmpdir.name, "profiles.f32")
+        self.path = path
+        self.index_path = path + ".json"
+        self.steps = steps                               # 연간 스텝 수 (8760=1시간, 35040=15분)
+        self.step_minutes = self.MINUTES_PER_YEAR / steps
+
+        self.hashes = []           # 행 번호 -> 내용 해시
+        self._rows_by_hash = {}    # 내용 해시 -> 행 번호
+        self._rows_by_id = {}      # 프로필 id -> 행 번호
+        self._matrix = None
+        self._mapped_rows = 0
+
+        if os.path.exists(self.index_path):
+            self._load_index()
+        elif os.path.exists(self.path):
+            self._rebuild_index()
+        else:
+            open(self.path, "wb").close()
+
+    def _load_index(self):
+        """기존 저장소 인덱스 읽기"""
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        self.steps = index["steps"]
+        self.step_minutes = self.MINUTES_PER_YEAR / self.steps
+        self.hashes = list(index["hashes"])
+        self._rows_by_hash = {h: row for row, h in enumerate(self.hashes)}
+        self._rows_by_id = dict(index["ids"])
+
+    def _rebuild_index(self):
+        """인덱스 없이 행렬 파일만 있을 때 - 온전한 행의 해시를 다시 계산하고 끝의 잘린 행은 잘라냄
+        (프로필 id는 파일에 없으므로 add()/load()로 다시 등록하면 같은 행을 재사용)"""
+        row_bytes = self.steps * np.dtype(np.float32).itemsize
+        rows = os.path.getsize(self.path) // row_bytes
+        with open(self.path, "r+b") as f:
+            f.truncate(rows * row_bytes)
+            for row in range(rows):
+                digest = hashlib.sha1(f.read(row_bytes)).hexdigest()
+                self._rows_by_hash.setdefault(digest, row)
+                self.hashes.append(digest)
+
+    def save_index(self):
+        """해시/프로필 id 인덱스 저장 (행렬 파일은 추가 시 이미 기록됨)"""
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            json.dump({"steps": self.steps, "hashes": self.hashes, "ids": self._rows_by_id}, f)
+
+    def _resample(self, values):
+        """저장소 해상도로 맞추기 (1시간 <-> 15분 등 정수배 관계만 허용)"""
+        n = len(values)
+        if n == self.steps:
+            return values
+        if n % 366 == 0 and n % 365 != 0:
+            values = values[:n // 366 * 365]  # 윤년 프로필은 마지막 날 제외
+            n = len(values)
+        if n > self.steps and n % self.steps == 0:
+            return values.reshape(self.steps, n // self.steps).mean(axis=1)
+        if n < self.steps and self.steps % n == 0:
+            return np.repeat(values, self.steps // n)
+        raise ValueError(f"프로필 길이 {n}을(를) {self.steps} 스텝으로 변환할 수 없습니다")
+
+    def add(self, profile_id, values):
+        """프로필 추가 -> 행 번호 (같은 내용이 이미 있으면 기존 행 재사용)"""
+        values = self._resample(np.asarray(values, dtype=np.float32))
+        digest = hashlib.sha1(values.tobytes()).hexdigest()
+        row = self._rows_by_hash.get(digest)
+        if row is None:
+            row = len(self.hashes)
+            with open(self.path, "ab") as f:
+                f.write(values.tobytes())
+            self.hashes.append(digest)
+            self._rows_by_hash[digest] = row
+        self._rows_by_id[profile_id] = row
+        return row
+
+    def load(self, profile_id, source, base_dir=None):
+        """리스트/배열 또는 파일(.npy, .csv, .txt)에서 프로필 추가"""
+        if isinstance(source, str):
+            path = source if base_dir is None else os.path.join(base_dir, source)
+            if path.endswith(".npy"):
+                values = np.load(path, mmap_mode="r")
+            else:
+                with open(path, "r", encoding="utf-8") as f:
+                    values = [float(r[-1]) for r in csv.reader(f) if r and _is_number(r[-1])]
+            return self.add(profile_id, values)
+        return self.add(profile_id, source)
+
+    def row(self, profile_id):
+        """프로필 id의 행 번호 (없으면 -1)"""
+        if profile_id is None:
+            return -1
+        return self._rows_by_id.get(profile_id, -1)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @property
+    def matrix(self):
+        """(프로필 수, 스텝 수) 메모리 맵 행렬 - 행이 추가되면 다시 매핑"""
+        if self._mapped_rows != len(self.hashes):
+            self._matrix = np.memmap(self.path, dtype=np.float32, mode="r", shape=(len(self.hashes), self.steps))
+            self._mapped_rows = len(self.hashes)
+        return self._matrix
+
+    def close(self):
+        """메모리 맵 해제, 임시 디렉터리를 쓴 경우 파일까지 삭제"""
+        self._matrix = None
+        self._mapped_rows = 0
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def timestep(self, sim_time):
+        """시뮬레이션 시각 -> 연중 스텝 인덱스"""
+        minutes = ((sim_time.timetuple().tm_yday - 1) * 24 + sim_time.hour) * 60 + sim_time.minute
+        return int(minutes // self.step_minutes) % self.steps
+
+    def values(self, rows, sim_time):
+        """행 번호 배열의 현재 스텝 값 (해당 원소만 읽음)"""
+        if len(rows) == 0 or not self.hashes:
+            return np.empty(0)
+        return self.matrix[rows, self.timestep(sim_time)].astype(float)
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
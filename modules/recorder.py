@@ -0,0 +1,158 @@
+import os
+import json
+from datetime import timedelta
+import numpy as np
+from modules.timeseries import to_epoch, from_epoch
+
+# 필드 -> (설비 종류, 속성)
+FIELDS = {
+    "flow": ("line", "flow"),
+    "usage_rate": ("line", "usage_rate"),
+    "current_supply": ("building", "current_supply"),
+    "shortage": ("building", "shortage"),
+}
+
+
+class FlowRecorder:
+    """송전선/건물별 전력 흐름 전체 해상도 기록
+
+    - 필드마다 (시간 단계 수, 설비 수) float32 행렬을 디렉터리에 미리 잡아 두고 np.memmap으로 한 행씩 기록
+      (송전선: flow, usage_rate / 건물: current_supply, shortage)
+    - 열은 기록 시작 시점 city.lines / city.buildings 목록 위치, 이후 추가될 설비를 위해 spare 열을 더 잡음
+      (아직 없는 설비 칸은 NaN)
+    - 단계별 경과 시뮬레이션 시간(초)을 함께 저장해 조회는 단계 길이로 가중 (프레임 dt가 달라도 시간 기준)
+    - 조회 함수는 매핑된 행렬을 block 행 단위로 읽어 계산하므로 긴 기록도 메모리에 다 올리지 않음
+    - index.json에 크기/기록 단계 수를 남겨 FlowRecorder.open(directory)로 나중에 다시 조회 가능
+    - 열 위치는 기록 시작 때의 설비 목록 기준이므로 시나리오가 바뀌어 목록이 새로 만들어지면 기록을 거부
+    """
+
+    def __init__(self, simulator, steps, directory, spare=16):
+        os.makedirs(directory, exist_ok=True)
+        self.simulator = simulator
+        self.directory = directory
+        self.steps = 0
+        self.capacity = max(int(steps), 1)
+        city = simulator.city
+        self.widths = {"line": len(city.lines) + spare, "building": len(city.buildings) + spare}
+        self._entity_lists = (id(city.lines), id(city.buildings))
+        self.start_epoch = to_epoch(simulator.simTime)
+        self._start = simulator.simTime
+        self._map("w+")
+        self.save_index()
+
+    @classmethod
+    def open(cls, directory):
+        """저장된 기록을 읽기 전용으로 다시 열기 (시뮬레이터 없이 조회만)"""
+        with open(os.path.join(directory, "index.json"), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        recorder = cls.__new__(cls)
+        recorder.simulator = None
+        recorder._entity_lists = None
+        recorder.directory = directory
+        recorder.steps = index["steps"]
+        recorder.capacity = index["capacity"]
+        recorder.widths = index["widths"]
+        recorder.start_epoch = index["start_epoch"]
+        recorder._start = from_epoch(recorder.start_epoch)
+        recorder._map("r")
+        return recorder
+
+    def _map(self, mode):
+        self.elapsed = np.memmap(os.path.join(self.directory, "elapsed.f64"), dtype=np.float64, mode=mode,
+                                 shape=(self.capacity,))
+        self.arrays = {field: np.memmap(os.path.join(self.directory, f"{field}.f32"), dtype=np.float32, mode=mode,
+                                        shape=(self.capacity, self.widths[kind]))
+                       for field, (kind, _) in FIELDS.items()}
+
+    def save_index(self):
+        with open(os.path.join(self.directory, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"steps": self.steps, "capacity": self.capacity, "widths": self.widths,
+                       "start_epoch": self.start_epoch}, f)
+
+    @property
+    def full(self):
+        return self.steps >= self.capacity
+
+    # ---------------- 기록 ----------------
+    def record(self):
+        """현재 상태를 한 단계로 기록 (미리 잡은 단계를 다 쓰면 False)"""
+        if self.full:
+            return False
+        sim = self.simulator
+        if (id(sim.city.lines), id(sim.city.buildings)) != self._entity_lists:
+            raise RuntimeError("기록 시작 후 설비 목록이 바뀌었습니다 (시나리오 로드) - 기록을 다시 시작하세요")
+        i = self.steps
+        self.elapsed[i] = (sim.simTime - self._start).total_seconds()
+        entities = {"line": sim.city.lines, "building": sim.city.buildings}
+        for field, (kind, attr) in FIELDS.items():
+            items = entities[kind][:self.widths[kind]]
+            row = self.arrays[field][i]
+            row[:len(items)] = np.fromiter((getattr(item, attr, 0.0) for item in items), dtype=np.float32,
+                                           count=len(items))
+            row[len(items):] = np.nan
+        self.steps = i + 1
+        return True
+
+    def flush(self):
+        """매핑된 행렬과 인덱스를 디스크에 반영"""
+        self.elapsed.flush()
+        for matrix in self.arrays.values():
+            matrix.flush()
+        self.save_index()
+
+    def close(self):
+        self.flush()
+
+    # ---------------- 조회 ----------------
+    def durations(self):
+        """단계별 길이 (시간) - 첫 단계는 기록 시작 시각부터"""
+        elapsed = np.asarray(self.elapsed[:self.steps])
+        return np.diff(elapsed, prepend=0.0) / 3600.0
+
+    def times(self):
+        """단계별 시뮬레이션 시각 목록"""
+        return [self._start + timedelta(seconds=s) for s in self.elapsed[:self.steps].tolist()]
+
+    def series(self, field, column):
+        """설비 하나의 전체 기록 (float32 배열)"""
+        return np.asarray(self.arrays[field][:self.steps, column])
+
+    def hours_above(self, field, threshold, block=65536):
+        """설비별로 값이 threshold를 넘은 시간 합 (예: hours_above("usage_rate", 90) -> 송전선별 혼잡 시간)"""
+        matrix = self.arrays[field]
+        hours = self.durations()
+        total = np.zeros(matrix.shape[1])
+        for lo in range(0, self.steps, block):
+            hi = min(lo + block, self.steps)
+            total += hours[lo:hi] @ (matrix[lo:hi] > threshold)
+        return total
+
+    def intervals_above(self, field, column, threshold):
+        """설비 하나가 threshold를 넘은 구간 목록 [(시작 시각, 끝 시각)]"""
+        above = self.series(field, column) > threshold
+        if not above.any():
+            return []
+        edges = np.diff(above.astype(np.int8), prepend=0, append=0)
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        # 단계 i는 이전 단계 시각부터 i 시각까지의 상태
+        elapsed = np.concatenate(([0.0], np.asarray(self.elapsed[:self.steps])))
+        return [(self._start + timedelta(seconds=float(elapsed[s])), self._start + timedelta(seconds=float(elapsed[e])))
+                for s, e in zip(starts.tolist(), ends.tolist())]
+
+    def duration_curve(self, field, column, points=None):
+        """지속 곡선: 값을 큰 순서로 정렬하고 누적 시간과 짝지음 -> (누적 시간 배열, 값 배열)
+
+        points를 주면 누적 시간 축을 points개 지점으로 균등 추출 (그래프용)
+        """
+        values = self.series(field, column)
+        valid = ~np.isnan(values)
+        values, hours = values[valid], self.durations()[valid]
+        order = np.argsort(-values, kind="stable")
+        values = values[order]
+        hours = np.cumsum(hours[order])
+        if points is not None and len(values) > points:
+            pick = np.searchsorted(hours, np.linspace(0.0, hours[-1], points), side="left")
+            pick = np.minimum(pick, len(values) - 1)
+            hours, values = hours[pick], values[pick]
+        return hours, values
@@ -0,0 +1,138 @@
+import math
+import numpy as np
+from modules.cascade import CascadeEngine
+from modules.parallel import map_chunks
+
+class ReliabilityResult:
+    """신뢰도 지표 추정 결과 (구간은 정규 근사 신뢰구간)"""
+
+    def __init__(self, samples, lolp, lolp_interval, eens, eens_interval, effective_samples, bias):
+        self.samples = samples
+        self.lolp = lolp                        # 공급 부족 확률 (임의 시점에 고장으로 부하 손실이 있을 확률)
+        self.lolp_interval = lolp_interval
+        self.eens = eens                        # 연간 기대 미공급 에너지 (MWh/년)
+        self.eens_interval = eens_interval
+        self.effective_samples = effective_samples  # 가중치 유효 표본 수 (가중치 쏠림 진단)
+        self.bias = bias
+
+    @property
+    def lole(self):
+        """연간 공급 부족 기대 시간 (시간/년)"""
+        return self.lolp * 8760.0
+
+    def to_dict(self):
+        return {"samples": self.samples, "lolp": self.lolp, "lolp_interval": self.lolp_interval,
+                "lole": self.lole, "eens": self.eens, "eens_interval": self.eens_interval,
+                "effective_samples": self.effective_samples, "bias": self.bias}
+
+
+class ReliabilityEstimator:
+    """중요도 표본추출(importance sampling) 신뢰도 추정 (상태 표본추출 방식)
+
+    - 송전선/발전소 불가용률 U = λr / (1 + λr): λ는 HazardModel 고장률(현재 날씨/부하), r은 수리반 평균 수리 시간
+    - 고장 확률을 q = min(bias x U, max_probability)로 키운 분포에서 계통 상태를 한 번에 배열로 추출하고
+      표본마다 우도비 w = Π (U/q)^x ((1-U)/(1-q))^(1-x)로 보정 -> 드문 다중 고장을 적은 표본으로 관측
+    - 상태 평가는 무화면 연쇄 고장 엔진(CascadeEngine)의 기준 잔여 그래프에서 warm start로 수행
+      (propagate=True면 과부하 연쇄 트립까지 포함)
+    - 부하 손실 = 고장 없는 기준 공급량 - 고장 상태 공급량, LOLP = E_q[w 1(손실 > 0)], EENS = E_q[w 손실] x 8760
+    - workers > 1이면 표본 묶음을 spawn 프로세스 풀에서 병렬 평가 (기본은 현재 프로세스에서 차례로)
+    """
+
+    def __init__(self, simulator, bias=None, target_failures=2.0, max_probability=0.5, propagate=True,
+                 workers=1, seed=None, z=1.96, loss_tolerance=1e-6):
+        self.simulator = simulator
+        self.bias = bias                            # 고장 확률 배수 (None이면 표본당 기대 고장 수가 target_failures가 되도록)
+        self.target_failures = target_failures
+        self.max_probability = max_probability
+        self.propagate = propagate
+        self.workers = workers
+        self.seed = seed
+        self.z = z
+        self.loss_tolerance = loss_tolerance
+        self.engine = CascadeEngine(simulator.power_system)
+
+    def unavailability(self):
+        """(송전선 불가용률, 발전소 불가용률) - 엔진 그래프 순서"""
+        engine = self.engine
+        city = self.simulator.city
+        event_system = self.simulator.event_system
+        hazard = event_system.hazard
+        repair = event_system.restoration.mean_repair_hours
+        line_rate = hazard.line_rates([city.lines[p] for p in engine.line_positions]) * repair.get("line", 3.0)
+        plant_rate = hazard.plant_rates([city.buildings[i] for i in engine.producers.tolist()]) * repair.get("building", 6.0)
+        return line_rate / (1.0 + line_rate), plant_rate / (1.0 + plant_rate)
+
+    def evaluate(self, failed_lines, failed_plants):
+        """고장 상태 하나의 부하 손실 (MW)"""
+        return state_loss(self.engine, failed_lines, failed_plants, self.propagate)
+
+    def evaluate_states(self, states, line_count):
+        """상태 행렬(표본 x [송전선, 발전소]) 평가 -> 표본별 부하 손실 배열"""
+        return evaluate_states((self.engine, line_count, self.propagate), states)
+
+    def estimate(self, samples=2000):
+        """samples개 상태를 추출해 LOLP/EENS 추정 -> ReliabilityResult"""
+        self.engine.build()
+        line_u, plant_u = self.unavailability()
+        u = np.concatenate([line_u, plant_u])
+        line_count = len(line_u)
+        if len(u) == 0 or u.sum() <= 0:
+            return ReliabilityResult(samples, 0.0, (0.0, 0.0), 0.0, (0.0, 0.0), float(samples), 1.0)
+
+        bias = float(self.bias) if self.bias is not None else max(1.0, self.target_failures / float(u.sum()))
+        q = np.minimum(u * bias, self.max_probability)
+        q = np.maximum(q, u)       # 고장 확률을 낮추지는 않음 (max_probability보다 U가 큰 설비)
+        rng = np.random.default_rng(self.seed)
+        states = rng.random((samples, len(u))) < q
+
+        # 로그 우도비 (고장 설비: log U/q, 정상 설비: log (1-U)/(1-q))
+        # (고장률 0인 설비는 추출되지 않으므로 0으로 둠)
+        positive = u > 0
+        fail_term = np.zeros(len(u))
+        fail_term[positive] = np.log(u[positive]) - np.log(q[positive])
+        ok_term = np.log1p(-u) - np.log1p(-q)
+        log_weight = states @ fail_term + (~states) @ ok_term
+        weights = np.exp(log_weight)
+
+        losses = self.evaluate_parallel(states, line_count)
+        lol = (losses > self.loss_tolerance).astype(float)
+        lolp, lolp_interval = self._interval(weights * lol)
+        eens, eens_interval = self._interval(weights * losses * 8760.0)
+        effective = float(weights.sum() ** 2 / np.square(weights).sum()) if weights.any() else 0.0
+        return ReliabilityResult(samples, lolp, lolp_interval, eens, eens_interval, effective, bias)
+
+    def _interval(self, values):
+        """가중 표본 평균과 정규 근사 신뢰구간"""
+        n = len(values)
+        mean = float(values.mean())
+        half = self.z * float(values.std(ddof=1)) / math.sqrt(n) if n > 1 else 0.0
+        return mean, (max(mean - half, 0.0), mean + half)
+
+    def evaluate_parallel(self, states, line_count):
+        """표본 묶음 평가 (workers > 1이면 시뮬레이터 참조를 뗀 엔진 복사본을 작업 프로세스로 보냄)"""
+        chunks = min(self.workers, len(states))
+        if chunks <= 1:
+            return self.evaluate_states(states, line_count)
+        bounds = np.linspace(0, len(states), chunks + 1).astype(int).tolist()
+        parts = map_chunks(evaluate_states, (self.engine.detached(), line_count, self.propagate),
+                           [states[start:end] for start, end in zip(bounds[:-1], bounds[1:])], self.workers)
+        return np.concatenate(parts)
+
+
+def state_loss(engine, failed_lines, failed_plants, propagate=True):
+    """고장 상태 하나의 부하 손실 (MW) - engine은 build()된 CascadeEngine"""
+    if not failed_lines and not failed_plants:
+        return 0.0
+    result = engine.cascade(failed_lines, plants=failed_plants, propagate=propagate)
+    return max(result.load_lost, 0.0)
+
+def evaluate_states(context, states):
+    """상태 행렬 묶음 평가 -> 표본별 부하 손실 배열 (context: (엔진, 송전선 수, 연쇄 트립 여부))"""
+    engine, line_count, propagate = context
+    losses = np.zeros(len(states))
+    for i, row in enumerate(states):
+        failed = np.flatnonzero(row)
+        lines = failed[failed < line_count].tolist()
+        plants = (failed[failed >= line_count] - line_count).tolist()
+        losses[i] = state_loss(engine, lines, plants, propagate)
+    return losses
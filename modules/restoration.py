@@ -0,0 +1,171 @@
+import heapq
+import math
+from datetime import timedelta
+import numpy as np
+
+class RepairJob:
+    """복구 작업 하나 (고장 송전선 또는 건물)"""
+
+    def __init__(self, component, kind, location, priority, failed_at):
+        self.component = component
+        self.kind = kind                  # "line" / "building"
+        self.location = location          # 작업 위치 (x, y)
+        self.priority = priority          # 작은 값이 먼저 (등급, -부하)
+        self.failed_at = failed_at
+        self.dispatched_at = None
+        self.restored_at = None
+        self.crew = None
+
+
+class RepairCrew:
+    def __init__(self, crew_id, location):
+        self.crew_id = crew_id
+        self.location = location
+        self.job = None                   # 진행 중 작업 (없으면 대기)
+
+
+class RestorationSystem:
+    """수리반 풀과 복구 대기열 (이산 사건 방식)
+
+    - 고장 설비는 우선순위 큐의 작업이 된다: 병원(및 병원 연결 송전선) -> 부하가 큰 송전선 -> 발전소 -> 기타 건물
+    - 빈 수리반이 생기면 가장 급한 작업에 가장 가까운 수리반을 배정하고,
+      이동 시간(거리 / 속도 x 로그정규 변동)과 수리 시간(로그정규, 유형별 평균)을 뽑아
+      완료 시각을 이벤트 시스템 우선순위 큐에 예약한다 -> 매 틱 확인(polling) 없음
+    - 완료 사건에서 설비를 복구하고 수리반은 그 위치에서 다음 작업을 받는다
+    """
+
+    PRIORITY_HOSPITAL = 0
+    PRIORITY_LINE = 1
+    PRIORITY_PLANT = 2
+    PRIORITY_BUILDING = 3
+
+    def __init__(self, simulator, event_system, crews=3, travel_speed=600.0, travel_sigma=0.3,
+                 mean_repair_hours=None, repair_sigma=0.5, seed=None):
+        self.simulator = simulator
+        self.event_system = event_system
+        self.crew_count = crews
+        self.travel_speed = travel_speed          # 이동 속도 (지도 좌표 단위 / 시간)
+        self.travel_sigma = travel_sigma          # 이동 시간 로그정규 변동
+        self.mean_repair_hours = {"line": 3.0, "building": 6.0}
+        if mean_repair_hours:
+            self.mean_repair_hours.update(mean_repair_hours)
+        self.repair_sigma = repair_sigma
+        self.rng = np.random.default_rng(seed)
+        self.completed = []                       # 완료된 RepairJob 목록
+        self.reset()
+
+    def reset(self):
+        """대기 작업/진행 작업 모두 취소 (예약된 완료 사건은 세대 번호로 무효화)"""
+        self._generation = getattr(self, '_generation', 0) + 1
+        self._queue = []                          # (우선순위, 순번, RepairJob)
+        self._seq = 0
+        self._jobs = {}                           # id(설비) -> RepairJob (중복 신고 방지)
+        depot = self.depot()
+        self.crews = [RepairCrew(i, depot) for i in range(self.crew_count)]
+
+    def depot(self):
+        """수리반 대기 위치 = 건물 중심"""
+        buildings = [b for b in self.simulator.city.buildings]
+        if not buildings:
+            return (0.0, 0.0)
+        return (sum(b.x for b in buildings) / len(buildings), sum(b.y for b in buildings) / len(buildings))
+
+    # ---------------- 작업 등록 ----------------
+    def job_for(self, component, now):
+        """고장 설비 -> RepairJob (우선순위/위치 계산)"""
+        buildings = self.simulator.city.buildings
+        if hasattr(component, 'u'):
+            a, b = buildings[component.u], buildings[component.v]
+            location = ((a.x + b.x) / 2, (a.y + b.y) / 2)
+            hospital = getattr(a, 'building_type', None) == 'hospital' or getattr(b, 'building_type', None) == 'hospital'
+            # 고장 직전 흐름(line.flow)이 큰 송전선부터
+            grade = self.PRIORITY_HOSPITAL if hospital else self.PRIORITY_LINE
+            return RepairJob(component, "line", location, (grade, -abs(component.flow)), now)
+        if getattr(component, 'building_type', None) == 'hospital':
+            grade = self.PRIORITY_HOSPITAL
+        elif component.base_supply > 0:
+            grade = self.PRIORITY_PLANT
+        else:
+            grade = self.PRIORITY_BUILDING
+        return RepairJob(component, "building", (component.x, component.y), (grade, -abs(component.base_supply)), now)
+
+    def report(self, components, now=None):
+        """고장 설비 신고 -> 새로 등록된 작업 수 (이미 대기/수리 중인 설비는 무시)"""
+        now = now or self.simulator.simTime
+        added = 0
+        for component in components:
+            if id(component) in self._jobs:
+                continue
+            job = self.job_for(component, now)
+            self._jobs[id(component)] = job
+            heapq.heappush(self._queue, (job.priority, self._seq, job))
+            self._seq += 1
+            added += 1
+        if added:
+            self.dispatch(now)
+        return added
+
+    # ---------------- 배정 / 완료 ----------------
+    def travel_hours(self, start, end):
+        distance = math.hypot(end[0] - start[0], end[1] - start[1])
+        return distance / self.travel_speed * float(self.rng.lognormal(0.0, self.travel_sigma))
+
+    def repair_hours(self, kind):
+        # 로그정규 평균이 mean_repair_hours가 되도록 mu 보정
+        mean = self.mean_repair_hours.get(kind, 4.0)
+        mu = math.log(mean) - self.repair_sigma ** 2 / 2
+        return float(self.rng.lognormal(mu, self.repair_sigma))
+
+    def dispatch(self, now):
+        """빈 수리반에 대기 작업 배정 (급한 작업부터, 가장 가까운 빈 수리반)"""
+        free = [crew for crew in self.crews if crew.job is None]
+        while free and self._queue:
+            _, _, job = heapq.heappop(self._queue)
+            if not job.component.removed or job.component.deleted:
+                # 다른 경로(전체 복구 등)로 이미 복구되었거나 사용자가 삭제한 설비
+                del self._jobs[id(job.component)]
+                continue
+            crew = min(free, key=lambda c: math.hypot(c.location[0] - job.location[0], c.location[1] - job.location[1]))
+            free.remove(crew)
+            crew.job = job
+            job.crew = crew.crew_id
+            job.dispatched_at = now
+            hours = self.travel_hours(crew.location, job.location) + self.repair_hours(job.kind)
+            self.event_system.schedule(now + timedelta(hours=hours), self._completion(crew, job))
+
+    def _completion(self, crew, job):
+        generation = self._generation
+
+        def complete(at):
+            if generation != self._generation:
+                return False
+            return self.complete(crew, job, at)
+        return complete
+
+    def complete(self, crew, job, at):
+        """수리 완료 사건: 설비 복구, 수리반 해제 후 다음 작업 배정 (수리 중 사용자가 삭제한 설비는 복구하지 않음)"""
+        crew.location = job.location
+        crew.job = None
+        self._jobs.pop(id(job.component), None)
+        if not job.component.deleted:
+            job.component.removed = False
+            job.restored_at = at
+            self.completed.append(job)
+            self.event_system.journal_event("restoration", at, [(job.component, {"removed": False})])
+        self.dispatch(at)
+        return True
+
+    # ---------------- 상태 ----------------
+    @property
+    def pending(self):
+        return len(self._queue)
+
+    @property
+    def busy_crews(self):
+        return sum(1 for crew in self.crews if crew.job is not None)
+
+    def mean_outage_hours(self):
+        """완료된 작업의 평균 정전(고장 -> 복구) 시간"""
+        if not self.completed:
+            return 0.0
+        return sum((job.restored_at - job.failed_at).total_seconds() for job in self.completed) / 3600.0 / len(self.completed)
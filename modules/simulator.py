@@ -1,7 +1,10 @@
+import os
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from modules.weather import WeatherSystem
 from modules.power import PowerSystem
 from modules.event import EventSystem
+from modules.profiles import LoadProfileStore
 from city import CityGraph
 
 class Simulator:
@@ -26,6 +29,9 @@ class Simulator:
         self.simTime = datetime(2025,1,1,0,0,0)
         self.gameSpeed = 300.0  # 1초에 게임 시간 (분)
         
+        # 시나리오 지역 (기후 모델 선택)
+        self.region = "Seoul"
+        
         # 하위 시스템 초기화
         self.weather_system = WeatherSystem(self)
         self.power_system = PowerSystem(self)
@@ -34,12 +40,21 @@ class Simulator:
         # 경제 모델
         self.economic_model = None
         
+        # 건물별 실측 부하 프로필 저장소 (시나리오에 load_profiles가 있을 때 생성)
+        self.profile_store = None
+        
         # 외부에서 불러올 시나리오 목록
         self.scenarios = []
         self.current_scenario = None
         self.current_scenario_index = -1
         self.action_log = []
         self.is_paused = False # 일시 정지 상태 변수 추가
+        
+        # 이벤트 저널 (start_journal로 켰을 때만 기록)
+        self.journal = None
+        
+        # 송전선/건물별 전체 해상도 흐름 기록 (start_recorder로 켰을 때만 기록)
+        self.recorder = None
     
     def pause_simulation(self):
         """시뮬레이션 일시 정지"""
@@ -61,10 +76,57 @@ class Simulator:
         """
         self.scenarios = scenarios
     
+    def start_journal(self, path=None, checkpoint_interval=1000):
+        """이벤트 저널 기록 시작 (path가 None이면 메모리 기록) -> EventJournal
+        
+        결정적 재실행을 위해 새 시뮬레이터에서 첫 시나리오를 로드하기 전에 시작해야 한다.
+        """
+        from modules.journal import EventJournal
+        self.stop_journal()
+        self.journal = EventJournal(self, path, checkpoint_interval)
+        return self.journal
+    
+    def stop_journal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+    
+    def start_recorder(self, steps, directory, spare=16):
+        """step()마다 송전선/건물별 흐름을 directory의 메모리 매핑 행렬에 기록 (steps 단계를 미리 잡음) -> FlowRecorder
+
+        시나리오를 새로 불러오면 열 위치가 달라지므로 기록은 자동으로 끝남
+        """
+        from modules.recorder import FlowRecorder
+        self.stop_recorder()
+        self.recorder = FlowRecorder(self, steps, directory, spare)
+        return self.recorder
+    
+    def stop_recorder(self):
+        """기록 종료 (파일은 남김) -> 기록기 (조회용)"""
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+        return recorder
+    
+    def record_edit(self, source, action, effects=()):
+        """사용자 편집 기록 블록 (저널이 꺼져 있으면 아무 것도 하지 않음)"""
+        if self.journal is None:
+            return nullcontext()
+        return self.journal.capture(source, action, effects)
+    
     def load_scenario(self, scenario_data):
+        if self.journal is not None:
+            with self.journal.scenario(scenario_data):
+                self._load_scenario(scenario_data)
+        else:
+            self._load_scenario(scenario_data)
+    
+    def _load_scenario(self, scenario_data):
         # print(f"시나리오 로드 중: {scenario_data.get('name', '이름 없는 시나리오')}")
+        self.stop_recorder()
         self.city.clear_all()
         self.current_scenario = scenario_data
+        self.region = scenario_data.get("region", "Seoul")
 
         # 예산을 scenario_data의 budget 또는 money 값으로 설정하되, 최소 1000.0 보장
         scenario_budget = scenario_data.get("budget", scenario_data.get("money", 1000.0))
@@ -72,6 +134,9 @@ class Simulator:
 
         start_datetime_str = scenario_data.get("start_time", "2025-01-01 00:00:00")
         
+        # 부하 프로필 등록 (같은 내용은 저장소에서 한 행으로 공유)
+        self.load_profiles(scenario_data.get("load_profiles", {}))
+        
         # 건물 재구성
         for binfo in scenario_data["buildings"]:
             # 발전소 타입에 따라 다른 메서드 호출
@@ -82,6 +147,7 @@ class Simulator:
                     capacity=binfo.get("wind_capacity", 50.0),
                     x=binfo["x"], y=binfo["y"]
                 )
+                b.hub_height = binfo.get("hub_height", b.hub_height)
             elif building_type == "solar_plant":
                 b = self.city.add_solar_plant(
                     capacity=binfo.get("solar_capacity", 40.0),
@@ -122,6 +188,8 @@ class Simulator:
             b.battery_charge = binfo.get("battery_charge", 0.0)
             b.smart_grid_connected = binfo.get("smart_grid_connected", False)
             b.energy_efficiency = binfo.get("energy_efficiency", 1.0)
+            b.load_profile = binfo.get("load_profile")
+            b.profile_row = self.profile_store.row(b.load_profile) if self.profile_store else -1
         
         # 송전선 재구성
         for linfo in scenario_data["lines"]:
@@ -129,12 +197,51 @@ class Simulator:
             if pl is not None:
                 pl.removed = linfo.get("removed", False)
         
+        # 이전 도시 설비의 대기/진행 중 수리 작업과 고장 목록 취소 (수리반은 새 도시 중심에서 출발)
+        self.event_system.restoration.reset()
+        self.event_system.hazard.reset()
+        
+        # 수요 인자 테이블 구성, 발전소/배터리 목록 재분류 (시나리오당 한 번)
+        self.power_system.build_demand_table()
+        self.power_system.invalidate_fleets()
+        
+        # 저장장치 최적 운전 계획 (시나리오에 storage_scheduler 설정이 있을 때)
+        scheduler_options = scenario_data.get("storage_scheduler")
+        if scheduler_options:
+            self.power_system.enable_storage_scheduler(**(scheduler_options if isinstance(scheduler_options, dict) else {}))
+        else:
+            self.power_system.disable_storage_scheduler()
+        
+        # 한계 비용 순 시장 급전 (시나리오에 market 설정이 있을 때)
+        market_options = scenario_data.get("market")
+        if market_options:
+            self.power_system.enable_market(**(market_options if isinstance(market_options, dict) else {}))
+        else:
+            self.power_system.disable_market()
+        
+        # 프로슈머 간 전력 거래 (시나리오에 p2p 설정이 있을 때)
+        p2p_options = scenario_data.get("p2p")
+        if p2p_options:
+            self.power_system.enable_p2p(**(p2p_options if isinstance(p2p_options, dict) else {}))
+        else:
+            self.power_system.disable_p2p()
+        
         # 날씨 한번 업데이트
         self.weather_system.update_weather()
         
         # 전력 흐름 초기 계산
         self.update_flow(instant=True)
     
+    def load_profiles(self, profiles):
+        """시나리오의 load_profiles {프로필 id: 값 리스트 또는 파일 경로}를 저장소에 등록"""
+        if not profiles:
+            return
+        if self.profile_store is None:
+            self.profile_store = LoadProfileStore()
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for profile_id, source in profiles.items():
+            self.profile_store.load(profile_id, source, base_dir)
+    
     def get_current_season(self):
         month = self.simTime.month
         if 3 <= month <= 5:
@@ -146,9 +253,9 @@ class Simulator:
         else:
             return "겨울"
     
-    def apply_demand_pattern(self, region="Seoul"):
+    def apply_demand_pattern(self, region=None):
         """수요 패턴 적용 - Power 시스템으로 위임"""
-        self.power_system.apply_demand_pattern(region)
+        self.power_system.apply_demand_pattern(region or self.region)
     
     def calc_total_flow(self):
         """총 전력 흐름 계산 - 실제 공급량 반환"""
@@ -173,12 +280,24 @@ class Simulator:
         # 배터리 업데이트
         if self.economic_model:
             self.economic_model.update_energy_prices(dt_ms)
+            self.economic_model.update_billing(dt_simulated / 3600.0)
         
         self.power_system.update_battery()
     
+    def step(self, dt_ms):
+        """한 프레임 진행: 시간/날씨 -> 수요 패턴 -> 이벤트 -> 전력 흐름 (저널이 있으면 틱 기록, 기록기가 있으면 흐름 기록)"""
+        with self.journal.tick(dt_ms) if self.journal is not None else nullcontext():
+            self.update_sim_time(dt_ms)
+            self.apply_demand_pattern()
+            self.update_events()
+            self.update_flow(instant=True)
+        if self.recorder is not None:
+            self.recorder.record()
+    
     def update_events(self):
-        """이벤트 업데이트"""
-        self.event_system.update_events()
+        """이벤트 업데이트 - 다음 이벤트 예정 시각이 지났을 때만 이벤트 시스템 호출"""
+        if self.event_system.is_due(self.simTime):
+            self.event_system.update_events()
     
     def get_simulation_stats(self):
         """시뮬레이션 통계 데이터 수집"""
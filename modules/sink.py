@@ -0,0 +1,276 @@
+import abc
+import json
+import queue
+import struct
+import threading
+import numpy as np
+from modules.timeseries import from_epoch
+
+# 열 파일 형식
+#   [MAGIC][스키마 길이 uint32][스키마 JSON]
+#   청크 반복: [메타 길이 uint32][데이터 길이 uint64][메타 JSON][열별 원시 배열 (epoch, 스키마 순)]
+#   닫을 때: [푸터 JSON][푸터 길이 uint64][FOOTER_MAGIC]
+# 푸터(청크 위치/시각 범위 색인)가 없으면(비정상 종료) 청크 헤더를 차례로 읽어 복구한다.
+MAGIC = b"PGC1"
+FOOTER_MAGIC = b"PGCF"
+CHUNK_HEADER = struct.Struct("<IQ")
+FOOTER_TAIL = struct.Struct("<Q")
+
+
+class SnapshotSink(abc.ABC):
+    """스냅샷 열 저장소를 청크 단위로 파일에 흘려 쓰는 싱크 (기반 클래스)
+
+    - offer(store)가 아직 쓰지 않은 행이 chunk_rows개 이상이면 그 구간을 복사해 쓰기 큐에 넣는다
+    - 직렬화와 디스크 쓰기는 백그라운드 스레드가 하므로 시뮬레이션 루프는 파일 입출력을 기다리지 않는다
+    - 청크마다 파일에 flush되므로 중간에 죽어도 마지막 청크까지는 남는다
+    - 쓰기 중 오류는 보관했다가 flush()/close()에서 다시 던진다
+    - 스키마는 첫 offer()에서 행이 없어도 보내므로 스냅샷이 하나도 없는 파일도 형식을 갖춘다
+    """
+
+    def __init__(self, path, chunk_rows=256):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.rows_written = 0           # 쓰기 큐에 넣은 행 수
+        self._next = None               # 다음에 쓸 행의 시퀀스 번호 (None: 아직 스키마를 보내지 않음)
+        self._categories = {}           # 열 -> 지금까지 보낸 범주 수
+        self._queue = queue.Queue()
+        self._error = None
+        self._file = open(path, "wb")
+        self._thread = threading.Thread(target=self._run, name=f"{type(self).__name__}-writer", daemon=True)
+        self._thread.start()
+
+    # ---------------- 시뮬레이션 스레드 ----------------
+    def offer(self, store, force=False):
+        """store의 새 행이 chunk_rows개 이상 쌓였으면(force면 1개 이상) 한 청크로 보냄 -> 보낸 행 수"""
+        end = store.dropped + len(store)
+        if self._next is None:
+            self._next = store.dropped
+            self._queue.put(("schema", {name: dtype.str for name, dtype in store.dtypes.items()},
+                             list(store.categories)))
+        start = max(self._next, store.dropped)   # 링 버퍼에서 이미 버려진 행은 건너뜀
+        rows = end - start
+        if rows <= 0 or (rows < self.chunk_rows and not force):
+            return 0
+        lo, hi = start - store.dropped, end - store.dropped
+        chunk = {"epoch": store.epochs[lo:hi].copy(),
+                 "columns": {name: store.column(name)[lo:hi].copy() for name in store.dtypes},
+                 "categories": {}}
+        # 범주 열은 새로 생긴 라벨만 함께 보냄
+        for name, labels in store.categories.items():
+            sent = self._categories.get(name, 0)
+            chunk["categories"][name] = labels[sent:]
+            self._categories[name] = len(labels)
+        self._queue.put(("chunk", chunk))
+        self._next = end
+        self.rows_written += rows
+        return rows
+
+    def flush(self):
+        """쓰기 큐가 빌 때까지 대기"""
+        self._queue.join()
+        self._raise()
+
+    def close(self, store=None):
+        """남은 행을 쓰고(store가 주어지면) 파일 마무리"""
+        if store is not None:
+            self.offer(store, force=True)
+        if self._thread.is_alive():
+            self._queue.put(("close",))
+            self._thread.join()
+        self._raise()
+
+    def _raise(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    # ---------------- 쓰기 스레드 ----------------
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if self._error is None:
+                    if item[0] == "schema":
+                        self.write_schema(item[1], item[2])
+                    elif item[0] == "chunk":
+                        self.write_chunk(item[1])
+                    else:
+                        self.finish()
+                    self._file.flush()
+            except Exception as e:
+                self._error = e
+            finally:
+                if item[0] == "close":
+                    self._file.close()
+                self._queue.task_done()
+            if item[0] == "close":
+                return
+
+    def write_schema(self, dtypes, categorical):
+        pass
+
+    @abc.abstractmethod
+    def write_chunk(self, chunk):
+        """청크 하나를 파일에 씀 (쓰기 스레드에서 호출)"""
+
+    def finish(self):
+        pass
+
+
+class NDJSONSink(SnapshotSink):
+    """줄마다 스냅샷 하나인 JSON (NDJSON) - 다른 도구와 주고받기용"""
+
+    def __init__(self, path, chunk_rows=256):
+        self._labels = {}
+        super().__init__(path, chunk_rows)
+
+    def write_chunk(self, chunk):
+        columns = {name: values.tolist() for name, values in chunk["columns"].items()}
+        for name, labels in chunk["categories"].items():
+            self._labels.setdefault(name, []).extend(labels)
+        lines = []
+        for i, epoch in enumerate(chunk["epoch"].tolist()):
+            row = {"timestamp": from_epoch(epoch).isoformat()}
+            for name, values in columns.items():
+                value = values[i]
+                if name in self._labels:
+                    value = self._labels[name][value] if value >= 0 else None
+                row[name] = value
+            lines.append(json.dumps(row, ensure_ascii=False))
+        self._file.write(("\n".join(lines) + "\n").encode("utf-8"))
+
+
+class ColumnarSink(SnapshotSink):
+    """열 단위 이진 파일 - 청크마다 열별 원시 배열, 닫을 때 청크 색인 푸터 기록"""
+
+    def __init__(self, path, chunk_rows=4096):
+        self._index = []            # [파일 위치, 행 수, 첫 epoch, 마지막 epoch]
+        self._schema = None
+        self._labels = {}
+        super().__init__(path, chunk_rows)
+
+    def write_schema(self, dtypes, categorical):
+        self._schema = {"columns": [[name, dtype] for name, dtype in dtypes.items()], "categorical": categorical}
+        body = json.dumps(self._schema).encode("utf-8")
+        self._file.write(MAGIC + struct.pack("<I", len(body)) + body)
+
+    def write_chunk(self, chunk):
+        epochs = chunk["epoch"]
+        for name, labels in chunk["categories"].items():
+            self._labels.setdefault(name, []).extend(labels)
+        meta = json.dumps({"rows": len(epochs), "first": int(epochs[0]), "last": int(epochs[-1]),
+                           "categories": chunk["categories"]}, ensure_ascii=False).encode("utf-8")
+        data = [np.ascontiguousarray(epochs, dtype="<i8").tobytes()]
+        data += [np.ascontiguousarray(chunk["columns"][name], dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+                 for name, dtype in self._schema["columns"]]
+        size = sum(len(part) for part in data)
+        self._index.append([self._file.tell(), len(epochs), int(epochs[0]), int(epochs[-1])])
+        self._file.write(CHUNK_HEADER.pack(len(meta), size) + meta)
+        for part in data:
+            self._file.write(part)
+
+    def finish(self):
+        if self._schema is None:
+            # offer()가 한 번도 없었던 경우: 빈 스키마라도 써서 읽을 수 있는 파일로 마무리
+            self.write_schema({}, [])
+        footer = json.dumps({"chunks": self._index, "categories": self._labels}, ensure_ascii=False).encode("utf-8")
+        self._file.write(footer + FOOTER_TAIL.pack(len(footer)) + FOOTER_MAGIC)
+
+
+class ColumnarReader:
+    """ColumnarSink 파일 읽기 - 푸터 색인으로 필요한 청크만 읽는 시각 구간 조회"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"열 스냅샷 파일이 아닙니다: {path}")
+            (length,) = struct.unpack("<I", f.read(4))
+            schema = json.loads(f.read(length).decode("utf-8"))
+            self.data_start = f.tell()
+            self.columns = [(name, np.dtype(dtype).newbyteorder("<")) for name, dtype in schema["columns"]]
+            self.categorical = schema["categorical"]
+            self.complete = self._read_footer(f)
+            if not self.complete:
+                self._scan(f)
+        self.first_epochs = np.array([c[2] for c in self.chunks], dtype=np.int64)
+        self.last_epochs = np.array([c[3] for c in self.chunks], dtype=np.int64)
+
+    def _read_footer(self, f):
+        f.seek(0, 2)
+        end = f.tell()
+        tail = FOOTER_TAIL.size + len(FOOTER_MAGIC)
+        if end - self.data_start < tail:
+            return False
+        f.seek(end - tail)
+        raw = f.read(tail)
+        if raw[FOOTER_TAIL.size:] != FOOTER_MAGIC:
+            return False
+        (length,) = FOOTER_TAIL.unpack(raw[:FOOTER_TAIL.size])
+        f.seek(end - tail - length)
+        footer = json.loads(f.read(length).decode("utf-8"))
+        self.chunks = footer["chunks"]
+        self.categories = footer["categories"]
+        return True
+
+    def _scan(self, f):
+        """푸터가 없는 파일(비정상 종료)은 청크 헤더를 따라가며 색인 복구 (끝이 잘린 청크는 버림)"""
+        self.chunks = []
+        self.categories = {}
+        f.seek(0, 2)
+        end = f.tell()
+        offset = self.data_start
+        while offset + CHUNK_HEADER.size <= end:
+            f.seek(offset)
+            meta_length, size = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+            if offset + CHUNK_HEADER.size + meta_length + size > end:
+                break
+            meta = json.loads(f.read(meta_length).decode("utf-8"))
+            for name, labels in meta["categories"].items():
+                self.categories.setdefault(name, []).extend(labels)
+            self.chunks.append([offset, meta["rows"], meta["first"], meta["last"]])
+            offset += CHUNK_HEADER.size + meta_length + size
+
+    def __len__(self):
+        return sum(c[1] for c in self.chunks)
+
+    def _read_chunk(self, f, chunk, names):
+        offset, rows = chunk[0], chunk[1]
+        f.seek(offset)
+        meta_length, _ = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+        base = offset + CHUNK_HEADER.size + meta_length
+        f.seek(base)
+        epochs = np.frombuffer(f.read(rows * 8), dtype="<i8")
+        position = base + rows * 8
+        values = {}
+        for name, dtype in self.columns:
+            if name in names:
+                f.seek(position)
+                values[name] = np.frombuffer(f.read(rows * dtype.itemsize), dtype=dtype)
+            position += rows * dtype.itemsize
+        return epochs, values
+
+    def read(self, start=None, end=None, columns=None):
+        """[start, end) epoch 구간 -> (epoch 배열, {열: 배열}) - 겹치는 청크만 읽음"""
+        names = [name for name, _ in self.columns] if columns is None else list(columns)
+        lo = 0 if start is None else int(np.searchsorted(self.last_epochs, start, side="left"))
+        hi = len(self.chunks) if end is None else int(np.searchsorted(self.first_epochs, end, side="left"))
+        parts = []
+        with open(self.path, "rb") as f:
+            for chunk in self.chunks[lo:hi]:
+                parts.append(self._read_chunk(f, chunk, names))
+        if not parts:
+            return np.empty(0, dtype=np.int64), {name: np.empty(0, dtype=dict(self.columns)[name]) for name in names}
+        epochs = np.concatenate([p[0] for p in parts])
+        values = {name: np.concatenate([p[1][name] for p in parts]) for name in names}
+        mask = np.ones(len(epochs), dtype=bool)
+        if start is not None:
+            mask &= epochs >= start
+        if end is not None:
+            mask &= epochs < end
+        return epochs[mask], {name: arr[mask] for name, arr in values.items()}
+
+    def labels(self, name, codes):
+        """범주 열 코드 -> 문자열 목록"""
+        table = self.categories.get(name, [])
+        return [table[c] if c >= 0 else None for c in np.asarray(codes).tolist()]
@@ -0,0 +1,301 @@
+import time
+import numpy as np
+from datetime import timedelta
+from modules.economics import EconomicModel
+from modules.battery import BatteryFleet
+from modules.generators import hydrogen_parameters
+
+def solve_storage_dp(capacity, soc, charge_eff, discharge_eff, max_charge, max_discharge,
+                     charge_limit, discharge_limit, prices, terminal_price, levels=21):
+    """저장장치 N개의 H스텝 최적 충방전을 동적계획법으로 한 번에 계산
+
+    저장량을 levels 단계로 나누고 (장치, 현재 단계, 이동 폭) 배열 위에서 역방향 DP를 수행한다.
+    이동 폭은 스텝당 충방전 한도 안의 단계 차이만 두므로 배열 크기는 N x levels x (한도 / 단계 간격)이다.
+    - capacity, soc, charge_eff, discharge_eff, max_charge, max_discharge, terminal_price: (N,)
+      max_charge/max_discharge는 스텝당 저장량 변화 한도
+    - charge_limit: (N, H) 스텝당 계통에서 끌어올 수 있는 전력량 한도
+    - discharge_limit: (N, H) 스텝당 내보낼 수 있는 전력량 한도
+    - prices: (N, H) 또는 (H,) 스텝별 전력 가치
+    반환: (N, H) 스텝별 저장량 변화 계획 (+충전 / -방전)
+    """
+    capacity = np.asarray(capacity, dtype=float)
+    count = len(capacity)
+    horizon = np.shape(prices)[-1]
+    prices = np.broadcast_to(np.asarray(prices, dtype=float), (count, horizon))
+    if count == 0 or horizon == 0:
+        return np.zeros((count, horizon))
+
+    charge_eff = np.asarray(charge_eff, dtype=float)
+    discharge_eff = np.asarray(discharge_eff, dtype=float)
+    max_charge = np.asarray(max_charge, dtype=float)
+    max_discharge = np.asarray(max_discharge, dtype=float)
+    step = capacity / (levels - 1)
+    grid = np.arange(levels)
+    # 한 스텝에 움직일 수 있는 단계 수(충방전 한도 / 단계 간격) 안의 전이만 만든다 -> (N, K, 띠 폭) 배열
+    moving = step > 0
+    up = int(np.minimum(np.floor((max_charge[moving] + 1e-9) / step[moving]), levels - 1).max(initial=0))
+    down = int(np.minimum(np.floor((max_discharge[moving] + 1e-9) / step[moving]), levels - 1).max(initial=0))
+    offsets = np.arange(-down, up + 1)
+    successor = grid[:, None] + offsets[None, :]                                # (K, B) 다음 단계
+    outside = (successor < 0) | (successor >= levels)
+    successor = np.clip(successor, 0, levels - 1)
+    delta = offsets[None, :] * step[:, None]                                     # (N, B) 저장량 변화
+    charging = delta > 0
+    grid_energy = np.where(charging, delta / charge_eff[:, None], 0.0)
+    delivered = np.where(charging, 0.0, -delta * discharge_eff[:, None])
+    rate_ok = (delta <= max_charge[:, None] + 1e-9) & (-delta <= max_discharge[:, None] + 1e-9)
+    # 가치가 같으면 움직이지 않도록 아주 작은 이동 비용
+    move_cost = 1e-9 * np.abs(delta)
+
+    # 종료 시점 저장량 가치 (남은 에너지를 평균 가격으로 방전했다고 가정)
+    value = (grid[None, :] * step[:, None]) * (np.asarray(terminal_price, dtype=float) * discharge_eff)[:, None]
+    policy = np.empty((horizon, count, levels), dtype=np.intp)
+    for t in range(horizon - 1, -1, -1):
+        feasible = rate_ok & (grid_energy <= charge_limit[:, t, None] + 1e-9) & \
+                   (delivered <= discharge_limit[:, t, None] + 1e-9)
+        gain = np.where(feasible, prices[:, t, None] * (delivered - grid_energy) - move_cost, -np.inf)
+        q = gain[:, None, :] + value[:, successor]
+        q[:, outside] = -np.inf
+        choice = q.argmax(axis=2)
+        policy[t] = successor[grid[None, :], choice]
+        value = np.take_along_axis(q, choice[:, :, None], axis=2)[:, :, 0]
+
+    # 현재 저장량에서 정방향으로 계획 추적
+    rows = np.arange(count)
+    level = np.clip(np.rint(np.divide(soc, step, out=np.zeros(count), where=step > 0)), 0, levels - 1).astype(np.intp)
+    schedule = np.empty((count, horizon))
+    for t in range(horizon):
+        next_level = policy[t][rows, level]
+        schedule[:, t] = (next_level - level) * step
+        level = next_level
+    return schedule
+
+
+class StorageScheduler:
+    """스마트 그리드 배터리와 수소 저장소의 롤링 호라이즌 최적 운전 계획
+
+    매 시뮬레이션 시간(정시)마다 향후 horizon시간의 수요/태양광/가격을 예측하고
+    solve_storage_dp로 전체 저장장치 계획을 한 번에 다시 세운 뒤, 첫 시간의 계획 출력만 실행한다.
+    - 가격: EconomicModel.price_forecast (계통 잉여 시간은 surplus_price_ratio 배로 할인)
+    - 배터리: 자기 건물 예상 수요까지만 방전 (역송 없음), 충전은 계통에서
+    - 수소: 계통 잉여 시간에만 수전해, 부족 시간에만 연료전지 (잉여/부족량은 저장소 수로 나눔)
+      계획은 저장 에너지 단위로 세우고, 질량(kg) 저장소는 hydrogen_energy_density로 환산해
+      HydrogenEnergyStorage.charge/discharge로 실행한다
+    """
+
+    def __init__(self, power_system, horizon=24, levels=21, battery_power_ratio=0.25,
+                 hydrogen_power_ratio=0.1, surplus_price_ratio=0.05, max_levels=201):
+        self.power_system = power_system
+        self.simulator = power_system.simulator
+        self.horizon = horizon
+        self.levels = levels
+        self.max_levels = max_levels    # 충방전 한도가 저장 단계 간격보다 작을 때 늘릴 수 있는 최대 단계 수
+        self.battery_power_ratio = battery_power_ratio      # 배터리 시간당 최대 충방전 (용량 대비)
+        self.hydrogen_power_ratio = hydrogen_power_ratio    # 수소 저장소 시간당 최대 충방전 (용량 대비)
+        self.surplus_price_ratio = surplus_price_ratio
+
+        self.units = []          # (건물, "battery" | "hydrogen")
+        self.schedule = np.zeros((0, horizon))
+        self.plan_power = {}     # 건물 idx -> 이번 시간 계획 출력 (저장량 변화율, +충전)
+        self.prices = np.zeros(horizon)
+        self.net_load = np.zeros(horizon)
+        self.last_plan_ms = 0.0
+        self._plan_key = None
+        self._last_dispatch = None
+        self._fallback_economics = None
+
+    def _economics(self):
+        if self.simulator.economic_model is not None:
+            return self.simulator.economic_model
+        if self._fallback_economics is None:
+            self._fallback_economics = EconomicModel(self.simulator)
+        return self._fallback_economics
+
+    def _collect_units(self):
+        buildings = self.simulator.city.buildings
+        fleet = self.power_system.battery_fleet
+        fleet.sync(buildings)
+        units = [(b, "battery") for b, mode in zip(fleet.members, fleet.mode.tolist())
+                 if mode == BatteryFleet.MODE_SMART_GRID and not b.removed]
+        units += [(b, "hydrogen") for b in self.power_system.generators.fleet("hydrogen", buildings)
+                  if not b.removed and b.hydrogen_storage > 0]
+        return units
+
+    def forecast(self, start, hours, batteries=()):
+        """향후 hours시간 예측 -> (가격, 계통 순부하, 배터리 건물별 수요)"""
+        simulator = self.simulator
+        power_system = self.power_system
+        weather = simulator.weather_system
+        buildings = simulator.city.buildings
+        times = [start + timedelta(hours=h) for h in range(hours)]
+
+        prices = np.array(self._economics().price_forecast(start, hours), dtype=float)
+
+        # 수요: 수요 건물 기본 수요 x 수요 인자 테이블
+        if power_system.demand_table is None:
+            power_system.build_demand_table()
+        table = power_system.demand_table
+        consumers = [b for b in buildings if not b.removed and b.base_supply <= 0]
+        base = np.array([-b.base_supply for b in consumers], dtype=float)
+        codes = np.array([b.type_code for b in consumers], dtype=np.intp)
+        battery_base = np.array([max(-b.base_supply, 0.0) for b in batteries], dtype=float)
+        battery_codes = np.array([b.type_code for b in batteries], dtype=np.intp)
+        demand = np.zeros(hours)
+        battery_demand = np.zeros((len(batteries), hours))
+        if table is not None:
+            for h, t in enumerate(times):
+                if len(base):
+                    demand[h] = float(base @ table.factors(codes, t))
+                if len(battery_base):
+                    battery_demand[:, h] = battery_base * table.factors(battery_codes, t)
+
+        # 태양광: 시간별 태양 고도 x 현재 구름량 유지 가정
+        solar_capacity = sum(b.solar_capacity for b in buildings if not b.removed)
+        region_info = weather.get_region_info(simulator.region)
+        lat = region_info.get("lat", 37.5665)
+        lon = region_info.get("lon", 126.9780)
+        solar = np.zeros(hours)
+        if solar_capacity > 0:
+            for h, t in enumerate(times):
+                altitude, _ = weather.get_sun_position(t, lat, lon)
+                solar[h] = solar_capacity * weather.compute_solar_radiation(altitude, weather.cloud_factor, 30, 180) * weather.solar_efficiency
+
+        # 계통 순부하: 현재 (저장소 제외) 순부하에 예측 변화분을 더함
+        net_now = -sum(b.current_supply for b in buildings
+                       if not b.removed and getattr(b, 'power_plant_type', None) != 'hydrogen')
+        net_load = net_now + (demand - demand[0]) - (solar - solar[0])
+        return prices, net_load, battery_demand
+
+    def plan(self):
+        """전체 저장장치 운전 계획 다시 세우기"""
+        started = time.perf_counter()
+        self.units = self._collect_units()
+        batteries = [b for b, kind in self.units if kind == "battery"]
+        hydrogen = [b for b, kind in self.units if kind == "hydrogen"]
+        hours = self.horizon
+
+        prices, net_load, battery_demand = self.forecast(self.simulator.simTime, hours, batteries)
+        value = np.where(net_load > 0, prices, prices * self.surplus_price_ratio)
+        self.prices = prices
+        self.net_load = net_load
+
+        count = len(self.units)
+        capacity = np.empty(count)
+        soc = np.empty(count)
+        charge_eff = np.empty(count)
+        discharge_eff = np.empty(count)
+        max_charge = np.empty(count)
+        max_discharge = np.empty(count)
+        charge_limit = np.empty((count, hours))
+        discharge_limit = np.empty((count, hours))
+
+        round_trip = dict(zip((id(b) for b in self.power_system.battery_fleet.members),
+                              self.power_system.battery_fleet.round_trip.tolist()))
+        for i, b in enumerate(batteries):
+            capacity[i] = b.battery_capacity
+            soc[i] = min(b.battery_charge, b.battery_capacity)
+            charge_eff[i] = discharge_eff[i] = round_trip.get(id(b), 0.95)
+            max_charge[i] = max_discharge[i] = b.battery_capacity * self.battery_power_ratio
+            charge_limit[i] = np.inf
+            discharge_limit[i] = battery_demand[i]
+
+        share = max(len(hydrogen), 1)
+        surplus = np.maximum(-net_load, 0.0) / share
+        shortage = np.maximum(net_load, 0.0) / share
+        for j, b in enumerate(hydrogen):
+            i = len(batteries) + j
+            charge_eff[i], discharge_eff[i], energy_density = hydrogen_parameters(b)
+            capacity[i] = b.hydrogen_storage * energy_density
+            soc[i] = min(b.hydrogen_level, b.hydrogen_storage) * energy_density
+            if hasattr(b, 'max_charge_rate'):
+                # 정격 충방전 속도는 계통 쪽 전력 -> 저장 에너지 변화 한도로 환산
+                max_charge[i] = b.max_charge_rate * charge_eff[i]
+                max_discharge[i] = b.max_discharge_rate / discharge_eff[i]
+            else:
+                max_charge[i] = max_discharge[i] = capacity[i] * self.hydrogen_power_ratio
+            charge_limit[i] = surplus
+            discharge_limit[i] = shortage
+
+        # 호라이즌 안에 도달 가능한 저장량 범위로 격자를 좁히고, 한 단계 간격이 충방전 한도를 넘지 않도록 장치별 단계 수 조정
+        # (대용량 질량 저장소는 용량 대비 충방전 한도가 작아 기본 단계로는 움직일 수 없음)
+        # 단계 수가 같은 장치끼리 묶어 풀므로 촘촘한 격자가 필요한 장치 하나 때문에 나머지 배열이 커지지 않는다
+        lower = np.maximum(soc - max_discharge * hours, 0.0)
+        upper = np.minimum(soc + max_charge * hours, capacity)
+        rate = np.minimum(max_charge, max_discharge)
+        moving = rate > 0
+        needed = np.full(count, float(self.levels))
+        needed[moving] = np.ceil(np.minimum((upper - lower)[moving] / rate[moving], self.max_levels)) + 1
+        unit_levels = np.clip(needed, self.levels, self.max_levels).astype(int)
+        terminal_price = np.full(count, float(value.mean()) if hours else 0.0)
+        self.schedule = np.zeros((count, hours))
+        for levels in np.unique(unit_levels).tolist():
+            group = unit_levels == levels
+            self.schedule[group] = solve_storage_dp(
+                (upper - lower)[group], (soc - lower)[group], charge_eff[group], discharge_eff[group],
+                max_charge[group], max_discharge[group], charge_limit[group], discharge_limit[group],
+                np.broadcast_to(value, (count, hours))[group], terminal_price[group], levels)
+        self.plan_power = {b.idx: float(self.schedule[i, 0]) for i, (b, _) in enumerate(self.units)} if hours else {}
+        self._plan_key = self._hour_key()
+        self.last_plan_ms = (time.perf_counter() - started) * 1000.0
+
+    def _hour_key(self):
+        t = self.simulator.simTime
+        return (t.year, t.timetuple().tm_yday, t.hour)
+
+    def dispatch(self):
+        """이번 틱 계획 출력 실행 (정시가 바뀌면 먼저 재계획)"""
+        if self._plan_key != self._hour_key():
+            self.plan()
+        now = self.simulator.simTime
+        dt_hours = 0.0
+        if self._last_dispatch is not None:
+            dt_hours = min(max((now - self._last_dispatch).total_seconds() / 3600.0, 0.0), 1.0)
+        self._last_dispatch = now
+
+        for b, kind in self.units:
+            if b.removed:
+                continue
+            power = self.plan_power.get(b.idx, 0.0)
+            if kind == "battery":
+                if dt_hours > 0:
+                    # 흐른 시간이 없으면 충전량이 그대로인데 계통 전력만 주고받게 되므로 건너뜀
+                    self._dispatch_battery(b, power, dt_hours)
+            else:
+                self._dispatch_hydrogen(b, power, dt_hours)
+
+    @staticmethod
+    def _clip_power(power, level, capacity, dt_hours):
+        """저장량 범위를 넘지 않도록 출력 제한"""
+        if dt_hours > 0:
+            power = min(power, (capacity - level) / dt_hours)
+            power = max(power, -level / dt_hours)
+        return power
+
+    def _dispatch_battery(self, b, power, dt_hours):
+        efficiency = getattr(b, 'battery_efficiency', self.power_system.battery_fleet.efficiency)
+        power = self._clip_power(power, b.battery_charge, b.battery_capacity, dt_hours)
+        if power > 0:
+            b.current_supply -= power / efficiency
+        elif power < 0:
+            # 자기 건물 수요까지만 방전
+            delivered = min(-power * efficiency, max(-b.current_supply, 0.0))
+            power = -delivered / efficiency
+            b.current_supply += delivered
+        b.battery_charge += power * dt_hours
+
+    def _dispatch_hydrogen(self, b, power, dt_hours):
+        """계획 출력(저장 에너지 변화율, +충전) 실행 - 질량 저장소는 모델의 charge/discharge로 변환"""
+        charge_eff, discharge_eff, energy_density = hydrogen_parameters(b)
+        power = self._clip_power(power, b.hydrogen_level * energy_density, b.hydrogen_storage * energy_density, dt_hours)
+        convert = hasattr(b, 'charge') and dt_hours > 0
+        if power > 0:
+            if convert:
+                b.current_supply = -b.charge(power / charge_eff, duration=dt_hours)
+                return
+            b.current_supply = -power / charge_eff  # 수전해 전력은 수요
+        elif power < 0:
+            if convert:
+                b.current_supply = b.discharge(-power * discharge_eff, duration=dt_hours)
+                return
+            b.current_supply = -power * discharge_eff  # 연료전지 발전
+        b.hydrogen_level += power * dt_hours / energy_density
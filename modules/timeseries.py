@@ -0,0 +1,207 @@
+import numpy as np
+from datetime import datetime, timezone
+
+def to_epoch(t):
+    """datetime(시뮬레이션 시각, naive) -> int 초 (UTC로 간주)"""
+    if isinstance(t, datetime):
+        if t.tzinfo is None:
+            t = t.replace(tzinfo=timezone.utc)
+        return int(t.timestamp())
+    return int(t)
+
+def from_epoch(epoch):
+    """int 초 -> naive datetime (to_epoch의 역변환)"""
+    return datetime.fromtimestamp(int(epoch), tz=timezone.utc).replace(tzinfo=None)
+
+
+class TimeSeriesStore:
+    """시간 인덱스 열(column) 저장소
+
+    - 시각은 int64 epoch 초, 값은 열마다 고정 dtype 배열 (기본 float64)
+    - 용량이 차면 두 배로 늘리고(chunk를 주면 chunk 행 단위로 늘려 여유 공간을 한 덩어리 이하로 유지),
+      max_length를 넘으면 오래된 절반을 버려 메모리 상한 유지 (링 버퍼)
+    - 시각은 단조 증가해야 하고 (같은 시각은 허용, 더 이른 시각은 append가 ValueError)
+      구간 조회는 이진 탐색 O(log n), 결과는 복사 없는 배열 뷰
+    - categorical 열은 문자열을 정수 코드로 저장 (categories[열][코드] = 문자열)
+    """
+
+    def __init__(self, columns=("value",), capacity=1024, max_length=None, categorical=(), chunk=None):
+        if isinstance(columns, dict):
+            self.dtypes = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        else:
+            self.dtypes = {name: np.dtype(float) for name in columns}
+        for name in categorical:
+            self.dtypes[name] = np.dtype(np.int32)
+        self.categories = {name: [] for name in categorical}
+        self._codes = {name: {} for name in categorical}
+        self.max_length = max_length
+        self.chunk = chunk
+        self.dropped = 0          # 링 버퍼에서 버린 행 수 (시퀀스 번호 = dropped + 행 위치)
+        self._size = 0
+        if max_length is not None:
+            capacity = min(capacity, max_length)
+        self._epoch = np.empty(max(capacity, 16), dtype=np.int64)
+        self._data = {name: np.empty(len(self._epoch), dtype=dtype) for name, dtype in self.dtypes.items()}
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        """할당된 배열 메모리 (바이트)"""
+        return self._epoch.nbytes + sum(arr.nbytes for arr in self._data.values())
+
+    # ---------------- 추가 ----------------
+    def _reserve(self, needed):
+        size = len(self._epoch)
+        if needed <= size:
+            return
+        if self.max_length is not None and needed > self.max_length:
+            # 오래된 절반을 버리고 앞으로 당김 (분할 상환 O(1))
+            drop = max(needed - self.max_length, self._size // 2)
+            keep = self._size - drop
+            self._epoch[:keep] = self._epoch[drop:self._size]
+            for arr in self._data.values():
+                arr[:keep] = arr[drop:self._size]
+            self._size = keep
+            self.dropped += drop
+            needed -= drop
+            if needed <= size:
+                return
+        if self.chunk:
+            size = -(-needed // self.chunk) * self.chunk
+        while size < needed:
+            size *= 2
+        if self.max_length is not None:
+            size = max(min(size, self.max_length), needed)
+        epoch = np.empty(size, dtype=np.int64)
+        epoch[:self._size] = self._epoch[:self._size]
+        self._epoch = epoch
+        for name, arr in self._data.items():
+            grown = np.empty(size, dtype=arr.dtype)
+            grown[:self._size] = arr[:self._size]
+            self._data[name] = grown
+
+    def code(self, column, label):
+        """categorical 열의 문자열 -> 정수 코드 (처음 보는 값이면 등록)"""
+        codes = self._codes[column]
+        if label not in codes:
+            codes[label] = len(self.categories[column])
+            self.categories[column].append(label)
+        return codes[label]
+
+    def append(self, time, **values):
+        """한 행 추가 -> 시퀀스 번호 (빠진 열은 0 / 결측 코드 -1)"""
+        epoch = to_epoch(time)
+        if self._size and epoch < self._epoch[self._size - 1]:
+            raise ValueError(f"시각이 거꾸로 감: {from_epoch(epoch)} < {from_epoch(self._epoch[self._size - 1])}")
+        self._reserve(self._size + 1)
+        i = self._size
+        self._epoch[i] = epoch
+        for name, arr in self._data.items():
+            value = values.get(name)
+            if name in self.categories:
+                arr[i] = -1 if value is None else self.code(name, value)
+            else:
+                arr[i] = 0 if value is None else value
+        self._size = i + 1
+        return self.dropped + i
+
+    # ---------------- 조회 ----------------
+    @property
+    def epochs(self):
+        return self._epoch[:self._size]
+
+    def column(self, name):
+        return self._data[name][:self._size]
+
+    def labels(self, name):
+        """categorical 열을 문자열 목록으로 복원"""
+        table = self.categories[name]
+        return [table[c] if c >= 0 else None for c in self.column(name).tolist()]
+
+    def last(self, name):
+        return self._data[name][self._size - 1] if self._size else None
+
+    def span(self, start=None, end=None):
+        """[start, end) 구간의 행 범위 (lo, hi) - 이진 탐색"""
+        epochs = self.epochs
+        lo = 0 if start is None else int(np.searchsorted(epochs, to_epoch(start), side="left"))
+        hi = self._size if end is None else int(np.searchsorted(epochs, to_epoch(end), side="left"))
+        return lo, max(lo, hi)
+
+    def range(self, start=None, end=None, columns=None):
+        """[start, end) 구간 -> (epoch 뷰, {열: 값 뷰})"""
+        lo, hi = self.span(start, end)
+        names = self.dtypes if columns is None else columns
+        return self._epoch[lo:hi], {name: self._data[name][lo:hi] for name in names}
+
+    def resample(self, column, interval, start=None, end=None, how="mean"):
+        """interval(초 또는 timedelta) 단위 구간 집계 -> (구간 시작 epoch, 집계값)
+
+        how: mean / sum / min / max / last / count (값이 없는 구간은 결과에서 빠짐)
+        """
+        if hasattr(interval, "total_seconds"):
+            interval = interval.total_seconds()
+        interval = int(interval)
+        epochs, values = self.range(start, end, (column,))
+        values = values[column].astype(float, copy=False)
+        if len(epochs) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        buckets = epochs // interval
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        counts = np.diff(np.r_[starts, len(epochs)])
+        if how == "sum":
+            result = np.add.reduceat(values, starts)
+        elif how == "mean":
+            result = np.add.reduceat(values, starts) / counts
+        elif how == "min":
+            result = np.minimum.reduceat(values, starts)
+        elif how == "max":
+            result = np.maximum.reduceat(values, starts)
+        elif how == "last":
+            result = values[starts + counts - 1]
+        elif how == "count":
+            result = counts.astype(float)
+        else:
+            raise ValueError(f"지원하지 않는 집계 방식: {how}")
+        return buckets[starts] * interval, result
+
+    def rolling(self, column, window, start=None, end=None):
+        """최근 window개 행의 이동 평균/표준편차 (누적합 기반 O(n)) -> (epoch, 평균, 표준편차)
+
+        앞쪽 window-1개 행은 그때까지의 행만으로 계산한다.
+        """
+        epochs, values = self.range(start, end, (column,))
+        values = values[column].astype(float)
+        count = len(values)
+        if count == 0:
+            return epochs, np.empty(0), np.empty(0)
+        # 수치 안정성을 위해 평균을 뺀 값으로 누적
+        shift = values.mean()
+        centered = values - shift
+        c1 = np.r_[0.0, np.cumsum(centered)]
+        c2 = np.r_[0.0, np.cumsum(centered * centered)]
+        hi = np.arange(1, count + 1)
+        lo = np.maximum(hi - window, 0)
+        n = hi - lo
+        s1 = c1[hi] - c1[lo]
+        s2 = c2[hi] - c2[lo]
+        mean = s1 / n
+        var = np.maximum(s2 / n - mean * mean, 0.0)
+        return epochs, mean + shift, np.sqrt(var)
+
+    def to_records(self, start=None, end=None):
+        """기존 dict 목록 형식으로 변환 (저장/호환용, 복사 발생)"""
+        lo, hi = self.span(start, end)
+        records = []
+        for i in range(lo, hi):
+            record = {"time": from_epoch(self._epoch[i]).isoformat()}
+            for name, arr in self._data.items():
+                if name in self.categories:
+                    c = int(arr[i])
+                    record[name] = self.categories[name][c] if c >= 0 else None
+                else:
+                    record[name] = arr[i].item()
+            records.append(record)
+        return records
@@ -1,6 +1,9 @@
 import random
 import math
+import numpy as np
 from data import region_data
+from modules.wind import WindModel
+from modules.climate import get_climate_model
 
 class WeatherSystem:
     def __init__(self, simulator):
@@ -14,6 +17,7 @@ class WeatherSystem:
         self.humidity = 50.0  # 습도 속성 초기화 추가
         self.cloud_factor = 0.0  # 구름량 속성 초기화 추가
         self.wind_speed = 5.0  # 풍속 (m/s) 초기화
+        self.wind_model = WindModel(self)  # 자기상관 풍속 과정 (기준 높이 풍속)
         
         # 미세먼지 시스템 추가
         self.current_pm_level = "good"  # 현재 미세먼지 수준
@@ -43,6 +47,9 @@ class WeatherSystem:
         self.weather_duration -= dt_sim_minutes
         if self.weather_duration <= 0:
             self.update_weather()
+        
+        # 풍속 과정 진행 (기준 높이 풍속)
+        self.wind_speed = self.wind_model.advance(dt_sim_minutes)
             
         # 미세먼지 지속 시간 감소
         self.pm_duration -= dt_sim_minutes
@@ -62,6 +69,11 @@ class WeatherSystem:
         # 기본값 (서울)
         return region_data["Seoul"]
     
+    @property
+    def climate(self):
+        """현재 시뮬레이터 지역의 기후 모델 (지역별로 한 번만 구성됨)"""
+        return get_climate_model(getattr(self.simulator, "region", "Seoul"))
+    
     def get_season(self):
         """현재 계절을 반환"""
         month = self.simulator.simTime.month
@@ -148,15 +160,26 @@ class WeatherSystem:
         # 최종 출력 (W/m²)
         return panel_irradiance / 1000.0  # 정규화된 값 반환 (0~1 범위)
     
+    def compute_solar_radiation_batch(self, alt_deg, cloud_factor, panel_tilts, panel_azimuths):
+        """compute_solar_radiation의 배열 버전 - 같은 태양 고도에서 패널 배열 전체를 한 번에 계산"""
+        panel_tilts = np.asarray(panel_tilts, dtype=float)
+        if alt_deg <= 0:
+            return np.zeros(len(panel_tilts))
+        
+        dni = 1000.0 * math.sin(math.radians(alt_deg)) ** 0.7 * (1.0 - 0.75 * cloud_factor)
+        dhi = dni * (0.2 + 0.4 * cloud_factor)
+        
+        azimuth_factor = np.maximum(0.5, np.cos(np.radians(np.abs(180.0 - np.asarray(panel_azimuths, dtype=float)))))
+        tilt_factor = 1.0 - (np.abs(30.0 - panel_tilts) / 90.0) * 0.3
+        
+        return (dni * azimuth_factor * tilt_factor + dhi * 0.5) / 1000.0
+    
     def get_korea_temperature(self, current_time, current_weather):
         """시간, 월, 날씨에 따른 기온 계산"""
-        month = current_time.month
         hour = current_time.hour
         
-        # 월별 기본 평균 온도 (서울 기준)
-        monthly_avg = [
-            -2.4, -0.4, 5.7, 12.5, 17.8, 22.2, 24.9, 25.7, 21.2, 14.8, 7.2, -0.4
-        ]
+        # 일 평균 온도 (기후 모델의 월평균을 일 단위로 보간)
+        day_avg = self.climate.avg_temp(current_time.timetuple().tm_yday)
         
         # 하루 중 온도 변화 (시간별 편차, 0시 기준)
         hourly_offset = [
@@ -168,7 +191,7 @@ class WeatherSystem:
         ]
         
         # 기본 온도 계산
-        base_temp = monthly_avg[month - 1] + hourly_offset[hour]
+        base_temp = day_avg + hourly_offset[hour]
         
         # 날씨에 따른 온도 조정
         weather_offset = {
@@ -257,28 +280,12 @@ class WeatherSystem:
         """날씨 변경 처리 (확률 기반)"""
         current_month = self.simulator.simTime.month
         
-        # 날씨 변화 확률 (간단 예시)
-        weather_probs = {
-            1:  {"맑음": 0.3, "흐림": 0.3, "비": 0.1, "눈": 0.3},  # 1월
-            2:  {"맑음": 0.4, "흐림": 0.3, "비": 0.1, "눈": 0.2},
-            3:  {"맑음": 0.5, "흐림": 0.3, "비": 0.2, "눈": 0.0},
-            4:  {"맑음": 0.5, "흐림": 0.3, "비": 0.2, "눈": 0.0},
-            5:  {"맑음": 0.5, "흐림": 0.3, "비": 0.2, "눈": 0.0},
-            6:  {"맑음": 0.4, "흐림": 0.3, "비": 0.3, "눈": 0.0},
-            7:  {"맑음": 0.3, "흐림": 0.3, "비": 0.4, "눈": 0.0},
-            8:  {"맑음": 0.3, "흐림": 0.3, "비": 0.4, "눈": 0.0},
-            9:  {"맑음": 0.4, "흐림": 0.3, "비": 0.3, "눈": 0.0},
-            10: {"맑음": 0.5, "흐림": 0.4, "비": 0.1, "눈": 0.0},
-            11: {"맑음": 0.4, "흐림": 0.4, "비": 0.2, "눈": 0.0},
-            12: {"맑음": 0.3, "흐림": 0.3, "비": 0.1, "눈": 0.3}
-        }
-        
-        # 현재 달에 해당하는 확률 가져오기
-        month_probs = weather_probs.get(current_month, {"맑음": 0.5, "흐림": 0.3, "비": 0.2, "눈": 0.0})
+        # 지역/월별 날씨 확률 (기후 모델에서 정규화된 테이블)
+        month_table = self.climate.weather_table(current_month)
         
         # 날씨 변화 처리
-        weathers = list(month_probs.keys())
-        probs = list(month_probs.values())
+        weathers = [w for w, _ in month_table]
+        probs = [p for _, p in month_table]
         self.current_weather = random.choices(weathers, weights=probs, k=1)[0]
         
         # 지속 시간 설정 (30분~4시간)
@@ -301,25 +308,9 @@ class WeatherSystem:
         }
         self.solar_efficiency = weather_efficiency.get(self.current_weather, 1.0)
         
-        # 날씨에 따른 풍속 업데이트
-        if self.current_weather == "맑음":
-            self.wind_speed = random.uniform(2.0, 8.0)  # 맑은 날 약한 바람
-        elif self.current_weather == "흐림":
-            self.wind_speed = random.uniform(5.0, 12.0)  # 흐린 날 중간 바람
-        elif self.current_weather == "비":
-            self.wind_speed = random.uniform(8.0, 18.0)  # 비오는 날 강한 바람
-        elif self.current_weather == "눈":
-            self.wind_speed = random.uniform(3.0, 10.0)  # 눈오는 날 중약 바람
-        
-        # 계절별 풍속 보정
-        season_wind_factor = {
-            "봄": 1.2,  # 봄철 바람 강함
-            "여름": 0.8,  # 여름철 바람 약함
-            "가을": 1.1,  # 가을철 바람 중간
-            "겨울": 1.3   # 겨울철 바람 강함
-        }
-        season = self.get_season()
-        self.wind_speed *= season_wind_factor.get(season, 1.0)
+        # 날씨/계절에 따른 풍속 분포 갱신 (풍속 자체는 update에서 연속적으로 진행)
+        self.wind_model.on_weather_change(self.current_weather, self.get_season())
+        self.wind_speed = self.wind_model.reference_speed
     
     def update_pm_levels(self):
         """미세먼지 수준 업데이트"""
@@ -396,15 +387,8 @@ class WeatherSystem:
     
     def get_humidity_demand_factor(self, building, month):
         """습도에 따른 전력 수요 인자 계산"""
-        # 계절에 따라 적정 습도가 다름
-        if 3 <= month <= 5:  # 봄
-            optimal_humidity = 50.0
-        elif 6 <= month <= 8:  # 여름
-            optimal_humidity = 60.0
-        elif 9 <= month <= 11:  # 가을
-            optimal_humidity = 50.0
-        else:  # 겨울
-            optimal_humidity = 40.0
+        # 계절에 따라 적정 습도가 다름 (기후 모델의 월별 테이블)
+        optimal_humidity = self.climate.optimal_humidity[month - 1]
             
         # 현재 습도와 적정 습도의 차이
         humidity_diff = abs(self.humidity - optimal_humidity)
@@ -422,15 +406,8 @@ class WeatherSystem:
         temperature = self.current_temperature
         month = self.simulator.simTime.month
         
-        # 계절별 적정 온도
-        if 3 <= month <= 5:  # 봄
-            optimal_temp = 20.0
-        elif 6 <= month <= 8:  # 여름
-            optimal_temp = 24.0
-        elif 9 <= month <= 11:  # 가을
-            optimal_temp = 20.0
-        else:  # 겨울
-            optimal_temp = 18.0
+        # 계절별 적정 온도 (기후 모델의 월별 테이블)
+        optimal_temp = self.climate.optimal_temp[month - 1]
             
         # 온도 차이에 따른 소비량
         temp_diff = abs(temperature - optimal_temp)
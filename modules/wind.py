@@ -0,0 +1,172 @@
+import math
+import numpy as np
+
+class WindModel:
+    """자기상관 풍속 과정과 테이블 기반 풍력 출력 곡선
+
+    - 잠재 변수 z는 AR(1) 과정(정상분포 N(0,1))으로 블록 단위로 미리 생성
+    - z를 가우시안 코퓰라로 Weibull 주변분포 풍속으로 변환 (기준 높이 풍속)
+    - 발전소별 허브 높이로 멱법칙(power law) 보정: 풍력발전소 기본 허브 높이 80m는 기준 높이 10m 대비
+      (80/10)^0.143 ≈ 1.35배이므로 날씨별 평균 풍속(10m 기준)보다 약 35% 빠른 풍속으로 출력 곡선을 읽는다
+    - 출력 곡선은 (풍속, 출력비) 테이블을 np.interp로 전체 발전소에 한 번에 적용
+    """
+
+    # 날씨별 기준 높이(10m) 평균 풍속 (m/s)
+    WEATHER_MEAN_SPEED = {
+        "맑음": 5.0,
+        "흐림": 8.5,
+        "비": 13.0,
+        "눈": 6.5
+    }
+
+    # 계절별 풍속 보정
+    SEASON_WIND_FACTOR = {
+        "봄": 1.2,
+        "여름": 0.8,
+        "가을": 1.1,
+        "겨울": 1.3
+    }
+
+    def __init__(self, weather_system, block_size=1440, step_minutes=1.0, phi=0.98,
+                 weibull_shape=2.0, reference_height=10.0, shear_exponent=0.143, seed=None):
+        self.weather_system = weather_system
+        self.block_size = block_size          # 한 번에 생성할 샘플 수 (기본 1일치, 1분 간격)
+        self.step_minutes = step_minutes      # 샘플 간격(분)
+        self.phi = phi                        # AR(1) 자기상관 계수 (1분 간격)
+        self.weibull_shape = weibull_shape    # Weibull 형상모수 k
+        self.reference_height = reference_height  # 풍속 측정 기준 높이 (m)
+        self.shear_exponent = shear_exponent  # 풍속 고도 보정 지수 (평지 1/7)
+        self.rng = np.random.default_rng(seed)
+
+        # 잠재 AR(1) 블록 버퍼
+        self._block = np.empty(0)
+        self._cursor = 0
+        self._last_z = self.rng.standard_normal()
+        self._pending_minutes = 0.0
+
+        # Weibull 척도모수 (날씨 변화 시 목표값으로 서서히 이동)
+        self.scale = self._scale_for_mean(5.0)
+        self.target_scale = self.scale
+        self.scale_relaxation = 0.02  # 1분당 목표 척도로 접근하는 비율
+
+        # 현재 기준 높이 풍속
+        self.current_z = self._last_z
+        self.reference_speed = self._z_to_speed(np.array([self.current_z]))[0]
+
+        # 출력 곡선 테이블 (정규화 출력 0~1)
+        self.curve_speeds, self.curve_output = self.build_power_curve()
+
+        # 풍력발전소 배열 캐시
+        self._fleet_key = None
+        self._fleet_idx = np.empty(0, dtype=np.int64)
+        self._fleet_capacity = np.empty(0)
+        self._fleet_hub_factor = np.empty(0)
+
+    def build_power_curve(self, cut_in=3.0, rated=12.0, cut_out=25.0, step=0.5):
+        """풍속-출력비 테이블 생성 (시동~정격 구간 3제곱, 정격~정지 구간 정격출력)"""
+        speeds = np.arange(0.0, cut_out + step, step)
+        # 시동 풍속 직전 출력 0, 정지 풍속 직후 출력 0 (보간 구간이 생기지 않도록 바로 옆에 점 추가)
+        speeds = np.union1d(speeds, [cut_in - 1e-6, cut_in])
+        output = np.where(speeds < cut_in, 0.0, np.minimum((speeds / rated) ** 3, 1.0))
+        speeds = np.append(speeds, [cut_out + 1e-6, cut_out + 100.0])
+        output = np.append(output, [0.0, 0.0])
+        return speeds, output
+
+    def set_power_curve(self, speeds, output):
+        """측정된 출력 곡선 테이블로 교체"""
+        self.curve_speeds = np.asarray(speeds, dtype=float)
+        self.curve_output = np.asarray(output, dtype=float)
+
+    def _scale_for_mean(self, mean_speed):
+        """평균 풍속에 해당하는 Weibull 척도모수"""
+        return mean_speed / math.gamma(1.0 + 1.0 / self.weibull_shape)
+
+    def _generate_block(self):
+        """AR(1) 잠재 과정을 블록 단위로 생성 (부분 블록마다 누적합으로 벡터화)"""
+        n = self.block_size
+        phi = self.phi
+        noise = self.rng.standard_normal(n) * math.sqrt(1.0 - phi * phi)
+        block = np.empty(n)
+        z0 = self._last_z
+        # phi^-k가 커지지 않도록 256개 단위로 나누어 계산
+        chunk = 256
+        for start in range(0, n, chunk):
+            e = noise[start:start + chunk]
+            k = np.arange(1, len(e) + 1)
+            powers = phi ** k
+            block[start:start + len(e)] = powers * (z0 + np.cumsum(e / powers))
+            z0 = block[start + len(e) - 1]
+        self._block = block
+        self._cursor = 0
+        self._last_z = block[-1]
+
+    def _z_to_speed(self, z):
+        """표준정규 잠재값을 Weibull 풍속으로 변환"""
+        u = 0.5 * (1.0 + _erf(z / math.sqrt(2.0)))
+        u = np.clip(u, 1e-12, 1.0 - 1e-12)
+        return self.scale * (-np.log1p(-u)) ** (1.0 / self.weibull_shape)
+
+    def on_weather_change(self, weather, season):
+        """날씨/계절 변화 시 목표 Weibull 척도모수 갱신"""
+        mean_speed = self.WEATHER_MEAN_SPEED.get(weather, 5.0) * self.SEASON_WIND_FACTOR.get(season, 1.0)
+        self.target_scale = self._scale_for_mean(mean_speed)
+
+    def advance(self, dt_minutes):
+        """시뮬레이션 시간만큼 풍속 과정 진행, 기준 높이 풍속 반환"""
+        self._pending_minutes += max(0.0, dt_minutes)
+        steps = int(self._pending_minutes / self.step_minutes)
+        if steps <= 0:
+            return self.reference_speed
+        self._pending_minutes -= steps * self.step_minutes
+
+        # 블록을 넘어가면 새 블록 생성 (중간 샘플은 건너뜀)
+        remaining = steps
+        while self._cursor + remaining > len(self._block):
+            remaining -= len(self._block) - self._cursor
+            self._generate_block()
+        self._cursor += remaining
+        self.current_z = self._block[self._cursor - 1]
+
+        # 척도모수를 목표값으로 지수적으로 접근
+        relax = 1.0 - (1.0 - self.scale_relaxation) ** (steps * self.step_minutes)
+        self.scale += (self.target_scale - self.scale) * relax
+
+        self.reference_speed = float(self._z_to_speed(np.array([self.current_z]))[0])
+        return self.reference_speed
+
+    def hub_height_factor(self, hub_height):
+        """허브 높이 풍속 보정 계수 (멱법칙)"""
+        return (np.asarray(hub_height, dtype=float) / self.reference_height) ** self.shear_exponent
+
+    def power_curve(self, hub_speeds):
+        """허브 높이 풍속 배열 -> 정규화 출력 배열"""
+        return np.interp(hub_speeds, self.curve_speeds, self.curve_output)
+
+    def _refresh_fleet(self, buildings):
+        """풍력발전소 인덱스/용량/허브높이 배열 재구성"""
+        fleet = [b for b in buildings
+                 if b.wind_capacity > 0 or getattr(b, 'power_plant_type', None) == 'wind']
+        self._fleet_idx = np.array([b.idx for b in fleet], dtype=np.int64)
+        self._fleet_capacity = np.array([b.wind_capacity for b in fleet], dtype=float)
+        self._fleet_hub_factor = self.hub_height_factor([getattr(b, 'hub_height', self.reference_height) for b in fleet])
+        self._fleet_key = (id(buildings), len(buildings))
+
+    def invalidate_fleet(self):
+        """발전소 용량/허브 높이가 바뀌었을 때 캐시 무효화"""
+        self._fleet_key = None
+
+    def fleet_output(self, buildings):
+        """모든 풍력발전소 출력을 한 번의 배열 연산으로 계산 -> (인덱스 배열, 출력 배열)"""
+        if self._fleet_key != (id(buildings), len(buildings)):
+            self._refresh_fleet(buildings)
+        hub_speeds = self.reference_speed * self._fleet_hub_factor
+        return self._fleet_idx, self._fleet_capacity * self.power_curve(hub_speeds)
+
+def _erf(x):
+    """오차함수 근사 (Abramowitz-Stegun 7.1.26, 최대 오차 1.5e-7)"""
+    x = np.asarray(x, dtype=float)
+    sign = np.sign(x)
+    a = np.abs(x)
+    t = 1.0 / (1.0 + 0.3275911 * a)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1.0 - poly * np.exp(-a * a))
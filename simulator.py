@@ -1,7 +1,9 @@
+import copy
 from datetime import datetime, timedelta
 from city import CityGraph, PowerLine
 from data import *
 from algorithms import *
+from modules.climate import get_climate_model
 
 class Simulator:
     def __init__(self):
@@ -133,111 +135,11 @@ class Simulator:
     
     def get_region_info(self, region):
         """
-        지역 정보를 딕셔너리로 리턴 (임의 예시용).
-        사실상 data.py에 있는 region_data와 유사한 역할.
+        지역 정보를 딕셔너리로 리턴.
+        data.py의 region_data로 한 번만 구성된 ClimateModel의 캐시된 테이블을 복사해서 돌려줌
+        (호출자가 고쳐도 캐시가 바뀌지 않도록). 내부 계산은 복사 없이 캐시를 직접 읽음.
         """
-        # 간단 예시만 유지
-        region_coords = {
-            "Seoul":    {"lat": 37.5665, "lon": 126.9780},
-            "Busan":    {"lat": 35.1796, "lon": 129.0756},
-            "Gangwon":  {"lat": 37.8604, "lon": 128.3115},
-            "Daejeon":  {"lat": 36.3504, "lon": 127.3845},
-            "Gwangju":  {"lat": 35.1595, "lon": 126.8526},
-            "Jeju":     {"lat": 33.4996, "lon": 126.5312}
-        }
-        if region not in region_coords:
-            region = "Seoul"
-        
-        lat = region_coords[region]["lat"]
-        lon = region_coords[region]["lon"]
-        
-        # 월별 최저/최고 기온(간단 예시)
-        base_temp_data_Seoul = {
-            1:  {"min": -6,  "max":  2},
-            2:  {"min": -3,  "max":  5},
-            3:  {"min":  2,  "max": 11},
-            4:  {"min":  7,  "max": 17},
-            5:  {"min": 12, "max": 23},
-            6:  {"min": 17, "max": 27},
-            7:  {"min": 22, "max": 29},
-            8:  {"min": 23, "max": 30},
-            9:  {"min": 18, "max": 26},
-            10: {"min": 10, "max": 19},
-            11: {"min":  3, "max": 11},
-            12: {"min": -2, "max":  5}
-        }
-        # 지역별 온도 오프셋
-        region_temp_offset = {
-            "Seoul":   (0, 0),
-            "Busan":   (+2, +3),
-            "Gangwon": (-3, -2),
-            "Daejeon": (0, +1),
-            "Gwangju": (+1, +2),
-            "Jeju":    (+5, +5)
-        }
-        off_min, off_max = region_temp_offset[region]
-        
-        # 이 지역의 월별 temp data 생성
-        region_temp_data = {}
-        for m in range(1,13):
-            region_temp_data[m] = {
-                "min": base_temp_data_Seoul[m]["min"] + off_min,
-                "max": base_temp_data_Seoul[m]["max"] + off_max
-            }
-        
-        # 간단한 날씨 확률 테이블 (예시)
-        base_weather_Seoul = {
-            1:  [("맑음", 0.3), ("흐림", 0.3), ("비", 0.1), ("눈", 0.3)],
-            2:  [("맑음", 0.4), ("흐림", 0.3), ("비", 0.1), ("눈", 0.2)],
-            3:  [("맑음", 0.5), ("흐림", 0.3), ("비", 0.2)],
-            4:  [("맑음", 0.5), ("흐림", 0.3), ("비", 0.2)],
-            5:  [("맑음", 0.5), ("흐림", 0.3), ("비", 0.2)],
-            6:  [("맑음", 0.4), ("흐림", 0.3), ("비", 0.3)],
-            7:  [("맑음", 0.3), ("흐림", 0.3), ("비", 0.4)],
-            8:  [("맑음", 0.3), ("흐림", 0.3), ("비", 0.4)],
-            9:  [("맑음", 0.4), ("흐림", 0.3), ("비", 0.3)],
-            10: [("맑음", 0.5), ("흐림", 0.4), ("비", 0.1)],
-            11: [("맑음", 0.4), ("흐림", 0.4), ("비", 0.2)],
-            12: [("맑음", 0.3), ("흐림", 0.3), ("비", 0.1), ("눈", 0.3)],
-        }
-        region_weather_offset = {
-            "Seoul":   {"맑음":0,"흐림":0,"비":0,"눈":0},
-            "Busan":   {"맑음":-0.05,"흐림":0,"비":+0.05,"눈":0},
-            "Gangwon": {"맑음":-0.1,"흐림":0,"비":-0.05,"눈":+0.15},
-            "Daejeon": {"맑음":0,"흐림":0,"비":0,"눈":0},
-            "Gwangju": {"맑음":-0.05,"흐림":+0.05,"비":0,"눈":0},
-            "Jeju":    {"맑음":-0.1,"흐림":0,"비":+0.1,"눈":0},
-        }
-        
-        woffset = region_weather_offset[region]
-        
-        region_weather_table = {}
-        for m in range(1,13):
-            base_list = base_weather_Seoul[m][:]
-            new_list = []
-            for (weather_name, prob) in base_list:
-                delta = woffset.get(weather_name, 0)
-                new_prob = prob + delta
-                if new_prob < 0:
-                    new_prob = 0
-                new_list.append((weather_name, new_prob))
-            total_p = sum(p for _,p in new_list)
-            if total_p < 1e-9:
-                new_list = [("맑음",1.0)]
-            else:
-                new_list = [(w, p/total_p) for (w,p) in new_list]
-            region_weather_table[m] = new_list
-        
-        return {
-            "lat": lat,
-            "lon": lon,
-            "temp_data": region_temp_data,
-            "weather_table": region_weather_table,
-            "humidity": {
-                1: 59.5, 2: 58.3, 3: 58.1, 4: 59.2, 5: 64.4, 6: 71.7,
-                7: 80.3, 8: 78.9, 9: 72.1, 10: 66.3, 11: 62.8, 12: 60.1
-            }
-        }
+        return copy.deepcopy(get_climate_model(region).region_info)
     
     def get_sun_position(self, current_time, lat, lon):
         """
@@ -323,7 +225,7 @@ class Simulator:
         지역별(Seoul 가정) 월별 최저/최고 기온 + 일중 사인 변동 + 날씨 영향
         """
         region = "Seoul"
-        rinfo = self.get_region_info(region)
+        rinfo = get_climate_model(region).region_info
         temp_data = rinfo["temp_data"]
         
         m = current_time.month
@@ -364,7 +266,7 @@ class Simulator:
         
         import random
         region = getattr(self, "region", "Seoul")  # 시나리오에서 설정된 지역 사용
-        rinfo = self.get_region_info(region)
+        rinfo = get_climate_model(region).region_info
         wtable = rinfo["weather_table"]
         
         m = self.simTime.month
@@ -423,7 +325,7 @@ class Simulator:
         self.cloud_factor = random.uniform(cloud_range[0], cloud_range[1])
         
         # 태양 위치 계산 추가
-        region_info = self.get_region_info(region)
+        region_info = get_climate_model(region).region_info
         lat = region_info["lat"]
         lon = region_info["lon"]
         alt_deg, azi_deg = self.get_sun_position(self.simTime, lat, lon)
@@ -584,10 +486,9 @@ class Simulator:
         sens = getattr(building, "humidity_sensitivity", 1.0)
         temp = self.current_temperature
         
-        # 절대습도 계산 (단순화된 버전)
-        sat_vapor_pressure = 610.78 * math.exp(temp / (temp + 238.3) * 17.2694)
-        actual_vapor_pressure = sat_vapor_pressure * (self.humidity/100)
-        abs_humidity = 0.622 * actual_vapor_pressure / (101325 - actual_vapor_pressure)
+        # 절대습도 계산 (포화수증기압은 기후 모델 룩업 테이블 사용)
+        climate = get_climate_model(getattr(self, "region", "Seoul"))
+        abs_humidity = climate.absolute_humidity(temp, self.humidity)
         
         # 계절별 기준값
         if month in [6,7,8]:  # 여름
@@ -623,9 +524,9 @@ class Simulator:
         else:
             factor = 1.0
         
-        # 일교차 계산 (최고기온 - 최저기온)
-        temp_data = self.get_region_info(getattr(self, "region", "Seoul"))["temp_data"][self.simTime.month]
-        daily_range = temp_data["max"] - temp_data["min"]  # max와 min의 차이로 계산
+        # 일교차 (기후 모델의 일별 보간 테이블)
+        climate = get_climate_model(getattr(self, "region", "Seoul"))
+        daily_range = climate.temp_range(self.simTime.timetuple().tm_yday)
         
         if daily_range > 5:
             factor *= 1 + 0.02*(daily_range - 5)/5
@@ -661,7 +562,7 @@ class Simulator:
         print(f"  날씨({self.current_weather}): x{weather_mult:.2f} (구름량 영향 포함)")
         
         # 태양 위치
-        rinfo = self.get_region_info(region)
+        rinfo = get_climate_model(region).region_info
         lat = rinfo["lat"]
         lon = rinfo["lon"]
         alt_deg, azi_deg = self.get_sun_position(self.simTime, lat, lon)
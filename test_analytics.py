@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""시뮬레이션 지표 열 저장소 테스트"""
+
+import io
+import os
+import json
+import random
+import contextlib
+from datetime import timedelta
+import numpy as np
+from modules.simulator import Simulator
+from modules.economics import EconomicModel
+from modules.analytics import SimulationAnalytics
+from modules.aggregates import RunningStats, QuantileSketch, StreamingAggregates, merge_aggregates
+
+def test_columnar_report_matches_snapshots():
+    """열 저장소 보고서가 스냅샷 값으로 직접 계산한 결과와 같고 행당 메모리가 작은지 확인"""
+    print("\n=== 지표 열 저장소 테스트 ===")
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json"), encoding="utf-8") as f:
+        scenario = json.load(f)["scenarios"][0]
+    random.seed(3)
+    sim = Simulator()
+    sim.gameSpeed = 6000.0
+    sim.set_economic_model(EconomicModel(sim))
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.load_scenario(scenario)
+        analytics = SimulationAnalytics(sim, snapshot_interval=timedelta(minutes=10), chunk=64)
+        demands = [abs(sim.city.total_demand())]
+        for _ in range(300):
+            sim.step(33)
+            before = len(analytics.metrics)
+            analytics.update()
+            if len(analytics.metrics) > before:
+                demands.append(abs(sim.city.total_demand()))
+
+    metrics = analytics.metrics
+    assert len(metrics) == len(demands) > 50
+    assert np.all(np.diff(metrics.epochs) > 0)
+    report = analytics.generate_report()
+    assert abs(report["energy_metrics"]["avg_demand"] - np.mean(demands)) < 1e-3 * max(1.0, np.mean(demands))
+    assert report["economic_metrics"]["electricity_price"] == sim.economic_model.current_electricity_price
+    assert report["environmental_metrics"]["current_weather"] == sim.weather_system.current_weather
+    window = analytics.generate_report(start=sim.simTime - timedelta(days=365))
+    # 구간 보고서는 float32 열에서 다시 집계하므로 누적 집계와 float32 정밀도 안에서 일치
+    assert abs(window["energy_metrics"]["avg_demand"] - report["energy_metrics"]["avg_demand"]) < 1e-5 * max(1.0, np.mean(demands))
+    assert window["statistics"]["blackout_intervals"] == report["statistics"]["blackout_intervals"]
+    point = analytics.data_points[-1]
+    assert point["buildings"]["total"] == len(sim.city.buildings) and "economics" in point
+
+    # 1분 간격 1년 기록의 열 메모리 추정 (chunk 단위 증가라 여유 공간은 한 덩어리 이하)
+    per_row = metrics.nbytes / len(metrics._epoch)
+    year_mb = per_row * 525600 / 1e6
+    assert year_mb < 100
+    print(f"  ✅ 스냅샷 {len(metrics)}개, 행당 {per_row:.0f} B, 1분 간격 1년 약 {year_mb:.0f} MB")
+
+def test_mergeable_aggregates():
+    """Welford 통계/분위수 스케치가 정확한 값과 맞고, 나눠서 집계 후 병합한 결과가 한 번에 집계한 것과 같은지 확인"""
+    rng = np.random.default_rng(0)
+    demand = rng.lognormal(4.0, 0.5, 20000)
+    temperature = rng.normal(5.0, 12.0, 20000)
+    for values in (demand, temperature):
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        stats, stats_left, stats_right = RunningStats(), RunningStats(), RunningStats()
+        for i, v in enumerate(values.tolist()):
+            whole.add(v)
+            stats.add(v)
+            (left if i % 2 else right).add(v)
+            (stats_left if i < 7000 else stats_right).add(v)
+        merged = left.merge(right)
+        assert merged.positive == whole.positive and merged.negative == whole.negative
+        for q in (0.05, 0.5, 0.95):
+            exact = np.quantile(values, q, method="lower")
+            assert abs(whole.quantile(q) - exact) <= 0.0101 * abs(exact) + 1e-9
+        stats_left.merge(stats_right)
+        assert abs(stats_left.mean - values.mean()) < 1e-9 * abs(values.mean()) + 1e-9
+        assert abs(stats_left.variance - values.var(ddof=1)) < 1e-7 * values.var()
+        assert abs(stats.variance - values.var(ddof=1)) < 1e-7 * values.var()
+    print("  ✅ 분위수 스케치 상대 오차 1% 이내, 병합 결과 일치")
+
+def test_merge_streaming_aggregates():
+    """앙상블 실행 3개의 StreamingAggregates를 merge_aggregates로 합친 결과가 전체 값으로 직접 계산한 통계와 같은지 확인"""
+    print("\n=== 앙상블 집계 병합 테스트 ===")
+    rng = np.random.default_rng(1)
+    runs, rows = [], []
+    for run in range(3):
+        aggregate = StreamingAggregates()
+        epochs = 1_700_000_000 + run * 86400 + np.arange(500) * 600
+        blackout = np.zeros(500, dtype=int)
+        blackout[100 * run + 50:100 * run + 80] = 3
+        blackout[400:410] = 1
+        for epoch, count in zip(epochs.tolist(), blackout.tolist()):
+            values = {"total_demand": float(rng.lognormal(4.0, 0.4)), "total_supply": float(rng.lognormal(4.1, 0.3)),
+                      "temperature": float(rng.normal(10.0, 8.0)), "blackout_count": count}
+            aggregate.add(epoch, values)
+            rows.append(values)
+        runs.append(aggregate)
+    before = [a.to_dict() for a in runs]
+
+    merged = merge_aggregates(runs)
+    assert [a.to_dict() for a in runs] == before  # 입력은 바뀌지 않음
+    assert merged.blackout_intervals == 6 and merged.blackout_seconds == 3 * (30 + 10) * 600
+    assert merged.first_epoch == runs[0].first_epoch and merged.last_epoch == runs[-1].last_epoch
+    for name in ("total_demand", "temperature"):
+        values = np.array([r[name] for r in rows])
+        stats = merged.stats[name]
+        assert stats.count == len(values) and stats.min == values.min() and stats.max == values.max()
+        assert abs(stats.mean - values.mean()) < 1e-9 * abs(values.mean()) + 1e-9
+        assert abs(stats.variance - values.var(ddof=1)) < 1e-7 * values.var()
+        exact = np.quantile(values, 0.5, method="lower")
+        assert abs(merged.sketches[name].quantile(0.5) - exact) <= 0.0101 * abs(exact) + 1e-9
+    assert merged.stats["electricity_price"].count == 0
+    assert merge_aggregates([]).to_dict() == StreamingAggregates().to_dict()
+    print(f"  ✅ 실행 3개 병합: {merged.stats['total_demand'].count}행, 정전 구간 {merged.blackout_intervals}개")
+
+if __name__ == "__main__":
+    test_columnar_report_matches_snapshots()
+    test_mergeable_aggregates()
+    test_merge_streaming_aggregates()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""계통 수급 누산기(SystemBalance) 테스트 - 기존 저장소별 재탐색 계산과 비교"""
+
+import numpy as np
+from modules.simulator import Simulator
+from modules.balance import SystemBalance
+from modules.generators import HydrogenKernel
+
+def rescan(city, building):
+    """기존 apply_hydrogen_storage의 계산: 송전선/건물을 매번 다시 훑어 연결 발전소와 전체 수급을 구함"""
+    connected_power_plants = []
+    for line in city.lines:
+        if line.removed:
+            continue
+        if line.u == building.idx:
+            other_building = city.buildings[line.v]
+            if not other_building.removed and other_building.base_supply > 0:
+                connected_power_plants.append(other_building)
+        elif line.v == building.idx:
+            other_building = city.buildings[line.u]
+            if not other_building.removed and other_building.base_supply > 0:
+                connected_power_plants.append(other_building)
+    connected_generation = sum(plant.current_supply for plant in connected_power_plants)
+    total_generation = sum(b.current_supply for b in city.buildings if b.current_supply > 0 and not b.removed)
+    total_demand = sum(-b.current_supply for b in city.buildings if b.current_supply < 0 and not b.removed)
+    return connected_power_plants, connected_generation, total_generation, total_demand
+
+def old_apply_hydrogen_storage(city, building):
+    """기존 저장소 배치 로직 (출력 없이 그대로)"""
+    connected_power_plants, connected_generation, total_generation, total_demand = rescan(city, building)
+    if not connected_power_plants:
+        return
+    if hasattr(building, 'charge') and hasattr(building, 'discharge'):
+        if total_generation > total_demand * 1.1 and connected_generation > 0:
+            surplus_power = min((total_generation - total_demand) * 0.5, connected_generation * 0.8)
+            building.current_supply = -building.charge(surplus_power, duration=1.0)
+        elif total_demand > total_generation * 1.05:
+            power_shortage = (total_demand - total_generation) * 0.3
+            building.current_supply = building.discharge(power_shortage, duration=1.0)
+    else:
+        if total_generation > total_demand * 1.1 and connected_generation > 0:
+            surplus_power = min(total_generation - total_demand, connected_generation * 0.8)
+            hydrogen_efficiency = building.electrolysis_efficiency if hasattr(building, 'electrolysis_efficiency') else building.hydrogen_efficiency
+            hydrogen_produced = surplus_power * hydrogen_efficiency * 0.1
+            storage_available = building.hydrogen_storage - building.hydrogen_level
+            if storage_available > 0:
+                actual_production = min(hydrogen_produced, storage_available)
+                building.hydrogen_level += actual_production
+                building.current_supply = -(actual_production / hydrogen_efficiency / 0.1)
+        elif total_demand > total_generation * 1.05 and building.hydrogen_level > 0:
+            power_shortage = total_demand - total_generation
+            fuel_cell_efficiency = building.fuel_cell_efficiency if hasattr(building, 'fuel_cell_efficiency') else building.hydrogen_efficiency
+            max_power_from_hydrogen = building.hydrogen_level * fuel_cell_efficiency
+            actual_generation = min(power_shortage * 0.5, max_power_from_hydrogen)
+            if actual_generation > 0:
+                building.hydrogen_level -= actual_generation / fuel_cell_efficiency
+                building.current_supply = actual_generation
+
+def hydrogen_city(seed, demand_scale):
+    """발전소/수소저장소(두 종류)/수요처를 무작위 송전선으로 연결한 도시 (중복선, 저장소끼리 연결, 제거된 발전소/선 포함)"""
+    rng = np.random.default_rng(seed)
+    sim = Simulator()
+    city = sim.city
+    plants = [city.add_solar_plant(50.0, x=100 * i, y=0) for i in range(4)]
+    storages = [city.add_hydrogen_storage(100.0, x=100 * i, y=100) for i in range(3)]
+    storages += [city.add_building(power_plant_type="hydrogen", hydrogen_storage=500.0, x=100 * i, y=200) for i in range(2)]
+    consumers = [city.add_building(-20.0, x=100 * i, y=300) for i in range(6)]
+    nodes = plants + storages + consumers
+    for storage in storages:
+        for other in rng.choice(len(nodes), size=3, replace=False):
+            if nodes[other] is not storage:
+                city.add_line(storage.idx, nodes[other].idx, 50.0)
+    city.add_line(storages[0].idx, storages[1].idx, 50.0)
+    city.add_line(plants[0].idx, storages[0].idx, 50.0)
+    city.add_line(plants[0].idx, storages[0].idx, 50.0)
+    city.add_line(plants[1].idx, storages[3].idx, 50.0).removed = True
+    plants[2].removed = True
+
+    for b in city.buildings:
+        b.current_supply = 0.0
+    for plant in plants:
+        plant.current_supply = float(rng.uniform(10.0, 60.0))
+    for consumer in consumers:
+        consumer.current_supply = -float(rng.uniform(5.0, 40.0)) * demand_scale
+    for storage in storages[3:]:
+        storage.hydrogen_level = float(rng.uniform(0.0, 200.0))
+    return sim, storages
+
+def test_incremental_matches_rescan():
+    """저장소 순서대로 출력을 바꿔 가며 누산기 값이 매번 전체 재탐색 결과와 같은지 확인"""
+    print("\n=== SystemBalance 증분 갱신 vs 재탐색 테스트 ===")
+    checks = 0
+    for seed in range(20):
+        sim, storages = hydrogen_city(seed, demand_scale=1.0)
+        city = sim.city
+        rng = np.random.default_rng(100 + seed)
+        balance = SystemBalance()
+        balance.compute(city.buildings, city.lines, watch=storages)
+        for _ in range(3):
+            for storage in storages:
+                plants, connected, generation, demand = rescan(city, storage)
+                assert balance.connected_plant_count(storage.idx) == len(plants)
+                assert abs(balance.connected_generation(storage.idx) - connected) < 1e-9
+                assert abs(balance.generation - generation) < 1e-9
+                assert abs(balance.demand - demand) < 1e-9
+                balance.set_supply(storage, float(rng.uniform(-30.0, 30.0)))
+                checks += 1
+    print(f"  ✅ {checks}번 비교 모두 일치")
+
+def test_hydrogen_dispatch_matches_old():
+    """HydrogenKernel 배치 결과(출력/저장량)가 기존 저장소별 재탐색 로직과 같은지 확인"""
+    print("\n=== 수소저장소 배치 기존 로직 비교 테스트 ===")
+    charged = discharged = 0
+    for seed in range(20):
+        for demand_scale in (0.3, 1.0, 3.0):
+            old_sim, old_storages = hydrogen_city(seed, demand_scale)
+            new_sim, new_storages = hydrogen_city(seed, demand_scale)
+            for _ in range(3):
+                for storage in old_storages:
+                    old_apply_hydrogen_storage(old_sim.city, storage)
+                HydrogenKernel().apply(new_storages, np.ones(len(new_storages), dtype=bool), new_sim.power_system, "Seoul")
+                for old, new in zip(old_sim.city.buildings, new_sim.city.buildings):
+                    assert abs(old.current_supply - new.current_supply) < 1e-9, (seed, demand_scale, old.idx)
+                    assert abs(getattr(old, "hydrogen_level", 0.0) - getattr(new, "hydrogen_level", 0.0)) < 1e-9
+            charged += sum(s.current_supply < 0 for s in new_storages)
+            discharged += sum(s.current_supply > 0 for s in new_storages)
+    assert charged > 0 and discharged > 0
+    print(f"  ✅ 60개 도시 일치 (충전 {charged}회, 방전 {discharged}회)")
+
+if __name__ == "__main__":
+    test_incremental_matches_rescan()
+    test_hydrogen_dispatch_matches_old()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""시간대별 요금 청구 테스트"""
+
+from datetime import datetime, timedelta
+from modules.simulator import Simulator
+from modules.economics import EconomicModel
+
+def test_time_of_use_bill():
+    """하루 동안 시간대별 요금제로 적분한 청구액이 손으로 계산한 금액과 같고, 월이 바뀌면 그 금액으로 마감되는지 확인"""
+    print("\n=== 시간대별 요금 청구 테스트 ===")
+    sim = Simulator()
+    sim.set_economic_model(EconomicModel(sim))
+    city = sim.city
+    office = city.add_building(-5.0, 0, 0)
+    office.building_type = "office"
+    hospital = city.add_building(-5.0, 100, 0)
+    hospital.building_type = "hospital"
+    billing = sim.economic_model.billing
+
+    # 0-7시 2MW, 8-17시 5MW (12시는 1MW 부족), 18-23시 3MW
+    sim.simTime = datetime(2025, 1, 31, 0, 0)
+    for hour in range(24):
+        load = 2.0 if hour < 8 else 5.0 if hour < 18 else 3.0
+        for b in (office, hospital):
+            b.current_supply = -load
+            b.shortage = 1.0 if hour == 12 else 0.0
+        billing.tick(1.0)
+        sim.simTime += timedelta(hours=1)
+
+    # 기본 가격 100원/kWh = 100,000원/MWh, 피크(9-12, 17-20시) x1.5, 오프피크(1-5시) x0.7
+    #   0시 2x100k + 1-5시 5x2x70k + 6-7시 2x2x100k + 8시 5x100k + 9-11시 3x5x150k + 12시 4x150k
+    #   + 13-16시 4x5x100k + 17시 5x150k + 18-20시 3x3x150k + 21-23시 3x3x100k = 9,650,000원
+    energy_charge = 9_650_000
+    office_total = energy_charge + 5 * 8000 * 1000 + 200_000            # 최대 수요 5MW x 8,000원/kW + 기본 요금
+    hospital_total = (energy_charge + 5 * 6000 * 1000) * 1.2 + 200_000  # 병원 요금제 할증 1.2배
+    bills = sim.economic_model.get_bills()
+    assert abs(bills.energy[office.idx] - 83.0) < 1e-9 and bills.peak[office.idx] == 5.0
+    assert abs(bills.energy_charge[office.idx] - energy_charge) < 1e-6
+    assert abs(bills.total[office.idx] - office_total) < 1e-6
+    assert abs(bills.total[hospital.idx] - hospital_total) < 1e-6
+
+    sim.simTime = datetime(2025, 2, 1, 0, 0)
+    billing.tick(0.0)
+    closed = billing.history[-1]
+    assert (closed.year, closed.month) == (2025, 1)
+    assert abs(closed.total.sum() - (office_total + hospital_total)) < 1e-6
+    assert billing.energy.sum() == 0.0
+    # 마감된 청구액은 경제 모델 수익/순이익에 반영
+    stats = sim.economic_model.get_economic_stats()
+    assert abs(stats["revenue"] - (office_total + hospital_total)) < 1e-6
+    assert abs(stats["profit"] - (stats["revenue"] - stats["operational_cost"] - stats["carbon_tax"])) < 1e-6
+    print(f"  ✅ 사무실 {office_total:,.0f}원, 병원 {hospital_total:,.0f}원 (손 계산과 일치), 1월 청구서 마감")
+
+if __name__ == "__main__":
+    test_time_of_use_bill()
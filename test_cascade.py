@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""송전선 연쇄 고장 테스트"""
+
+import random
+from modules.simulator import Simulator
+from modules.flow import augment_paths
+
+def make_grid(seed, count=60):
+    """가까운 건물끼리 연결한 임의 계통 (6개 중 1개 발전소)"""
+    random.seed(seed)
+    sim = Simulator()
+    city = sim.city
+    points = [(random.uniform(0, 500), random.uniform(0, 500)) for _ in range(count)]
+    for i, (x, y) in enumerate(points):
+        supply = random.uniform(10, 30) if i % 6 == 0 else -random.uniform(1, 5)
+        city.add_building(supply, x, y)
+    for i in range(count):
+        nearest = sorted(range(count), key=lambda j: (points[i][0] - points[j][0]) ** 2 + (points[i][1] - points[j][1]) ** 2)
+        for j in nearest[1:4]:
+            if i < j:
+                city.add_line(i, j, random.uniform(3, 12))
+    for b in city.buildings:
+        b.current_supply = b.base_supply
+    sim.power_system.compute_line_flows()
+    return sim
+
+def test_cascade_warm_start_matches_cold_solve():
+    """warm start 연쇄 고장 결과 공급량이 같은 토폴로지를 처음부터 푼 최대 유량과 같은지 확인"""
+    print("\n=== 연쇄 고장 테스트 ===")
+    for seed in range(3):
+        sim = make_grid(seed)
+        engine = sim.power_system.cascade
+        results = engine.sample(100, seed=seed)
+        assert len(results) == 100
+        for result in results[:30]:
+            residual = engine.network.capacity.tolist()
+            for pos in result.tripped:
+                k = engine.line_positions.index(pos)
+                edge = int(engine.line_edges[k])
+                residual[edge] = residual[edge ^ 1] = 0.0
+            augment_paths(engine.network, residual, engine.source, engine.sink, eps=engine.eps)
+            assert abs(engine.served(residual) - result.served_after) < 1e-4
+            assert result.served_after <= result.served_before + 1e-6
+        longest = max(results, key=lambda r: len(r.tripped))
+        print(f"  seed {seed}: 최장 연쇄 {len(longest.rounds)}라운드, 트립 {len(longest.tripped)}개, 손실 {longest.load_lost:.2f} MW")
+    print("  ✅ warm start 결과 일치")
+
+def test_cascade_applied_on_line_trip():
+    """apply=True면 연쇄 트립 송전선이 모두 제거되고 라운드 순서가 기록되는지 확인"""
+    sim = make_grid(5)
+    engine = sim.power_system.cascade
+    results = engine.sample(200, seed=1)
+    result = max(results, key=lambda r: len(r.tripped))
+    lines = sim.city.lines
+    applied = sim.power_system.simulate_cascade([lines[result.initial[0]]], apply=True)
+    assert applied.tripped == result.tripped
+    assert all(lines[pos].removed for pos in applied.tripped)
+    assert len(set(applied.tripped)) == len(applied.tripped)
+    print(f"  ✅ 연쇄 고장 적용: {applied.to_dict()['rounds']}")
+
+if __name__ == "__main__":
+    test_cascade_warm_start_matches_cold_solve()
+    test_cascade_applied_on_line_trip()
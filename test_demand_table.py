@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""수요 인자 테이블 테스트"""
+
+import datetime
+import numpy as np
+from data import building_type_factors, building_type_codes, default_building_type_code
+from modules.simulator import Simulator
+from modules.demand import DemandFactorTable
+
+def scalar_factor(pattern, building_type, sim_time):
+    """기존 건물별 계산 방식 (비교용)"""
+    factor = (pattern["daily_pattern"][sim_time.hour]
+              * pattern["weekly_pattern"][sim_time.weekday()]
+              * pattern["seasonal_pattern"][sim_time.month - 1])
+    for holiday in pattern.get("holiday_list", []):
+        if holiday["month"] == sim_time.month and holiday["day"] == sim_time.day:
+            factor *= pattern.get("holiday_factor", 1.3)
+            break
+    if building_type in building_type_factors:
+        data = building_type_factors[building_type]
+        is_weekend = sim_time.weekday() >= 5
+        is_night = sim_time.hour < 6 or sim_time.hour >= 20
+        if is_weekend and is_night:
+            factor *= data["weekend_night_factor"]
+        elif is_weekend:
+            factor *= data["weekend_day_factor"]
+        elif is_night:
+            factor *= data["weekday_night_factor"]
+        else:
+            factor *= data["weekday_day_factor"]
+    return factor
+
+def test_demand_table_matches_scalar():
+    """테이블 gather 결과가 기존 건물별 계산과 같은지 확인"""
+    print("\n=== 수요 인자 테이블 테스트 ===")
+    sim = Simulator()
+    pattern = sim.pattern
+    table = DemandFactorTable(pattern)
+
+    types = list(building_type_codes) + ["unknown_type"]
+    codes = np.array([building_type_codes.get(t, default_building_type_code) for t in types])
+
+    start = datetime.datetime(2025, 1, 1)
+    for step in range(0, 24 * 400, 7):  # 1년 이상, 요일/시간 골고루
+        sim_time = start + datetime.timedelta(hours=step)
+        factors = table.factors(codes, sim_time)
+        for t, f in zip(types, factors):
+            expected = scalar_factor(pattern, t, sim_time)
+            assert abs(f - expected) < 1e-9, f"{t} {sim_time}: {f} != {expected}"
+    print("테이블 인자 = 기존 계산 인자")
+
+def test_building_type_code():
+    """building_type 설정 시 type_code 갱신 확인"""
+    sim = Simulator()
+    b = sim.city.add_building(-5.0, 0, 0)
+    for name, code in building_type_codes.items():
+        b.building_type = name
+        assert b.type_code == code
+    b.building_type = "unknown_type"
+    assert b.type_code == default_building_type_code
+    print("type_code 갱신 확인")
+
+if __name__ == "__main__":
+    test_demand_table_matches_scalar()
+    test_building_type_code()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""랜덤 이벤트 포아송 스케줄러 테스트"""
+
+import random
+from datetime import timedelta
+from modules.simulator import Simulator
+
+def counting_events(event_system, rates):
+    """이벤트 유형을 발생 횟수만 세는 함수로 바꿈 (설비는 건드리지 않음) -> 유형별 횟수 dict"""
+    counts = {name: 0 for name in rates}
+
+    def make(name):
+        def handler():
+            counts[name] += 1
+            return False
+        handler.__name__ = name
+        return handler
+    event_system.event_types = [make(name) for name in rates]
+    event_system.event_rates = dict(rates)
+    return counts
+
+def run_events(step, hours, seed, rates):
+    """빈 도시에서 step 간격으로 hours 시간 진행 -> (유형별 발생 횟수, 시뮬레이터)"""
+    random.seed(seed)
+    sim = Simulator()
+    counts = counting_events(sim.event_system, rates)
+    end = sim.simTime + timedelta(hours=hours)
+    sim.update_events()  # 시작 시각 기준으로 첫 도착 샘플링
+    while sim.simTime < end:
+        sim.simTime = min(sim.simTime + step, end)
+        sim.update_events()
+    return counts, sim
+
+def test_poisson_arrival_counts():
+    """긴 구간의 유형별 발생 횟수가 발생률 x 시간에 맞고, 한 번에 진행하는 시간 간격(gameSpeed x 프레임 길이)과 무관한지 확인"""
+    print("\n=== 포아송 이벤트 발생 횟수 테스트 ===")
+    rates = {"random_line_trip": 0.5, "random_gen_off": 0.05}
+    hours = 4000
+    fine, _ = run_events(timedelta(minutes=5), hours, 21, rates)
+    for name, rate in rates.items():
+        expected = rate * hours
+        assert abs(fine[name] - expected) < 4 * expected ** 0.5, (name, fine[name], expected)
+    # 같은 난수 시드면 프레임당 진행 시간이 달라도 도착 과정이 같음 (gameSpeed 300 vs 6000 at 30 FPS 등)
+    coarse, _ = run_events(timedelta(hours=3, minutes=20), hours, 21, rates)
+    assert coarse == fine
+    print(f"  ✅ {hours}시간 동안 {fine} (기대 {[r * hours for r in rates.values()]}), 진행 간격과 무관")
+
+def test_reschedule_when_time_goes_back():
+    """시각이 되돌아가면 이전 예정 도착을 버리고 현재 시각 기준으로 다시 샘플링하는지 확인"""
+    print("\n=== 시간 역행 재스케줄 테스트 ===")
+    rates = {"random_line_trip": 1.0, "random_bldg_remove": 0.2}
+    counts, sim = run_events(timedelta(minutes=30), 200, 4, rates)
+    events = sim.event_system
+    late = events.next_event_time
+    assert late > sim.simTime
+
+    start = sim.simTime - timedelta(hours=200)
+    sim.simTime = start
+    sim.update_events()
+    scheduled = [item for item in events._queue if not callable(item[2])]
+    assert sorted(item[2] for item in scheduled) == sorted(rates)
+    assert all(item[0] >= start for item in scheduled)
+    assert events.next_event_time < late
+
+    before = dict(counts)
+    end = start + timedelta(hours=200)
+    while sim.simTime < end:
+        sim.simTime += timedelta(minutes=30)
+        sim.update_events()
+    replayed = counts["random_line_trip"] - before["random_line_trip"]
+    assert abs(replayed - 200) < 4 * 200 ** 0.5
+    print(f"  ✅ 되돌린 뒤 도착 {len(scheduled)}건 재스케줄, 다시 200시간 동안 {replayed}건")
+
+if __name__ == "__main__":
+    test_poisson_arrival_counts()
+    test_reschedule_when_time_goes_back()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""발전소 유형별 배치 커널 테스트"""
+
+import datetime
+from modules.simulator import Simulator
+
+def test_thermal_plant_keeps_rooftop_solar():
+    """화력발전소의 옥상 태양광 발전량이 기본 발전량에 더해진 채로 유지되는지 확인"""
+    print("\n=== 화력 + 옥상 태양광 테스트 ===")
+    sim = Simulator()
+    sim.simTime = datetime.datetime(2025, 6, 1, 12, 0, 0)
+    plain = sim.city.add_thermal_plant(100.0, 0, 0)
+    rooftop = sim.city.add_thermal_plant(100.0, 50, 0)
+    rooftop.solar_capacity = 50.0
+    sim.apply_demand_pattern()
+
+    weather = sim.weather_system
+    region_info = weather.get_region_info("Seoul")
+    altitude, _ = weather.get_sun_position(sim.simTime, region_info.get("lat", 37.5665), region_info.get("lon", 126.9780))
+    radiation = weather.compute_solar_radiation(altitude, weather.cloud_factor, rooftop.panel_tilt, rooftop.panel_azimuth)
+    solar_output = 50.0 * radiation * weather.solar_efficiency
+
+    assert solar_output > 0
+    assert abs(plain.current_supply - plain.base_supply) < 1e-9
+    assert abs(rooftop.current_supply - (rooftop.base_supply + solar_output)) < 1e-6, (rooftop.current_supply, solar_output)
+    print(f"  화력 {rooftop.base_supply:.2f} MW + 태양광 {solar_output:.2f} MW = {rooftop.current_supply:.2f} MW")
+
+if __name__ == "__main__":
+    test_thermal_plant_keeps_rooftop_solar()
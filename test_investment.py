@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""투자 후보 평가 테스트"""
+
+from modules.simulator import Simulator
+from modules.investment import InvestmentEvaluator
+
+def shortage_city():
+    """발전소 30 MW -(5 MW 송전선)- 수요 20 MW 계통 -> (시뮬레이터, 수요 건물, 송전선)"""
+    sim = Simulator()
+    city = sim.city
+    city.add_building(30.0, 0, 0)
+    consumer = city.add_building(-20.0, 100, 0)
+    line = city.add_line(0, 1, 5.0)
+    for b in city.buildings:
+        b.current_supply = b.base_supply
+    return sim, consumer, line
+
+def test_investment_ranking():
+    """송전 용량 부족 계통에서 부족분을 많이 해소하는 후보일수록 NPV가 큰지 확인"""
+    print("\n=== 투자 후보 순위 테스트 ===")
+    sim, consumer, line = shortage_city()
+
+    # 같은 비용에서 미공급 해소량: 수요처 발전소 15 MW > 송전선 증설 2 MW > 스마트 그리드 0.5 MW
+    candidates = [{"id": "smart_grid", "cost": 10, "target_data": {}},
+                  {"id": "upgrade_line", "cost": 10, "target_data": {"line": line}},
+                  {"id": "build_producer", "cost": 10, "target_data": {"building": consumer}},
+                  {"id": "disaster_prevention", "cost": 10, "target_data": {}}]
+    scores = InvestmentEvaluator(sim).evaluate(candidates)
+    by_id = {score["id"]: score for score in scores}
+
+    assert [score["id"] for score in scores] == [c["id"] for c in candidates]
+    assert by_id["disaster_prevention"]["npv"] is None
+    ranked = sorted((s for s in scores if s["npv"] is not None), key=lambda s: -s["npv"])
+    assert [s["id"] for s in ranked] == ["build_producer", "upgrade_line", "smart_grid"]
+    assert all(s["annual_benefit"] > 0 for s in ranked)
+    # 같은 발전소에서 더 보내는 후보끼리는 연간 편익이 늘어난 송전량에 비례
+    ratio = by_id["upgrade_line"]["annual_benefit"] / by_id["smart_grid"]["annual_benefit"]
+    assert abs(ratio - 2.0 / 0.5) < 1e-6, ratio
+    for s in ranked:
+        print(f"  {s['id']}: NPV {s['npv']:.0f}, 회수 {s['payback']:.2f}년")
+
+def test_parallel_matches_serial():
+    """작업 프로세스 2개로 나눠 평가해도 (시뮬레이터를 뗀 사본 + 위치 번호 후보) 차례 평가와 결과가 같은지 확인"""
+    print("\n=== 투자 후보 병렬 평가 테스트 ===")
+    sim, consumer, line = shortage_city()
+    candidates = [{"id": "upgrade_line", "cost": 10, "target_data": {"line": line}},
+                  {"id": "build_producer", "cost": 10, "target_data": {"building": consumer}},
+                  {"id": "add_solar", "cost": 10, "target_data": {"buildings": [consumer]}},
+                  {"id": "upgrade_multiple_lines", "cost": 10, "target_data": {"lines": [line]}},
+                  {"id": "disaster_prevention", "cost": 10, "target_data": {}}]
+    serial = InvestmentEvaluator(sim).evaluate(candidates)
+    parallel = InvestmentEvaluator(sim, workers=2).evaluate(candidates)
+    assert serial == parallel, (serial, parallel)
+    # 평가는 원본 도시를 바꾸지 않음
+    assert line.capacity == 5.0 and consumer.solar_capacity == 0.0
+    print(f"  ✅ 후보 {len(candidates)}개 병렬/차례 평가 일치")
+
+if __name__ == "__main__":
+    test_investment_ranking()
+    test_parallel_matches_serial()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""이벤트 저널 / 결정적 재실행 테스트"""
+
+import io
+import os
+import json
+import random
+import tempfile
+import contextlib
+from modules.simulator import Simulator
+from modules.economics import EconomicModel
+from modules.journal import JournalReplayer, read_journal, EDIT, EVENT
+
+def record_session(path, ticks=1200):
+    """이벤트가 자주 나는 설정으로 편집/시나리오 전환을 섞어 기록 -> 기록한 시뮬레이터"""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json"), encoding="utf-8") as f:
+        scenarios = json.load(f)["scenarios"]
+    random.seed(7)
+    sim = Simulator()
+    sim.gameSpeed = 6000.0
+    sim.set_economic_model(EconomicModel(sim))
+    for name in sim.event_system.event_rates:
+        sim.event_system.event_rates[name] = 0.05
+    sim.event_system.hazard.line_rate = 2e-3
+    sim.start_journal(path, checkpoint_interval=100)
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim.load_scenario(scenarios[0])
+        for i in range(ticks):
+            random.random()  # 화면 쪽 난수 소비 (파티클 등)는 재실행 결과에 영향이 없어야 함
+            if i == 150:
+                with sim.record_edit("context_menu", "용량 +10.0"):
+                    sim.city.lines[0].capacity += 10.0
+                    sim.update_flow(True)
+            if i == 300:
+                with sim.record_edit("drawer_ui", "add_demand"):
+                    b = sim.city.add_building(-5.0, 10, 10)
+                    sim.city.add_line(0, b.idx, 5.0, 1.0)
+                    sim.update_flow(True)
+            if i == 500:
+                with sim.record_edit("drawer_ui", "restore_all", effects=("restoration_reset",)):
+                    sim.city.restore_all()
+                    sim.event_system.restoration.reset()
+                    sim.update_flow(True)
+            if i == 700:
+                sim.load_scenario(scenarios[1 % len(scenarios)])
+            sim.step(random.choice([30, 33, 40]))
+    sim.stop_journal()
+    return sim
+
+def test_replay_is_deterministic():
+    """기록과 재실행의 이벤트/난수/최종 상태가 같은지 확인"""
+    print("\n=== 이벤트 저널 재실행 테스트 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "session.journal")
+        sim = record_session(path)
+        records = list(read_journal(path))
+        events = [p for k, p in records if k == EVENT]
+        edits = [p for k, p in records if k == EDIT]
+        assert events and all(e["changes"] for e in events)
+        assert [e["action"] for e in edits] == ["용량 +10.0", "add_demand", "restore_all"]
+        assert edits[1]["ops"][-1][0] == "add"
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = JournalReplayer(path).run()
+        replayed = result.simulator
+        assert result.deterministic, result.divergence
+        assert result.ticks == 1200
+        assert replayed.simTime == sim.simTime and replayed.event_count == sim.event_count
+        assert [(b.current_supply, b.removed) for b in replayed.city.buildings] == \
+               [(b.current_supply, b.removed) for b in sim.city.buildings]
+        assert [pl.flow for pl in replayed.city.lines] == [pl.flow for pl in sim.city.lines]
+        print(f"  ✅ 틱 {result.ticks}개, 이벤트 {len(events)}건, 편집 {len(edits)}건 재실행 일치")
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            found = JournalReplayer(path).run(stop=lambda s: s.event_count >= 3)
+        assert found.found_tick is not None and found.simulator.event_count >= 3
+        print(f"  ✅ 조건 탐색: {found.found_tick}번째 틱 ({found.found_time})")
+
+if __name__ == "__main__":
+    test_replay_is_deterministic()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""한계 비용 순 시장 청산 테스트"""
+
+import random
+from datetime import timedelta
+from modules.simulator import Simulator
+
+def brute_force_clear(plants, demand):
+    """정렬 후 앞에서부터 채우는 단순 청산 (비교용) -> (청산 가격, 발전소 idx별 급전량)"""
+    dispatch = {}
+    remaining = demand
+    price = 0.0
+    for cost, idx, capacity in sorted(plants):
+        take = min(capacity, max(remaining, 0.0))
+        dispatch[idx] = take
+        if take > 0:
+            price = cost
+        remaining -= take
+    return price, dispatch
+
+def make_simulator(seed):
+    random.seed(seed)
+    sim = Simulator()
+    city = sim.city
+    for _ in range(40):
+        kind = random.choice(["thermal", "nuclear", "solar", "wind", "plain"])
+        b = city.add_building(random.uniform(5, 50), random.uniform(0, 500), random.uniform(0, 500))
+        if kind != "plain":
+            b.power_plant_type = kind
+    for _ in range(60):
+        city.add_building(random.uniform(-30, -1), random.uniform(0, 500), random.uniform(0, 500))
+    return sim
+
+def test_merit_order_matches_brute_force():
+    """트리 청산 결과가 정렬 후 순차 채움과 같은지 확인 (용량 점 갱신 포함)"""
+    print("\n=== 시장 청산 테스트 ===")
+    for seed in range(3):
+        sim = make_simulator(seed)
+        power_system = sim.power_system
+        market = power_system.enable_market(reserve_margin=0.0)
+        for b in sim.city.buildings:
+            b.current_supply = b.base_supply
+        fleet = power_system.generators.fleet("market", sim.city.buildings)
+        assert len(fleet) == 40
+
+        for step in range(5):
+            # 일부 발전소 가능 출력 변경 -> 점 갱신
+            for b in random.sample(fleet, 10):
+                market.update_capacity(b, random.uniform(0, b.base_supply))
+            plants = [(market.costs[market.position[b.idx]], b.idx, market.capacity[market.position[b.idx]]) for b in fleet]
+            total = sum(p[2] for p in plants)
+            demand = random.uniform(0.1, 0.9) * total
+            price = market.clear(demand)
+            expected_price, expected = brute_force_clear(plants, demand)
+            assert abs(price - expected_price) < 1e-9, (price, expected_price)
+
+            # 급전량: 한계 발전소 앞은 전량, 한계 발전소는 나머지, 뒤는 0
+            for b in fleet:
+                position = market.position[b.idx]
+                if position < market.marginal_position:
+                    dispatched = market.capacity[position]
+                elif position == market.marginal_position:
+                    dispatched = market.marginal_target
+                else:
+                    dispatched = 0.0
+                assert abs(dispatched - expected[b.idx]) < 1e-6
+            assert abs(market.supply_at(price) - sum(p[2] for p in plants if p[0] <= price)) < 1e-6
+        print(f"  seed {seed}: 청산 가격 {price:.1f} 원/kWh, 한계 발전소 위치 {market.marginal_position}")
+    print("  ✅ 시장 청산 결과 일치")
+
+def test_market_dispatch_in_tick():
+    """틱 처리 중 시장 급전으로 발전량이 잔여 수요(+예비율) 수준으로 줄어드는지 확인"""
+    sim = make_simulator(7)
+    power_system = sim.power_system
+    market = power_system.enable_market(reserve_margin=0.1)
+    power_system.apply_demand_pattern()
+    demand = sum(-b.current_supply for b in sim.city.buildings if b.current_supply < 0)
+    generation = sum(b.current_supply for b in sim.city.buildings if b.current_supply > 0)
+    assert abs(generation - demand * 1.1) < 1e-6, (generation, demand)
+    first_clear = market.last_clear
+
+    # 15분 안에는 다시 청산하지 않음
+    sim.simTime += timedelta(minutes=5)
+    power_system.apply_demand_pattern()
+    assert market.last_clear == first_clear
+    sim.simTime += timedelta(minutes=15)
+    power_system.apply_demand_pattern()
+    assert market.last_clear == sim.simTime
+
+    power_system.disable_market()
+    assert power_system.generators.get("market") is None
+    print("  ✅ 시장 급전 틱 적용 확인")
+
+def test_merit_order_edge_cases():
+    """같은 비용 발전소, 용량 0 발전소, 누적 용량 경계와 같은 수요, 공급 부족에서도 정렬 순차 채움과 청산 가격이 같은지 확인"""
+    print("\n=== 시장 청산 경계 조건 테스트 ===")
+    sim = make_simulator(11)
+    market = sim.power_system.enable_market(reserve_margin=0.0)
+    fleet = sim.power_system.generators.fleet("market", sim.city.buildings)
+    for b in fleet:
+        market.update_capacity(b, float(random.randint(0, 5)))   # 정수 용량 (0 포함) -> 누적 경계가 정확히 표현됨
+    checked = 0
+    for update in range(300):
+        b = random.choice(fleet)
+        market.update_capacity(b, float(random.randint(0, 5)))
+        plants = [(market.costs[market.position[b.idx]], b.idx, market.capacity[market.position[b.idx]]) for b in fleet]
+        ordered = sorted(plants)
+        total = sum(p[2] for p in plants)
+        # 점 갱신이 누적돼도 트리 합이 용량 배열과 같음
+        assert market._tree.prefix(len(fleet)) == total
+        boundaries = [sum(p[2] for p in ordered[:k + 1]) for k in range(len(ordered)) if ordered[k][2] > 0]
+        for demand in random.sample(boundaries, 3) + [random.uniform(0.5, total - 0.5)]:
+            price = market.clear(demand)
+            expected_price, expected = brute_force_clear(plants, demand)
+            assert price == expected_price, (update, demand, price, expected_price)
+            if demand < total:
+                marginal = market.plants[market.marginal_position]
+                assert market.marginal_target == expected[marginal.idx] > 0
+            else:
+                assert market.marginal_position == -1   # 수요 = 전체 공급: 전 발전소 급전
+            checked += 1
+
+    # 공급 부족: 전 발전소 급전, 가격은 용량이 남아 있는 가장 비싼 발전소
+    for b in fleet:
+        market.update_capacity(b, 1.0)
+    top = market.costs[-1]
+    for b in market.plants:
+        if market.costs[market.position[b.idx]] == top:
+            market.update_capacity(b, 0.0)     # 가장 비싼 발전 유형 전부 정지
+    plants = [(market.costs[market.position[b.idx]], b.idx, market.capacity[market.position[b.idx]]) for b in fleet]
+    price = market.clear(len(fleet) + 10.0)
+    assert price == brute_force_clear(plants, len(fleet) + 10.0)[0] < top
+    assert market.marginal_position == -1
+    print(f"  ✅ 청산 {checked}회 (경계 수요 포함) 정렬 순차 채움과 일치")
+
+if __name__ == "__main__":
+    test_merit_order_matches_brute_force()
+    test_merit_order_edge_cases()
+    test_market_dispatch_in_tick()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""최소비용 유량 / 다기간 유량 계산 테스트"""
+
+import itertools
+import numpy as np
+from modules.flow import FlowNetwork, min_cost_flow
+from modules.simulator import Simulator
+from modules.multiperiod import MultiPeriodFlowSolver
+
+def brute_force_flows(n, tails, heads, caps, costs, source, sink):
+    """정수 간선 유량을 모두 나열 -> {유량 값: 최소 비용} (노드 보존을 만족하는 해만)"""
+    flows = np.array(list(itertools.product(*(range(c + 1) for c in caps))), dtype=float)
+    incidence = np.zeros((n, len(tails)))
+    incidence[tails, np.arange(len(tails))] -= 1.0
+    incidence[heads, np.arange(len(tails))] += 1.0
+    balance = flows @ incidence.T
+    inner = [v for v in range(n) if v not in (source, sink)]
+    valid = np.all(balance[:, inner] == 0, axis=1)
+    values = balance[valid, sink]
+    total = flows[valid] @ np.asarray(costs, dtype=float)
+    best = {}
+    for value, cost in zip(values.tolist(), total.tolist()):
+        best[value] = min(best.get(value, np.inf), cost)
+    return best
+
+def test_min_cost_flow_matches_brute_force():
+    """작은 임의 그래프에서 최대 유량/최소 비용과 유량 상한(max_flow)별 최소 비용이 전수 탐색 최적해와 같은지 확인"""
+    print("\n=== 최소비용 유량 전수 탐색 비교 테스트 ===")
+    rng = np.random.default_rng(7)
+    n, source, sink = 5, 0, 4
+    for trial in range(30):
+        pairs = [(u, v) for u in range(n) for v in range(n) if u != v and u != sink and v != source]
+        pick = rng.choice(len(pairs), size=7, replace=False)
+        tails = np.array([pairs[k][0] for k in pick])
+        heads = np.array([pairs[k][1] for k in pick])
+        caps = rng.integers(0, 4, size=7)
+        costs = rng.integers(0, 6, size=7)
+        best = brute_force_flows(n, tails, heads, caps, costs, source, sink)
+
+        network = FlowNetwork(n)
+        edges = network.add_edges(tails, heads, caps, costs)
+        network.finalize()
+        total_flow, total_cost, flow, _ = min_cost_flow(network, source, sink)
+        assert abs(total_flow - max(best)) < 1e-9, trial
+        assert abs(total_cost - best[max(best)]) < 1e-9, trial
+        assert np.all(flow[edges] >= -1e-9) and np.all(flow[edges] <= caps + 1e-9)
+        assert abs(float(flow[edges] @ costs) - total_cost) < 1e-9
+
+        for limit in range(1, int(max(best))):
+            network = FlowNetwork(n)
+            network.add_edges(tails, heads, caps, costs)
+            network.finalize()
+            limited_flow, limited_cost, _, _ = min_cost_flow(network, source, sink, max_flow=limit)
+            assert abs(limited_flow - limit) < 1e-9 and abs(limited_cost - best[limit]) < 1e-9, (trial, limit)
+    print("  ✅ 임의 그래프 30개에서 전수 탐색 최적 비용과 일치")
+
+def test_storage_round_trip_losses():
+    """저장장치가 내보낸 에너지는 왕복 효율만큼 줄어들고 저장량이 손실을 반영하는지 확인"""
+    print("\n=== 다기간 저장 손실 테스트 ===")
+    sim = Simulator()
+    city = sim.city
+    battery = city.add_building(0.0, 0, 0)
+    city.add_building(-1.0, 100, 0)
+    city.add_line(0, 1, 5.0)
+    battery.battery_capacity = 10.0
+    battery.battery_charge = 8.0
+    round_trip = sim.power_system.battery_fleet.efficiency ** 2
+    solver = MultiPeriodFlowSolver(sim.power_system)
+    hours = 12
+
+    # 방전만: 매시간 1 MWh 수요에 8 MWh 저장량이 실제로 낼 수 있는 만큼만 공급
+    demand = np.zeros((hours, 2))
+    demand[:, 1] = 1.0
+    result = solver.solve(hours, start=sim.simTime, generation=np.zeros((hours, 2)), demand=demand)
+    assert abs(result.total_served - 8.0 * round_trip) < 1e-6, result.total_served
+    assert abs(result.served.sum() - result.total_served) < 1e-6
+    assert abs(result.storage_level[-1, 0]) < 1e-6
+    assert abs(result.storage_losses[0] - 8.0 * (1.0 - round_trip)) < 1e-6
+    assert np.all(np.diff(result.storage_level[:, 0]) <= 1e-9)
+
+    # 시간 이동: 앞 4시간 발전으로 충전해 뒤 8시간 수요에 공급 -> 방전 = 충전 x 왕복 효율
+    battery.battery_charge = 0.0
+    generation = np.zeros((hours, 2))
+    generation[:4, 0] = 2.0
+    demand = np.zeros((hours, 2))
+    demand[4:, 1] = 1.0
+    result = solver.solve(hours, start=sim.simTime, generation=generation, demand=demand)
+    charged = result.storage_charge.sum()
+    delivered = result.storage_discharge.sum()
+    assert abs(charged - 8.0) < 1e-6, charged
+    assert abs(delivered - 8.0 * round_trip) < 1e-6, delivered
+    assert abs(result.served[4:, 1].sum() - delivered) < 1e-6
+    level = result.storage_level[:, 0]
+    assert abs(level[-1] - (level[0] + charged - delivered / round_trip)) < 1e-6
+    print(f"  ✅ 왕복 효율 {round_trip:.4f}: 저장 8 MWh -> 공급 {delivered:.3f} MWh")
+
+if __name__ == "__main__":
+    test_min_cost_flow_matches_brute_force()
+    test_storage_round_trip_losses()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""프로슈머 간 전력 거래 호가창 테스트"""
+
+import random
+import numpy as np
+from modules.simulator import Simulator
+from modules.p2p import OrderBook
+
+def brute_force_volume(bids, asks):
+    """가격-시간 순으로 정렬한 뒤 앞에서부터 맞추는 단순 체결 (비교용) -> 총 체결량"""
+    bids = sorted(enumerate(bids), key=lambda item: (-item[1][2], item[0]))
+    asks = sorted(enumerate(asks), key=lambda item: (item[1][2], item[0]))
+    bid_left = [q for _, (_, q, _) in bids]
+    ask_left = [q for _, (_, q, _) in asks]
+    i = j = 0
+    volume = 0.0
+    while i < len(bids) and j < len(asks) and bids[i][1][2] >= asks[j][1][2]:
+        quantity = min(bid_left[i], ask_left[j])
+        volume += quantity
+        bid_left[i] -= quantity
+        ask_left[j] -= quantity
+        if bid_left[i] <= 1e-12:
+            i += 1
+        if ask_left[j] <= 1e-12:
+            j += 1
+    return volume
+
+def test_order_book_matches_brute_force():
+    """힙 호가창 체결량이 정렬 체결과 같고, 체결 후 호가가 교차하지 않는지 확인"""
+    print("\n=== P2P 호가창 테스트 ===")
+    random.seed(3)
+    for _ in range(30):
+        bids = [(i, random.uniform(0.1, 5), random.choice([80, 90, 100, 110])) for i in range(random.randint(0, 40))]
+        asks = [(100 + i, random.uniform(0.1, 5), random.choice([85, 95, 105])) for i in range(random.randint(0, 40))]
+        book = OrderBook()
+        book.load(bids, asks)
+        trades = book.match()
+        assert abs(sum(t[2] for t in trades) - brute_force_volume(bids, asks)) < 1e-9
+        for buyer, seller, quantity, price in trades:
+            assert quantity > 0
+            assert dict((i, p) for i, _, p in asks)[seller] <= price <= dict((i, p) for i, _, p in bids)[buyer]
+        if book.best_bid() is not None and book.best_ask() is not None:
+            assert book.best_bid() < book.best_ask()
+    print("  ✅ 호가창 체결량 일치")
+
+def test_p2p_trades_injected():
+    """체결된 매도량이 잉여보다 크면 배터리 방전으로 주입되는지 확인"""
+    sim = Simulator()
+    city = sim.city
+    seller = city.add_building(-2.0, 0, 0)
+    seller.is_prosumer, seller.solar_capacity = True, 5.0
+    seller.battery_capacity, seller.battery_charge = 10.0, 10.0
+    buyer = city.add_building(-4.0, 10, 0)
+    buyer.is_prosumer, buyer.solar_capacity = True, 1.0
+    buyer.battery_capacity, buyer.battery_charge = 0.0, 0.0
+
+    market = sim.power_system.enable_p2p()
+    seller.current_supply = 0.5     # 태양광 반영 후 잉여 0.5 MW
+    buyer.current_supply = -3.0     # 태양광 반영 후 부족 3 MW
+    sim.power_system.generators.fleets(city.buildings)
+    market.dispatch(np.ones(2, dtype=bool), sim.simTime)
+
+    assert len(market.trades) == 1
+    sold = market.trades[0][2]
+    assert abs(sold - min(3.0, 0.5 + 1.0 * market.round_trip[0])) < 1e-9
+    assert abs(seller.current_supply - sold) < 1e-9
+    assert abs(seller.battery_charge - (10.0 - (sold - 0.5) / market.round_trip[0])) < 1e-9
+    print(f"  ✅ 체결 {sold:.2f} MW, 배터리 방전 주입 {market.injected:.2f} MW")
+
+if __name__ == "__main__":
+    test_order_book_matches_brute_force()
+    test_p2p_trades_injected()
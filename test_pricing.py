@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""노드 가격(LMP) 테스트"""
+
+from modules.simulator import Simulator
+from modules.economics import EconomicModel
+
+def test_congested_line_splits_prices():
+    """혼잡 송전선 양 끝의 가격이 갈라지고, 가격이 실제 반영된 흐름과 같은 급전 해에서 나오는지 확인"""
+    print("\n=== 혼잡 송전선 가격 분리 테스트 ===")
+    sim = Simulator()
+    sim.set_economic_model(EconomicModel(sim))
+    city = sim.city
+    solar = city.add_building(100.0, 0, 0)
+    solar.power_plant_type = "solar"
+    city.add_building(-10.0, 100, 0)
+    city.add_building(-20.0, 200, 0)
+    city.add_thermal_plant(100.0, 300, 0)
+    feeder = city.add_line(0, 1, 100.0)
+    tie = city.add_line(1, 2, 5.0)        # 혼잡 송전선
+    thermal_line = city.add_line(3, 2, 50.0)
+    for b in city.buildings:
+        b.current_supply = b.base_supply
+    sim.power_system.compute_line_flows()
+
+    # 싼 태양광이 1번 수요 10과 혼잡선 한도 5를 채우고, 나머지 15는 화력이 공급
+    assert abs(feeder.flow - 15.0) < 1e-9
+    assert abs(tie.flow - 5.0) < 1e-9 and tie.usage_rate >= 100.0 - 1e-9
+    assert abs(thermal_line.flow - 15.0) < 1e-9
+
+    costs = sim.economic_model.generation_cost
+    prices = sim.power_system.compute_nodal_prices()
+    assert abs(prices[1] - (costs["solar"] + feeder.cost)) < 1e-9
+    assert abs(prices[2] - (costs["coal"] + thermal_line.cost)) < 1e-9
+    assert prices[2] - prices[1] > 50.0
+
+    sim.economic_model.update_nodal_prices()
+    nodal = sim.economic_model.nodal_prices
+    assert nodal[2] > nodal[1]
+
+    # 판매 수익은 건물 노드 가격으로 계산
+    economic_model = sim.economic_model
+    cheap = economic_model.sell_electricity(1000.0, building=city.buildings[1])
+    dear = economic_model.sell_electricity(1000.0, building=city.buildings[2])
+    assert abs(cheap - nodal[1]) < 1e-9 and abs(dear - nodal[2]) < 1e-9
+    assert abs(economic_model.revenue - (cheap + dear)) < 1e-9
+    assert economic_model.get_economic_stats()["revenue"] == economic_model.revenue
+    print(f"  혼잡선 양 끝 LMP: {prices[1]:.1f} / {prices[2]:.1f} 원/kWh, 1MWh 판매 수익 {cheap:.1f} / {dear:.1f}")
+
+if __name__ == "__main__":
+    test_congested_line_splits_prices()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""부하 프로필 저장소 테스트"""
+
+import os
+import datetime
+import numpy as np
+from modules.profiles import LoadProfileStore
+
+def test_profile_store_temp_dir():
+    """같은 내용 프로필은 한 행을 공유하고, 경로 없이 만든 저장소는 close()에서 임시 파일을 지우는지 확인"""
+    print("\n=== 부하 프로필 저장소 테스트 ===")
+    store = LoadProfileStore(steps=24 * 365)
+    hourly = np.linspace(0.5, 1.5, 24 * 365)
+    assert store.add("a", hourly) == store.add("b", hourly) == 0
+    assert store.add("c", np.repeat(hourly[:365], 24)) == 1 and len(store) == 2
+    when = datetime.datetime(2025, 1, 1, 5, 30)
+    assert np.allclose(store.values(np.array([0]), when), hourly[5])
+
+    directory = os.path.dirname(store.path)
+    assert os.path.exists(store.path)
+    store.close()
+    assert not os.path.exists(directory)
+    store.close()
+    print("  ✅ 프로필 3개 -> 행 2개, close() 후 임시 디렉터리 삭제")
+
+def test_profile_store_without_index(tmp_path):
+    """인덱스 파일 없이 행렬 파일만 남은 경우 온전한 행으로 인덱스를 다시 만들고 잘린 행은 버리는지 확인"""
+    print("\n=== 부하 프로필 저장소 인덱스 재구성 테스트 ===")
+    path = os.path.join(str(tmp_path), "profiles.f32")
+    store = LoadProfileStore(path, steps=24)
+    first, second = np.arange(24, dtype=np.float32), np.ones(24, dtype=np.float32)
+    store.add("a", first)
+    store.add("b", second)
+    store.close()
+    with open(path, "ab") as f:
+        f.write(b"\0" * 10)   # 쓰다 만 행
+    assert not os.path.exists(store.index_path)
+
+    reopened = LoadProfileStore(path, steps=24)
+    assert len(reopened) == 2 and os.path.getsize(path) == 2 * 24 * 4
+    assert reopened.row("a") == -1
+    assert reopened.add("b", second) == 1 and reopened.add("c", np.full(24, 2.0)) == 2
+    assert np.array_equal(reopened.matrix[0], first) and np.array_equal(reopened.matrix[2], np.full(24, 2.0))
+    reopened.close()
+    print("  ✅ 행 2개 복구, 잘린 10바이트 제거, 이후 추가 행 정렬 유지")
+
+if __name__ == "__main__":
+    import tempfile
+    test_profile_store_temp_dir()
+    with tempfile.TemporaryDirectory() as directory:
+        test_profile_store_without_index(directory)
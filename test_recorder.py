@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""송전선/건물별 흐름 전체 해상도 기록 테스트"""
+
+import io
+import os
+import json
+import random
+import tempfile
+import contextlib
+import numpy as np
+from modules.simulator import Simulator
+from modules.recorder import FlowRecorder
+
+def test_flow_recorder():
+    """매 단계 기록한 값이 시뮬레이터 상태와 같고, 임계 초과 시간/지속 곡선이 직접 계산한 결과와 맞는지 확인"""
+    print("\n=== 흐름 기록 테스트 ===")
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json"), encoding="utf-8") as f:
+        scenario = json.load(f)["scenarios"][2]
+    random.seed(11)
+    sim = Simulator()
+    sim.gameSpeed = 6000.0
+    with tempfile.TemporaryDirectory() as tmp:
+        usage = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.load_scenario(scenario)
+            recorder = sim.start_recorder(200, tmp, spare=2)
+            for _ in range(250):
+                sim.step(random.choice([30, 33, 40]))
+                if len(usage) < 200:
+                    usage.append([pl.usage_rate for pl in sim.city.lines])
+        assert recorder.full and recorder.steps == 200
+        usage = np.array(usage, dtype=np.float32)
+        assert np.array_equal(recorder.arrays["usage_rate"][:200, :usage.shape[1]], usage)
+        assert np.isnan(recorder.arrays["flow"][0, -1])
+
+        hours = recorder.durations()
+        assert abs(hours.sum() - (recorder.elapsed[199]) / 3600.0) < 1e-9 and np.all(hours > 0)
+        threshold = float(np.median(usage))
+        above = recorder.hours_above("usage_rate", threshold, block=64)
+        assert np.allclose(above[:usage.shape[1]], hours @ (usage > threshold))
+        assert np.all(above[usage.shape[1]:] == 0)
+
+        column = int(np.argmax(above))
+        intervals = recorder.intervals_above("usage_rate", column, threshold)
+        assert abs(sum((e - s).total_seconds() for s, e in intervals) / 3600.0 - above[column]) < 1e-6
+        curve_hours, curve_values = recorder.duration_curve("usage_rate", column)
+        assert np.all(np.diff(curve_values) <= 0) and abs(curve_hours[-1] - hours.sum()) < 1e-9
+        assert abs(curve_hours[np.flatnonzero(curve_values > threshold)[-1]] - above[column]) < 1e-9
+        assert len(recorder.duration_curve("usage_rate", column, points=20)[0]) == 20
+
+        sim.stop_recorder()
+        reopened = FlowRecorder.open(tmp)
+        assert reopened.steps == 200
+        assert np.allclose(reopened.hours_above("usage_rate", threshold), above)
+        print(f"  ✅ {recorder.steps}단계 x 송전선 {usage.shape[1]}개 기록, 최대 혼잡 송전선 {above[column]:.1f}시간 ({len(intervals)}구간)")
+
+def test_recorder_scenario_switch():
+    """시나리오를 다시 불러오면 기록이 끝나고, 바뀐 설비 목록으로 직접 기록하려 하면 예외가 나는지 확인"""
+    print("\n=== 시나리오 전환 시 흐름 기록 종료 테스트 ===")
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json"), encoding="utf-8") as f:
+        scenarios = json.load(f)["scenarios"]
+    sim = Simulator()
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.load_scenario(scenarios[2])
+            recorder = sim.start_recorder(50, tmp)
+            sim.step(33)
+            sim.load_scenario(scenarios[0])
+            assert sim.recorder is None
+            sim.step(33)
+        assert recorder.steps == 1
+        try:
+            recorder.record()
+        except RuntimeError:
+            pass
+        else:
+            raise AssertionError("설비 목록이 바뀐 뒤의 기록이 거부되지 않았습니다")
+        assert recorder.steps == 1
+        print("  ✅ 시나리오 로드 후 기록 종료, 이전 열 배치로의 기록 거부")
+
+if __name__ == "__main__":
+    test_flow_recorder()
+    test_recorder_scenario_switch()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""중요도 표본추출 신뢰도 추정 테스트"""
+
+import itertools
+import numpy as np
+from modules.simulator import Simulator
+from modules.flow import augment_paths
+from modules.reliability import ReliabilityEstimator, state_loss
+
+def make_grid():
+    """발전소 2개 + 수요 4개 링 계통 (설비 8개 -> 상태 256개를 전수 계산 가능)"""
+    sim = Simulator()
+    city = sim.city
+    for i, supply in enumerate([12.0, -4.0, -3.0, 10.0, -5.0, -4.0]):
+        city.add_building(supply, 100 * i, 0)
+    for i in range(6):
+        city.add_line(i, (i + 1) % 6, 8.0)
+    for b in city.buildings:
+        b.current_supply = b.base_supply
+    sim.power_system.compute_line_flows()
+    hazard = sim.event_system.hazard
+    hazard.line_rate = 0.02
+    hazard.plant_rate = 0.01
+    return sim
+
+def exact_lolp(estimator):
+    """전체 상태 전수 계산 LOLP"""
+    estimator.engine.build()
+    line_u, plant_u = estimator.unavailability()
+    u = np.concatenate([line_u, plant_u])
+    line_count = len(line_u)
+    states = np.array(list(itertools.product([False, True], repeat=len(u))))
+    probability = np.prod(np.where(states, u, 1.0 - u), axis=1)
+    losses = estimator.evaluate_states(states, line_count)
+    return float(probability[losses > estimator.loss_tolerance].sum())
+
+def test_importance_sampling_matches_plain_monte_carlo():
+    """중요도 표본추출 LOLP가 일반 몬테카를로(bias=1) 및 전수 계산과 신뢰구간 안에서 일치하는지 확인"""
+    print("\n=== 신뢰도 추정 테스트 ===")
+    sim = make_grid()
+    weighted = ReliabilityEstimator(sim, seed=1).estimate(4000)
+    plain = ReliabilityEstimator(sim, bias=1.0, seed=2).estimate(40000)
+    exact = exact_lolp(ReliabilityEstimator(sim))
+
+    assert weighted.bias > 1.0
+    assert 0.0 < exact < 0.5
+    assert weighted.lolp_interval[0] <= exact <= weighted.lolp_interval[1], (weighted.lolp_interval, exact)
+    assert plain.lolp_interval[0] <= exact <= plain.lolp_interval[1], (plain.lolp_interval, exact)
+    assert abs(weighted.eens - plain.eens) <= (weighted.eens_interval[1] - weighted.eens_interval[0]) + (plain.eens_interval[1] - plain.eens_interval[0])
+    print(f"  전수 {exact:.4f}, IS {weighted.lolp:.4f} {weighted.lolp_interval}, MC {plain.lolp:.4f} {plain.lolp_interval}")
+
+def test_parallel_matches_serial():
+    """작업 프로세스 평가 결과가 현재 프로세스 평가와 같은지 확인"""
+    sim = make_grid()
+    serial = ReliabilityEstimator(sim, seed=3).estimate(400)
+    parallel = ReliabilityEstimator(sim, seed=3, workers=2).estimate(400)
+    assert serial.lolp == parallel.lolp and serial.eens == parallel.eens
+
+def cold_loss(engine, failed_lines, failed_plants):
+    """고장 설비를 뺀 그래프를 처음부터 다시 푼 부하 손실 (warm start와 무관한 비교 기준)"""
+    capacity = engine.network.capacity.copy()
+    for k in failed_lines:
+        capacity[engine.line_edges[k]] = capacity[engine.line_edges[k] + 1] = 0.0
+    capacity[engine.source_edges[list(failed_plants)]] = 0.0
+    residual = capacity.tolist()
+    augment_paths(engine.network, residual, engine.source, engine.sink, eps=engine.eps)
+    edges = engine.sink_edges
+    served = float((capacity[edges] - np.asarray(residual)[edges]).sum())
+    return max(engine.base_served - served, 0.0)
+
+def test_plant_outages_lose_load():
+    """발전소 정지 상태의 부하 손실이 다시 푼 최대 유량과 같고, 전체 발전 정지면 기준 공급량 전부를 잃는지 확인"""
+    print("\n=== 발전소 정지 부하 손실 테스트 ===")
+    sim = make_grid()
+    engine = ReliabilityEstimator(sim).engine
+    engine.build()
+    line_count = len(engine.line_positions)
+    plant_count = len(engine.source_edges)
+    assert plant_count == 2 and engine.base_served > 0
+
+    everything = engine.cascade([], plants=range(plant_count))
+    assert everything.served_after == 0.0 and everything.load_lost == engine.base_served
+    assert state_loss(engine, [], list(range(plant_count))) == engine.base_served
+
+    # 연쇄 트립 없이(propagate=False) 모든 고장 조합을 다시 푼 결과와 비교
+    for state in itertools.product([False, True], repeat=line_count + plant_count):
+        failed = np.flatnonzero(state)
+        lines = failed[failed < line_count].tolist()
+        plants = (failed[failed >= line_count] - line_count).tolist()
+        loss = state_loss(engine, lines, plants, propagate=False)
+        assert abs(loss - cold_loss(engine, lines, plants)) < 1e-6, (lines, plants, loss)
+    single = state_loss(engine, [], [0])
+    assert single > 0
+    print(f"  ✅ 기준 공급 {engine.base_served:.1f}MW, 발전소 하나 정지 손실 {single:.1f}MW, 상태 {2 ** (line_count + plant_count)}개 일치")
+
+if __name__ == "__main__":
+    test_importance_sampling_matches_plain_monte_carlo()
+    test_plant_outages_lose_load()
+    test_parallel_matches_serial()
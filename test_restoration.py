@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""수리반 복구 대기열 테스트"""
+
+import datetime
+from modules.simulator import Simulator
+from modules.restoration import RestorationSystem
+from modules.hazard import HazardModel
+
+def make_sim():
+    """발전소 1개 + 수요 건물 3개, 무작위 이벤트/설비 고장 없음"""
+    sim = Simulator()
+    sim.simTime = datetime.datetime(2025, 1, 1, 0, 0, 0)
+    city = sim.city
+    city.add_building(30.0, 0, 0)
+    for i in range(3):
+        city.add_building(-5.0, 100 * (i + 1), 0)
+        city.add_line(0, i + 1, 10.0)
+    events = sim.event_system
+    for name in events.event_rates:
+        events.event_rates[name] = 0.0
+    events.hazard.line_rate = events.hazard.plant_rate = 0.0
+    events.restoration = RestorationSystem(sim, events, crews=1, seed=1)
+    return sim
+
+def run_hours(sim, hours):
+    for _ in range(hours):
+        sim.simTime += datetime.timedelta(hours=1)
+        sim.event_system.update_events()
+
+def test_deleted_components_are_not_restored():
+    """대기 중/수리 중에 사용자가 삭제한 설비는 수리반이 되살리지 않는지 확인"""
+    print("\n=== 삭제 설비 복구 방지 테스트 ===")
+    sim = make_sim()
+    city = sim.city
+    restoration = sim.event_system.restoration
+    sim.event_system.update_events()
+
+    failed = [city.lines[0], city.lines[1], city.buildings[3]]
+    for component in failed:
+        component.removed = True
+    restoration.report(failed)
+    assert restoration.busy_crews == 1 and restoration.pending == 2
+    in_progress = restoration.crews[0].job.component
+    queued = next(c for c in failed if c is not in_progress)
+    kept = next(c for c in failed if c is not in_progress and c is not queued)
+
+    city.delete(in_progress)
+    city.delete(queued)
+    run_hours(sim, 500)
+
+    assert in_progress.removed and queued.removed
+    assert not kept.removed
+    assert [job.component for job in restoration.completed] == [kept]
+    assert restoration.busy_crews == 0 and restoration.pending == 0
+    print(f"  복구 {len(restoration.completed)}건, 삭제 설비 2건 유지")
+
+def test_hazard_auto_repair_skips_deleted():
+    """설비 고장 자동 복구도 삭제 설비는 건너뛰고, 시나리오 로드 시 고장 목록이 비워지는지 확인"""
+    print("\n=== 고장 자동 복구 / 시나리오 로드 테스트 ===")
+    sim = make_sim()
+    city = sim.city
+    hazard = HazardModel(sim, mean_repair_hours=1.0, seed=2)
+    now = sim.simTime
+    hazard.add_line_failures([city.lines[0], city.lines[1]], now)
+    city.delete(city.lines[0])
+    hazard.restore(now + datetime.timedelta(days=30))
+    assert city.lines[0].removed and not city.lines[1].removed
+    assert not hazard.failed_lines
+
+    hazard.add_line_failures([city.lines[2]], now)
+    sim.event_system.hazard = hazard
+    sim.load_scenario({"buildings": [{"base_supply": 10.0, "x": 0, "y": 0}], "lines": []})
+    assert not hazard.failed_lines and not hazard.failed_plants
+    print("  삭제 송전선 유지, 시나리오 로드 후 고장 목록 비움")
+
+if __name__ == "__main__":
+    test_deleted_components_are_not_restored()
+    test_hazard_auto_repair_skips_deleted()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""스냅샷 스트리밍 싱크 (NDJSON / 열 이진 파일) 테스트"""
+
+import io
+import os
+import json
+import random
+import tempfile
+import contextlib
+from datetime import timedelta
+import numpy as np
+from modules.simulator import Simulator
+from modules.economics import EconomicModel
+from modules.analytics import SimulationAnalytics
+from modules.timeseries import TimeSeriesStore
+from modules.sink import ColumnarReader, ColumnarSink, SnapshotSink
+
+def test_streaming_sinks():
+    """실행 중 청크 단위로 쓴 파일이 메모리 스냅샷과 같고, 푸터 없이 잘린 파일도 완성된 청크까지 읽히는지 확인"""
+    print("\n=== 스냅샷 스트리밍 싱크 테스트 ===")
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.json"), encoding="utf-8") as f:
+        scenario = json.load(f)["scenarios"][0]
+    random.seed(5)
+    sim = Simulator()
+    sim.gameSpeed = 6000.0
+    sim.set_economic_model(EconomicModel(sim))
+    with tempfile.TemporaryDirectory() as tmp:
+        ndjson_path = os.path.join(tmp, "snapshots.ndjson")
+        columnar_path = os.path.join(tmp, "snapshots.pgc")
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim.load_scenario(scenario)
+            analytics = SimulationAnalytics(sim, snapshot_interval=timedelta(minutes=10))
+            analytics.stream_to(ndjson_path, "ndjson", chunk_rows=16)
+            columnar = analytics.stream_to(columnar_path, "columnar", chunk_rows=16)
+            for _ in range(300):
+                sim.step(33)
+                analytics.update()
+        # 실행 중에도 완성된 청크는 이미 파일에 있음
+        columnar.flush()
+        partial = ColumnarReader(columnar_path)
+        assert not partial.complete and len(partial) == columnar.rows_written > 0
+        analytics.close_sinks()
+
+        metrics = analytics.metrics
+        with open(ndjson_path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        assert len(rows) == len(metrics)
+        points = analytics.data_points
+        assert [r["weather"] for r in rows] == [p["weather"] for p in points]
+        assert [r["timestamp"] for r in rows] == [p["timestamp"] for p in points]
+        assert np.allclose([r["total_demand"] for r in rows], metrics.column("total_demand"))
+
+        reader = ColumnarReader(columnar_path)
+        assert reader.complete and len(reader) == len(metrics) and len(reader.chunks) > 2
+        epochs, columns = reader.read()
+        assert np.array_equal(epochs, metrics.epochs)
+        for name in metrics.dtypes:
+            assert np.array_equal(columns[name], metrics.column(name)), name
+        assert reader.labels("pm_level", columns["pm_level"]) == metrics.labels("pm_level")
+        start = int(metrics.epochs[20])
+        end = int(metrics.epochs[40])
+        epochs, columns = reader.read(start, end, columns=["total_supply"])
+        assert np.array_equal(epochs, metrics.epochs[20:40]) and list(columns) == ["total_supply"]
+
+        # 비정상 종료: 푸터와 마지막 청크 일부가 없는 파일
+        with open(columnar_path, "rb") as f:
+            data = f.read()
+        with open(columnar_path, "wb") as f:
+            f.write(data[:reader.chunks[-1][0] + 40])
+        recovered = ColumnarReader(columnar_path)
+        assert not recovered.complete and len(recovered.chunks) == len(reader.chunks) - 1
+        epochs, _ = recovered.read()
+        assert np.array_equal(epochs, metrics.epochs[:len(epochs)])
+        print(f"  ✅ 스냅샷 {len(metrics)}개, 청크 {len(reader.chunks)}개 기록, 잘린 파일에서 {len(epochs)}행 복구")
+
+def test_empty_columnar_sink():
+    """스냅샷이 하나도 없어도 열 파일에 스키마와 푸터가 남아 빈 결과로 읽히는지 확인"""
+    print("\n=== 빈 열 스냅샷 파일 테스트 ===")
+    store = TimeSeriesStore({"total_supply": np.float64}, categorical=("weather",))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "empty.pgc")
+        sink = ColumnarSink(path)
+        sink.offer(store)
+        sink.close(store)
+        reader = ColumnarReader(path)
+        assert reader.complete and len(reader) == 0
+        assert [name for name, _ in reader.columns] == ["total_supply", "weather"]
+        epochs, columns = reader.read(columns=["total_supply"])
+        assert len(epochs) == 0 and len(columns["total_supply"]) == 0
+
+        bare_path = os.path.join(tmp, "bare.pgc")
+        ColumnarSink(bare_path).close()
+        assert ColumnarReader(bare_path).complete and len(ColumnarReader(bare_path)) == 0
+    try:
+        SnapshotSink(os.path.join(tmp, "abstract"))
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("write_chunk 없는 싱크가 만들어졌습니다")
+    print("  ✅ 빈 파일도 스키마/푸터 기록, 기반 싱크는 직접 만들 수 없음")
+
+if __name__ == "__main__":
+    test_streaming_sinks()
+    test_empty_columnar_sink()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""저장장치 최적 운전 계획 테스트"""
+
+import datetime
+import numpy as np
+from modules.simulator import Simulator
+from modules.generators import hydrogen_parameters
+from modules.storage import solve_storage_dp
+
+def dense_storage_dp(capacity, soc, charge_eff, discharge_eff, max_charge, max_discharge,
+                     charge_limit, discharge_limit, prices, terminal_price, levels):
+    """(장치, 현재 단계, 다음 단계)를 모두 펼친 기존 DP -> (N, H) 계획 (띠 DP 비교용)"""
+    capacity = np.asarray(capacity, dtype=float)
+    count = len(capacity)
+    horizon = np.shape(prices)[-1]
+    prices = np.broadcast_to(np.asarray(prices, dtype=float), (count, horizon))
+    if count == 0 or horizon == 0:
+        return np.zeros((count, horizon))
+
+    step = capacity / (levels - 1)
+    grid = np.arange(levels)
+    delta = (grid[None, :] - grid[:, None])[None, :, :] * step[:, None, None]   # (N, K, K) 현재 -> 다음 단계 저장량 변화
+    charging = delta > 0
+    grid_energy = np.where(charging, delta / np.asarray(charge_eff, dtype=float)[:, None, None], 0.0)
+    delivered = np.where(charging, 0.0, -delta * np.asarray(discharge_eff, dtype=float)[:, None, None])
+    rate_ok = (delta <= np.asarray(max_charge, dtype=float)[:, None, None] + 1e-9) & \
+              (-delta <= np.asarray(max_discharge, dtype=float)[:, None, None] + 1e-9)
+    # 가치가 같으면 움직이지 않도록 아주 작은 이동 비용
+    move_cost = 1e-9 * np.abs(delta)
+
+    # 종료 시점 저장량 가치 (남은 에너지를 평균 가격으로 방전했다고 가정)
+    value = (grid[None, :] * step[:, None]) * (np.asarray(terminal_price, dtype=float) * np.asarray(discharge_eff, dtype=float))[:, None]
+    policy = np.empty((horizon, count, levels), dtype=np.intp)
+    for t in range(horizon - 1, -1, -1):
+        feasible = rate_ok & (grid_energy <= charge_limit[:, t, None, None] + 1e-9) & \
+                   (delivered <= discharge_limit[:, t, None, None] + 1e-9)
+        q = prices[:, t, None, None] * (delivered - grid_energy) - move_cost + value[:, None, :]
+        q = np.where(feasible, q, -np.inf)
+        policy[t] = q.argmax(axis=2)
+        value = np.take_along_axis(q, policy[t][:, :, None], axis=2)[:, :, 0]
+
+    # 현재 저장량에서 정방향으로 계획 추적
+    rows = np.arange(count)
+    level = np.clip(np.rint(np.divide(soc, step, out=np.zeros(count), where=step > 0)), 0, levels - 1).astype(np.intp)
+    schedule = np.empty((count, horizon))
+    for t in range(horizon):
+        next_level = policy[t][rows, level]
+        schedule[:, t] = (next_level - level) * step
+        level = next_level
+    return schedule
+
+def test_hydrogen_dispatch_conserves_energy():
+    """수소 저장소 계획 실행 중 수소 질량 변화가 계통과 주고받은 전력량과 맞는지 확인 (kg 저장소, MWh 저장소)"""
+    print("\n=== 수소 저장소 운전 계획 보존 테스트 ===")
+    sim = Simulator()
+    sim.simTime = datetime.datetime(2025, 1, 1, 0, 0, 0)
+    city = sim.city
+    mass_storage = city.add_building(power_plant_type="hydrogen", hydrogen_storage=100.0)   # kg 단위 (HydrogenEnergyStorage)
+    mass_storage.hydrogen_level = 40.0
+    energy_storage = city.add_hydrogen_storage(50.0, 100, 0)                               # MWh 단위
+    scheduler = sim.power_system.enable_storage_scheduler(horizon=12)
+
+    # 잉여 6시간 -> 부족 6시간이 반복되는 예측 (가격은 부족 시간이 높음)
+    hours = np.arange(scheduler.horizon)
+    pattern = np.where((hours // 6) % 2 == 0, -400.0, 400.0)
+
+    def forecast(start, count, batteries=()):
+        shift = start.hour % 12
+        net_load = np.roll(pattern, -shift)[:count]
+        return np.where(net_load > 0, 150.0, 50.0), net_load, np.zeros((len(batteries), count))
+    scheduler.forecast = forecast
+
+    storages = [mass_storage, energy_storage]
+    charged = {id(b): 0.0 for b in storages}
+    delivered = {id(b): 0.0 for b in storages}
+    start_level = {id(b): b.hydrogen_level for b in storages}
+    scheduler.dispatch()
+    for _ in range(24):
+        sim.simTime += datetime.timedelta(hours=1)
+        levels = {id(b): b.hydrogen_level for b in storages}
+        scheduler.dispatch()
+        for b in storages:
+            charge_eff, discharge_eff, energy_density = hydrogen_parameters(b)
+            stored = (b.hydrogen_level - levels[id(b)]) * energy_density
+            assert -1e-9 <= b.hydrogen_level <= b.hydrogen_storage + 1e-9
+            if b.current_supply < 0:
+                charged[id(b)] += -b.current_supply
+                assert abs(stored - (-b.current_supply) * charge_eff) < 1e-6, (b.idx, stored, b.current_supply)
+            elif b.current_supply > 0:
+                delivered[id(b)] += b.current_supply
+                assert abs(stored + b.current_supply / discharge_eff) < 1e-6, (b.idx, stored, b.current_supply)
+
+    for b in storages:
+        charge_eff, discharge_eff, energy_density = hydrogen_parameters(b)
+        net_stored = (b.hydrogen_level - start_level[id(b)]) * energy_density
+        assert charged[id(b)] > 0 and delivered[id(b)] > 0, b.idx
+        assert abs(net_stored - (charged[id(b)] * charge_eff - delivered[id(b)] / discharge_eff)) < 1e-6
+        print(f"  저장소 {b.idx}: 충전 {charged[id(b)]:.1f}, 방전 {delivered[id(b)]:.1f}, 저장량 {start_level[id(b)]:.1f} -> {b.hydrogen_level:.1f}")
+
+def test_banded_dp_matches_dense():
+    """충방전 한도 안의 전이만 두는 DP가 모든 단계 쌍을 펼친 DP와 같은 계획을 내는지 확인"""
+    print("\n=== 저장장치 띠 DP 비교 테스트 ===")
+    rng = np.random.default_rng(3)
+    for trial in range(20):
+        count, horizon, levels = 5, 12, int(rng.integers(5, 61))
+        capacity = rng.uniform(0.0, 20.0, count)
+        capacity[0] = 0.0
+        args = (capacity, capacity * rng.uniform(0, 1, count), rng.uniform(0.6, 1.0, count), rng.uniform(0.6, 1.0, count),
+                capacity * rng.uniform(0.02, 1.2, count), capacity * rng.uniform(0.02, 1.2, count),
+                np.where(rng.random((count, horizon)) < 0.2, np.inf, rng.uniform(0, 10, (count, horizon))),
+                rng.uniform(0, 10, (count, horizon)), rng.uniform(20, 200, horizon), rng.uniform(50, 150, count), levels)
+        banded = solve_storage_dp(*args)
+        assert np.array_equal(banded, dense_storage_dp(*args)), trial
+    print("  ✅ 임의 20개 사례에서 전체 DP와 같은 계획")
+
+def test_battery_dispatch_needs_elapsed_time():
+    """흐른 시간이 0인 첫 틱에는 배터리가 계통 전력을 주고받지 않는지 확인"""
+    print("\n=== 배터리 0시간 틱 테스트 ===")
+    sim = Simulator()
+    sim.simTime = datetime.datetime(2025, 1, 1, 0, 0, 0)
+    battery = sim.city.add_building(-5.0, 0, 0)
+    battery.battery_capacity = 10.0
+    battery.battery_charge = 5.0
+    battery.smart_grid_connected = True
+    scheduler = sim.power_system.enable_storage_scheduler(horizon=6)
+    scheduler.forecast = lambda start, count, batteries=(): (np.linspace(50.0, 300.0, count), np.full(count, 10.0),
+                                                              np.full((len(batteries), count), 5.0))
+    battery.current_supply = -5.0
+    scheduler.dispatch()
+    assert [b for b, _ in scheduler.units] == [battery]
+    assert scheduler.plan_power[battery.idx] != 0.0
+    assert battery.current_supply == -5.0 and battery.battery_charge == 5.0
+    print(f"  ✅ 계획 출력 {scheduler.plan_power[battery.idx]:+.2f} MW, 첫 틱 전력/충전량 변화 없음")
+
+if __name__ == "__main__":
+    test_hydrogen_dispatch_conserves_energy()
+    test_banded_dp_matches_dense()
+    test_battery_dispatch_needs_elapsed_time()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""시간 인덱스 열 저장소 테스트"""
+
+from datetime import datetime, timedelta
+import numpy as np
+from modules.timeseries import TimeSeriesStore, to_epoch, from_epoch
+
+def test_append_grow_range():
+    """용량을 넘겨 늘어나도 값이 유지되고, 구간 조회가 [start, end) 행을 돌려주는지 확인"""
+    print("\n=== 시계열 저장소 추가/확장/구간 테스트 ===")
+    start = datetime(2025, 1, 1)
+    store = TimeSeriesStore({"value": np.float64, "count": np.int32}, capacity=4, chunk=8)
+    times = [start + timedelta(minutes=10 * i) for i in range(50)]
+    for i, t in enumerate(times):
+        assert store.append(t, value=i * 0.5, count=i) == i
+    store.append(times[-1], value=99.0)   # 같은 시각은 허용, 빠진 열은 0
+    assert len(store) == 51
+    assert len(store._epoch) % 8 == 0 and len(store._epoch) - len(store) < 8
+    assert store.column("value")[:50].tolist() == [i * 0.5 for i in range(50)]
+    assert store.last("value") == 99.0 and store.last("count") == 0
+    assert [from_epoch(e) for e in store.epochs[:50]] == times
+
+    epochs, columns = store.range(times[10], times[20])
+    assert len(epochs) == 10 and columns["count"].tolist() == list(range(10, 20))
+    assert np.shares_memory(columns["value"], store._data["value"])
+    lo, hi = store.span(times[10] + timedelta(minutes=5), times[12])
+    assert (lo, hi) == (11, 12)
+    assert store.span(times[30], times[5]) == (30, 30)
+    assert store.span(None, times[3]) == (0, 3) and store.span(times[49])[1] == 51
+
+    try:
+        store.append(times[-2], value=1.0)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("더 이른 시각이 추가되었습니다")
+    assert len(store) == 51 and to_epoch(store.epochs[-1]) == to_epoch(times[-1])
+    print(f"  ✅ 51행 추가 (할당 {len(store._epoch)}행), 구간 조회/역행 시각 거부")
+
+def test_ring_buffer_and_categorical():
+    """max_length를 넘으면 오래된 행을 버리고 시퀀스 번호가 이어지며, 범주 열이 문자열로 복원되는지 확인"""
+    print("\n=== 시계열 저장소 링 버퍼/범주 열 테스트 ===")
+    start = datetime(2025, 6, 1)
+    store = TimeSeriesStore(("price",), max_length=20, categorical=("weather",))
+    weathers = ["맑음", "흐림", None, "비"]
+    sequences = []
+    for i in range(45):
+        sequences.append(store.append(start + timedelta(hours=i), price=float(i), weather=weathers[i % 4]))
+    assert sequences == list(range(45))
+    assert len(store) <= 20 and len(store._epoch) <= 20
+    assert store.dropped + len(store) == 45
+    kept = store.column("price").tolist()
+    assert kept == [float(i) for i in range(store.dropped, 45)]
+    assert store.labels("weather") == [weathers[i % 4] for i in range(store.dropped, 45)]
+    assert store.categories["weather"] == ["맑음", "흐림", "비"]
+    assert store.code("weather", "흐림") == 1
+    records = store.to_records()
+    assert records[-1] == {"time": (start + timedelta(hours=44)).isoformat(), "price": 44.0, "weather": "맑음"}
+    assert records[-2]["weather"] == "비" and records[-3]["weather"] is None
+    print(f"  ✅ 45행 중 최근 {len(store)}행 유지 (버린 행 {store.dropped}), 범주 {len(store.categories['weather'])}개")
+
+if __name__ == "__main__":
+    test_append_grow_range()
+    test_ring_buffer_and_categorical()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""자기상관 풍속 과정 / 풍력 출력 곡선 테스트"""
+
+import math
+import numpy as np
+from modules.simulator import Simulator
+from modules.wind import WindModel, _erf
+
+def test_latent_process_autocorrelation():
+    """잠재 AR(1) 과정이 정상분포 N(0,1)을 유지하고 지연 k 자기상관이 phi^k인지 확인"""
+    print("\n=== 풍속 AR(1) 자기상관 테스트 ===")
+    model = WindModel(None, block_size=1440, phi=0.9, seed=11)
+    blocks = []
+    for _ in range(200):
+        model._generate_block()
+        blocks.append(model._block)
+    z = np.concatenate(blocks)
+    assert abs(z.mean()) < 0.03 and abs(z.var() - 1.0) < 0.03, (z.mean(), z.var())
+    for lag in (1, 2, 5, 10):
+        correlation = np.corrcoef(z[:-lag], z[lag:])[0, 1]
+        assert abs(correlation - 0.9 ** lag) < 0.01, (lag, correlation)
+    # 블록 경계에서도 과정이 이어짐 (경계 차이 분산 = 블록 안 차이 분산 = 2(1 - phi))
+    steps = np.diff(z)
+    boundary = steps[np.arange(1, 200) * 1440 - 1]
+    assert abs(boundary.var() - 2 * (1 - 0.9)) < 0.06, boundary.var()
+    print(f"  ✅ {len(z)}개 샘플, 지연 1 자기상관 {np.corrcoef(z[:-1], z[1:])[0, 1]:.3f} (phi 0.9)")
+
+def test_weibull_marginal():
+    """가우시안 코퓰라(_erf) 변환 풍속의 분포가 목표 평균의 Weibull 분포와 같은지 확인"""
+    print("\n=== 풍속 Weibull 주변분포 테스트 ===")
+    x = np.linspace(-5, 5, 2001)
+    assert np.max(np.abs(_erf(x) - np.array([math.erf(v) for v in x]))) < 1.5e-7
+
+    model = WindModel(None, weibull_shape=2.0, seed=3)
+    model.scale = model._scale_for_mean(8.0)
+    z = np.random.default_rng(5).standard_normal(400000)
+    speeds = model._z_to_speed(z)
+    assert abs(speeds.mean() - 8.0) < 0.03, speeds.mean()
+    grid = np.linspace(0.5, 25.0, 50)
+    empirical = np.searchsorted(np.sort(speeds), grid) / len(speeds)
+    weibull = 1.0 - np.exp(-(grid / model.scale) ** 2.0)
+    assert np.max(np.abs(empirical - weibull)) < 0.005
+    # 단조 변환이므로 잠재값 순서가 풍속 순서로 보존됨
+    assert np.all(np.diff(model._z_to_speed(np.sort(z[:1000]))) >= 0)
+    print(f"  ✅ 평균 {speeds.mean():.2f} m/s, 누적분포 최대 차이 {np.max(np.abs(empirical - weibull)):.4f}")
+
+def test_power_curve_and_hub_height():
+    """출력 곡선의 시동/정격/정지 풍속 값과 허브 높이 보정이 발전소 출력에 반영되는지 확인"""
+    print("\n=== 풍력 출력 곡선 테스트 ===")
+    model = WindModel(None, seed=1)
+    speeds = np.array([0.0, 2.9, 2.999, 3.0, 6.0, 11.9, 12.0, 18.0, 25.0, 25.001, 30.0])
+    output = model.power_curve(speeds)
+    expected = [0.0, 0.0, 0.0, (3 / 12) ** 3, (6 / 12) ** 3, None, 1.0, 1.0, 1.0, 0.0, 0.0]
+    for speed, value, target in zip(speeds, output, expected):
+        if target is not None:
+            assert abs(value - target) < 1e-12, (speed, value, target)
+    assert (10.5 / 12) ** 3 < output[5] < 1.0
+    assert np.all(np.diff(model.power_curve(np.linspace(3.0, 12.0, 200))) >= 0)
+
+    # 기본 허브 높이 80m: 기준 10m 풍속의 (80/10)^0.143 ≈ 1.35배
+    factor = float(model.hub_height_factor(80.0))
+    assert abs(factor - 8.0 ** 0.143) < 1e-12 and abs(factor - 1.35) < 0.01
+    sim = Simulator()
+    plant = sim.city.add_wind_plant(capacity=40.0)
+    low = sim.city.add_wind_plant(capacity=40.0, x=50)
+    low.hub_height = 10.0
+    model.reference_speed = 6.0
+    idx, power = model.fleet_output(sim.city.buildings)
+    by_idx = dict(zip(idx.tolist(), power.tolist()))
+    assert abs(by_idx[plant.idx] - 40.0 * float(model.power_curve(6.0 * factor))) < 1e-9
+    assert abs(by_idx[low.idx] - 40.0 * (6.0 / 12.0) ** 3) < 1e-9
+    print(f"  ✅ 기준 풍속 6 m/s: 80m 허브 {by_idx[plant.idx]:.1f} MW, 10m 허브 {by_idx[low.idx]:.1f} MW")
+
+if __name__ == "__main__":
+    test_latent_process_autocorrelation()
+    test_weibull_marginal()
+    test_power_curve_and_hub_height()
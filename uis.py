@@ -286,7 +286,7 @@ class ContextMenu:
         
     def delete_line(self):
         if isinstance(self.target, PowerLine):
-            self.target.removed = True
+            self.simulator.city.delete(self.target)
             self.simulator.update_flow(True)
         self.hide()
         
@@ -306,12 +306,13 @@ class ContextMenu:
     def adjust_solar(self, delta):
         if self.target:
             self.target.solar_capacity = max(0, self.target.solar_capacity + delta)
+            self.simulator.power_system.invalidate_fleets()  # 태양광 발전소/프로슈머 배터리 재분류
             self.simulator.update_flow(True)
         self.hide()
         
     def delete_building(self):
         if self.target:
-            self.target.removed = True
+            self.simulator.city.delete(self.target)
             self.simulator.update_flow(True)
         self.hide()
         
@@ -355,6 +356,7 @@ class ContextMenu:
                 
                 # 배터리 용량 설정
                 self.target.battery_capacity = new_capacity
+                self.simulator.power_system.invalidate_fleets()
                 
                 # 충전량이 용량을 초과하지 않도록 조정
                 if self.target.battery_charge > new_capacity:
@@ -437,6 +439,7 @@ class ContextMenu:
         """
         if self.target:
             self.target.smart_grid_connected = not self.target.smart_grid_connected
+            self.simulator.power_system.invalidate_fleets()
             state = "연결됨" if self.target.smart_grid_connected else "해제됨"
             print(f"스마트 그리드 {state}")
             
@@ -538,9 +541,11 @@ class ContextMenu:
             
         mx, my = pos
         if self.hover_idx >= 0 and self.hover_idx < len(self.items):
-            _, callback = self.items[self.hover_idx]
+            label, callback = self.items[self.hover_idx]
             if callback:  # 구분선이 아닌 경우에만 콜백 실행
-                callback()
+                # 메뉴 편집은 이벤트 저널에 기록 (메뉴 항목 이름을 동작 이름으로)
+                with self.simulator.record_edit("context_menu", label):
+                    callback()
             return True
             
         # 메뉴 영역 밖 클릭